@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Area Index Module - One-pass index of a scheme's Revit areas
+
+Matching used to rescan every area for every Excel requirement and
+re-lowercase every string each time. The index normalizes each area once,
+groups them by (department, program type, program type detail) and keeps
+the numeric fields already converted, so matching, unmatched detection and
+the department/level aggregations all read from the same structure.
+"""
+
+import time
+
+
+def normalize_key(value):
+    """Lowercase and trim a matching field, None becomes empty string."""
+    if value is None:
+        return u""
+    try:
+        return value.lower().strip()
+    except AttributeError:
+        return str(value).lower().strip()
+
+
+def make_key(department, program_type, program_type_detail):
+    """Normalized lookup key shared by requirements and areas."""
+    return (normalize_key(department),
+            normalize_key(program_type),
+            normalize_key(program_type_detail))
+
+
+def safe_float(value):
+    try:
+        return float(value) if value else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class SchemeAreaIndex:
+    """Hash index over the areas of one scheme.
+
+    Args:
+        areas_list (list): Area dicts with department, program_type,
+            program_type_detail, area_sf, level_name and level_elevation.
+    """
+
+    def __init__(self, areas_list):
+        self.areas_list = areas_list
+        self._by_key = {}
+        self._key_by_id = {}
+        self._sf_by_id = {}
+        self._elevation_by_id = {}
+        self.total_sf = 0.0
+
+        for area in areas_list:
+            key = make_key(area.get('department', ''),
+                           area.get('program_type', ''),
+                           area.get('program_type_detail', ''))
+            area_id = id(area)
+            area_sf = safe_float(area.get('area_sf'))
+            self._by_key.setdefault(key, []).append(area)
+            self._key_by_id[area_id] = key
+            self._sf_by_id[area_id] = area_sf
+            self._elevation_by_id[area_id] = safe_float(area.get('level_elevation'))
+            self.total_sf += area_sf
+
+    def find(self, program_type_detail, department, program_type):
+        """Get areas matching a requirement exactly, in original area order."""
+        return list(self._by_key.get(make_key(department, program_type, program_type_detail), []))
+
+    def get_area_sf(self, area):
+        """Area in SF already converted to float."""
+        area_id = id(area)
+        if area_id in self._sf_by_id:
+            return self._sf_by_id[area_id]
+        return safe_float(area.get('area_sf'))
+
+    def get_level_elevation(self, area):
+        """Level elevation already converted to float."""
+        area_id = id(area)
+        if area_id in self._elevation_by_id:
+            return self._elevation_by_id[area_id]
+        return safe_float(area.get('level_elevation'))
+
+    def sum_area_sf(self, areas):
+        return sum(self.get_area_sf(area) for area in areas)
+
+    def get_unmatched(self, requirement_keys):
+        """Get areas whose key is not in requirement_keys, in original order.
+
+        Args:
+            requirement_keys (set): Keys built with make_key
+        """
+        return [area for area in self.areas_list
+                if self._key_by_id[id(area)] not in requirement_keys]
+
+
+def _legacy_find(req_detail, req_dept, req_type, areas_list):
+    matching_areas = []
+    for area_object in areas_list:
+        area_dept = area_object.get('department', '')
+        area_type = area_object.get('program_type', '')
+        area_detail = area_object.get('program_type_detail', '')
+        if (req_detail.lower().strip() == area_detail.lower().strip() and
+                req_dept.lower().strip() == area_dept.lower().strip() and
+                req_type.lower().strip() == area_type.lower().strip()):
+            matching_areas.append(area_object)
+    return matching_areas
+
+
+def benchmark(requirement_count=5000, area_count=50000, legacy_sample=20):
+    """Time index matching against the legacy linear scan on synthetic data.
+
+    The legacy scan is O(requirements x areas), so it is timed on a sample
+    of requirements and extrapolated.
+
+    Returns:
+        dict: index_build, index_match, legacy_match_estimated (seconds)
+    """
+    import random
+    random.seed(7)
+
+    requirements = []
+    for i in range(requirement_count):
+        requirements.append(("Room {}".format(i), "Dept {}".format(i % 40), "Division {}".format(i % 200)))
+
+    areas_list = []
+    for i in range(area_count):
+        detail, dept, division = requirements[random.randrange(requirement_count)]
+        if i % 10 == 0:
+            detail = "Unplanned {}".format(i)
+        areas_list.append({
+            'department': "  " + dept.upper() + " ",
+            'program_type': division,
+            'program_type_detail': detail.lower(),
+            'area_sf': str(100 + i % 500),
+            'level_name': "Level {}".format(i % 12),
+            'level_elevation': i % 12 * 15.0,
+        })
+
+    t_start = time.time()
+    index = SchemeAreaIndex(areas_list)
+    index_build = time.time() - t_start
+
+    t_start = time.time()
+    matched = 0
+    for detail, dept, division in requirements:
+        matching = index.find(detail, dept, division)
+        matched += len(matching)
+        index.sum_area_sf(matching)
+    unmatched = index.get_unmatched(set(make_key(dept, division, detail) for detail, dept, division in requirements))
+    index_match = time.time() - t_start
+
+    t_start = time.time()
+    for detail, dept, division in requirements[:legacy_sample]:
+        assert _legacy_find(detail, dept, division, areas_list) == index.find(detail, dept, division)
+    legacy_match_estimated = (time.time() - t_start) * requirement_count / float(legacy_sample)
+
+    print("{} requirements x {} areas".format(requirement_count, area_count))
+    print("  index build:            {:.3f}s".format(index_build))
+    print("  index match + unmatched: {:.3f}s ({} matched, {} unmatched)".format(index_match, matched, len(unmatched)))
+    print("  legacy scan (estimated): {:.1f}s".format(legacy_match_estimated))
+    return {
+        'index_build': index_build,
+        'index_match': index_match,
+        'legacy_match_estimated': legacy_match_estimated,
+    }
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -120,7 +120,19 @@ def _collect_levels(revit_areas):
     return levels
 
 
-def build_matrix(matches, revit_areas, color_hierarchy=None):
+def build_matrix(matches, revit_areas, color_hierarchy=None, area_index=None):
+    """Build the level x department table for one scheme.
+
+    area_index (SchemeAreaIndex, optional) reuses the area SF and level
+    elevation the matcher already converted instead of parsing them again.
+    """
+    if area_index is not None:
+        get_area_sf = area_index.get_area_sf
+        get_elevation = area_index.get_level_elevation
+    else:
+        get_area_sf = lambda area: _safe_float(area.get('area_sf'))
+        get_elevation = lambda area: _safe_float(area.get('level_elevation'))
+
     sorted_matches = sorted(matches, key=lambda item: item.get('excel_row_index', 0))
 
     departments = _collect_departments(sorted_matches)
@@ -147,8 +159,8 @@ def build_matrix(matches, revit_areas, color_hierarchy=None):
     for area in filtered_areas:
         dept = _normalize_department(area.get('department'))
         level_name = _normalize_level(area.get('level_name'))
-        elevation = _safe_float(area.get('level_elevation'))
-        area_value = _safe_float(area.get('area_sf'))
+        elevation = get_elevation(area)
+        area_value = get_area_sf(area)
 
         if level_name not in cell_values:
             cell_values[level_name] = {}
@@ -9,7 +9,7 @@ import os
 import shutil
 import time
 import config
-from EnneadTab import EXCEL, DATA_FILE, EXE
+from EnneadTab import EXCEL, JOB_CHANNEL
 
 
 def fake_write_design_values(excel_data, all_matches, excel_path, worksheet):
@@ -175,23 +175,12 @@ def write_design_values_to_excel(excel_data, all_matches, excel_path, worksheet)
     }
     
     print("Updating {} cells...".format(total_updates))
-    DATA_FILE.set_data(job_data, "excel_handler_input")
-    
-    # Launch ExcelHandler
-    EXE.try_open_app("ExcelHandler")
-    
-    # Wait for ExcelHandler to complete (max 30 seconds)
-    max_wait = 300  # 30 seconds (300 * 0.1)
-    wait = 0
-    while wait < max_wait:
-        job_status = DATA_FILE.get_data("excel_handler_input")
-        if job_status and job_status.get("status") == "done":
-            print("ExcelHandler completed successfully!")
-            break
-        time.sleep(0.1)
-        wait += 1
     
-    if wait >= max_wait:
+    # Launch ExcelHandler and wait for it to complete (max 30 seconds)
+    result = JOB_CHANNEL.EXCEL_HANDLER.run(job_data, timeout=30)
+    if result.is_done:
+        print("ExcelHandler completed successfully!")
+    else:
         print("WARNING: ExcelHandler timeout after 30 seconds")
     
     # Print summary
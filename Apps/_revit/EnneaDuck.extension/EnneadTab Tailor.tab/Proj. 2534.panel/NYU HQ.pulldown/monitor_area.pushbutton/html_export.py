@@ -9,13 +9,15 @@ Uses exact matching on 3 parameters: Department, Program Type, Program Type Deta
 import os
 import webbrowser
 import subprocess
-import io
+import json
 import time
+import shutil
 from datetime import datetime
 import config
+import area_index
 import suggestion_logic
 import department_matrix
-from EnneadTab import ENVIRONMENT
+from EnneadTab import ENVIRONMENT, REPORT_WRITER
 
 try:
     _BUILTINS_DICT = __builtins__ if isinstance(__builtins__, dict) else __builtins__.__dict__
@@ -27,6 +29,19 @@ except Exception:
 class AreaMatcher:
     """Exact matching between Excel requirements and Revit areas using 3 parameters"""
     
+    def __init__(self):
+        # One area index per scheme areas list, shared by matching,
+        # unmatched detection and the department/level aggregations
+        self._indexes = {}
+    
+    def get_index(self, areas_list):
+        """Get the area index for a scheme's areas list, building it once"""
+        index = self._indexes.get(id(areas_list))
+        if index is None or index.areas_list is not areas_list:
+            index = area_index.SchemeAreaIndex(areas_list)
+            self._indexes[id(areas_list)] = index
+        return index
+    
     def _safe_int(self, value):
         """Safely convert value to integer"""
         try:
@@ -63,7 +78,7 @@ class AreaMatcher:
                 matches = self._match_single_scheme(excel_data, areas_list)
                 
                 # Calculate scheme info
-                total_sf = sum(self._safe_float(area['area_sf']) for area in areas_list)
+                total_sf = self.get_index(areas_list).total_sf
                 scheme_info = {
                     'name': scheme_name,
                     'count': len(areas_list),
@@ -89,6 +104,7 @@ class AreaMatcher:
             list: List of match results
         """
         matches = []
+        index = self.get_index(areas_list)
         
         for room_key, requirement in excel_data.items():
             # Get actual Excel row number from RowData object
@@ -114,16 +130,15 @@ class AreaMatcher:
             target_dgsf = self._safe_float(target_dgsf)
             
             # Find matching Revit areas using exact 3-parameter match
-            matching_areas = self._find_matching_areas(
+            matching_areas = index.find(
                 room_name,  # program_type_detail
                 department, 
-                program_type, 
-                areas_list
+                program_type
             )
             
             # Calculate actual counts and areas
             actual_count = len(matching_areas)
-            actual_dgsf = sum(self._safe_float(area['area_sf']) for area in matching_areas)
+            actual_dgsf = index.sum_area_sf(matching_areas)
             
             # Calculate deltas (handle None values)
             # If target is None or 0, delta should be None (no requirement)
@@ -187,21 +202,8 @@ class AreaMatcher:
         Returns:
             list: List of matching area objects (exact match only)
         """
-        matching_areas = []
-        
-        for area_object in areas_list:
-            # Get the 3 parameters from area object (using dict keys, not config params)
-            area_dept = area_object.get('department', '')
-            area_type = area_object.get('program_type', '')
-            area_detail = area_object.get('program_type_detail', '')
-            
-            # EXACT match on all 3 parameters (case-insensitive, whitespace-trimmed)
-            if (req_detail.lower().strip() == area_detail.lower().strip() and 
-                req_dept.lower().strip() == area_dept.lower().strip() and 
-                req_type.lower().strip() == area_type.lower().strip()):
-                matching_areas.append(area_object)
-        
-        return matching_areas
+        # EXACT match on all 3 parameters (case-insensitive, whitespace-trimmed)
+        return self.get_index(areas_list).find(req_detail, req_dept, req_type)
     
     def _determine_status(self, target_count, target_dgsf, actual_count, actual_dgsf):
         """Determine fulfillment status with proper overage handling"""
@@ -290,27 +292,16 @@ class AreaMatcher:
         Returns:
             list: List of unmatched area objects
         """
-        # Get all matched area objects
-        all_matched_areas = []
+        # Any area whose key matches at least one requirement is matched
+        requirement_keys = set()
         
         for room_key, requirement in excel_data.items():
             room_name = getattr(requirement, config.PROGRAM_TYPE_DETAIL_KEY[config.APP_EXCEL], room_key)
             department = getattr(requirement, config.DEPARTMENT_KEY[config.APP_EXCEL], '')
             program_type = getattr(requirement, config.PROGRAM_TYPE_KEY[config.APP_EXCEL], '')
-            
-            matching_areas = self._find_matching_areas(
-                room_name,  # program_type_detail
-                department, 
-                program_type, 
-                areas_list
-            )
-            all_matched_areas.extend(matching_areas)
-        
-        # Find unmatched areas by comparing object references
-        matched_ids = set(id(area) for area in all_matched_areas)
-        unmatched = [area for area in areas_list if id(area) not in matched_ids]
+            requirement_keys.add(area_index.make_key(department, program_type, room_name))
         
-        return unmatched
+        return self.get_index(areas_list).get_unmatched(requirement_keys)
 
 
 class HTMLReportGenerator:
@@ -389,6 +380,9 @@ class HTMLReportGenerator:
                     file_age = current_time - os.path.getmtime(filepath)
                     if file_age > max_age_seconds:
                         os.remove(filepath)
+                        # data scripts of the report live in a folder named after it
+                        data_folder = os.path.splitext(filepath)[0] + REPORT_WRITER.DATA_FOLDER_SUFFIX
+                        shutil.rmtree(data_folder, ignore_errors=True)
                         deleted_count += 1
                         print("Deleted old report: {}".format(filename))
                 except Exception as e:
@@ -438,6 +432,7 @@ class HTMLReportGenerator:
 
         # Match areas to requirements
         matcher = AreaMatcher()
+        self.matcher = matcher
         all_matches = matcher.match_areas_to_requirements(excel_data, revit_data)
         
         # Get unmatched areas for each scheme
@@ -451,42 +446,37 @@ class HTMLReportGenerator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # Generate single consolidated HTML
+        # Stream single consolidated HTML to a timestamped file
         report_creator = self._get_report_creator()
-        html_content = self._create_consolidated_html(
-            all_matches_dict=all_matches,
-            all_unmatched_dict=all_unmatched_areas,
-            current_time=current_time,
-            report_creator=report_creator
-        )
-        
-        # Save to timestamped file
         filename = "area_report_consolidated_{}.html".format(timestamp)
         filepath = os.path.join(self.reports_dir, filename)
         
-        with io.open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with REPORT_WRITER.ReportWriter(filepath) as writer:
+            self._write_consolidated_html(
+                writer,
+                all_matches_dict=all_matches,
+                all_unmatched_dict=all_unmatched_areas,
+                current_time=current_time,
+                report_creator=report_creator
+            )
         
-        # Also save as latest_report.html for easy access
+        # Also save as latest_report.html for easy access, it links the same assets and data scripts
         latest_path = os.path.join(self.reports_dir, config.LATEST_REPORT_FILENAME)
-        with io.open(latest_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        shutil.copyfile(filepath, latest_path)
         
         # Return single filepath in list for compatibility
         return [filepath], all_matches, all_unmatched_areas
     
-    def _create_scheme_content(self, scheme_name, matches, unmatched_areas, is_first=False):
+    def _write_scheme_content(self, writer, scheme_name, matches, unmatched_areas, is_first=False):
         """
-        Create HTML content for a single scheme (without outer HTML structure)
+        Write HTML content for a single scheme (without outer HTML structure)
         
         Args:
+            writer: REPORT_WRITER.ReportWriter of the report
             scheme_name: Name of the area scheme
             matches: List of matched areas for this scheme
             unmatched_areas: Dictionary of unmatched areas for this scheme
             is_first: Whether this is the first scheme (will be visible by default)
-        
-        Returns:
-            str: HTML content wrapped in a scheme container div
         """
         # Calculate summary statistics
         total_target_count = sum(match['target_count'] for match in matches if match['target_count'] is not None)
@@ -510,13 +500,14 @@ class HTMLReportGenerator:
         safe_scheme_name = scheme_name.replace(" ", "_").replace("/", "_").replace("-", "_")
 
         scheme_areas = self.revit_data.get(scheme_name, [])
-        matrix_data = department_matrix.build_matrix(matches, scheme_areas, self.color_hierarchy)
+        matrix_data = department_matrix.build_matrix(matches, scheme_areas, self.color_hierarchy,
+                                                     area_index=self.matcher.get_index(scheme_areas))
         self.department_matrix_cache[scheme_name] = matrix_data
         matrix_html = department_matrix.render_html(matrix_data, safe_scheme_name)
         active_class = " active" if is_first else ""
         
-        # Generate scheme-specific content
-        content = """
+        # Generate scheme-specific content, the unmatched section is streamed in between
+        content_head = """
 <div class="scheme-content{active_class}" id="scheme-{safe_scheme_name}" data-scheme="{scheme_name}">
     <header class="report-header">
         <div class="area-scheme-badge">
@@ -602,8 +593,8 @@ class HTMLReportGenerator:
         </div>
     </div>
     
-    {unmatched_section}
-    
+"""
+        content_tail = """
     <div class="summary-section">
         <h2>📊 Summary</h2>
         <div class="summary-cards">
@@ -714,7 +705,8 @@ class HTMLReportGenerator:
         </div>
     </div>
 </div>
-""".format(
+"""
+        values = dict(
             active_class=active_class,
             safe_scheme_name=safe_scheme_name,
             scheme_name=scheme_name,
@@ -729,19 +721,18 @@ class HTMLReportGenerator:
             high_count_delta_alerts=high_count_delta_alerts,
             high_area_delta_alerts=high_area_delta_alerts,
             extreme_difference_alerts=extreme_difference_alerts,
-            unmatched_section=self._create_unmatched_section(unmatched_areas, matches, scheme_name),
             department_summary_table=self._create_department_summary_table(matches),
             department_by_level_viz=self._create_department_by_level_visualization(matches, unmatched_areas),
             matrix_html=matrix_html,
             tree_view_html=self._create_tree_view_html(matches)
         )
         
-        return content
+        writer.write(content_head.format(**values))
+        self._write_unmatched_section(writer, unmatched_areas, matches, scheme_name)
+        writer.write(content_tail.format(**values))
     
-    def _create_consolidated_html(self, all_matches_dict, all_unmatched_dict, current_time, report_creator):
-        """Create consolidated HTML for all schemes with tabbed navigation"""
-        # Generate content for all schemes
-        all_scheme_contents = []
+    def _write_consolidated_html(self, writer, all_matches_dict, all_unmatched_dict, current_time, report_creator):
+        """Write consolidated HTML for all schemes with tabbed navigation, one scheme at a time"""
         scheme_nav_items = []
         is_first = True
         
@@ -749,14 +740,6 @@ class HTMLReportGenerator:
         sorted_scheme_names = sorted(all_matches_dict.keys())
         
         for scheme_name in sorted_scheme_names:
-            scheme_data = all_matches_dict[scheme_name]
-            matches = scheme_data.get('matches', [])
-            unmatched_areas = all_unmatched_dict.get(scheme_name, {})
-            
-            # Generate scheme content
-            scheme_content = self._create_scheme_content(scheme_name, matches, unmatched_areas, is_first)
-            all_scheme_contents.append(scheme_content)
-            
             # Generate navigation item
             safe_scheme_name = scheme_name.replace(" ", "_").replace("/", "_").replace("-", "_")
             active_class = " active" if is_first else ""
@@ -773,21 +756,17 @@ class HTMLReportGenerator:
             
             is_first = False
         
-        # Combine all scheme contents
-        combined_scheme_content = "\n".join(all_scheme_contents)
         combined_nav_items = "\n".join(scheme_nav_items)
         
-        # Build complete HTML with outer structure
-        html = """
+        # Outer structure around the scheme contents, stylesheet and scripts are shared assets
+        html_head = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{report_title}</title>
-    <style>
-        {css_styles}
-    </style>
+    {stylesheet}
 </head>
 <body>
     <!-- EnneadTab Logo - Lower Left with Parallax -->
@@ -804,9 +783,8 @@ class HTMLReportGenerator:
                 <p><strong>Project:</strong> {project_name}</p>
             </div>
         </header>
-        
-        {combined_scheme_content}
-        
+"""
+        html_tail = """
         <footer class="report-footer">
             <p>Report generated by {report_creator} | {current_time}</p>
             <p style="margin-top: 10px; font-size: 0.9em; color: #9ca3af;">
@@ -885,25 +863,37 @@ class HTMLReportGenerator:
     </nav>
     
     <script>
-        // Area Geometry Data for 3D Visualization
-        const AREA_GEOMETRY_DATA = {geometry_data};
-        
-        {javascript}
+        // Area geometry data scripts for the 3D viewer, loaded per scheme on first view
+        const AREA_GEOMETRY_FILES = {geometry_files};
+        const AREA_GEOMETRY_DATA = {{}};
     </script>
+    {scripts}
 </body>
 </html>
-""".format(
+"""
+        writer.write(html_head.format(
             report_title=config.REPORT_TITLE,
-            css_styles=self._get_css_styles(),
+            stylesheet=writer.stylesheet_tag("area_report", self._get_css_styles()) + writer.pager_tags(),
             current_time=current_time,
             project_name=config.PROJECT_NAME,
-            combined_scheme_content=combined_scheme_content,
+            report_creator=report_creator
+        ))
+        
+        is_first = True
+        for scheme_name in sorted_scheme_names:
+            scheme_data = all_matches_dict[scheme_name]
+            matches = scheme_data.get('matches', [])
+            unmatched_areas = all_unmatched_dict.get(scheme_name, {})
+            self._write_scheme_content(writer, scheme_name, matches, unmatched_areas, is_first)
+            is_first = False
+        
+        writer.write(html_tail.format(
+            current_time=current_time,
             scheme_nav_items=combined_nav_items,
-            geometry_data=self._generate_geometry_data_json(self.revit_data),
-            javascript=self._get_javascript(),
+            geometry_files=json.dumps(self._write_geometry_data(writer, self.revit_data)),
+            scripts=writer.data_loader_tag() + writer.script_tag("area_report", self._get_javascript()),
             report_creator=report_creator
-        )
-        return html
+        ))
     
     def _create_table_rows(self, matches):
         """Create table rows for the comparison table, grouped by department, preserving Excel order"""
@@ -1689,23 +1679,26 @@ class HTMLReportGenerator:
         </div>
         """.format(level_rows="".join(level_rows))
     
-    def _create_unmatched_section(self, unmatched_areas, valid_matches=None, scheme_name=None):
+    def _write_unmatched_section(self, writer, unmatched_areas, valid_matches=None, scheme_name=None):
         """
-        Create section for unmatched areas with suggestions
+        Write section for unmatched areas with suggestions
+        
+        Rows are streamed level by level and paged in the browser, see
+        REPORT_WRITER.PagedRows, so a model with thousands of unmatched
+        areas does not build or lay out one giant table.
         
         Args:
+            writer: REPORT_WRITER.ReportWriter of the report
             unmatched_areas: List of unmatched area objects
             valid_matches: List of valid match dictionaries (for suggestions)
             scheme_name: Name of the scheme (optional)
-            
-        Returns:
-            str: HTML for unmatched section
         """
         if not unmatched_areas:
-            return ""
+            return
         
         # Build list of valid items for fuzzy matching suggestions
         valid_items = suggestion_logic.build_valid_items(valid_matches)
+        suggestion_engine = suggestion_logic.SuggestionEngine(valid_items)
         
         # Group unmatched areas by level
         areas_by_level = {}
@@ -1715,11 +1708,50 @@ class HTMLReportGenerator:
                 areas_by_level[level_name] = []
             areas_by_level[level_name].append(area_object)
         
-        # Create HTML for each level
-        level_sections = []
+        section_title = "○ Unmatched Areas"
+        if scheme_name:
+            section_title = "{} - {}".format(section_title, scheme_name)
+        
+        writer.write("""
+        <div class="unmatched-section">
+            <h3>{section_title}</h3>
+            <div class="unmatched-alert">
+                <div class="alert-icon">⚠️</div>
+                <div class="alert-content">
+                    <strong>Action Required:</strong> These areas are not approved in the Excel program requirements. Please review and update the area parameters in Revit to match approved program entries, or add them to the Excel requirements if they are valid new spaces.
+                </div>
+            </div>
+            <p>The following Revit areas were not matched to any Excel requirements, grouped by level. <span class="zero-area-hint">Note: entries showing <strong>0 SF</strong> are often <em>not placed</em> in the model yet or the boundary is <em>not enclosed</em> (room/area not bounding) in Revit.</span></p>
+        """.format(section_title=section_title))
+        
+        # Write the rows of each level
         for level_name, level_areas in sorted(areas_by_level.items()):
-            level_rows = []
-            level_total_sf = 0
+            level_total_sf = sum(area_object.get('area_sf', 0) for area_object in level_areas)
+            writer.write("""
+            <div class="level-section">
+                <h4>📍 {level_name} ({area_count} areas, {total_sf:,} SF)</h4>
+            <div class="table-container">
+                <table class="unmatched-table">
+                    <thead>
+                        <tr>
+                                <th class="col-dept">Department</th>
+                                <th class="col-division">Division</th>
+                                <th class="col-function">Function</th>
+                                <th class="col-area">Area (SF)</th>
+                                <th class="col-level">Created By</th>
+                                <th class="col-level">Last Edited By</th>
+                                <th class="col-status">Status</th>
+                                <th class="col-suggestion">Suggested Match</th>
+                        </tr>
+                    </thead>
+                    {tbody}
+            """.format(
+                level_name=level_name.replace('/', ' / '),  # Add spaces around slashes
+                area_count=len(level_areas),
+                total_sf=int(round(level_total_sf)),  # Round to whole number for readability
+                tbody=REPORT_WRITER.paged_tbody_tag(len(level_areas))
+            ))
+            level_rows = writer.begin_paged_rows()
             
             for area_object in level_areas:
                 area_sf = area_object.get('area_sf', 0)
@@ -1728,14 +1760,12 @@ class HTMLReportGenerator:
                 area_detail = area_object.get('program_type_detail', '')
                 creator = area_object.get('creator', 'Unknown')
                 last_editor = area_object.get('last_editor', 'Unknown')
-                level_total_sf += area_sf
                 
                 # Find best suggestion for this unmatched area
-                plain_suggestion = suggestion_logic.get_suggestion_text(
+                plain_suggestion = suggestion_engine.get_suggestion_text(
                     area_dept,
                     area_type,
-                    area_detail,
-                    valid_items
+                    area_detail
                 )
                 if plain_suggestion:
                     area_object['suggestion_text'] = plain_suggestion
@@ -1758,7 +1788,7 @@ class HTMLReportGenerator:
                     zero_area_badge = '<span class=\"zero-area-badge\" title=\"Area boundary is not properly enclosed\">Not Enclosed</span>'
                 
                 display_area_sf = "{:,.0f}".format(float(self._safe_float(area_sf))) if not is_zero else "0"
-                level_rows.append("""
+                level_rows.add_row("""
                     <tr class=\"{zero_row_class}\">\n                        <td class=\"col-dept\">{area_dept}</td>\n                        <td class=\"col-division\">{area_type}</td>\n                        <td class=\"col-function\">{area_detail}</td>\n                        <td class=\"col-area\">{area_sf} SF {zero_area_badge}</td>\n                        <td class=\"col-level\">{creator}</td>\n                        <td class=\"col-level\">{last_editor}</td>\n                        <td class=\"col-status\"><span class=\"status-badge unmatched\">○ Unmatched</span></td>\n                        <td class=\"col-suggestion\">{suggestion}</td>\n                </tr>
              """.format(
                     area_dept=area_dept,
@@ -1772,56 +1802,17 @@ class HTMLReportGenerator:
                         suggestion=suggestion_text
                     ))
             
-            level_sections.append("""
-            <div class="level-section">
-                <h4>📍 {level_name} ({area_count} areas, {total_sf:,} SF)</h4>
-            <div class="table-container">
-                <table class="unmatched-table">
-                    <thead>
-                        <tr>
-                                <th class="col-dept">Department</th>
-                                <th class="col-division">Division</th>
-                                <th class="col-function">Function</th>
-                                <th class="col-area">Area (SF)</th>
-                                <th class="col-level">Created By</th>
-                                <th class="col-level">Last Edited By</th>
-                                <th class="col-status">Status</th>
-                                <th class="col-suggestion">Suggested Match</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                            {level_rows}
+            level_rows.close()
+            writer.write("""
                     </tbody>
                 </table>
             </div>
             </div>
-            """.format(
-                level_name=level_name.replace('/', ' / '),  # Add spaces around slashes
-                area_count=len(level_areas),
-                total_sf=int(round(level_total_sf)),  # Round to whole number for readability
-                level_rows="".join(level_rows)
-            ))
-        
-        section_title = "○ Unmatched Areas"
-        if scheme_name:
-            section_title = "{} - {}".format(section_title, scheme_name)
+            """)
         
-        return """
-        <div class="unmatched-section">
-            <h3>{section_title}</h3>
-            <div class="unmatched-alert">
-                <div class="alert-icon">⚠️</div>
-                <div class="alert-content">
-                    <strong>Action Required:</strong> These areas are not approved in the Excel program requirements. Please review and update the area parameters in Revit to match approved program entries, or add them to the Excel requirements if they are valid new spaces.
-                </div>
-            </div>
-            <p>The following Revit areas were not matched to any Excel requirements, grouped by level. <span class="zero-area-hint">Note: entries showing <strong>0 SF</strong> are often <em>not placed</em> in the model yet or the boundary is <em>not enclosed</em> (room/area not bounding) in Revit.</span></p>
-            {level_sections}
+        writer.write("""
         </div>
-        """.format(
-            section_title=section_title,
-            level_sections="".join(level_sections)
-        )
+        """)
     
     def _get_status_icon(self, status):
         """Get icon for status"""
@@ -6211,44 +6202,9 @@ class HTMLReportGenerator:
                 // Re-initialize visualizations for the newly active scheme
                 initializeSchemeVisualizations(targetScheme);
                 
-                // Initialize geometry viewer if it hasn't been created yet
-                if (typeof geometryViewers !== 'undefined' && !geometryViewers[schemeId]) {
-                    console.log('Initializing geometry viewer for newly visible scheme:', schemeId);
-                    var canvas = document.getElementById('geometry-canvas-' + schemeId);
-                    if (canvas && typeof AREA_GEOMETRY_DATA !== 'undefined') {
-                        // Try exact match first
-                        var schemeData = AREA_GEOMETRY_DATA[schemeId];
-                        
-                        // If not found, try with spaces instead of underscores
-                        if (!schemeData) {
-                            var schemeNameWithSpaces = schemeId.replace(/_/g, ' ');
-                            schemeData = AREA_GEOMETRY_DATA[schemeNameWithSpaces];
-                        }
-                        
-                        // Fuzzy match as fallback
-                        if (!schemeData) {
-                            var normalizedSchemeName = schemeId.toLowerCase().replace(/[_\s]/g, '');
-                            for (var key in AREA_GEOMETRY_DATA) {
-                                if (key.toLowerCase().replace(/[_\s]/g, '') === normalizedSchemeName) {
-                                    schemeData = AREA_GEOMETRY_DATA[key];
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        if (schemeData && typeof createGeometryViewer === 'function') {
-                            console.log('Creating viewer for scheme:', schemeId);
-                            var viewer = createGeometryViewer(canvas, schemeId, schemeData);
-                            geometryViewers[schemeId] = viewer;
-                            
-                            // Populate filter dropdowns
-                            if (typeof populateFilterDropdowns === 'function') {
-                                populateFilterDropdowns(schemeId, schemeData);
-                            }
-                        } else {
-                            console.warn('No geometry data found for scheme:', schemeId);
-                        }
-                    }
+                // Initialize geometry viewer if it hasn't been created yet, its data loads on first view
+                if (typeof initializeGeometryViewer === 'function') {
+                    initializeGeometryViewer(schemeId);
                 }
                 
                 // Scroll to top smoothly
@@ -6440,54 +6396,48 @@ class HTMLReportGenerator:
         var geometryViewers = {};
         
         /**
-         * Initialize all geometry viewers after Three.js loads
+         * Initialize the geometry viewer of the visible scheme after Three.js loads.
+         * Other schemes get theirs when switched to, see switchToScheme.
          */
         function initializeGeometryViewers() {
-            console.log('Initializing geometry viewers...');
-            console.log('AREA_GEOMETRY_DATA:', AREA_GEOMETRY_DATA);
-            
-            // Find all geometry viewer canvases
-            var canvases = document.querySelectorAll('.geometry-canvas');
-            console.log('Found geometry canvases:', canvases.length);
-            
-            canvases.forEach(function(canvas) {
-                var canvasId = canvas.id;
-                var schemeName = canvasId.replace('geometry-canvas-', '');
-                console.log('Initializing viewer for scheme:', schemeName);
-                
-                // Find matching scheme name in data (handle underscore vs space differences)
-                var actualSchemeName = null;
-                var schemeData = {};
-                
-                // Try exact match first
-                if (AREA_GEOMETRY_DATA[schemeName]) {
-                    actualSchemeName = schemeName;
-                    schemeData = AREA_GEOMETRY_DATA[schemeName];
-                } else {
-                    // Try converting underscores to spaces
-                    var schemeNameWithSpaces = schemeName.replace(/_/g, ' ');
-                    if (AREA_GEOMETRY_DATA[schemeNameWithSpaces]) {
-                        actualSchemeName = schemeNameWithSpaces;
-                        schemeData = AREA_GEOMETRY_DATA[schemeNameWithSpaces];
-                    } else {
-                        // Try finding similar name (case-insensitive partial match)
-                        for (var key in AREA_GEOMETRY_DATA) {
-                            if (key.replace(/[_\s-]/g, '').toLowerCase() === schemeName.replace(/[_\s-]/g, '').toLowerCase()) {
-                                actualSchemeName = key;
-                                schemeData = AREA_GEOMETRY_DATA[key];
-                                break;
-                            }
-                        }
-                    }
+            var activeCanvases = document.querySelectorAll('.scheme-content.active .geometry-canvas');
+            console.log('Initializing geometry viewers for visible schemes:', activeCanvases.length);
+            activeCanvases.forEach(function(canvas) {
+                initializeGeometryViewer(canvas.id.replace('geometry-canvas-', ''));
+            });
+        }
+        
+        /**
+         * Load the geometry data script of one scheme and create its viewer.
+         * AREA_GEOMETRY_FILES maps the scheme id to a data script next to the report,
+         * the data is only downloaded and parsed when the scheme is shown.
+         */
+        function initializeGeometryViewer(schemeName) {
+            if (geometryViewers[schemeName] || typeof THREE === 'undefined' || typeof THREE.OrbitControls === 'undefined') {
+                return;
+            }
+            var canvas = document.getElementById('geometry-canvas-' + schemeName);
+            if (!canvas) {
+                return;
+            }
+            var src = (typeof AREA_GEOMETRY_FILES !== 'undefined') ? AREA_GEOMETRY_FILES[schemeName] : null;
+            if (!src) {
+                console.warn('No geometry data for scheme:', schemeName);
+                canvas.parentElement.innerHTML = '<p style="color: #9ca3af; text-align: center; padding: 40px;">No geometry data available for this scheme.</p>';
+                return;
+            }
+            
+            loadReportData(schemeName, src, function(schemeData) {
+                if (geometryViewers[schemeName]) {
+                    return;
                 }
-                
-                if (!actualSchemeName || Object.keys(schemeData).length === 0) {
-                    console.warn('No geometry data for scheme:', schemeName, 'Available schemes:', Object.keys(AREA_GEOMETRY_DATA));
+                if (!schemeData || Object.keys(schemeData).length === 0) {
+                    console.warn('No geometry data for scheme:', schemeName);
                     canvas.parentElement.innerHTML = '<p style="color: #9ca3af; text-align: center; padding: 40px;">No geometry data available for this scheme.</p>';
                     return;
                 }
-                
-                console.log('Found geometry data for scheme:', actualSchemeName);
+                AREA_GEOMETRY_DATA[schemeName] = schemeData;
+                console.log('Found geometry data for scheme:', schemeName);
                 
                 // Create viewer for this scheme
                 var viewer = createGeometryViewer(canvas, schemeName, schemeData);
@@ -7601,105 +7551,92 @@ class HTMLReportGenerator:
             except Exception:
                 return ""
     
-    def _generate_geometry_data_json(self, revit_data):
+    def _write_geometry_data(self, writer, revit_data):
         """
-        Generate JavaScript-ready JSON data for area geometries
+        Write area geometries as one data script per scheme
+        
+        The 3D viewer loads a scheme's script the first time that scheme is
+        shown, so the page itself stays small. Areas are serialized one at a
+        time instead of dumping the whole structure as a single string.
         
         Args:
+            writer: REPORT_WRITER.ReportWriter of the report
             revit_data: Dictionary of area data by scheme {scheme_name: [areas]}
         
         Returns:
-            str: JavaScript object literal with geometry data
+            dict: Data script url by safe scheme name (the id used by the viewer canvas)
         """
-        import json
-        
-        # Build geometry data structure organized by scheme -> level -> areas
-        geometry_data = {}
+        geometry_files = {}
+        total_areas = 0
         
-        
-        for scheme_name, areas_list in revit_data.items():
+        for scheme_index, scheme_name in enumerate(sorted(revit_data.keys())):
+            areas_list = revit_data[scheme_name]
             if not isinstance(areas_list, list):
                 continue
             
-            
-            scheme_data = {}
-            areas_with_geometry = 0
-            
+            # Group areas with geometry by level, organized as level -> areas
+            areas_by_level = {}
             for area_obj in areas_list:
                 geometry = area_obj.get('geometry')
                 if not geometry:
                     # Skip areas without geometry
                     continue
-                
-                areas_with_geometry += 1
-                
-                level_name = geometry.get('level_name', 'Unknown')
-                
-                # Initialize level if not exists
-                if level_name not in scheme_data:
-                    scheme_data[level_name] = []
-                
-                # Get metadata from area_obj (not geometry)
-                department = area_obj.get('department', '')
-                program_type = area_obj.get('program_type', '')
-                program_type_detail = area_obj.get('program_type_detail', '')
-                area_sf = area_obj.get('area_sf', 0)
-                
-                
-                # Get department color from hierarchy
-                dept_color = self.get_color('department', department)
-                
-                # Build area geometry object for JavaScript
-                # Sanitize all values for JSON serialization (Python 2.7 compatible)
-                area_geom = {
-                    'area_id': int(geometry.get('area_id')) if geometry.get('area_id') else 0,
-                    'department': self._sanitize_for_json(department),
-                    'program_type': self._sanitize_for_json(program_type),
-                    'program_type_detail': self._sanitize_for_json(program_type_detail),
-                    'area_sf': float(area_sf),
-                    'level_elevation': float(geometry.get('level_elevation', 0)),
-                    'boundary_loops': geometry.get('boundary_loops', []),
-                    'color': self._sanitize_for_json(dept_color)
-                }
-                
-                scheme_data[level_name].append(area_geom)
-            
-            
-            geometry_data[scheme_name] = scheme_data
-        
-        # Convert to JSON string
-        try:
-            # Python 2.7 compatible JSON serialization
-            # Use ensure_ascii=True to avoid encoding issues in Python 2.7
-            json_str = json.dumps(geometry_data, indent=2, ensure_ascii=True)
+                areas_by_level.setdefault(geometry.get('level_name', 'Unknown'), []).append(area_obj)
             
-            # Write to script folder for debugging
+            safe_scheme_name = scheme_name.replace(" ", "_").replace("/", "_").replace("-", "_")
             try:
-                import os
-                # Debug JSON output (optional - comment out for production)
-                # import io
-                # script_dir = os.path.dirname(__file__)
-                # debug_path = os.path.join(script_dir, "area_geometry_debug.json")
-                # with io.open(debug_path, 'w', encoding='utf-8') as f:
-                #     if isinstance(json_str, str):
-                #         json_str_unicode = json_str.decode('utf-8')
-                #     else:
-                #         json_str_unicode = json_str
-                #     f.write(json_str_unicode)
-                
-                # Summary
-                total_areas = sum(sum(len(areas) for areas in levels.values()) for levels in geometry_data.values())
-                if total_areas > 0:
-                    print("3D geometry: {} areas loaded".format(total_areas))
-            except Exception as debug_e:
-                pass
-            
-            return json_str
-        except Exception as e:
-            print("Error generating geometry JSON: {}".format(str(e)))
-            import traceback
-            traceback.print_exc()
-            return "{}"
+                data_script, url = writer.open_data_script("geometry_{}".format(scheme_index), safe_scheme_name)
+                with data_script:
+                    data_script.write("{")
+                    for level_position, level_name in enumerate(sorted(areas_by_level.keys())):
+                        if level_position:
+                            data_script.write(",")
+                        data_script.write_json(self._sanitize_for_json(level_name))
+                        data_script.write(": [")
+                        for area_position, area_obj in enumerate(areas_by_level[level_name]):
+                            if area_position:
+                                data_script.write(",\n")
+                            data_script.write_json(self._get_area_geometry(area_obj))
+                            total_areas += 1
+                        data_script.write("]")
+                    data_script.write("}")
+                geometry_files[safe_scheme_name] = url
+            except Exception as e:
+                print("Error writing geometry data for {}: {}".format(scheme_name, str(e)))
+                import traceback
+                traceback.print_exc()
+        
+        if total_areas > 0:
+            print("3D geometry: {} areas loaded".format(total_areas))
+        return geometry_files
+    
+    def _get_area_geometry(self, area_obj):
+        """
+        Build the JSON friendly geometry object of one area for the 3D viewer
+        
+        Args:
+            area_obj: Area dictionary with a 'geometry' entry
+        
+        Returns:
+            dict: Area geometry with its metadata
+        """
+        geometry = area_obj.get('geometry')
+        
+        # Get metadata from area_obj (not geometry)
+        department = area_obj.get('department', '')
+        
+        # Sanitize all values for JSON serialization (Python 2.7 compatible)
+        return {
+            'area_id': int(geometry.get('area_id')) if geometry.get('area_id') else 0,
+            'department': self._sanitize_for_json(department),
+            'program_type': self._sanitize_for_json(area_obj.get('program_type', '')),
+            'program_type_detail': self._sanitize_for_json(area_obj.get('program_type_detail', '')),
+            'area_sf': float(area_obj.get('area_sf', 0)),
+            'level_elevation': float(geometry.get('level_elevation', 0)),
+            'boundary_loops': geometry.get('boundary_loops', []),
+            # Get department color from hierarchy
+            'color': self._sanitize_for_json(self.get_color('department', department))
+        }
     
     def open_report_in_browser(self, filepath=None):
         """Open the report in Microsoft Edge browser (preferred) or default browser"""
@@ -7731,3 +7668,92 @@ class HTMLReportGenerator:
         print("Microsoft Edge not found, using default browser")
         webbrowser.open("file://{}".format(abs_filepath))
         return True
+
+
+class _SampleRow(object):
+    """Stand-in for excel_data RowData, attributes are the Excel column names."""
+
+    def __init__(self, values):
+        for key, value in values.items():
+            setattr(self, key, value)
+
+
+def _make_sample_data(area_count, requirement_count=2000, level_count=12):
+    import random
+    random.seed(3)
+    excel_data = {}
+    requirements = []
+    for i in range(requirement_count):
+        dept, division, room = "Dept {}".format(i % 30), "Division {}".format(i % 150), "Room {}".format(i)
+        requirements.append((dept, division, room))
+        excel_data[config.COMPOSITE_KEY_SEPARATOR.join([dept, division, room])] = _SampleRow({
+            config.DEPARTMENT_KEY[config.APP_EXCEL]: dept,
+            config.PROGRAM_TYPE_KEY[config.APP_EXCEL]: division,
+            config.PROGRAM_TYPE_DETAIL_KEY[config.APP_EXCEL]: room,
+            config.COUNT_KEY[config.APP_EXCEL]: random.randint(1, 40),
+            config.SCALED_DGSF_KEY[config.APP_EXCEL]: random.randint(100, 20000),
+            '_row_number': i + 2,
+        })
+
+    areas_list = []
+    for i in range(area_count):
+        dept, division, room = requirements[random.randrange(requirement_count)]
+        if i % 8 == 0:
+            room = "Unplanned {}".format(i)
+        level = i % level_count
+        x, y = (i % 50) * 30.0, (i // 50 % 50) * 30.0
+        areas_list.append({
+            'department': dept,
+            'program_type': division,
+            'program_type_detail': room,
+            'area_sf': 100 + i % 700,
+            'level_name': "Level {}".format(level),
+            'level_elevation': level * 15.0,
+            'creator': "user{}".format(i % 9),
+            'last_editor': "user{}".format(i % 5),
+            'geometry': {
+                'area_id': 100000 + i,
+                'level_name': "Level {}".format(level),
+                'level_elevation': level * 15.0,
+                'boundary_loops': [[[x, y], [x + 25.0, y], [x + 25.0, y + 25.0], [x, y + 25.0]]],
+            },
+        })
+    return excel_data, {"Scheme A": areas_list}
+
+
+def benchmark(area_count=50000):
+    """Generate a report for area_count synthetic areas, print time, peak memory and file sizes.
+
+    Returns:
+        dict: seconds, peak bytes (0 on IronPython) and bytes of the page and its data scripts
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+    import tempfile
+    excel_data, revit_data = _make_sample_data(area_count)
+    generator = HTMLReportGenerator()
+    generator.reports_dir = tempfile.mkdtemp()
+    if tracemalloc:
+        tracemalloc.start()
+    t_start = time.time()
+    filepaths, _, all_unmatched = generator.generate_html_report(excel_data, revit_data)
+    duration = time.time() - t_start
+    peak = 0
+    if tracemalloc:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    page_size = os.path.getsize(filepaths[0])
+    data_folder = os.path.splitext(filepaths[0])[0] + REPORT_WRITER.DATA_FOLDER_SUFFIX
+    data_size = sum(os.path.getsize(os.path.join(data_folder, x)) for x in os.listdir(data_folder))
+    print("{} areas, {} unmatched".format(area_count, sum(len(x) for x in all_unmatched.values())))
+    print("  report: {:.2f}s, peak {:.1f} MB above the input data".format(duration, peak / 1e6))
+    print("  page {:.1f} MB, data scripts {:.1f} MB".format(page_size / 1e6, data_size / 1e6))
+    shutil.rmtree(generator.reports_dir, ignore_errors=True)
+    return {'seconds': duration, 'peak': peak, 'page_size': page_size, 'data_size': data_size}
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -12,7 +12,7 @@ import time
 import proDUCKtion # pyright: ignore 
 proDUCKtion.validify()
 
-from EnneadTab import ERROR_HANDLE, NOTIFICATION, EXE, USER, FOLDER
+from EnneadTab import ERROR_HANDLE, NOTIFICATION, EXE, USER, FOLDER, REPORT_WRITER
 
 try:
     import pythoncom
@@ -181,7 +181,8 @@ def monitor_area(doc):
         for scheme_name, scheme_data in all_matches.items():
             matches = scheme_data.get('matches', [])
             scheme_areas = revit_data_by_scheme.get(scheme_name, [])
-            matrix_data = department_matrix.build_matrix(matches, scheme_areas, color_hierarchy)
+            matrix_data = department_matrix.build_matrix(matches, scheme_areas, color_hierarchy,
+                                                         area_index=generator.matcher.get_index(scheme_areas))
             staged_path = department_matrix.write_excel(matrix_data, scheme_name, staging_dir)
             if staged_path:
                 wait_attempts = 0
@@ -290,17 +291,34 @@ def monitor_area(doc):
             if not os.path.exists(dist_reports_dir):
                 os.makedirs(dist_reports_dir)
 
-            # Copy generated HTML reports
+            # Copy generated HTML reports with their geometry data scripts
             import shutil
             for filepath in filepaths:
                 if not filepath.lower().endswith('.html'):
                     continue
                 dst_path = os.path.join(dist_reports_dir, os.path.basename(filepath))
                 shutil.copy2(filepath, dst_path)
+                data_folder = os.path.splitext(filepath)[0] + REPORT_WRITER.DATA_FOLDER_SUFFIX
+                if os.path.isdir(data_folder):
+                    dst_data_folder = os.path.join(dist_reports_dir, os.path.basename(data_folder))
+                    if os.path.exists(dst_data_folder):
+                        shutil.rmtree(dst_data_folder)
+                    shutil.copytree(data_folder, dst_data_folder)
 
-            # Copy icon asset if present in the source reports folder
             if filepaths:
                 src_reports_dir = os.path.dirname(filepaths[0])
+
+                # Shared stylesheet and scripts, each version is only copied once
+                src_assets = os.path.join(src_reports_dir, REPORT_WRITER.ASSET_FOLDER)
+                dst_assets = os.path.join(dist_reports_dir, REPORT_WRITER.ASSET_FOLDER)
+                if os.path.isdir(src_assets):
+                    if not os.path.exists(dst_assets):
+                        os.makedirs(dst_assets)
+                    for asset_name in os.listdir(src_assets):
+                        if not os.path.exists(os.path.join(dst_assets, asset_name)):
+                            shutil.copy2(os.path.join(src_assets, asset_name), os.path.join(dst_assets, asset_name))
+
+                # Copy icon asset if present in the source reports folder
                 icon_name = 'icon_logo_dark_background.png'
                 src_icon = os.path.join(src_reports_dir, icon_name)
                 if os.path.exists(src_icon):
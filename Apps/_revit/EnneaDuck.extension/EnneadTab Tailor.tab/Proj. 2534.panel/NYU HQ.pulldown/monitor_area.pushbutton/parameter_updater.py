@@ -72,14 +72,14 @@ def update_area_parameters(doc, matches_by_scheme, unmatched_by_scheme):
 
             scheme_matches = matches_by_scheme.get(scheme_name, {})
             valid_items = suggestion_logic.build_valid_items(scheme_matches.get('matches', []))
+            suggestion_engine = suggestion_logic.SuggestionEngine(valid_items)
 
             for area_object in unmatched_areas:
                 if not area_object.get('suggestion_text'):
-                    suggestion_text = suggestion_logic.get_suggestion_text(
+                    suggestion_text = suggestion_engine.get_suggestion_text(
                         area_object.get('department', ''),
                         area_object.get('program_type', ''),
-                        area_object.get('program_type_detail', ''),
-                        valid_items
+                        area_object.get('program_type_detail', '')
                     )
                     if suggestion_text:
                         area_object['suggestion_text'] = suggestion_text
@@ -106,6 +106,9 @@ def find_best_suggestion(unmatched_dept, unmatched_div, unmatched_func, valid_it
     """
     Find the closest matching valid item using fuzzy matching.
 
+    Builds a throwaway SuggestionEngine; callers asking for many areas
+    against the same valid items should keep one engine instead.
+
     Args:
         unmatched_dept (str): Department name from the unmatched area.
         unmatched_div (str): Division/Program Type from the unmatched area.
@@ -115,6 +118,13 @@ def find_best_suggestion(unmatched_dept, unmatched_div, unmatched_func, valid_it
     Returns:
         dict or None: The best matching item (contains department/division/function) or None.
     """
+    if not valid_items:
+        return None
+    return SuggestionEngine(valid_items).find_best(unmatched_dept, unmatched_div, unmatched_func)
+
+
+def _find_best_suggestion_linear(unmatched_dept, unmatched_div, unmatched_func, valid_items):
+    """Original item-by-item scan, kept as the reference for unit_test and benchmark."""
     if not valid_items:
         return None
 
@@ -147,6 +157,105 @@ def find_best_suggestion(unmatched_dept, unmatched_div, unmatched_func, valid_it
     return None
 
 
+_FIELDS = ('department', 'division', 'function')
+
+
+class SuggestionEngine:
+    """
+    Suggestion lookup over a fixed list of valid items.
+
+    Scoring is the same as _calculate_score: 3 minus 1 per exact field
+    minus 0.3 per partial field (query contained in the item value). Since
+    partials can never add up to one exact match, the best item is the one
+    with the most exact fields, then the most partial fields, then the
+    best tie priority, then the earliest position, which is exactly the
+    order the item-by-item scan ends up with.
+
+    Item values are lowercased once. Each field keeps a map from distinct
+    value to item positions, so exact hits are a dict lookup and partial
+    hits are one substring check per distinct value instead of per item.
+    Answers are cached per normalized query since many unmatched areas
+    share the same three values.
+
+    Args:
+        valid_items (list): List of valid program entries produced by build_valid_items.
+    """
+
+    def __init__(self, valid_items):
+        self.valid_items = valid_items or []
+        # field -> {lowercased value: [item positions]}
+        self._value_map = {}
+        for field in _FIELDS:
+            self._value_map[field] = {}
+        for position, valid_item in enumerate(self.valid_items):
+            for field in _FIELDS:
+                value = valid_item[field].lower()
+                self._value_map[field].setdefault(value, []).append(position)
+        self._partial_cache = {}
+        self._result_cache = {}
+
+    def _get_partial_positions(self, field, query):
+        """Positions whose field value contains query but is not equal to it."""
+        cache_key = (field, query)
+        positions = self._partial_cache.get(cache_key)
+        if positions is None:
+            positions = set()
+            if query:
+                for value, value_positions in self._value_map[field].items():
+                    if value != query and query in value:
+                        positions.update(value_positions)
+            self._partial_cache[cache_key] = positions
+        return positions
+
+    def _find_best_position(self, query):
+        # Pack the rank into one integer so each position only needs a few
+        # additions: exact count, partial count, then the tie priority bits
+        # (dept, func, div exact, then dept, func, div partial).
+        weights = {}
+        for field, field_query, exact_bit, partial_bit in zip(_FIELDS, query, (32, 8, 16), (4, 1, 2)):
+            for position in self._value_map[field].get(field_query, ()):
+                weights[position] = weights.get(position, 0) + 1000 + exact_bit
+            for position in self._get_partial_positions(field, field_query):
+                weights[position] = weights.get(position, 0) + 100 + partial_bit
+
+        # anything without a weight scores 3 and is never suggested
+        best_weight = 0
+        best_position = None
+        for position, weight in weights.items():
+            if weight > best_weight or (weight == best_weight and position < best_position):
+                best_weight = weight
+                best_position = position
+        return best_position
+
+    def find_best(self, unmatched_dept, unmatched_div, unmatched_func):
+        """Same contract as find_best_suggestion, against this engine's items."""
+        query = (_normalize_text(unmatched_dept).lower(),
+                 _normalize_text(unmatched_div).lower(),
+                 _normalize_text(unmatched_func).lower())
+        if query not in self._result_cache:
+            self._result_cache[query] = self._find_best_position(query)
+        position = self._result_cache[query]
+        if position is None:
+            return None
+        return self.valid_items[position]
+
+    def find_best_many(self, unmatched_rows):
+        """
+        Suggest for a batch of unmatched areas.
+
+        Args:
+            unmatched_rows (list): (department, division, function) tuples.
+
+        Returns:
+            list: Best matching item or None per row, in input order.
+        """
+        return [self.find_best(dept, div, func) for dept, div, func in unmatched_rows]
+
+    def get_suggestion_text(self, unmatched_dept, unmatched_div, unmatched_func):
+        """Plain-text suggestion or None, see get_suggestion_text."""
+        return get_plain_text(self.find_best(unmatched_dept, unmatched_div, unmatched_func))
+
+
 def get_plain_text(suggestion_dict):
     """Convert a suggestion dictionary to the plain text representation."""
     if not suggestion_dict:
@@ -183,3 +292,92 @@ def get_suggestion_text(unmatched_dept, unmatched_div, unmatched_func, valid_ite
     return None
 
 
+
+
+def _make_test_data(item_count, area_count, seed=11):
+    import random
+    rng = random.Random(seed)
+    departments = ["Dept {}".format(i) for i in range(30)] + ["Research", "Research Core", "Admin", ""]
+    divisions = ["Division {}".format(i) for i in range(60)] + ["Lab", "Lab Support", "Office", ""]
+    functions = ["Room {}".format(i) for i in range(item_count // 2)] + ["Office", "Open Office", "Storage", ""]
+
+    valid_matches = []
+    for i in range(item_count):
+        valid_matches.append({
+            'department': rng.choice(departments),
+            'division': rng.choice(divisions),
+            'room_name': rng.choice(functions)
+        })
+
+    def mutate(text):
+        roll = rng.random()
+        if roll < 0.4:
+            return text
+        if roll < 0.55:
+            return " " + text.upper() + " "
+        if roll < 0.75 and len(text) > 2:
+            start = rng.randrange(len(text) - 1)
+            return text[start:start + rng.randrange(1, len(text) - start + 1)]
+        if roll < 0.85:
+            return None
+        return "Unknown {}".format(rng.randrange(1000))
+
+    rows = []
+    for i in range(area_count):
+        source = rng.choice(valid_matches)
+        rows.append((mutate(source['department']), mutate(source['division']), mutate(source['room_name'])))
+    return build_valid_items(valid_matches), rows
+
+
+def unit_test():
+    """Regression test, the engine must pick the very same item as the linear scan."""
+    for seed in range(5):
+        valid_items, rows = _make_test_data(300, 1500, seed=seed)
+        engine = SuggestionEngine(valid_items)
+        batch = engine.find_best_many(rows)
+        for row, engine_result in zip(rows, batch):
+            expected = _find_best_suggestion_linear(row[0], row[1], row[2], valid_items)
+            assert engine_result is expected, (row, engine_result, expected)
+            assert find_best_suggestion(row[0], row[1], row[2], valid_items) is expected
+
+    # earliest item wins a full tie, no hit at all gives no suggestion
+    valid_items = build_valid_items([
+        {'department': 'Research', 'division': 'Lab', 'room_name': 'Wet Lab'},
+        {'department': 'Research', 'division': 'Lab', 'room_name': 'Dry Lab'},
+    ])
+    engine = SuggestionEngine(valid_items)
+    assert engine.find_best("research", "lab", "Office") is valid_items[0]
+    assert engine.find_best("research", "lab", "dry") is valid_items[1]
+    assert engine.find_best("Admin", "Office", "Storage") is None
+    assert engine.get_suggestion_text("Research", "Lab", "Dry Lab") == "Research | Lab | Dry Lab"
+    assert SuggestionEngine([]).find_best("a", "b", "c") is None
+    print("suggestion_logic unit test passed")
+
+
+def benchmark(item_count=2000, area_count=5000):
+    """Time the linear scan against SuggestionEngine on synthetic data.
+
+    Returns:
+        dict: linear, engine (seconds)
+    """
+    import time
+    valid_items, rows = _make_test_data(item_count, area_count)
+
+    t_start = time.time()
+    for row in rows:
+        _find_best_suggestion_linear(row[0], row[1], row[2], valid_items)
+    linear = time.time() - t_start
+
+    t_start = time.time()
+    SuggestionEngine(valid_items).find_best_many(rows)
+    engine = time.time() - t_start
+
+    print("{} valid items x {} unmatched areas".format(item_count, area_count))
+    print("  linear scan: {:.3f}s".format(linear))
+    print("  engine:      {:.3f}s".format(engine))
+    return {'linear': linear, 'engine': engine}
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -11,7 +11,7 @@ import os
 
 from datetime import datetime
 
-from EnneadTab import ERROR_HANDLE, FOLDER
+from EnneadTab import ERROR_HANDLE, FOLDER, REPORT_WRITER
 
 
 class HTMLReportGenerator:
@@ -31,18 +31,22 @@ class HTMLReportGenerator:
         """
         self.template_names = template_names
     
-    def generate_comparison_report(self, differences, summary_stats, comparison_data=None, json_file_path=None):
+    def save_comparison_report(self, differences, summary_stats, comparison_data=None, json_file_path=None, filepath=None):
         """
-        Generate the complete HTML comparison report.
+        Generate the complete HTML comparison report and stream it to disk.
+        
+        Sections are written as they are generated. The stylesheet and scripts
+        are linked from the shared report assets instead of being embedded.
         
         Args:
             differences: Dictionary containing all differences found
             summary_stats: Dictionary containing summary statistics
             comparison_data: Dictionary containing all template data for comprehensive comparison
             json_file_path: Path to the saved JSON file for clickable link
+            filepath: Target file, defaults to ViewTemplate_Comparison.html in the DUMP folder
             
         Returns:
-            str: Complete HTML report as string
+            str: Filepath of the saved HTML file
         """
         # Ensure differences and summary_stats are valid dictionaries
         if not isinstance(differences, dict):
@@ -75,23 +79,275 @@ class HTMLReportGenerator:
         
         self.template_names = valid_template_names
         
-        html = self._generate_html_header(summary_stats, json_file_path)
-        
-        # Only show detailed sections (differences) if we have differences
-        if differences and isinstance(differences, dict) and any(len(section) > 0 for section in differences.values()):
-            html += self._generate_detailed_sections(differences, comparison_data)
+        if filepath is None:
+            filepath = os.path.join(FOLDER.DUMP_FOLDER, "ViewTemplate_Comparison.html")
         
-        html += self._generate_html_footer()
+        with REPORT_WRITER.ReportWriter(filepath) as writer:
+            head_assets = (writer.stylesheet_tag("view_template_compare", self._get_css_styles()) +
+                           writer.script_tag("view_template_compare", self._get_javascript()) +
+                           writer.pager_tags())
+            writer.write(self._generate_html_header(summary_stats, json_file_path, head_assets))
+            
+            # Only show detailed sections (differences) if we have differences
+            if differences and isinstance(differences, dict) and any(len(section) > 0 for section in differences.values()):
+                self._write_detailed_sections(writer, differences, comparison_data)
+            
+            writer.write(self._generate_html_footer())
         
-        return html
+        ERROR_HANDLE.print_note("HTML report saved to: {}".format(filepath))
+        return filepath
+    
+    def _get_css_styles(self):
+        """Stylesheet of the report, written once as a shared asset."""
+        css_lines = []
+        css_lines.append("        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap');")
+        css_lines.append("        body { font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; background: #1a1a1a; color: #ffffff; min-height: 100vh; line-height: 1.6; }")
+        css_lines.append("        .container { max-width: 1400px; margin: 0 auto; background: #2a2a2a; padding: 30px; border-radius: 12px; box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4); border: 1px solid #404040; }")
+        css_lines.append("        h1 { color: #ffffff; text-align: center; border-bottom: 2px solid #666666; padding-bottom: 15px; font-size: 2.5em; font-weight: 600; margin-bottom: 30px; letter-spacing: -0.02em; }")
+        css_lines.append("        h2 { color: #ffffff; cursor: pointer; padding: 15px; background: #333333; border-radius: 8px; margin: 15px 0; border: 1px solid #404040; transition: all 0.3s ease; font-weight: 500; }")
+        css_lines.append("        h2:hover { background: #404040; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
+        css_lines.append("        .collapsible { display: none; padding: 20px; border: 1px solid #404040; border-radius: 8px; margin: 10px 0; background: #2a2a2a; }")
+        css_lines.append("        table { width: 100%; border-collapse: collapse; margin: 15px 0; background: #2a2a2a; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3); }")
+        css_lines.append("        th, td { border: 1px solid #404040; padding: 12px; text-align: left; }")
+        css_lines.append("        th { background: #404040; color: #ffffff; font-weight: 600; font-size: 0.95em; }")
+        css_lines.append("        .template-col { background: #333333; font-weight: 600; color: #cccccc; border-left: 3px solid #666666; }")
+        css_lines.append("        .same { background: #2d4a2d; color: #a8d5a8; border: 1px solid #4a6b4a; }")
+        css_lines.append("        .different { background: #4a3d2d; color: #d5c4a8; border: 1px solid #6b5a4a; }")
+        css_lines.append("        .summary { background: #333333; padding: 25px; border-radius: 12px; margin: 20px 0; border: 1px solid #404040; }")
+        css_lines.append("        .warning { background: #4a2d2d; border: 2px solid #6b4a4a; padding: 15px; margin-bottom: 20px; border-radius: 10px; color: #d5a8a8; }")
+        css_lines.append("        .timestamp { color: #999999; font-size: 0.9em; text-align: center; margin: 15px 0; font-style: italic; }")
+        css_lines.append("        .search-container { position: fixed; top: 0; left: 0; right: 0; background: #1a1a1a; padding: 20px; z-index: 1000; box-shadow: 0 4px 20px rgba(0, 0, 0, 0.5); border-bottom: 1px solid #404040; display: flex; justify-content: center; align-items: center; }")
+        css_lines.append("        .search-container .search-content { display: flex; align-items: center; justify-content: center; max-width: 800px; width: 100%; flex-wrap: wrap; gap: 10px; }")
+        css_lines.append("        .search-container input { width: 400px; min-width: 300px; padding: 12px 16px; border: 1px solid #404040; border-radius: 8px; font-size: 14px; margin-right: 12px; background: #2a2a2a; color: #ffffff; transition: all 0.3s ease; font-family: 'Inter', sans-serif; }")
+        css_lines.append("        @media (max-width: 768px) {")
+        css_lines.append("            .search-container .search-content { flex-direction: column; align-items: center; }")
+        css_lines.append("            .search-container input { width: 90%; max-width: 400px; margin-right: 0; margin-bottom: 10px; }")
+        css_lines.append("            .search-container .search-info { margin-left: 0; margin-top: 10px; text-align: center; }")
+        css_lines.append("        }")
+        css_lines.append("        .search-container input:focus { outline: none; border-color: #666666; box-shadow: 0 0 10px rgba(102, 102, 102, 0.3); background: #333333; }")
+        css_lines.append("        .search-container input::placeholder { color: #999999; }")
+        css_lines.append("        .search-container button { padding: 12px 20px; background: #404040; color: #ffffff; border: 1px solid #666666; border-radius: 8px; cursor: pointer; font-size: 14px; font-weight: 500; transition: all 0.3s ease; margin-right: 8px; font-family: 'Inter', sans-serif; }")
+        css_lines.append("        .search-container button:hover { background: #666666; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
+        css_lines.append("        .search-container .search-info { color: #cccccc; font-size: 13px; margin-left: 15px; font-weight: 400; }")
+        css_lines.append("        body { padding-top: 80px; }")
+        css_lines.append("        .search-highlight { background: #4a4a2d; color: #d5d5a8; font-weight: 600; padding: 2px 4px; border-radius: 4px; }")
+        css_lines.append("        .visible-cell { background-color: #2d4a2d !important; color: #a8d5a8 !important; font-weight: 600; text-align: center; border: 2px solid #4a6b4a; position: relative; }")
+        css_lines.append("        .hidden-cell { background-color: #4a2d2d !important; color: #d5a8a8 !important; font-weight: 600; text-align: center; border: 2px solid #6b4a4a; position: relative; }")
+        # Use Unicode escape sequences for IronPython 2.7 compatibility
+        css_lines.append("        .visible-cell::before { content: '\\1F441 '; font-size: 14px; }")  # Eye emoji
+        css_lines.append("        .hidden-cell::before { content: '\\1F6AB '; font-size: 14px; }")  # Prohibited emoji
+        css_lines.append("        .search-hidden { display: none; }")
+        css_lines.append("        ul { list-style: none; padding: 0; }")
+        css_lines.append("        ul li { padding: 8px 0; border-bottom: 1px solid #404040; color: #ffffff; }")
+        css_lines.append("        ul li:last-child { border-bottom: none; }")
+        css_lines.append("        .error { background: #4a2d2d; border: 1px solid #6b4a4a; padding: 20px; border-radius: 10px; margin: 15px 0; color: #d5a8a8; }")
+        css_lines.append("        .section { margin: 20px 0; }")
+        css_lines.append("        .bold-text { font-weight: 700; color: #ffffff; }")
+        css_lines.append("        .toggle { display: flex; align-items: center; justify-content: space-between; }")
+        css_lines.append("        .toggle-hint { font-size: 0.7em; color: #666666; opacity: 0.6; margin-left: 8px; transition: all 0.2s ease; }")
+        css_lines.append("        .toggle:hover .toggle-hint { opacity: 0.8; color: #888888; }")
+        css_lines.append("        .toggle-hint.expanded { color: #ffa500; }")
+        css_lines.append("        .close-all-btn { position: fixed; bottom: 20px; right: 20px; padding: 12px 20px; background: #404040; color: #ffffff; border: 1px solid #666666; border-radius: 8px; cursor: pointer; font-size: 14px; font-weight: 500; transition: all 0.3s ease; z-index: 1000; }")
+        css_lines.append("        .close-all-btn:hover { background: #666666; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
+        css_lines.append("        .minimap { position: fixed; left: 20px; top: 50%; transform: translateY(-50%); width: 200px; max-height: 400px; background: #2a2a2a; border: 1px solid #404040; border-radius: 8px; padding: 15px; z-index: 1000; overflow-y: auto; }")
+        css_lines.append("        .minimap h4 { color: #ffffff; margin: 0 0 10px 0; font-size: 14px; font-weight: 600; }")
+        css_lines.append("        .minimap-item { color: #cccccc; font-size: 12px; padding: 5px 0; cursor: pointer; border-bottom: 1px solid #404040; transition: all 0.2s ease; }")
+        css_lines.append("        .minimap-item:hover { color: #ffffff; background: #404040; padding-left: 5px; }")
+        css_lines.append("        .minimap-item:last-child { border-bottom: none; }")
+        css_lines.append("        .minimap-item.active { color: #ffffff; font-weight: bold; background: #666666; padding-left: 5px; border-left: 3px solid #ffffff; }")
+        css_lines.append("        .summary-collapsible { display: none; }")
+        css_lines.append("        .summary-collapsible.show { display: block; }")
+        css_lines.append("        /* Summary section uses same collapsible behavior as other sections */")
+        css_lines.append("        /* Custom scrollbar */")
+        css_lines.append("        ::-webkit-scrollbar { width: 12px; }")
+        css_lines.append("        ::-webkit-scrollbar-track { background: #2a2a2a; border-radius: 6px; }")
+        css_lines.append("        ::-webkit-scrollbar-thumb { background: #404040; border-radius: 6px; }")
+        css_lines.append("        ::-webkit-scrollbar-thumb:hover { background: #666666; }")
+        return "\n".join(css_lines)
+
+    def _get_javascript(self):
+        """Scripts of the report, written once as a shared asset."""
+        js_lines = []
+        js_lines.append("        function toggleSection(sectionId) {")
+        js_lines.append("            var section = document.getElementById(sectionId);")
+        js_lines.append("            var hint = document.querySelector('.toggle-hint[data-section=\"' + sectionId + '\"]');")
+        js_lines.append("            if (section.style.display === \"none\" || section.style.display === \"\") {")
+        js_lines.append("                section.style.display = \"block\";")
+        js_lines.append("                if (hint) {")
+        js_lines.append("                    hint.textContent = \"-\";")
+        js_lines.append("                    hint.classList.add('expanded');")
+        js_lines.append("                }")
+        js_lines.append("            } else {")
+        js_lines.append("                section.style.display = \"none\";")
+        js_lines.append("                if (hint) {")
+        js_lines.append("                    hint.textContent = \"+\";")
+        js_lines.append("                    hint.classList.remove('expanded');")
+        js_lines.append("                }")
+        js_lines.append("            }")
+        js_lines.append("        }")
+        js_lines.append("        var searchTimeout;")
+        js_lines.append("        function performSearch() {")
+        js_lines.append("            var searchTerm = document.getElementById('searchInput').value.toLowerCase();")
+        js_lines.append("            var searchInfo = document.getElementById('searchInfo');")
+        js_lines.append("            var tables = document.querySelectorAll('table');")
+        js_lines.append("            var totalRows = 0;")
+        js_lines.append("            var matchingRows = 0;")
+        js_lines.append("            document.querySelectorAll('.search-highlight').forEach(function(el) {")
+        js_lines.append("                el.classList.remove('search-highlight');")
+        js_lines.append("            });")
+        js_lines.append("            document.querySelectorAll('.search-hidden').forEach(function(el) {")
+        js_lines.append("                el.classList.remove('search-hidden');")
+        js_lines.append("            });")
+        js_lines.append("            if (searchTerm === '') {")
+        js_lines.append("                searchInfo.textContent = 'Enter search term to filter results';")
+        js_lines.append("                return;")
+        js_lines.append("            }")
+        js_lines.append("            tables.forEach(function(table) {")
+        js_lines.append("                var rows = table.querySelectorAll('tr');")
+        js_lines.append("                rows.forEach(function(row) {")
+        js_lines.append("                    totalRows++;")
+        js_lines.append("                    var cells = row.querySelectorAll('td, th');")
+        js_lines.append("                    var rowText = '';")
+        js_lines.append("                    var hasMatch = false;")
+        js_lines.append("                    cells.forEach(function(cell) {")
+        js_lines.append("                        rowText += cell.textContent + ' ';")
+        js_lines.append("                    });")
+        js_lines.append("                    if (rowText.toLowerCase().includes(searchTerm)) {")
+        js_lines.append("                        hasMatch = true;")
+        js_lines.append("                        matchingRows++;")
+        js_lines.append("                        cells.forEach(function(cell) {")
+        js_lines.append("                            var originalText = cell.innerHTML;")
+        js_lines.append("                            var regex = new RegExp('(' + searchTerm + ')', 'gi');")
+        js_lines.append("                            cell.innerHTML = originalText.replace(regex, '<span class=\"search-highlight\">$1</span>');")
+        js_lines.append("                        });")
+        js_lines.append("                    } else {")
+        js_lines.append("                        if (row.querySelector('th')) {")
+        js_lines.append("                        } else {")
+        js_lines.append("                            row.classList.add('search-hidden');")
+        js_lines.append("                        }")
+        js_lines.append("                    }")
+        js_lines.append("                });")
+        js_lines.append("            });")
+        js_lines.append("            searchInfo.textContent = 'Found ' + matchingRows + ' matching rows';")
+        js_lines.append("        }")
+        js_lines.append("        function debouncedSearch() {")
+        js_lines.append("            clearTimeout(searchTimeout);")
+        js_lines.append("            searchTimeout = setTimeout(performSearch, 300);")
+        js_lines.append("        }")
+        js_lines.append("        function handleKeyPress(event) {")
+        js_lines.append("            if (event.key === 'Enter') {")
+        js_lines.append("                clearTimeout(searchTimeout);")
+        js_lines.append("                performSearch();")
+        js_lines.append("            }")
+        js_lines.append("        }")
+        js_lines.append("        function clearSearch() {")
+        js_lines.append("            document.getElementById('searchInput').value = '';")
+        js_lines.append("            performSearch();")
+        js_lines.append("        }")
+        js_lines.append("        function closeAllSections() {")
+        js_lines.append("            var sections = document.querySelectorAll('.collapsible');")
+        js_lines.append("            var hints = document.querySelectorAll('.toggle-hint');")
+        js_lines.append("            sections.forEach(function(section) {")
+        js_lines.append("                section.style.display = 'none';")
+        js_lines.append("            });")
+        js_lines.append("            hints.forEach(function(hint) {")
+        js_lines.append("                hint.textContent = '+';")
+        js_lines.append("                hint.classList.remove('expanded');")
+        js_lines.append("            });")
+        js_lines.append("        }")
+
+        js_lines.append("        function scrollToSection(sectionId) {")
+        js_lines.append("            var element = document.getElementById(sectionId);")
+        js_lines.append("            if (element) {")
+        js_lines.append("                // Open the section if it's closed")
+        js_lines.append("                if (element.style.display === 'none' || element.style.display === '') {")
+        js_lines.append("                    toggleSection(sectionId);")
+        js_lines.append("                }")
+        js_lines.append("                // Scroll to the section")
+        js_lines.append("                element.scrollIntoView({ behavior: 'smooth', block: 'start' });")
+        js_lines.append("            }")
+        js_lines.append("        }")
+        js_lines.append("        function updateMinimap() {")
+        js_lines.append("            var minimap = document.getElementById('minimap');")
+        js_lines.append("            if (!minimap) return;")
+        js_lines.append("            var sections = document.querySelectorAll('.section');")
+        js_lines.append("            var minimapContent = '';")
+        js_lines.append("            console.log('Found ' + sections.length + ' sections');")
+        js_lines.append("            sections.forEach(function(section, index) {")
+        js_lines.append("                var h2 = section.querySelector('h2');")
+        js_lines.append("                if (h2) {")
+        js_lines.append("                    var onclick = h2.getAttribute('onclick');")
+        js_lines.append("                    var title = h2.textContent.replace(' +', '').replace(' -', '').trim();")
+        js_lines.append("                    console.log('Section ' + index + ': onclick=\"' + onclick + '\", title=\"' + title + '\"');")
+        js_lines.append("                    if (onclick && onclick.includes('toggleSection')) {")
+        js_lines.append("                        var match = onclick.match(/toggleSection\\('([^']+)'\\)/);")
+        js_lines.append("                        if (match) {")
+        js_lines.append("                            var sectionId = match[1];")
+        js_lines.append("                            minimapContent += '<div class=\"minimap-item\" data-section=\"' + sectionId + '\" onclick=\"scrollToSection(\\'' + sectionId + '\\')\">' + title + '</div>';")
+        js_lines.append("                        }")
+        js_lines.append("                    }")
+        js_lines.append("                }")
+        js_lines.append("            });")
+        js_lines.append("            console.log('Generated minimap content: ' + minimapContent);")
+        js_lines.append("            minimap.innerHTML = '<h4>Navigation</h4>' + minimapContent;")
+        js_lines.append("        }")
+        js_lines.append("        function updateActiveSection() {")
+        js_lines.append("            var sections = document.querySelectorAll('.section');")
+        js_lines.append("            var scrollTop = window.pageYOffset || document.documentElement.scrollTop;")
+        js_lines.append("            var windowHeight = window.innerHeight;")
+        js_lines.append("            var activeSectionId = null;")
+        js_lines.append("            var minDistance = Infinity;")
+        js_lines.append("            ")
+        js_lines.append("            sections.forEach(function(section) {")
+        js_lines.append("                var rect = section.getBoundingClientRect();")
+        js_lines.append("                var distance = Math.abs(rect.top);")
+        js_lines.append("                if (distance < minDistance && rect.top <= 100) {")
+        js_lines.append("                    minDistance = distance;")
+        js_lines.append("                    var h2 = section.querySelector('h2');")
+        js_lines.append("                    if (h2) {")
+        js_lines.append("                        var onclick = h2.getAttribute('onclick');")
+        js_lines.append("                        if (onclick && onclick.includes('toggleSection')) {")
+        js_lines.append("                            var match = onclick.match(/toggleSection\\('([^']+)'\\)/);")
+        js_lines.append("                            if (match) {")
+        js_lines.append("                                activeSectionId = match[1];")
+        js_lines.append("                            }")
+        js_lines.append("                        }")
+        js_lines.append("                    }")
+        js_lines.append("                }")
+        js_lines.append("            });")
+        js_lines.append("            ")
+        js_lines.append("            // Update minimap active state")
+        js_lines.append("            var minimapItems = document.querySelectorAll('.minimap-item');")
+        js_lines.append("            minimapItems.forEach(function(item) {")
+        js_lines.append("                item.classList.remove('active');")
+        js_lines.append("            });")
+        js_lines.append("            ")
+        js_lines.append("            if (activeSectionId) {")
+        js_lines.append("                var activeItem = document.querySelector('.minimap-item[data-section=\"' + activeSectionId + '\"]');")
+        js_lines.append("                if (activeItem) {")
+        js_lines.append("                    activeItem.classList.add('active');")
+        js_lines.append("                }")
+        js_lines.append("            }")
+        js_lines.append("        }")
+        js_lines.append("        ")
+        js_lines.append("        window.addEventListener('load', function() {")
+        js_lines.append("            updateMinimap();")
+        js_lines.append("            updateActiveSection();")
+        js_lines.append("        });")
+        js_lines.append("        ")
+        js_lines.append("        window.addEventListener('scroll', function() {")
+        js_lines.append("            updateActiveSection();")
+        js_lines.append("        });")
+        return "\n".join(js_lines)
     
-    def _generate_html_header(self, summary_stats=None, json_file_path=None):
+    def _generate_html_header(self, summary_stats=None, json_file_path=None, head_assets=""):
         """
-        Generate the HTML header with CSS and JavaScript.
+        Generate the HTML header linking the CSS and JavaScript assets.
         
         Args:
             summary_stats: Dictionary containing summary statistics
             json_file_path: Path to the saved JSON file for clickable link
+            head_assets: Stylesheet and script tags for the head section
             
         Returns:
             str: HTML header section
@@ -143,246 +399,8 @@ class HTMLReportGenerator:
         html_parts.append("    <meta charset=\"UTF-8\">")
         html_parts.append("    <title>EnneadTab - View Template Comparison Report</title>")
         
-        # CSS styles
-        html_parts.append("    <style>")
-        html_parts.append("        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap');")
-        html_parts.append("        body { font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; background: #1a1a1a; color: #ffffff; min-height: 100vh; line-height: 1.6; }")
-        html_parts.append("        .container { max-width: 1400px; margin: 0 auto; background: #2a2a2a; padding: 30px; border-radius: 12px; box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4); border: 1px solid #404040; }")
-        html_parts.append("        h1 { color: #ffffff; text-align: center; border-bottom: 2px solid #666666; padding-bottom: 15px; font-size: 2.5em; font-weight: 600; margin-bottom: 30px; letter-spacing: -0.02em; }")
-        html_parts.append("        h2 { color: #ffffff; cursor: pointer; padding: 15px; background: #333333; border-radius: 8px; margin: 15px 0; border: 1px solid #404040; transition: all 0.3s ease; font-weight: 500; }")
-        html_parts.append("        h2:hover { background: #404040; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
-        html_parts.append("        .collapsible { display: none; padding: 20px; border: 1px solid #404040; border-radius: 8px; margin: 10px 0; background: #2a2a2a; }")
-        html_parts.append("        table { width: 100%; border-collapse: collapse; margin: 15px 0; background: #2a2a2a; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3); }")
-        html_parts.append("        th, td { border: 1px solid #404040; padding: 12px; text-align: left; }")
-        html_parts.append("        th { background: #404040; color: #ffffff; font-weight: 600; font-size: 0.95em; }")
-        html_parts.append("        .template-col { background: #333333; font-weight: 600; color: #cccccc; border-left: 3px solid #666666; }")
-        html_parts.append("        .same { background: #2d4a2d; color: #a8d5a8; border: 1px solid #4a6b4a; }")
-        html_parts.append("        .different { background: #4a3d2d; color: #d5c4a8; border: 1px solid #6b5a4a; }")
-        html_parts.append("        .summary { background: #333333; padding: 25px; border-radius: 12px; margin: 20px 0; border: 1px solid #404040; }")
-        html_parts.append("        .warning { background: #4a2d2d; border: 2px solid #6b4a4a; padding: 15px; margin-bottom: 20px; border-radius: 10px; color: #d5a8a8; }")
-        html_parts.append("        .timestamp { color: #999999; font-size: 0.9em; text-align: center; margin: 15px 0; font-style: italic; }")
-        html_parts.append("        .search-container { position: fixed; top: 0; left: 0; right: 0; background: #1a1a1a; padding: 20px; z-index: 1000; box-shadow: 0 4px 20px rgba(0, 0, 0, 0.5); border-bottom: 1px solid #404040; display: flex; justify-content: center; align-items: center; }")
-        html_parts.append("        .search-container .search-content { display: flex; align-items: center; justify-content: center; max-width: 800px; width: 100%; flex-wrap: wrap; gap: 10px; }")
-        html_parts.append("        .search-container input { width: 400px; min-width: 300px; padding: 12px 16px; border: 1px solid #404040; border-radius: 8px; font-size: 14px; margin-right: 12px; background: #2a2a2a; color: #ffffff; transition: all 0.3s ease; font-family: 'Inter', sans-serif; }")
-        html_parts.append("        @media (max-width: 768px) {")
-        html_parts.append("            .search-container .search-content { flex-direction: column; align-items: center; }")
-        html_parts.append("            .search-container input { width: 90%; max-width: 400px; margin-right: 0; margin-bottom: 10px; }")
-        html_parts.append("            .search-container .search-info { margin-left: 0; margin-top: 10px; text-align: center; }")
-        html_parts.append("        }")
-        html_parts.append("        .search-container input:focus { outline: none; border-color: #666666; box-shadow: 0 0 10px rgba(102, 102, 102, 0.3); background: #333333; }")
-        html_parts.append("        .search-container input::placeholder { color: #999999; }")
-        html_parts.append("        .search-container button { padding: 12px 20px; background: #404040; color: #ffffff; border: 1px solid #666666; border-radius: 8px; cursor: pointer; font-size: 14px; font-weight: 500; transition: all 0.3s ease; margin-right: 8px; font-family: 'Inter', sans-serif; }")
-        html_parts.append("        .search-container button:hover { background: #666666; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
-        html_parts.append("        .search-container .search-info { color: #cccccc; font-size: 13px; margin-left: 15px; font-weight: 400; }")
-        html_parts.append("        body { padding-top: 80px; }")
-        html_parts.append("        .search-highlight { background: #4a4a2d; color: #d5d5a8; font-weight: 600; padding: 2px 4px; border-radius: 4px; }")
-        html_parts.append("        .visible-cell { background-color: #2d4a2d !important; color: #a8d5a8 !important; font-weight: 600; text-align: center; border: 2px solid #4a6b4a; position: relative; }")
-        html_parts.append("        .hidden-cell { background-color: #4a2d2d !important; color: #d5a8a8 !important; font-weight: 600; text-align: center; border: 2px solid #6b4a4a; position: relative; }")
-        # Use Unicode escape sequences for IronPython 2.7 compatibility
-        html_parts.append("        .visible-cell::before { content: '\\1F441 '; font-size: 14px; }")  # Eye emoji
-        html_parts.append("        .hidden-cell::before { content: '\\1F6AB '; font-size: 14px; }")  # Prohibited emoji
-        html_parts.append("        .search-hidden { display: none; }")
-        html_parts.append("        ul { list-style: none; padding: 0; }")
-        html_parts.append("        ul li { padding: 8px 0; border-bottom: 1px solid #404040; color: #ffffff; }")
-        html_parts.append("        ul li:last-child { border-bottom: none; }")
-        html_parts.append("        .error { background: #4a2d2d; border: 1px solid #6b4a4a; padding: 20px; border-radius: 10px; margin: 15px 0; color: #d5a8a8; }")
-        html_parts.append("        .section { margin: 20px 0; }")
-        html_parts.append("        .bold-text { font-weight: 700; color: #ffffff; }")
-        html_parts.append("        .toggle { display: flex; align-items: center; justify-content: space-between; }")
-        html_parts.append("        .toggle-hint { font-size: 0.7em; color: #666666; opacity: 0.6; margin-left: 8px; transition: all 0.2s ease; }")
-        html_parts.append("        .toggle:hover .toggle-hint { opacity: 0.8; color: #888888; }")
-        html_parts.append("        .toggle-hint.expanded { color: #ffa500; }")
-        html_parts.append("        .close-all-btn { position: fixed; bottom: 20px; right: 20px; padding: 12px 20px; background: #404040; color: #ffffff; border: 1px solid #666666; border-radius: 8px; cursor: pointer; font-size: 14px; font-weight: 500; transition: all 0.3s ease; z-index: 1000; }")
-        html_parts.append("        .close-all-btn:hover { background: #666666; transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3); }")
-        html_parts.append("        .minimap { position: fixed; left: 20px; top: 50%; transform: translateY(-50%); width: 200px; max-height: 400px; background: #2a2a2a; border: 1px solid #404040; border-radius: 8px; padding: 15px; z-index: 1000; overflow-y: auto; }")
-        html_parts.append("        .minimap h4 { color: #ffffff; margin: 0 0 10px 0; font-size: 14px; font-weight: 600; }")
-        html_parts.append("        .minimap-item { color: #cccccc; font-size: 12px; padding: 5px 0; cursor: pointer; border-bottom: 1px solid #404040; transition: all 0.2s ease; }")
-        html_parts.append("        .minimap-item:hover { color: #ffffff; background: #404040; padding-left: 5px; }")
-        html_parts.append("        .minimap-item:last-child { border-bottom: none; }")
-        html_parts.append("        .minimap-item.active { color: #ffffff; font-weight: bold; background: #666666; padding-left: 5px; border-left: 3px solid #ffffff; }")
-        html_parts.append("        .summary-collapsible { display: none; }")
-        html_parts.append("        .summary-collapsible.show { display: block; }")
-        html_parts.append("        /* Summary section uses same collapsible behavior as other sections */")
-        html_parts.append("        /* Custom scrollbar */")
-        html_parts.append("        ::-webkit-scrollbar { width: 12px; }")
-        html_parts.append("        ::-webkit-scrollbar-track { background: #2a2a2a; border-radius: 6px; }")
-        html_parts.append("        ::-webkit-scrollbar-thumb { background: #404040; border-radius: 6px; }")
-        html_parts.append("        ::-webkit-scrollbar-thumb:hover { background: #666666; }")
-        html_parts.append("    </style>")
-        
-        # JavaScript
-        html_parts.append("    <script>")
-        html_parts.append("        function toggleSection(sectionId) {")
-        html_parts.append("            var section = document.getElementById(sectionId);")
-        html_parts.append("            var hint = document.querySelector('.toggle-hint[data-section=\"' + sectionId + '\"]');")
-        html_parts.append("            if (section.style.display === \"none\" || section.style.display === \"\") {")
-        html_parts.append("                section.style.display = \"block\";")
-        html_parts.append("                if (hint) {")
-        html_parts.append("                    hint.textContent = \"-\";")
-        html_parts.append("                    hint.classList.add('expanded');")
-        html_parts.append("                }")
-        html_parts.append("            } else {")
-        html_parts.append("                section.style.display = \"none\";")
-        html_parts.append("                if (hint) {")
-        html_parts.append("                    hint.textContent = \"+\";")
-        html_parts.append("                    hint.classList.remove('expanded');")
-        html_parts.append("                }")
-        html_parts.append("            }")
-        html_parts.append("        }")
-        html_parts.append("        var searchTimeout;")
-        html_parts.append("        function performSearch() {")
-        html_parts.append("            var searchTerm = document.getElementById('searchInput').value.toLowerCase();")
-        html_parts.append("            var searchInfo = document.getElementById('searchInfo');")
-        html_parts.append("            var tables = document.querySelectorAll('table');")
-        html_parts.append("            var totalRows = 0;")
-        html_parts.append("            var matchingRows = 0;")
-        html_parts.append("            document.querySelectorAll('.search-highlight').forEach(function(el) {")
-        html_parts.append("                el.classList.remove('search-highlight');")
-        html_parts.append("            });")
-        html_parts.append("            document.querySelectorAll('.search-hidden').forEach(function(el) {")
-        html_parts.append("                el.classList.remove('search-hidden');")
-        html_parts.append("            });")
-        html_parts.append("            if (searchTerm === '') {")
-        html_parts.append("                searchInfo.textContent = 'Enter search term to filter results';")
-        html_parts.append("                return;")
-        html_parts.append("            }")
-        html_parts.append("            tables.forEach(function(table) {")
-        html_parts.append("                var rows = table.querySelectorAll('tr');")
-        html_parts.append("                rows.forEach(function(row) {")
-        html_parts.append("                    totalRows++;")
-        html_parts.append("                    var cells = row.querySelectorAll('td, th');")
-        html_parts.append("                    var rowText = '';")
-        html_parts.append("                    var hasMatch = false;")
-        html_parts.append("                    cells.forEach(function(cell) {")
-        html_parts.append("                        rowText += cell.textContent + ' ';")
-        html_parts.append("                    });")
-        html_parts.append("                    if (rowText.toLowerCase().includes(searchTerm)) {")
-        html_parts.append("                        hasMatch = true;")
-        html_parts.append("                        matchingRows++;")
-        html_parts.append("                        cells.forEach(function(cell) {")
-        html_parts.append("                            var originalText = cell.innerHTML;")
-        html_parts.append("                            var regex = new RegExp('(' + searchTerm + ')', 'gi');")
-        html_parts.append("                            cell.innerHTML = originalText.replace(regex, '<span class=\"search-highlight\">$1</span>');")
-        html_parts.append("                        });")
-        html_parts.append("                    } else {")
-        html_parts.append("                        if (row.querySelector('th')) {")
-        html_parts.append("                        } else {")
-        html_parts.append("                            row.classList.add('search-hidden');")
-        html_parts.append("                        }")
-        html_parts.append("                    }")
-        html_parts.append("                });")
-        html_parts.append("            });")
-        html_parts.append("            searchInfo.textContent = 'Found ' + matchingRows + ' matching rows';")
-        html_parts.append("        }")
-        html_parts.append("        function debouncedSearch() {")
-        html_parts.append("            clearTimeout(searchTimeout);")
-        html_parts.append("            searchTimeout = setTimeout(performSearch, 300);")
-        html_parts.append("        }")
-        html_parts.append("        function handleKeyPress(event) {")
-        html_parts.append("            if (event.key === 'Enter') {")
-        html_parts.append("                clearTimeout(searchTimeout);")
-        html_parts.append("                performSearch();")
-        html_parts.append("            }")
-        html_parts.append("        }")
-        html_parts.append("        function clearSearch() {")
-        html_parts.append("            document.getElementById('searchInput').value = '';")
-        html_parts.append("            performSearch();")
-        html_parts.append("        }")
-        html_parts.append("        function closeAllSections() {")
-        html_parts.append("            var sections = document.querySelectorAll('.collapsible');")
-        html_parts.append("            var hints = document.querySelectorAll('.toggle-hint');")
-        html_parts.append("            sections.forEach(function(section) {")
-        html_parts.append("                section.style.display = 'none';")
-        html_parts.append("            });")
-        html_parts.append("            hints.forEach(function(hint) {")
-        html_parts.append("                hint.textContent = '+';")
-        html_parts.append("                hint.classList.remove('expanded');")
-        html_parts.append("            });")
-        html_parts.append("        }")
-
-        html_parts.append("        function scrollToSection(sectionId) {")
-        html_parts.append("            var element = document.getElementById(sectionId);")
-        html_parts.append("            if (element) {")
-        html_parts.append("                // Open the section if it's closed")
-        html_parts.append("                if (element.style.display === 'none' || element.style.display === '') {")
-        html_parts.append("                    toggleSection(sectionId);")
-        html_parts.append("                }")
-        html_parts.append("                // Scroll to the section")
-        html_parts.append("                element.scrollIntoView({ behavior: 'smooth', block: 'start' });")
-        html_parts.append("            }")
-        html_parts.append("        }")
-        html_parts.append("        function updateMinimap() {")
-        html_parts.append("            var minimap = document.getElementById('minimap');")
-        html_parts.append("            if (!minimap) return;")
-        html_parts.append("            var sections = document.querySelectorAll('.section');")
-        html_parts.append("            var minimapContent = '';")
-        html_parts.append("            console.log('Found ' + sections.length + ' sections');")
-        html_parts.append("            sections.forEach(function(section, index) {")
-        html_parts.append("                var h2 = section.querySelector('h2');")
-        html_parts.append("                if (h2) {")
-        html_parts.append("                    var onclick = h2.getAttribute('onclick');")
-        html_parts.append("                    var title = h2.textContent.replace(' +', '').replace(' -', '').trim();")
-        html_parts.append("                    console.log('Section ' + index + ': onclick=\"' + onclick + '\", title=\"' + title + '\"');")
-        html_parts.append("                    if (onclick && onclick.includes('toggleSection')) {")
-        html_parts.append("                        var match = onclick.match(/toggleSection\\('([^']+)'\\)/);")
-        html_parts.append("                        if (match) {")
-        html_parts.append("                            var sectionId = match[1];")
-        html_parts.append("                            minimapContent += '<div class=\"minimap-item\" data-section=\"' + sectionId + '\" onclick=\"scrollToSection(\\'' + sectionId + '\\')\">' + title + '</div>';")
-        html_parts.append("                        }")
-        html_parts.append("                    }")
-        html_parts.append("                }")
-        html_parts.append("            });")
-        html_parts.append("            console.log('Generated minimap content: ' + minimapContent);")
-        html_parts.append("            minimap.innerHTML = '<h4>Navigation</h4>' + minimapContent;")
-        html_parts.append("        }")
-        html_parts.append("        function updateActiveSection() {")
-        html_parts.append("            var sections = document.querySelectorAll('.section');")
-        html_parts.append("            var scrollTop = window.pageYOffset || document.documentElement.scrollTop;")
-        html_parts.append("            var windowHeight = window.innerHeight;")
-        html_parts.append("            var activeSectionId = null;")
-        html_parts.append("            var minDistance = Infinity;")
-        html_parts.append("            ")
-        html_parts.append("            sections.forEach(function(section) {")
-        html_parts.append("                var rect = section.getBoundingClientRect();")
-        html_parts.append("                var distance = Math.abs(rect.top);")
-        html_parts.append("                if (distance < minDistance && rect.top <= 100) {")
-        html_parts.append("                    minDistance = distance;")
-        html_parts.append("                    var h2 = section.querySelector('h2');")
-        html_parts.append("                    if (h2) {")
-        html_parts.append("                        var onclick = h2.getAttribute('onclick');")
-        html_parts.append("                        if (onclick && onclick.includes('toggleSection')) {")
-        html_parts.append("                            var match = onclick.match(/toggleSection\\('([^']+)'\\)/);")
-        html_parts.append("                            if (match) {")
-        html_parts.append("                                activeSectionId = match[1];")
-        html_parts.append("                            }")
-        html_parts.append("                        }")
-        html_parts.append("                    }")
-        html_parts.append("                }")
-        html_parts.append("            });")
-        html_parts.append("            ")
-        html_parts.append("            // Update minimap active state")
-        html_parts.append("            var minimapItems = document.querySelectorAll('.minimap-item');")
-        html_parts.append("            minimapItems.forEach(function(item) {")
-        html_parts.append("                item.classList.remove('active');")
-        html_parts.append("            });")
-        html_parts.append("            ")
-        html_parts.append("            if (activeSectionId) {")
-        html_parts.append("                var activeItem = document.querySelector('.minimap-item[data-section=\"' + activeSectionId + '\"]');")
-        html_parts.append("                if (activeItem) {")
-        html_parts.append("                    activeItem.classList.add('active');")
-        html_parts.append("                }")
-        html_parts.append("            }")
-        html_parts.append("        }")
-        html_parts.append("        ")
-        html_parts.append("        window.addEventListener('load', function() {")
-        html_parts.append("            updateMinimap();")
-        html_parts.append("            updateActiveSection();")
-        html_parts.append("        });")
-        html_parts.append("        ")
-        html_parts.append("        window.addEventListener('scroll', function() {")
-        html_parts.append("            updateActiveSection();")
-        html_parts.append("        });")
-        html_parts.append("    </script>")
+        # Stylesheet, scripts and pager are shared assets linked from the page
+        html_parts.append(head_assets)
         html_parts.append("</head>")
         
         # Body start
@@ -1026,19 +1044,15 @@ class HTMLReportGenerator:
         
         return html
     
-    def _generate_detailed_sections(self, differences, comparison_data=None):
+    def _write_detailed_sections(self, writer, differences, comparison_data=None):
         """
-        Generate all detailed comparison sections.
+        Write all detailed comparison sections, one section at a time.
         
         Args:
+            writer: REPORT_WRITER.ReportWriter of the report
             differences: Dictionary containing all differences
             comparison_data: Dictionary containing template data with usage information
-            
-        Returns:
-            str: HTML for all detailed sections
         """
-        html = ""
-        
         try:
             # Safely access differences dictionary with defaults
             category_graphic_overrides = differences.get('category_graphic_overrides', {})
@@ -1050,34 +1064,34 @@ class HTMLReportGenerator:
         
         # Category Graphic Overrides Section
             if category_graphic_overrides:
-                html += self._generate_category_overrides_section(category_graphic_overrides)
+                writer.write(self._generate_category_overrides_section(category_graphic_overrides))
         
         # Category Visibility Settings Section
             if category_visibility_settings:
-                html += self._generate_category_visibility_section(category_visibility_settings)
+                writer.write(self._generate_category_visibility_section(category_visibility_settings))
         
         # Workset Visibility Settings Section
             if workset_visibility_settings:
-                html += self._generate_workset_visibility_section(workset_visibility_settings)
+                writer.write(self._generate_workset_visibility_section(workset_visibility_settings))
         
         # Template-Controlled Parameters Section
             if template_controlled_parameters:
-                html += self._generate_view_parameters_section(template_controlled_parameters)
+                writer.write(self._generate_view_parameters_section(template_controlled_parameters))
         
         # Dangerous Uncontrolled Parameters Section
             if dangerous_uncontrolled_parameters:
-                html += self._generate_uncontrolled_parameters_section(dangerous_uncontrolled_parameters)
+                writer.write(self._generate_uncontrolled_parameters_section(dangerous_uncontrolled_parameters))
         
         # Filter Settings Section
             if filter_settings:
-                html += self._generate_filters_section(filter_settings)
+                writer.write(self._generate_filters_section(filter_settings))
         
         # Template Usage Section
-            html += self._generate_template_usage_section(comparison_data)
+            writer.write(self._generate_template_usage_section(comparison_data))
                 
         except Exception as e:
             # Add error section if detailed sections generation fails
-            html += """
+            writer.write("""
         <div class="section">
             <h2 style="color: red;">Error Generating Detailed Sections</h2>
             <div class="error">
@@ -1085,9 +1099,7 @@ class HTMLReportGenerator:
                 <p><strong>{}</strong></p>
             </div>
         </div>
-""".format(str(e))
-        
-        return html
+""".format(str(e)))
     
     # --------------------------
     # Reusable HTML helpers
@@ -1143,7 +1155,7 @@ class HTMLReportGenerator:
 
     def _close_table(self):
         """Return closing tags for a table within a section."""
-        return ["                </table"]
+        return ["                </table>"]
 
     def _render_value_cell_simple(self, value):
         """Render a generic value cell with standard coloring rules used by simple sections."""
@@ -1933,14 +1945,20 @@ class HTMLReportGenerator:
                         parts.append("                            <th style=\"background: #404040; color: #ffffff; padding: 10px; text-align: left;\">View ID</th>")
                         parts.append("                        </tr>")
                         
+                        # Projects with thousands of views get paged rows, see REPORT_WRITER.PagedRows
+                        parts.append("                        " + REPORT_WRITER.paged_tbody_tag(len(views)))
+                        rows = REPORT_WRITER.PagedRows(parts.append)
                         for view in views:
-                            parts.append("                        <tr>")
-                            parts.append("                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('sheet_number', 'Unknown')))
-                            parts.append("                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('sheet_name', 'Unknown')))
-                            parts.append("                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #ffffff;\">{}</td>".format(view.get('name', 'Unknown')))
-                            parts.append("                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('type', 'Unknown')))
-                            parts.append("                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #999999; font-family: 'JetBrains Mono', monospace; font-size: 0.9em;\">{}</td>".format(view.get('id', 'Unknown')))
-                            parts.append("                        </tr>")
+                            rows.add_row("\n".join([
+                                "                        <tr>",
+                                "                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('sheet_number', 'Unknown')),
+                                "                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('sheet_name', 'Unknown')),
+                                "                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #ffffff;\">{}</td>".format(view.get('name', 'Unknown')),
+                                "                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #cccccc;\">{}</td>".format(view.get('type', 'Unknown')),
+                                "                            <td style=\"padding: 8px; border-bottom: 1px solid #404040; color: #999999; font-family: 'JetBrains Mono', monospace; font-size: 0.9em;\">{}</td>".format(view.get('id', 'Unknown')),
+                                "                        </tr>"]))
+                        rows.close()
+                        parts.append("                        </tbody>")
                         
                         parts.append("                    </table>")
                     else:
@@ -2088,57 +2106,6 @@ class HTMLReportGenerator:
 </html>
 """
     
-    def save_report_to_file(self, html_content):
-        """
-        Save the HTML report to the DUMP folder and return the filepath.
-        
-        Args:
-            html_content: The HTML content to save
-            
-        Returns:
-            str: Filepath of the saved HTML file
-        """
-        
-        # Create filename without timestamp
-        filename = "ViewTemplate_Comparison.html"
-        filepath = os.path.join(FOLDER.DUMP_FOLDER, filename)
-        
-        # Write HTML content to file with proper IronPython 2.7 Unicode handling
-        try:
-            # IronPython 2.7 approach: encode string to UTF-8 and write as binary
-            try:
-                # Check if unicode type exists (IronPython 2.7)
-                if 'unicode' in dir(__builtins__) and isinstance(html_content, globals()['unicode']):
-                    # If it's already unicode, encode it
-                    html_bytes = html_content.encode('utf-8')
-                else:
-                    # If it's a regular string, decode then re-encode to ensure UTF-8
-                    html_bytes = html_content.decode('utf-8').encode('utf-8')
-            except NameError:
-                # unicode type doesn't exist (Python 3)
-                html_bytes = html_content.encode('utf-8')
-            
-            with open(filepath, 'wb') as f:
-                f.write(html_bytes)
-                
-        except (UnicodeDecodeError, UnicodeEncodeError, NameError):
-            # Fallback for cases where unicode type doesn't exist (Python 3) or encoding fails
-            try:
-                # Try simple UTF-8 encoding
-                html_content_encoded = html_content.encode('utf-8')
-                with open(filepath, 'wb') as f:
-                    f.write(html_content_encoded)
-            except (UnicodeEncodeError, AttributeError):
-                # Last resort: ASCII fallback
-                ERROR_HANDLE.print_note("Warning: Falling back to ASCII encoding for compatibility")
-                html_content_safe = str(html_content).encode('ascii', 'replace').decode('ascii')
-                with open(filepath, 'w') as f:
-                    f.write(html_content_safe)
-        
-        ERROR_HANDLE.print_note("HTML report saved to: {}".format(filepath))
-        
-        return filepath
-    
     def _clean_problematic_unicode(self, data):
         """
         Recursively clean only problematic Unicode surrogates that cause encoding issues.
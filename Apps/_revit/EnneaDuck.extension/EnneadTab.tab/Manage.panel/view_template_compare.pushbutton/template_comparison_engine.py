@@ -4,9 +4,34 @@ Template Comparison Engine Module
 
 This module handles the comparison logic for finding differences between view templates,
 including special handling for uncontrolled parameters.
+
+Templates are first grouped, per section (category overrides, filters, ...),
+into distinct variants: sections are bucketed by size and key set and then
+confirmed equal with a plain == against the bucket's representatives.
+Sections identical in every template are skipped, the rest are compared
+column by column (key x variant) and expanded back to every template.
+Two hundred templates usually share a handful of configurations per
+section, so most keys are compared a handful of times instead of two
+hundred.
 """
 
 
+def _section_bucket(section):
+    """Cheap key that equal sections always share, == decides within a bucket."""
+    if section is None:
+        return None
+    try:
+        return (len(section), hash(frozenset(section)))
+    except TypeError:
+        return (len(section), None)
+
+
+# Sections compared by find_all_differences, also the default for clustering
+COMPARED_SECTIONS = ['category_overrides', 'category_visibility', 'workset_visibility',
+                     'view_parameters', 'uncontrolled_parameters', 'filters',
+                     'import_categories', 'revit_links', 'detail_levels', 'view_properties']
+
+
 class TemplateComparisonEngine:
     """
     Handles comparison logic between view templates.
@@ -23,6 +48,104 @@ class TemplateComparisonEngine:
             comparison_data: Dictionary containing template data for comparison
         """
         self.comparison_data = comparison_data
+        self._variant_cache = {}  # (data_key, template names) -> variants
+
+    def _get_section(self, template_name, data_key):
+        data = self.comparison_data[template_name]
+        if data_key == 'uncontrolled_parameters':
+            return frozenset(data.get(data_key) or [])
+        return data.get(data_key)
+
+    def get_section_variants(self, data_key, template_names):
+        """
+        Group templates whose section data_key is identical.
+
+        Args:
+            data_key: Key in the template data, e.g. 'category_overrides'
+            template_names: Templates to group
+
+        Returns:
+            list: [(section, [template names])] per distinct variant, in
+                first-seen order. A missing section is None.
+        """
+        cache_key = (data_key, tuple(template_names))
+        if cache_key in self._variant_cache:
+            return self._variant_cache[cache_key]
+
+        variants = []
+        buckets = {}
+        for template_name in template_names:
+            section = self._get_section(template_name, data_key)
+            candidates = buckets.setdefault(_section_bucket(section), [])
+            for variant in candidates:
+                if variant[0] == section:
+                    variant[1].append(template_name)
+                    break
+            else:
+                variant = (section, [template_name])
+                candidates.append(variant)
+                variants.append(variant)
+
+        self._variant_cache[cache_key] = variants
+        return variants
+
+    def _group_by_sections(self, template_names, data_keys):
+        """
+        Group templates identical in every section of data_keys.
+
+        Returns:
+            list: [(variant id tuple, [template names])] in first-seen order
+        """
+        variant_ids = dict((name, []) for name in template_names)
+        for data_key in data_keys:
+            for i, (_, names) in enumerate(self.get_section_variants(data_key, template_names)):
+                for name in names:
+                    variant_ids[name].append(i)
+
+        groups = {}
+        order = []
+        for template_name in template_names:
+            ids = tuple(variant_ids[template_name])
+            if ids not in groups:
+                groups[ids] = []
+                order.append(ids)
+            groups[ids].append(template_name)
+        return [(ids, groups[ids]) for ids in order]
+
+    def group_identical_templates(self, template_names, data_keys=None):
+        """
+        N-way clustering of templates with identical configuration.
+
+        Args:
+            template_names: Templates to cluster
+            data_keys: Sections to take into account, defaults to every
+                section compared by find_all_differences
+
+        Returns:
+            list: Lists of template names, largest group first. A template
+                with a unique configuration is a group of one.
+        """
+        if data_keys is None:
+            data_keys = COMPARED_SECTIONS
+        clusters = [names for _, names in self._group_by_sections(template_names, data_keys)]
+        clusters.sort(key=lambda names: -len(names))
+        return clusters
+
+    def _collect_all_keys(self, data_key):
+        """Union of section keys over all templates, reading each distinct section once."""
+        all_keys = set()
+        for section, _ in self.get_section_variants(data_key, sorted(self.comparison_data)):
+            if section:
+                all_keys.update(section.keys())
+        return all_keys
+
+    @staticmethod
+    def _expand_row(variants, column):
+        """Per-template values of one key from its per-variant column."""
+        row = {}
+        for (_, names), value in zip(variants, column):
+            row.update(dict.fromkeys(names, value))
+        return row
     
     def find_all_differences(self, template_names):
         """
@@ -63,17 +186,7 @@ class TemplateComparisonEngine:
         # Based on Revit API: GetNonControlledTemplateParameterIds() returns parameters 
         # that are NOT marked as included when the view is used as a template
         # These can cause inconsistent behavior across views using the same template
-        all_uncontrolled_params = set()
-        for template_name, data in self.comparison_data.items():
-            all_uncontrolled_params.update(data['uncontrolled_parameters'])
-            
-        for param in all_uncontrolled_params:
-            param_values = {}
-            for template_name in template_names:
-                param_values[template_name] = param in self.comparison_data[template_name]['uncontrolled_parameters']
-                    
-            if len(set(param_values.values())) > 1:
-                template_differences['dangerous_uncontrolled_parameters'][param] = param_values
+        template_differences['dangerous_uncontrolled_parameters'] = self._compare_uncontrolled_parameters(template_names)
         
         # Compare filter settings (enable, visibility, graphic overrides)
         template_differences['filter_settings'] = self._compare_filter_data('filters', template_names)
@@ -110,28 +223,27 @@ class TemplateComparisonEngine:
         """
         differences = {}
         
-        # Collect all keys from all templates
-        all_keys = set()
         for template_name, data in self.comparison_data.items():
-            if data_key in data and data[data_key] is not None:
-                all_keys.update(data[data_key].keys())
-            else:
+            if data_key not in data or data[data_key] is None:
                 print("Warning: {} not found in template {} data".format(data_key, template_name))
         
-        # Compare each key across templates
+        variants = self.get_section_variants(data_key, template_names)
+        # Identical in every template: keys missing everywhere compare as None == None
+        if len(variants) <= 1:
+            return differences
+        
+        sections = [section or {} for section, _ in variants]
+        # A key only in templates outside template_names is None everywhere, skip it
+        all_keys = set()
+        for section in sections:
+            all_keys.update(section.keys())
+        
+        # Compare each key column across the distinct variants
         for key in all_keys:
-            key_values = {}
-            for template_name in template_names:
-                if (data_key in self.comparison_data[template_name] and 
-                    self.comparison_data[template_name][data_key] is not None and
-                    key in self.comparison_data[template_name][data_key]):
-                    key_values[template_name] = self.comparison_data[template_name][data_key][key]
-                else:
-                    key_values[template_name] = None
-            
-            # Check if values are different
-            if self._has_differences(key_values):
-                differences[key] = key_values
+            column = [section.get(key) for section in sections]
+            first_value = column[0]
+            if not all(value == first_value for value in column):
+                differences[key] = self._expand_row(variants, column)
         
         return differences
     
@@ -154,15 +266,19 @@ class TemplateComparisonEngine:
         """
         differences = {}
         
-        # Collect all parameter names from all templates
+        # Same controlled values and same uncontrolled list means same answer for every parameter
+        variants = self._group_by_sections(template_names, [data_key, 'uncontrolled_parameters'])
+        if len(variants) <= 1:
+            return differences
+        
+        columns = []
         all_params = set()
-        for template_name, data in self.comparison_data.items():
-            # Get controlled parameters (dict)
-            controlled_params = data[data_key]
+        for _, names in variants:
+            template_data = self.comparison_data[names[0]]
+            controlled_params = template_data[data_key]
+            uncontrolled_params = set(template_data.get('uncontrolled_parameters', []))
+            columns.append((controlled_params, uncontrolled_params))
             all_params.update(controlled_params.keys())
-            
-            # Get uncontrolled parameters (list)
-            uncontrolled_params = data.get('uncontrolled_parameters', [])
             all_params.update(uncontrolled_params)
         
         # Compare each parameter across templates
@@ -170,28 +286,50 @@ class TemplateComparisonEngine:
             # Skip the "Workset" parameter as it's not relevant for template comparison
             if param_name.lower() == "workset":
                 continue
-                
-            param_data = {}
             
-            for template_name in template_names:
-                template_data = self.comparison_data[template_name]
-                controlled_params = template_data[data_key]
-                uncontrolled_params = template_data.get('uncontrolled_parameters', [])
-                
+            column = []
+            for controlled_params, uncontrolled_params in columns:
                 if param_name in controlled_params:
                     # Parameter is controlled, show its value
-                    param_data[template_name] = controlled_params[param_name]
+                    column.append(controlled_params[param_name])
                 elif param_name in uncontrolled_params:
                     # Parameter is not controlled
-                    param_data[template_name] = "Not Controlled"
+                    column.append("Not Controlled")
                 else:
                     # Parameter doesn't exist in this template
-                    param_data[template_name] = "Not Present"
+                    column.append("Not Present")
             
             # Check if values are different across templates
-            unique_values = set(param_data.values())
-            if len(unique_values) > 1:
-                differences[param_name] = param_data
+            first_value = column[0]
+            if not all(value == first_value for value in column):
+                differences[param_name] = self._expand_row(variants, column)
+        
+        return differences
+    
+    def _compare_uncontrolled_parameters(self, template_names):
+        """
+        Find parameters that are uncontrolled in some templates but not in others.
+        
+        Based on Revit API: GetNonControlledTemplateParameterIds() returns parameters
+        that are NOT marked as included when the view is used as a template.
+        These can cause inconsistent behavior across views using the same template.
+        
+        Args:
+            template_names: List of template names
+            
+        Returns:
+            dict: Parameter name -> {template name: is uncontrolled}
+        """
+        differences = {}
+        variants = self.get_section_variants('uncontrolled_parameters', template_names)
+        if len(variants) <= 1:
+            return differences
+        
+        param_sets = [param_set for param_set, _ in variants]
+        # Uncontrolled everywhere: same answer, uncontrolled nowhere among template_names: all False
+        in_all = frozenset.intersection(*param_sets)
+        for param in frozenset.union(*param_sets) - in_all:
+            differences[param] = self._expand_row(variants, [param in x for x in param_sets])
         
         return differences
     
@@ -248,25 +386,23 @@ class TemplateComparisonEngine:
         """
         differences = {}
         
-        # Collect all filter names from all templates
-        all_filters = set()
-        for template_name, data in self.comparison_data.items():
-            if data_key in data:
-                all_filters.update(data[data_key].keys())
-        
-        # Compare each filter across templates
-        for filter_name in all_filters:
-            filter_values = {}
-            for template_name in template_names:
-                template_data = self.comparison_data[template_name]
-                if data_key in template_data and filter_name in template_data[data_key]:
-                    filter_values[template_name] = template_data[data_key][filter_name]
-                else:
-                    filter_values[template_name] = None
-            
-            # Check if filter data is different across templates
-            if self._has_filter_differences(filter_values):
-                differences[filter_name] = filter_values
+        all_filters = self._collect_all_keys(data_key)
+        variants = self.get_section_variants(data_key, template_names)
+        sections = [section if section is not None else {} for section, _ in variants]
+        
+        if len(variants) == 1:
+            # Identical in every template, only filters missing from all of
+            # them still count (every value None)
+            remaining = all_filters - set(sections[0].keys())
+        else:
+            remaining = all_filters
+        
+        # Compare each filter column across the distinct variants
+        for filter_name in remaining:
+            column = [section.get(filter_name) for section in sections]
+            row = self._expand_row(variants, column)
+            if self._has_filter_differences(row):
+                differences[filter_name] = row
         
         return differences
     
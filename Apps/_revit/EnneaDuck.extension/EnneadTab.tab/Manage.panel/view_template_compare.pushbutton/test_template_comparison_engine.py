@@ -0,0 +1,239 @@
+# IronPython 2.7 Compatible
+"""
+Tests and timing harness for the template comparison engine.
+
+Runs outside Revit on synthetic comparison_data:
+
+    python test_template_comparison_engine.py
+
+unit_test() checks that TemplateComparisonEngine returns exactly what the
+previous key-by-key engine (kept below as _ReferenceEngine) returned, and
+that clustering groups identical templates. benchmark() times both engines.
+"""
+
+import random
+import time
+
+from template_comparison_engine import TemplateComparisonEngine
+
+
+class _ReferenceEngine(object):
+    """The key by key, template by template comparison the engine replaced."""
+
+    def __init__(self, comparison_data):
+        self.comparison_data = comparison_data
+
+    def find_all_differences(self, template_names):
+        differences = {}
+        for name, data_key in (('category_graphic_overrides', 'category_overrides'),
+                               ('category_visibility_settings', 'category_visibility'),
+                               ('workset_visibility_settings', 'workset_visibility'),
+                               ('import_category_overrides', 'import_categories'),
+                               ('revit_link_overrides', 'revit_links'),
+                               ('category_detail_levels', 'detail_levels'),
+                               ('view_behavior_properties', 'view_properties')):
+            differences[name] = self._compare_dict_values(data_key, template_names)
+        differences['template_controlled_parameters'] = self._compare_parameter_values('view_parameters', template_names)
+
+        all_uncontrolled_params = set()
+        for data in self.comparison_data.values():
+            all_uncontrolled_params.update(data['uncontrolled_parameters'])
+        differences['dangerous_uncontrolled_parameters'] = {}
+        for param in all_uncontrolled_params:
+            param_values = {}
+            for template_name in template_names:
+                param_values[template_name] = param in self.comparison_data[template_name]['uncontrolled_parameters']
+            if len(set(param_values.values())) > 1:
+                differences['dangerous_uncontrolled_parameters'][param] = param_values
+
+        differences['filter_settings'] = self._compare_filter_data('filters', template_names)
+        return differences
+
+    def _compare_dict_values(self, data_key, template_names):
+        differences = {}
+        all_keys = set()
+        for data in self.comparison_data.values():
+            if data.get(data_key) is not None:
+                all_keys.update(data[data_key].keys())
+        for key in all_keys:
+            key_values = {}
+            for template_name in template_names:
+                section = self.comparison_data[template_name].get(data_key)
+                key_values[template_name] = section[key] if section is not None and key in section else None
+            values = list(key_values.values())
+            if values and not all(value == values[0] for value in values):
+                differences[key] = key_values
+        return differences
+
+    def _compare_parameter_values(self, data_key, template_names):
+        differences = {}
+        all_params = set()
+        for data in self.comparison_data.values():
+            all_params.update(data[data_key].keys())
+            all_params.update(data.get('uncontrolled_parameters', []))
+        for param_name in all_params:
+            if param_name.lower() == "workset":
+                continue
+            param_data = {}
+            for template_name in template_names:
+                template_data = self.comparison_data[template_name]
+                if param_name in template_data[data_key]:
+                    param_data[template_name] = template_data[data_key][param_name]
+                elif param_name in template_data.get('uncontrolled_parameters', []):
+                    param_data[template_name] = "Not Controlled"
+                else:
+                    param_data[template_name] = "Not Present"
+            if len(set(param_data.values())) > 1:
+                differences[param_name] = param_data
+        return differences
+
+    def _compare_filter_data(self, data_key, template_names):
+        differences = {}
+        all_filters = set()
+        for data in self.comparison_data.values():
+            if data_key in data:
+                all_filters.update(data[data_key].keys())
+        for filter_name in all_filters:
+            filter_values = {}
+            for template_name in template_names:
+                template_data = self.comparison_data[template_name]
+                if data_key in template_data and filter_name in template_data[data_key]:
+                    filter_values[template_name] = template_data[data_key][filter_name]
+                else:
+                    filter_values[template_name] = None
+            if TemplateComparisonEngine({})._has_filter_differences(filter_values):
+                differences[filter_name] = filter_values
+        return differences
+
+
+def make_comparison_data(template_count=20, category_count=60, variant_count=4, seed=0):
+    """
+    Synthetic comparison_data shaped like the collector output.
+
+    Templates are built from variant_count base configurations per section,
+    plus a few random one-off edits, the way real template families drift.
+    """
+    rng = random.Random(seed)
+    categories = ["Category {}".format(i) for i in range(category_count)]
+    parameters = ["Parameter {}".format(i) for i in range(12)] + ["Workset"]
+
+    def make_override(variant, category):
+        override = {
+            'projection_line_weight': (variant + len(category)) % 5 or None,
+            'projection_line_color': "RGB({}, 0, 0)".format(variant * 40),
+            'projection_line_pattern': "Dash" if variant % 3 else "Solid",
+            'cut_line_weight': 3,
+            'cut_line_color': "RGB(0, 0, 0)",
+            'cut_pattern': "Solid" if variant % 2 else None,
+            'surface_foreground_pattern': {'name': "Diagonal", 'color': "RGB(128, 128, 128)", 'visible': True},
+            'surface_background_pattern': {'name': None, 'color': None, 'visible': False},
+            'transparency': 0,
+            'halftone': variant == 3,
+        }
+        return override
+
+    def make_section(kind, variant):
+        if kind == 'category_overrides':
+            # variants of a configuration differ on about one category in ten
+            return dict((c, make_override(variant if i % 10 == 0 else 0, c))
+                        for i, c in enumerate(categories) if (i + variant) % 23)
+        if kind in ('category_visibility', 'workset_visibility', 'import_categories', 'revit_links'):
+            states = ['Visible', 'Hidden', 'UNCONTROLLED']
+            return dict((c, states[(i * (variant + 1)) % 3 if i % 10 == 0 else 0])
+                        for i, c in enumerate(categories[:category_count // 2]))
+        if kind == 'detail_levels':
+            return dict((c, ['Coarse', 'Medium', 'Fine'][(i + variant) % 3]) for i, c in enumerate(categories[:20]))
+        if kind == 'view_properties':
+            return {'discipline': ['Architectural', 'Coordination'][variant % 2], 'scale': 96 // (variant + 1)}
+        if kind == 'filters':
+            return dict(("Filter {}".format(i), {
+                'enabled': (i + variant) % 3 != 0,
+                'visible': True,
+                'graphic_overrides': {'color': variant if i % 4 == 0 else 0},
+            }) for i in range(8 + variant))
+        raise ValueError(kind)
+
+    kinds = ['category_overrides', 'category_visibility', 'workset_visibility', 'import_categories',
+             'revit_links', 'detail_levels', 'view_properties', 'filters']
+    base = dict((kind, [make_section(kind, v) for v in range(variant_count)]) for kind in kinds)
+
+    comparison_data = {}
+    for t in range(template_count):
+        name = "Template {:03d}".format(t)
+        data = {'name': name, 'template_usage': {'views': [], 'total_count': 0}}
+        for kind in kinds:
+            data[kind] = dict(base[kind][rng.randrange(variant_count)])
+        if rng.random() < 0.3:
+            category = rng.choice(categories)
+            data['category_overrides'][category] = make_override(9, category)
+        if rng.random() < 0.1:
+            data['filters'].pop("Filter 0", None)
+        uncontrolled = [p for i, p in enumerate(parameters) if (i + t % 3) % 5 == 0]
+        data['uncontrolled_parameters'] = uncontrolled
+        data['view_parameters'] = dict((p, "Value {}".format((i + t % 2) % 3))
+                                       for i, p in enumerate(parameters) if p not in uncontrolled)
+        comparison_data[name] = data
+    return comparison_data
+
+
+def unit_test():
+    for seed in range(5):
+        comparison_data = make_comparison_data(template_count=12, category_count=30, seed=seed)
+        names = sorted(comparison_data)
+        for template_names in (names, names[:5], names[:1]):
+            expected = _ReferenceEngine(comparison_data).find_all_differences(template_names)
+            actual = TemplateComparisonEngine(comparison_data).find_all_differences(template_names)
+            assert sorted(actual) == sorted(expected)
+            for section in expected:
+                assert actual[section] == expected[section], (seed, section)
+
+    # identical templates produce no differences at all
+    comparison_data = make_comparison_data(template_count=6, variant_count=1, seed=1)
+    for data in comparison_data.values():
+        data['category_overrides'] = dict(comparison_data["Template 000"]['category_overrides'])
+        data['filters'] = dict(comparison_data["Template 000"]['filters'])
+        data['uncontrolled_parameters'] = list(comparison_data["Template 000"]['uncontrolled_parameters'])
+        data['view_parameters'] = dict(comparison_data["Template 000"]['view_parameters'])
+    engine = TemplateComparisonEngine(comparison_data)
+    differences = engine.find_all_differences(sorted(comparison_data))
+    assert engine.get_summary_statistics(differences)['total_differences'] == 0
+
+    # clustering: one group with everything, then split by a single edit
+    assert engine.group_identical_templates(sorted(comparison_data)) == [sorted(comparison_data)]
+    comparison_data["Template 004"]['filters']["Filter 1"] = {'enabled': False}
+    engine = TemplateComparisonEngine(comparison_data)
+    clusters = engine.group_identical_templates(sorted(comparison_data))
+    assert clusters == [[n for n in sorted(comparison_data) if n != "Template 004"], ["Template 004"]]
+    assert len(engine.group_identical_templates(sorted(comparison_data), ['category_overrides'])) == 1
+    print("template comparison engine: OK")
+
+
+def benchmark(template_count=200, category_count=300, variant_count=6):
+    """Time the engine against the reference on a project sized data set."""
+    comparison_data = make_comparison_data(template_count, category_count, variant_count)
+    template_names = sorted(comparison_data)
+
+    t_start = time.time()
+    expected = _ReferenceEngine(comparison_data).find_all_differences(template_names)
+    reference_time = time.time() - t_start
+
+    t_start = time.time()
+    engine = TemplateComparisonEngine(comparison_data)
+    actual = engine.find_all_differences(template_names)
+    engine_time = time.time() - t_start
+    assert actual == expected
+
+    t_start = time.time()
+    clusters = engine.group_identical_templates(template_names)
+    cluster_time = time.time() - t_start
+
+    print("{} templates x {} categories".format(template_count, category_count))
+    print("  reference engine: {:.3f}s".format(reference_time))
+    print("  columnar engine:  {:.3f}s".format(engine_time))
+    print("  clustering:       {:.3f}s ({} groups)".format(cluster_time, len(clusters)))
+    return {'reference': reference_time, 'engine': engine_time, 'clustering': cluster_time}
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -350,11 +350,8 @@ def generate_and_save_report(differences, template_names, comparison_data=None,
     engine = TemplateComparisonEngine({})  # Empty dict since we only need the method
     summary_stats = engine.get_summary_statistics(differences)
     
-    # Generate HTML report
-    html_content = generator.generate_comparison_report(differences, summary_stats, comparison_data, json_file_path)
-    
-    # Save report to file
-    filepath = generator.save_report_to_file(html_content)
+    # Generate HTML report, streamed to the DUMP folder
+    filepath = generator.save_comparison_report(differences, summary_stats, comparison_data, json_file_path)
     
     return filepath
 
@@ -13,7 +13,6 @@ Usage:
 __title__ = "Display Revit\nWarning History"
 __tip__ = True
 
-import os
 from pyrevit import forms, script
 from Autodesk.Revit import DB  # pyright: ignore
 
@@ -21,18 +20,18 @@ import proDUCKtion  # pyright: ignore
 proDUCKtion.validify()
 
 from EnneadTab.REVIT import REVIT_FORMS, REVIT_APPLICATION, REVIT_HISTORY
-from EnneadTab import ENVIRONMENT, NOTIFICATION, ERROR_HANDLE, LOG, FOLDER
+from EnneadTab import NOTIFICATION, ERROR_HANDLE, LOG
 
 doc = REVIT_APPLICATION.get_doc()
 
 
 class WarningHistoryOption(forms.TemplateListItem):
-    """Custom option class for warning history file selection."""
+    """Custom option class for warning history document selection."""
     
     @property
     def name(self):
-        """Get the formatted name of the warning history file."""
-        return self.item.replace("REVIT_WARNING_HISTORY_", "").replace(ENVIRONMENT.PLUGIN_EXTENSION, "")
+        """Get the name of the recorded document."""
+        return self.item
 
 
 @LOG.log(__file__, __title__)
@@ -43,14 +42,13 @@ def display_warning_history():
     if show_detail is None:
         return
 
-    selected_files = _select_warning_history_files()
-    if not selected_files:
+    selected_docs = _select_warning_history_files()
+    if not selected_docs:
         return
 
     _show_chart_js_hint()
-    for file_item in selected_files:
-        file_name = file_item.replace("REVIT_WARNING_HISTORY_", "").replace(ENVIRONMENT.PLUGIN_EXTENSION, "")
-        REVIT_HISTORY.display_warning(file_name, show_detail=show_detail)
+    for doc_name in selected_docs:
+        REVIT_HISTORY.display_warning(doc_name, show_detail=show_detail)
 
     print("Done")
 
@@ -72,18 +70,15 @@ def _get_detail_preference():
 
 
 def _select_warning_history_files():
-    """Select warning history files to analyze.
+    """Select documents with a warning history to analyze.
     
     Returns:
-        List of selected files or None if cancelled
+        List of selected document names or None if cancelled
     """
-    folder = FOLDER.SHARED_DUMP_FOLDER
-    
-    # Get all warning history files
+    # Documents recorded in the warning stores or in legacy history files
     file_list = [
         WarningHistoryOption(x) 
-        for x in os.listdir(folder) 
-        if x.startswith("REVIT_WARNING_HISTORY_")
+        for x in REVIT_HISTORY.list_recorded_documents()
     ]
     
 
@@ -958,16 +958,17 @@ class AiRenderForm(WPFWindow):
         scroll.Content = wp
         picker.Content = scroll
 
-        # Background-fill the thumbnails
+        # Background-fill the thumbnails, a few downloads at a time
         def fill_worker(state):
-            for (btn, img), item in zip(tiles, items):
-                try:
-                    path = AI.get_or_cache_demo_style_image(item["url"], item["filename"])
-                    bmp = G.bitmap_from_path(path)
-                    if bmp is not None:
-                        self._invoke_ui(lambda im=img, b=bmp: setattr(im, "Source", b))
-                except Exception:
-                    continue
+            def show(index, path):
+                img = tiles[index][1]
+                bmp = G.bitmap_from_path(path)
+                if bmp is not None:
+                    self._invoke_ui(lambda im=img, b=bmp: setattr(im, "Source", b))
+            try:
+                AI.cache_demo_style_images(items, on_cached=show)
+            except Exception as ex:
+                _trace("worker.fill_styles SWALLOWED {}".format(ex))
         System.Threading.ThreadPool.QueueUserWorkItem(
             System.Threading.WaitCallback(fill_worker))
 
@@ -33,7 +33,7 @@ import proDUCKtion # pyright: ignore
 proDUCKtion.validify()
 
 from EnneadTab.REVIT import REVIT_FORMS, REVIT_APPLICATION
-from EnneadTab import USER, ENVIRONMENT, SOUND, TIME, ERROR_HANDLE, FOLDER, IMAGE, LOG
+from EnneadTab import USER, ENVIRONMENT, SOUND, TIME, ERROR_HANDLE, FOLDER, IMAGE, LOG, SEARCH_INDEX
 
 
 uidoc = REVIT_APPLICATION.get_uidoc()
@@ -160,9 +160,9 @@ class EA_search_UI(forms.WPFWindow):
     def entered_text(self):
         return self.search_textbox.Text
 
-    @property
-    def _search_data_keys(self):
-        return self.search_datas.keys()
+    def get_search_data(self, title):
+        """(doc_string, script_path, youtube_link, post_link) of a search result."""
+        return self.search_index.get_payload(title)[:4]
 
 
     def is_enneadtab_command(self, command):
@@ -178,59 +178,49 @@ class EA_search_UI(forms.WPFWindow):
 
     @ERROR_HANDLE.try_catch_error()
     def load_commands(self):
-        """
-        enneadtab_commands = dict()
-        for command in sessionmgr.find_all_available_commands():
-            if command.name and command.extension == "ENNEAD":
-                enneadtab_commands[command.name] = command
-
-                #print command.name
-                if "search" in command.name.lower():
-                    for x in dir(command):
-                        try:
-                            print("{} = {}".format(x, getattr(command, x)))
-                        except Exception as e:
-                            print (e)
-                #print cmd.extension
-        """
-
-
-        #print dir(cmd)
-
-
+        """Load the search index, building it only when the commands changed.
 
+        Parsing every button script for its title and docstring is the slow
+        part, so the index is saved to the dump folder and reused until the
+        EnneadTab version, the Revit version or the command list changes.
+        """
+        from pyrevit.loader import sessionmgr
+        from pyrevit import HOST_APP
 
-
-        # build the search database
-        self.search_datas = dict()
-
+        enneadtab_commands = []
         if self.checkbox_enneadtab.IsChecked:
-            from pyrevit.loader import sessionmgr
-            for command in filter(self.is_enneadtab_command, sessionmgr.find_all_available_commands()):
-                
-                title, doc_string, script_path, youtube_link, post_link = self.get_command_title_and_docstring_and_panel_location(command)
-                self.search_datas[title] = (doc_string, script_path, youtube_link, post_link)
-        """
-            if "version note" in command.name.lower():
-                for x in dir(command):
-                    try:
-                        print("\n{} = {}".format(x, getattr(command, x)))
-                    except Exception as e:
-                        print (e)
-        """
+            enneadtab_commands = list(filter(self.is_enneadtab_command, sessionmgr.find_all_available_commands()))
+        is_native = bool(self.checkbox_native.IsChecked)
+
+        dist_version = ENVIRONMENT.get_dist_version()
+        signature = [dist_version, str(HOST_APP.version), len(enneadtab_commands), is_native]
+        index_file = FOLDER.get_local_dump_folder_file("search_command_index_{}{}.json".format(
+            "E" if enneadtab_commands else "", "N" if is_native else ""))
+
+        # a dev tree has no version stamp, always rebuild so docstring edits show up
+        if dist_version != "dev":
+            self.search_index = SEARCH_INDEX.SearchIndex.load(index_file, signature)
+            if self.search_index is not None:
+                self.search_session = SEARCH_INDEX.SearchSession(self.search_index)
+                return
 
-        if self.checkbox_native.IsChecked:
-            from pyrevit import HOST_APP
-            native_commands_dict = {x.name: x for x in HOST_APP.get_postable_commands()}
-            for native_command_name in native_commands_dict:
-                self.search_datas[native_command_name] = ("Refer to Revit tooltips.", "", None, None)
+        # build the search database
+        self.search_index = SEARCH_INDEX.SearchIndex()
+        for command in enneadtab_commands:
+            title, doc_string, script_path, youtube_link, post_link = self.get_command_title_and_docstring_and_panel_location(command)
+            self.search_index.add(title, doc_string, (doc_string, script_path, youtube_link, post_link, True))
 
-        return
+        if is_native:
+            for native_command in HOST_APP.get_postable_commands():
+                self.search_index.add(native_command.name, "",
+                                      ("Refer to Revit tooltips.", "", None, None, False))
 
-        for name, tooltip in self.search_datas.items():
-            print("\n#######################")
-            print(name)
-            print(tooltip)
+        self.search_index.build()
+        self.search_session = SEARCH_INDEX.SearchSession(self.search_index)
+        try:
+            self.search_index.save(index_file, signature)
+        except Exception:
+            pass
 
 
 
@@ -299,7 +289,7 @@ class EA_search_UI(forms.WPFWindow):
 
         self.set_visibility_visible(self.search_guess_textbox)
         self.search_guess_textbox.Text = self._search_results[self._result_index]
-        doc_string, script_path, youtube_link, post_link = self.search_datas[self.search_guess_textbox.Text]
+        doc_string, script_path, youtube_link, post_link = self.get_search_data(self.search_guess_textbox.Text)
         panel_location = self.get_button_panel(script_path)
         self.doc_textblock.Text = "Button Name: [{}]\nButton Location: {}\n##############\n\n{}".format(self.search_guess_textbox.Text,
                                                                                                 panel_location,
@@ -443,17 +433,15 @@ class EA_search_UI(forms.WPFWindow):
 
         from pyrevit.loader import sessionmgr
 
-
         # response = self.search_guess_textbox.Text
-        for command in filter(self.is_enneadtab_command, sessionmgr.find_all_available_commands()):
-            title, doc_string, script_path, youtube_link, post_link = self.get_command_title_and_docstring_and_panel_location(command)
-            #print title
-            if title == self.search_guess_textbox.Text:
-                selected_cmd = command
-                self.run_command_action_event_handler.kwargs = selected_cmd, True
-                self.ext_event.Raise()
-                return
-
+        doc_string, script_path, youtube_link, post_link, is_enneadtab = self.search_index.get_payload(self.search_guess_textbox.Text)
+        if is_enneadtab:
+            for command in sessionmgr.find_all_available_commands():
+                if command.script == script_path:
+                    self.run_command_action_event_handler.kwargs = command, True
+                    self.ext_event.Raise()
+                    return
+            return
 
         from pyrevit import HOST_APP
         for native_command in HOST_APP.get_postable_commands():
@@ -463,34 +451,16 @@ class EA_search_UI(forms.WPFWindow):
                 selected_cmd = native_command
                 self.run_command_action_event_handler.kwargs = selected_cmd, False
                 self.ext_event.Raise()
-
-
-
-
-
-
-
-
-
+                return
 
 
 
 
     #@TIME.timer
-    def set_search_results(self, *collections):
-        """Set search results for returning."""
+    def set_search_results(self, results):
+        """Set ranked search results for returning."""
         self._result_index = 0
-        self._search_results = []
-
-
-        for resultset in collections:
-            self._search_results.extend(sorted(resultset))
-
-        temp = []
-        for x in self._search_results:
-            if x not in temp:
-                temp.append(x)
-        self._search_results = temp
+        self._search_results = list(results)
 
         if len(self._search_results) == 0:
 
@@ -500,56 +470,6 @@ class EA_search_UI(forms.WPFWindow):
             self.set_visibility_collapse(self.doc_display_panel)
 
 
-    #@TIME.timer
-    def find_direct_match(self, input_text):
-        """Find direct text matches in search term."""
-        results = []
-        if input_text:
-            for command_name in self._search_data_keys:
-                if command_name.lower().startswith(input_text):
-                    results.append(command_name)
-
-        return results
-
-    #@TIME.timer
-    def find_word_match(self, input_text):
-        """Find direct word matches in search term."""
-        results = []
-        if input_text:
-            cur_words = input_text.split(' ')
-            for command_name in self._search_data_keys:
-                if all([x in command_name.lower() for x in cur_words]):
-                    results.append(command_name)
-
-        return results
-
-    #@TIME.timer
-    def find_in_doc_match(self, input_text):
-        """Find direct word matches in search term."""
-        def has_keyword_in_doc(command_name, keywords):
-            doc_string = self.search_datas[command_name][0]
-
-            if not doc_string:
-                return False
-
-            for keyword in keywords:
-
-                if keyword.lower() in doc_string.lower():
-                    #print keyword
-                    #print doc_string
-                    return True
-            return False
-
-        results = []
-        if input_text:
-            cur_words = input_text.split(' ')
-            for command_name in self._search_data_keys:
-                if has_keyword_in_doc(command_name, cur_words):
-                    results.append(command_name)
-
-        return results
-
-
     @ERROR_HANDLE.try_catch_error()
     def search_box_value_changed(self, sender, args):
         """Handle text changed event."""
@@ -567,11 +487,8 @@ class EA_search_UI(forms.WPFWindow):
             return
 
 
-        direct_match_results = self.find_direct_match(self.entered_text)
-
-        word_results = self.find_word_match(self.entered_text)
-        in_doc_results = self.find_in_doc_match(self.entered_text)
-        self.set_search_results(direct_match_results, word_results, in_doc_results)
+        # title prefix matches first, then ranked word, docstring and typo matches
+        self.set_search_results(self.search_session.search(self.entered_text))
 
         #print self._search_results
 
@@ -63,7 +63,7 @@ try:
     import System # pyright: ignore
     from EnneadTab import NOTIFICATION, DATA_FILE, FOLDER, OUTPUT, TIME, VERSION_CONTROL
     from EnneadTab import MODULE_HELPER, ERROR_HANDLE, USER, ENVIRONMENT, SOUND, DOCUMENTATION, LOG, IMAGE
-    from EnneadTab import JOKE, EMOJI, ENCOURAGING, HOLIDAY, EXE
+    from EnneadTab import JOKE, EMOJI, ENCOURAGING, HOLIDAY, EXE, MAINTENANCE
     from EnneadTab.REVIT import REVIT_FORMS, REVIT_APPLICATION, REVIT_EVENT, REVIT_SELECTION
 
     # Try to import KEYBOARD if it exists, otherwise create a fallback
@@ -373,10 +373,11 @@ def selection_owner_checker(sender, args):
             SOUND.play_error_sound()
             return
 
-def purge_dump_folder_families():
-    FOLDER.cleanup_folder_by_extension(FOLDER.DUMP_FOLDER, ".rfa", old_file_only=True)
-    FOLDER.cleanup_folder_by_extension(FOLDER.DUMP_FOLDER, ".3dm", old_file_only=True)
-    FOLDER.cleanup_folder_by_extension(FOLDER.DUMP_FOLDER, ".dwg", old_file_only=True)
+def register_maintenance():
+    # dump folder housekeeping waits until Revit is idle instead of delaying startup.
+    # The scheduled dump cleanup also removes the old .rfa, .3dm and .dwg files
+    # the startup used to purge in one go.
+    MAINTENANCE.attach_to_revit(__revit__)
 
 
 def should_register_context_menu():
@@ -709,7 +710,7 @@ def EnneadTab_startup():
 
     register_temp_graphic_server()
     register_selection_owner_checker()
-    purge_dump_folder_families()
+    register_maintenance()
 
     auto_open_temp_file_on_virtual7()
 
@@ -1,24 +1,12 @@
 # -*- coding: utf-8 -*-
-"""Element parameters route handler for EnneadTab MCP."""
-from pyrevit import routes
-from Autodesk.Revit import DB
-
+"""Element parameters route handler for EnneadTab MCP.
 
-def _get_param_value(param):
-    """Extract the value from a Revit parameter."""
-    if not param.HasValue:
-        return None
+Query params: names (only these parameters), plus limit/cursor/fields,
+see query_engine.py.
+"""
+from pyrevit import routes
 
-    storage = param.StorageType
-    if storage == DB.StorageType.String:
-        return param.AsString()
-    elif storage == DB.StorageType.Integer:
-        return param.AsInteger()
-    elif storage == DB.StorageType.Double:
-        return param.AsDouble()
-    elif storage == DB.StorageType.ElementId:
-        return param.AsElementId().IntegerValue
-    return None
+from revit_adapter import get_engine
 
 
 def register_element_params_routes(api):
@@ -30,43 +18,5 @@ def register_element_params_routes(api):
                 status_code=400,
             )
 
-        try:
-            eid = DB.ElementId(int(element_id))
-        except (ValueError, TypeError):
-            return routes.make_response(
-                data={"error": "Invalid element_id: {}".format(element_id)},
-                status_code=400,
-            )
-
-        elem = doc.GetElement(eid)
-        if elem is None:
-            return routes.make_response(
-                data={"error": "Element not found: {}".format(element_id)},
-                status_code=404,
-            )
-
-        parameters = []
-        for param in elem.Parameters:
-            param_data = {
-                "name": param.Definition.Name,
-                "value": _get_param_value(param),
-                "display_value": param.AsValueString(),
-                "storage_type": str(param.StorageType),
-                "is_read_only": param.IsReadOnly,
-                "has_value": param.HasValue,
-            }
-
-            try:
-                param_data["is_shared"] = param.IsShared
-            except Exception:
-                param_data["is_shared"] = False
-
-            parameters.append(param_data)
-
-        return routes.make_response(data={
-            "element_id": int(element_id),
-            "element_name": elem.Name if elem.Name else None,
-            "category": elem.Category.Name if elem.Category else None,
-            "parameter_count": len(parameters),
-            "parameters": parameters,
-        })
+        data, status = get_engine().element_parameters(doc, element_id, request)
+        return routes.make_response(data=data, status_code=status)
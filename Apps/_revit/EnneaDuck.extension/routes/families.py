@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
-"""Families route handler for EnneadTab MCP."""
+"""Families route handler for EnneadTab MCP.
+
+Query params: category (family category name), plus limit/cursor/fields,
+see query_engine.py. Leaving type_names out of fields skips loading every
+family symbol.
+"""
 from pyrevit import routes
-from Autodesk.Revit import DB
+
+from revit_adapter import get_engine
 
 
 def register_family_routes(api):
@@ -13,41 +19,5 @@ def register_family_routes(api):
                 status_code=400,
             )
 
-        category_filter = request.get("category")
-
-        collector = (
-            DB.FilteredElementCollector(doc)
-            .OfClass(DB.Family)
-            .ToElements()
-        )
-
-        families = []
-        for family in collector:
-            # Apply optional category filter
-            if category_filter:
-                fam_cat = family.FamilyCategory
-                if fam_cat is None:
-                    continue
-                if fam_cat.Name != category_filter:
-                    continue
-
-            # Collect type names
-            type_names = []
-            for type_id in family.GetFamilySymbolIds():
-                symbol = doc.GetElement(type_id)
-                if symbol:
-                    type_names.append(symbol.Name)
-
-            families.append({
-                "id": family.Id.IntegerValue,
-                "name": family.Name,
-                "category": family.FamilyCategory.Name if family.FamilyCategory else None,
-                "is_in_place": family.IsInPlace,
-                "type_count": len(type_names),
-                "type_names": type_names,
-            })
-
-        return routes.make_response(data={
-            "count": len(families),
-            "families": families,
-        })
+        data, status = get_engine().query_families(doc, request)
+        return routes.make_response(data=data, status_code=status)
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""Query engine shared by the elements, element_params, views and families routes.
+
+The engine only talks to the model through an adapter, so it has no Revit
+imports and can be tested on any Python with an in-memory stand-in (see
+test_query_engine.py). revit_adapter.py holds the Revit implementation.
+
+Every list query accepts:
+    limit=<n>           page size, see the defaults per query
+    cursor=<token>      next_cursor of the previous page
+    fields=id,name      only compute and return these fields
+
+Element, view and family pages are ordered by element id and the cursor is
+the last id returned, so a cursor stays valid while elements are added or
+deleted. A cursor also carries a hash of the query it came from and is
+refused when replayed against different filters.
+
+An adapter provides:
+    category_members()              -> iterable of (BuiltInCategory member name, value)
+    element_ids(doc, category)      -> element ids of the category, instances only
+    view_ids(doc), family_ids(doc)  -> element ids
+    get_element(doc, element_id)    -> element or None
+    read_parameters(elem, names)    -> {name: comparable text, None if missing}
+    element_row(elem, fields)       -> dict, see ELEMENT_FIELDS
+    view_row(view, fields)          -> dict, see VIEW_FIELDS
+    is_template(view)               -> bool
+    family_row(doc, family, fields) -> dict, see FAMILY_FIELDS
+    family_category(family)         -> category name or None
+    parameters(elem)                -> list of parameters in model order
+    parameter_name(param)           -> str
+    parameter_row(param, fields)    -> dict, see PARAMETER_FIELDS
+"""
+
+import bisect
+import hashlib
+import json
+
+
+DEFAULT_ELEMENT_LIMIT = 500
+MAX_LIMIT = 5000
+
+ELEMENT_FIELDS = ("id", "name", "category")
+VIEW_FIELDS = ("id", "name", "view_type", "scale")
+FAMILY_FIELDS = ("id", "name", "category", "is_in_place", "type_count", "type_names")
+PARAMETER_FIELDS = ("name", "value", "display_value", "storage_type",
+                    "is_read_only", "has_value", "is_shared")
+
+
+class QueryError(Exception):
+    """Bad query input, the route answers {"error": message} with status."""
+
+    def __init__(self, message, status=400):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _split_names(value):
+    if value is None or value == "":
+        return []
+    if isinstance(value, (list, tuple)):
+        names = [str(x).strip() for x in value]
+    else:
+        names = [x.strip() for x in str(value).split(",")]
+    return [x for x in names if x]
+
+
+def parse_fields(value, available):
+    """Requested fields in the order of available, all of them by default."""
+    requested = set(_split_names(value))
+    if not requested:
+        return list(available)
+    unknown = sorted(requested.difference(available))
+    if unknown:
+        raise QueryError("Unknown field(s): {}. Valid: {}".format(
+            ", ".join(unknown), ", ".join(available)))
+    return [x for x in available if x in requested]
+
+
+def parse_limit(value, default=None):
+    """Page size, default when not given, None meaning no limit."""
+    if value is None or value == "":
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise QueryError("limit must be an integer, got: {}".format(value))
+    if limit < 1:
+        raise QueryError("limit must be at least 1")
+    return min(limit, MAX_LIMIT)
+
+
+class ParameterFilter(object):
+    """Parameter filters parsed once per request.
+
+    filters maps a parameter name to the expected text, compared the way
+    the route always has: AsString(), or AsValueString() when that is empty.
+    """
+
+    def __init__(self, filters=None):
+        # checked in the order given, put the most selective parameter first
+        self.items = [(str(name), str(expected)) for name, expected in (filters or {}).items()]
+        self.names = [name for name, _ in self.items]
+
+    def signature(self):
+        return sorted(self.items)
+
+    @classmethod
+    def parse(cls, value):
+        """From the filters query param, a JSON object. Unparsable input filters nothing."""
+        if not value:
+            return cls()
+        if isinstance(value, dict):
+            return cls(value)
+        try:
+            filters = json.loads(value)
+        except (ValueError, TypeError):
+            return cls()
+        return cls(filters if isinstance(filters, dict) else None)
+
+    def __bool__(self):
+        return bool(self.items)
+    __nonzero__ = __bool__
+
+    def matches(self, elem, read_parameters, values):
+        """Check elem, stopping at the first parameter that differs.
+
+        The texts read are stored in values so they are not read again
+        for the projection.
+        """
+        for name, expected in self.items:
+            values.update(read_parameters(elem, [name]))
+            if values.get(name) != expected:
+                return False
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+def query_signature(*parts):
+    """Short hash of what a cursor was issued for."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
+
+
+def make_cursor(last_key, signature):
+    return "{}.{}".format(last_key, signature)
+
+
+def read_cursor(token, signature):
+    """Last key of the previous page, None when there is no cursor."""
+    if token is None or token == "":
+        return None
+    key, _, token_signature = str(token).rpartition(".")
+    if not key:
+        raise QueryError("Invalid cursor: {}".format(token))
+    if token_signature != signature:
+        raise QueryError("Cursor belongs to a different query: {}".format(token))
+    return key
+
+
+def keyset_page(sorted_ids, after_id, limit, load):
+    """Walk ids greater than after_id and collect up to limit rows.
+
+    Args:
+        sorted_ids (list): Ascending int ids
+        after_id (int): Last id of the previous page, or None
+        limit (int): Page size, None for everything
+        load (callable): load(id) -> row, or None to skip the id
+
+    Returns:
+        tuple: (rows, last id on the page, True if more rows follow)
+    """
+    start = bisect.bisect_right(sorted_ids, after_id) if after_id is not None else 0
+    rows = []
+    last_id = None
+    for index in range(start, len(sorted_ids)):
+        element_id = sorted_ids[index]
+        row = load(element_id)
+        if row is None:
+            continue
+        if limit is not None and len(rows) >= limit:
+            return rows, last_id, True
+        rows.append(row)
+        last_id = element_id
+    return rows, last_id, False
+
+
+def _int_cursor(token, signature):
+    key = read_cursor(token, signature)
+    if key is None:
+        return None
+    try:
+        return int(key)
+    except ValueError:
+        raise QueryError("Invalid cursor: {}".format(token))
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class CategoryTable(object):
+    """Category name lookup built once from the BuiltInCategory members.
+
+    Accepts "OST_Walls", "Walls", and either one in any case.
+    """
+
+    def __init__(self, members):
+        self._exact = {}
+        self._folded = {}
+        for name, value in members:
+            if not name.startswith("OST_"):
+                continue
+            self._exact[name] = value
+            self._folded.setdefault(name.lower(), value)
+            self._folded.setdefault(name[4:].lower(), value)
+
+    def __len__(self):
+        return len(self._exact)
+
+    def resolve(self, name):
+        if not name:
+            return None
+        value = self._exact.get(name)
+        if value is None:
+            value = self._exact.get("OST_{}".format(name))
+        if value is None:
+            value = self._folded.get(name.lower())
+        return value
+
+
+class QueryEngine(object):
+    """Runs the list queries of the MCP routes against an adapter.
+
+    Query methods take the document and a params object with .get(name),
+    the pyRevit request or a plain dict, and return (data, status_code).
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self._categories = None
+
+    @property
+    def categories(self):
+        if self._categories is None:
+            self._categories = CategoryTable(self.adapter.category_members())
+        return self._categories
+
+    def _run(self, query, *args):
+        try:
+            return query(*args), 200
+        except QueryError as e:
+            return {"error": str(e)}, e.status
+
+    # ---- elements ----
+
+    def query_elements(self, doc, params):
+        """GET /elements/?category=Walls&filters={"Mark": "A"}&fields=id,name&parameters=Comments"""
+        return self._run(self._query_elements, doc, params)
+
+    def _query_elements(self, doc, params):
+        category = params.get("category")
+        if not category:
+            raise QueryError("category query parameter is required")
+        bic = self.categories.resolve(category)
+        if bic is None:
+            raise QueryError("Unknown category: {}".format(category))
+
+        fields = parse_fields(params.get("fields"), ELEMENT_FIELDS)
+        wanted_parameters = _split_names(params.get("parameters"))
+        parameter_filter = ParameterFilter.parse(params.get("filters"))
+        limit = parse_limit(params.get("limit"), DEFAULT_ELEMENT_LIMIT)
+        signature = query_signature("elements", str(bic), parameter_filter.signature())
+        after_id = _int_cursor(params.get("cursor"), signature)
+
+        # parameters read for the filter are reused by the projection
+        extra_names = [x for x in wanted_parameters if x not in parameter_filter.names]
+        adapter = self.adapter
+
+        def load(element_id):
+            elem = adapter.get_element(doc, element_id)
+            if elem is None:
+                return None
+            values = {}
+            if parameter_filter and not parameter_filter.matches(elem, adapter.read_parameters, values):
+                return None
+            row = adapter.element_row(elem, fields)
+            if wanted_parameters:
+                if extra_names:
+                    values.update(adapter.read_parameters(elem, extra_names))
+                row["parameters"] = dict((name, values.get(name)) for name in wanted_parameters)
+            return row
+
+        ids = sorted(adapter.element_ids(doc, bic))
+        rows, last_id, has_more = keyset_page(ids, after_id, limit, load)
+        return {
+            "category": category,
+            "count": len(rows),
+            "capped": has_more,
+            "next_cursor": make_cursor(last_id, signature) if has_more else None,
+            "elements": rows,
+        }
+
+    # ---- element parameters ----
+
+    def element_parameters(self, doc, element_id, params):
+        """GET /element/<id>/parameters/?names=Mark,Comments&fields=name,value"""
+        return self._run(self._element_parameters, doc, element_id, params)
+
+    def _element_parameters(self, doc, element_id, params):
+        try:
+            element_id = int(element_id)
+        except (ValueError, TypeError):
+            raise QueryError("Invalid element_id: {}".format(element_id))
+        elem = self.adapter.get_element(doc, element_id)
+        if elem is None:
+            raise QueryError("Element not found: {}".format(element_id), 404)
+
+        fields = parse_fields(params.get("fields"), PARAMETER_FIELDS)
+        names = set(_split_names(params.get("names")))
+        limit = parse_limit(params.get("limit"))
+        signature = query_signature("parameters", element_id, sorted(names))
+        after = read_cursor(params.get("cursor"), signature)
+        start = int(after) if after is not None else 0
+
+        adapter = self.adapter
+        parameters = adapter.parameters(elem)
+        if names:
+            parameters = [p for p in parameters if adapter.parameter_name(p) in names]
+        end = len(parameters) if limit is None else start + limit
+        rows = [adapter.parameter_row(p, fields) for p in parameters[start:end]]
+        has_more = end < len(parameters)
+
+        element_row = adapter.element_row(elem, ("name", "category"))
+        return {
+            "element_id": element_id,
+            "element_name": element_row["name"],
+            "category": element_row["category"],
+            "parameter_count": len(rows),
+            "next_cursor": make_cursor(end, signature) if has_more else None,
+            "parameters": rows,
+        }
+
+    # ---- views ----
+
+    def query_views(self, doc, params):
+        """GET /views/?view_type=FloorPlan&fields=id,name&limit=100"""
+        return self._run(self._query_views, doc, params)
+
+    def _query_views(self, doc, params):
+        fields = parse_fields(params.get("fields"), VIEW_FIELDS)
+        view_type = params.get("view_type") or None
+        limit = parse_limit(params.get("limit"))
+        signature = query_signature("views", view_type)
+        after_id = _int_cursor(params.get("cursor"), signature)
+        adapter = self.adapter
+        # view_type is needed for grouping even when not projected
+        read_fields = fields if "view_type" in fields else list(fields) + ["view_type"]
+
+        def load(element_id):
+            view = adapter.get_element(doc, element_id)
+            # Skip view templates
+            if view is None or adapter.is_template(view):
+                return None
+            row = adapter.view_row(view, read_fields)
+            if view_type and row["view_type"] != view_type:
+                return None
+            return row
+
+        rows, last_id, has_more = keyset_page(sorted(adapter.view_ids(doc)), after_id, limit, load)
+
+        grouped = {}
+        for row in rows:
+            key = row["view_type"] if "view_type" in fields else row.pop("view_type")
+            grouped.setdefault(key, []).append(row)
+        return {
+            "count": len(rows),
+            "view_types": list(grouped.keys()),
+            "next_cursor": make_cursor(last_id, signature) if has_more else None,
+            "views_by_type": grouped,
+        }
+
+    # ---- families ----
+
+    def query_families(self, doc, params):
+        """GET /families/?category=Doors&fields=id,name,type_count"""
+        return self._run(self._query_families, doc, params)
+
+    def _query_families(self, doc, params):
+        fields = parse_fields(params.get("fields"), FAMILY_FIELDS)
+        category_filter = params.get("category") or None
+        limit = parse_limit(params.get("limit"))
+        signature = query_signature("families", category_filter)
+        after_id = _int_cursor(params.get("cursor"), signature)
+        adapter = self.adapter
+
+        def load(element_id):
+            family = adapter.get_element(doc, element_id)
+            if family is None:
+                return None
+            # Apply optional category filter
+            if category_filter and adapter.family_category(family) != category_filter:
+                return None
+            return adapter.family_row(doc, family, fields)
+
+        rows, last_id, has_more = keyset_page(sorted(adapter.family_ids(doc)), after_id, limit, load)
+        return {
+            "count": len(rows),
+            "next_cursor": make_cursor(last_id, signature) if has_more else None,
+            "families": rows,
+        }
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Revit side of the MCP query engine, see query_engine.py for the interface."""
+from Autodesk.Revit import DB
+
+from query_engine import QueryEngine
+
+
+# Above this many names one pass over elem.Parameters beats one
+# LookupParameter call per name.
+LOOKUP_PARAMETER_LIMIT = 4
+
+
+def _get_param_value(param):
+    """Extract the value from a Revit parameter."""
+    if not param.HasValue:
+        return None
+
+    storage = param.StorageType
+    if storage == DB.StorageType.String:
+        return param.AsString()
+    elif storage == DB.StorageType.Integer:
+        return param.AsInteger()
+    elif storage == DB.StorageType.Double:
+        return param.AsDouble()
+    elif storage == DB.StorageType.ElementId:
+        return param.AsElementId().IntegerValue
+    return None
+
+
+def _param_text(param):
+    return param.AsString() or str(param.AsValueString() or "")
+
+
+class RevitQueryAdapter(object):
+    """Reads elements, views, families and parameters from a Revit document."""
+
+    def category_members(self):
+        for member in dir(DB.BuiltInCategory):
+            if member.startswith("OST_"):
+                yield member, getattr(DB.BuiltInCategory, member)
+
+    def element_ids(self, doc, category):
+        collector = (
+            DB.FilteredElementCollector(doc)
+            .OfCategory(category)
+            .WhereElementIsNotElementType()
+        )
+        return [x.IntegerValue for x in collector.ToElementIds()]
+
+    def view_ids(self, doc):
+        return [x.IntegerValue for x in DB.FilteredElementCollector(doc).OfClass(DB.View).ToElementIds()]
+
+    def family_ids(self, doc):
+        return [x.IntegerValue for x in DB.FilteredElementCollector(doc).OfClass(DB.Family).ToElementIds()]
+
+    def get_element(self, doc, element_id):
+        return doc.GetElement(DB.ElementId(element_id))
+
+    def read_parameters(self, elem, names):
+        values = dict.fromkeys(names)
+        if len(names) <= LOOKUP_PARAMETER_LIMIT:
+            for name in names:
+                param = elem.LookupParameter(name)
+                if param is not None:
+                    values[name] = _param_text(param)
+            return values
+        for param in elem.Parameters:
+            name = param.Definition.Name
+            # first match wins, same as LookupParameter
+            if name in values and values[name] is None:
+                values[name] = _param_text(param)
+        return values
+
+    def element_row(self, elem, fields):
+        row = {}
+        for field in fields:
+            if field == "id":
+                row["id"] = elem.Id.IntegerValue
+            elif field == "name":
+                row["name"] = elem.Name if elem.Name else None
+            elif field == "category":
+                row["category"] = elem.Category.Name if elem.Category else None
+        return row
+
+    def is_template(self, view):
+        return view.IsTemplate
+
+    def view_row(self, view, fields):
+        row = {}
+        for field in fields:
+            if field == "id":
+                row["id"] = view.Id.IntegerValue
+            elif field == "name":
+                row["name"] = view.Name
+            elif field == "view_type":
+                row["view_type"] = str(view.ViewType)
+            elif field == "scale":
+                row["scale"] = view.Scale if hasattr(view, "Scale") else None
+        return row
+
+    def family_category(self, family):
+        fam_cat = family.FamilyCategory
+        return fam_cat.Name if fam_cat is not None else None
+
+    def family_row(self, doc, family, fields):
+        row = {}
+        type_names = None
+        for field in fields:
+            if field == "id":
+                row["id"] = family.Id.IntegerValue
+            elif field == "name":
+                row["name"] = family.Name
+            elif field == "category":
+                row["category"] = self.family_category(family)
+            elif field == "is_in_place":
+                row["is_in_place"] = family.IsInPlace
+            elif field == "type_count" and "type_names" not in fields:
+                row["type_count"] = family.GetFamilySymbolIds().Count
+            elif field in ("type_count", "type_names"):
+                # Collect type names
+                if type_names is None:
+                    type_names = []
+                    for type_id in family.GetFamilySymbolIds():
+                        symbol = doc.GetElement(type_id)
+                        if symbol:
+                            type_names.append(symbol.Name)
+                row[field] = len(type_names) if field == "type_count" else type_names
+        return row
+
+    def parameters(self, elem):
+        return list(elem.Parameters)
+
+    def parameter_name(self, param):
+        return param.Definition.Name
+
+    def parameter_row(self, param, fields):
+        row = {}
+        for field in fields:
+            if field == "name":
+                row["name"] = param.Definition.Name
+            elif field == "value":
+                row["value"] = _get_param_value(param)
+            elif field == "display_value":
+                row["display_value"] = param.AsValueString()
+            elif field == "storage_type":
+                row["storage_type"] = str(param.StorageType)
+            elif field == "is_read_only":
+                row["is_read_only"] = param.IsReadOnly
+            elif field == "has_value":
+                row["has_value"] = param.HasValue
+            elif field == "is_shared":
+                try:
+                    row["is_shared"] = param.IsShared
+                except Exception:
+                    row["is_shared"] = False
+        return row
+
+
+_ENGINE = None
+
+
+def get_engine():
+    """Engine shared by the routes, so the category table is built once per session."""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = QueryEngine(RevitQueryAdapter())
+    return _ENGINE
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Tests and timing harness for query_engine, run outside Revit:
+
+    python test_query_engine.py
+
+MemoryAdapter stands in for revit_adapter.RevitQueryAdapter over plain
+objects. unit_test() checks paging, projection, filters and cursors, and
+that a query without paging params answers what the old routes answered
+(kept below as _legacy_elements). benchmark() times both.
+"""
+
+import json
+import random
+import time
+
+from query_engine import QueryEngine
+
+
+class FakeParameter(object):
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class FakeElement(object):
+    def __init__(self, element_id, name, category, parameters, **extra):
+        self.id = element_id
+        self.name = name
+        self.category = category
+        self.parameters = parameters
+        self.__dict__.update(extra)
+
+    def LookupParameter(self, name):
+        # Revit walks the parameter set too
+        for param in self.parameters:
+            if param.name == name:
+                return param
+        return None
+
+
+class FakeDocument(object):
+    def __init__(self, element_count=2000, family_count=40, seed=0):
+        rng = random.Random(seed)
+        self.elements = {}
+        self.by_category = {}
+        categories = ["OST_Walls", "OST_Doors", "OST_Rooms"]
+        for i in range(element_count):
+            element_id = 1000 + i * 3
+            category = categories[i % len(categories)]
+            parameters = [FakeParameter("Param {}".format(k), str(k)) for k in range(40)]
+            parameters.append(FakeParameter("Mark", "M{}".format(rng.randrange(10))))
+            parameters.append(FakeParameter("Level", "Level {}".format(rng.randrange(4))))
+            elem = FakeElement(element_id, "Element {}".format(i), category[4:], parameters)
+            self.elements[element_id] = elem
+            self.by_category.setdefault(category, []).append(element_id)
+        self.views = []
+        for i in range(60):
+            view_id = 900000 + i
+            self.elements[view_id] = FakeElement(
+                view_id, "View {}".format(i), "Views", [],
+                view_type=["FloorPlan", "Section", "ThreeD"][i % 3], scale=100, is_template=i % 10 == 0)
+            self.views.append(view_id)
+        self.families = []
+        for i in range(family_count):
+            family_id = 800000 + i
+            symbols = []
+            for k in range(3):
+                symbol_id = 850000 + i * 10 + k
+                self.elements[symbol_id] = FakeElement(symbol_id, "Type {}".format(k), "", [])
+                symbols.append(symbol_id)
+            self.elements[family_id] = FakeElement(
+                family_id, "Family {}".format(i), ["Doors", "Windows"][i % 2], [],
+                is_in_place=False, symbol_ids=symbols)
+            self.families.append(family_id)
+        self.gets = 0
+
+
+BUILTIN_CATEGORIES = ["OST_Category{}".format(i) for i in range(1100)] + ["OST_Walls", "OST_Doors", "OST_Rooms"]
+
+
+class MemoryAdapter(object):
+    """query_engine adapter over FakeDocument."""
+
+    def __init__(self):
+        self.parameter_reads = 0
+
+    def category_members(self):
+        return [(name, name) for name in BUILTIN_CATEGORIES]
+
+    def element_ids(self, doc, category):
+        return list(doc.by_category.get(category, []))
+
+    def view_ids(self, doc):
+        return list(doc.views)
+
+    def family_ids(self, doc):
+        return list(doc.families)
+
+    def get_element(self, doc, element_id):
+        doc.gets += 1
+        return doc.elements.get(element_id)
+
+    def read_parameters(self, elem, names):
+        values = {}
+        for name in names:
+            self.parameter_reads += 1
+            param = elem.LookupParameter(name)
+            values[name] = param.value if param is not None else None
+        return values
+
+    def element_row(self, elem, fields):
+        values = {"id": elem.id, "name": elem.name, "category": elem.category}
+        return dict((field, values[field]) for field in fields)
+
+    def is_template(self, view):
+        return view.is_template
+
+    def view_row(self, view, fields):
+        values = {"id": view.id, "name": view.name, "view_type": view.view_type, "scale": view.scale}
+        return dict((field, values[field]) for field in fields)
+
+    def family_category(self, family):
+        return family.category
+
+    def family_row(self, doc, family, fields):
+        row = {}
+        for field in fields:
+            if field == "type_names":
+                row[field] = [self.get_element(doc, x).name for x in family.symbol_ids]
+            elif field == "type_count":
+                row[field] = len(family.symbol_ids)
+            else:
+                row[field] = {"id": family.id, "name": family.name, "category": family.category,
+                              "is_in_place": family.is_in_place}[field]
+        return row
+
+    def parameters(self, elem):
+        return list(elem.parameters)
+
+    def parameter_name(self, param):
+        return param.name
+
+    def parameter_row(self, param, fields):
+        values = {"name": param.name, "value": param.value, "display_value": param.value,
+                  "storage_type": "String", "is_read_only": False, "has_value": True, "is_shared": False}
+        return dict((field, values[field]) for field in fields)
+
+
+def _legacy_find_category(category_name):
+    """The old _find_builtin_category: a scan of every member per request."""
+    for member in BUILTIN_CATEGORIES:
+        if member == category_name or member == "OST_{}".format(category_name):
+            return member
+        if member.lower() == category_name.lower():
+            return member
+        if member.lower() == "ost_{}".format(category_name.lower()):
+            return member
+    return None
+
+
+def _legacy_elements(doc, category, filters_str=None, max_results=500):
+    """The old /elements/ route body."""
+    bic = _legacy_find_category(category)
+    filters = json.loads(filters_str) if filters_str else {}
+    elements = []
+    count = 0
+    for element_id in doc.by_category[bic]:
+        if count >= max_results:
+            break
+        elem = doc.elements[element_id]
+        elem_data = {"id": elem.id, "name": elem.name, "category": elem.category}
+        if filters:
+            match = True
+            for param_name, expected_value in filters.items():
+                param = elem.LookupParameter(param_name)
+                if param is None or param.value != str(expected_value):
+                    match = False
+                    break
+            if not match:
+                continue
+        elements.append(elem_data)
+        count += 1
+    return {"category": category, "count": len(elements), "capped": count >= max_results, "elements": elements}
+
+
+def _walk(query, params):
+    """Follow next_cursor to the end, returning every page."""
+    pages = []
+    params = dict(params)
+    while True:
+        data, status = query(params)
+        assert status == 200, data
+        pages.append(data)
+        if not data["next_cursor"]:
+            return pages
+        params["cursor"] = data["next_cursor"]
+
+
+def unit_test():
+    doc = FakeDocument()
+    adapter = MemoryAdapter()
+    engine = QueryEngine(adapter)
+
+    # category names, case and prefix insensitive, table built once
+    assert engine.categories.resolve("walls") == "OST_Walls"
+    assert engine.categories.resolve("OST_Doors") == "OST_Doors"
+    assert engine.categories.resolve("ost_rooms") == "OST_Rooms"
+    assert engine.categories.resolve("Nope") is None
+    assert engine.categories is engine.categories
+
+    # without paging params: the old response plus next_cursor
+    filters = json.dumps({"Mark": "M3"})
+    for category, filters_str in (("Walls", None), ("doors", filters), ("Rooms", json.dumps({"Missing": 1}))):
+        data, status = engine.query_elements(doc, {"category": category, "filters": filters_str})
+        legacy = _legacy_elements(doc, category, filters_str)
+        assert status == 200
+        for key in legacy:
+            assert data[key] == legacy[key], (category, key)
+    data, status = engine.query_elements(doc, {"category": "Walls"})
+    assert data["capped"] and data["next_cursor"] and len(data["elements"]) == 500
+
+    # paging past 500 reaches every element exactly once
+    pages = _walk(lambda p: engine.query_elements(doc, p), {"category": "Walls", "limit": "300"})
+    ids = [row["id"] for page in pages for row in page["elements"]]
+    assert ids == sorted(doc.by_category["OST_Walls"])
+    assert not pages[-1]["capped"]
+
+    # a filter stops at the first mismatch, the projection reuses what it read
+    adapter.parameter_reads = 0
+    pages = _walk(lambda p: engine.query_elements(doc, p),
+                  {"category": "Doors", "filters": filters, "fields": "id", "parameters": "Mark,Level"})
+    rows = [row for page in pages for row in page["elements"]]
+    assert rows and all(sorted(row) == ["id", "parameters"] and row["parameters"]["Mark"] == "M3" for row in rows)
+    assert len(pages) == 1
+    assert adapter.parameter_reads == len(doc.by_category["OST_Doors"]) + len(rows)
+
+    # a cursor survives deletions and refuses a different query
+    data, _ = engine.query_elements(doc, {"category": "Walls", "limit": "10"})
+    deleted = doc.by_category["OST_Walls"].pop(10)
+    data2, _ = engine.query_elements(doc, {"category": "Walls", "limit": "10", "cursor": data["next_cursor"]})
+    assert data2["elements"][0]["id"] == doc.by_category["OST_Walls"][10] and data2["elements"][0]["id"] != deleted
+    data3, status = engine.query_elements(doc, {"category": "Doors", "cursor": data["next_cursor"]})
+    assert status == 400 and "different query" in data3["error"]
+    assert engine.query_elements(doc, {"category": "Walls", "cursor": "abc"})[1] == 400
+    assert engine.query_elements(doc, {"category": "Walls", "fields": "id,colour"})[1] == 400
+    assert engine.query_elements(doc, {"category": "Nothing"})[0] == {"error": "Unknown category: Nothing"}
+    assert engine.query_elements(doc, {})[1] == 400
+
+    # element parameters
+    element_id = doc.by_category["OST_Walls"][0]
+    data, status = engine.element_parameters(doc, str(element_id), {})
+    assert status == 200 and data["parameter_count"] == 42 and data["next_cursor"] is None
+    data, _ = engine.element_parameters(doc, element_id, {"names": "Mark,Level", "fields": "name,value"})
+    assert [sorted(row) for row in data["parameters"]] == [["name", "value"]] * 2
+    pages = _walk(lambda p: engine.element_parameters(doc, element_id, p), {"limit": "5", "fields": "name"})
+    assert [row["name"] for page in pages for row in page["parameters"]] == [p.name for p in doc.elements[element_id].parameters]
+    assert engine.element_parameters(doc, 1, {})[1] == 404
+    assert engine.element_parameters(doc, "x", {})[1] == 400
+
+    # views: templates skipped, grouped, filtered by type and paged
+    data, _ = engine.query_views(doc, {})
+    assert data["count"] == 54 and sorted(data["view_types"]) == ["FloorPlan", "Section", "ThreeD"]
+    pages = _walk(lambda p: engine.query_views(doc, p), {"view_type": "Section", "limit": "7", "fields": "id"})
+    rows = [row for page in pages for row in page["views_by_type"].get("Section", [])]
+    assert len(rows) == 18 and all(list(row) == ["id"] for row in rows)
+
+    # families: projection skips the symbol lookups
+    doc.gets = 0
+    data, _ = engine.query_families(doc, {"category": "Doors", "fields": "id,name,type_count"})
+    assert data["count"] == 20 and doc.gets == 40
+    data, _ = engine.query_families(doc, {"limit": "15"})
+    assert data["families"][0]["type_names"] == ["Type 0", "Type 1", "Type 2"] and data["next_cursor"]
+    print("query engine: OK")
+
+
+def benchmark(element_count=60000, requests=200):
+    """Old route against the engine on a project sized fake model."""
+    doc = FakeDocument(element_count)
+    engine = QueryEngine(MemoryAdapter())
+    filters = json.dumps({"Mark": "M3", "Level": "Level 1"})
+
+    t_start = time.time()
+    for _ in range(requests):
+        _legacy_find_category("Walls")
+    legacy_lookup = time.time() - t_start
+    t_start = time.time()
+    for _ in range(requests):
+        engine.categories.resolve("Walls")
+    engine_lookup = time.time() - t_start
+
+    t_start = time.time()
+    legacy = _legacy_elements(doc, "Walls", filters)
+    legacy_page = time.time() - t_start
+
+    t_start = time.time()
+    data, _ = engine.query_elements(doc, {"category": "Walls", "filters": filters})
+    engine_page = time.time() - t_start
+    assert [row["id"] for row in data["elements"]] == [row["id"] for row in legacy["elements"]]
+
+    t_start = time.time()
+    pages = _walk(lambda p: engine.query_elements(doc, p),
+                  {"category": "Walls", "filters": filters, "fields": "id", "limit": "500"})
+    engine_all = time.time() - t_start
+    matches = sum(page["count"] for page in pages)
+
+    print("{} elements, {} category lookups".format(element_count, requests))
+    print("  category lookup, member scan: {:.4f}s".format(legacy_lookup))
+    print("  category lookup, table:       {:.4f}s".format(engine_lookup))
+    print("  first page, old route:        {:.3f}s ({} rows, rest unreachable)".format(legacy_page, legacy["count"]))
+    print("  first page, engine:           {:.3f}s".format(engine_page))
+    print("  every match, {} pages:         {:.3f}s ({} rows)".format(len(pages), engine_all, matches))
+    return {"legacy_lookup": legacy_lookup, "engine_lookup": engine_lookup,
+            "legacy_page": legacy_page, "engine_page": engine_page, "engine_all": engine_all}
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
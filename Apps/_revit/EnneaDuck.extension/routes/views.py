@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-"""Views route handler for EnneadTab MCP."""
+"""Views route handler for EnneadTab MCP.
+
+Query params: view_type (e.g. FloorPlan), plus limit/cursor/fields,
+see query_engine.py. View templates are left out.
+"""
 from pyrevit import routes
-from Autodesk.Revit import DB
+
+from revit_adapter import get_engine
 
 
 def register_view_routes(api):
@@ -13,33 +18,5 @@ def register_view_routes(api):
                 status_code=400,
             )
 
-        collector = (
-            DB.FilteredElementCollector(doc)
-            .OfClass(DB.View)
-            .ToElements()
-        )
-
-        grouped = {}
-        total = 0
-        for view in collector:
-            # Skip view templates
-            if view.IsTemplate:
-                continue
-
-            view_type = str(view.ViewType)
-            if view_type not in grouped:
-                grouped[view_type] = []
-
-            grouped[view_type].append({
-                "id": view.Id.IntegerValue,
-                "name": view.Name,
-                "view_type": view_type,
-                "scale": view.Scale if hasattr(view, "Scale") else None,
-            })
-            total += 1
-
-        return routes.make_response(data={
-            "count": total,
-            "view_types": list(grouped.keys()),
-            "views_by_type": grouped,
-        })
+        data, status = get_engine().query_views(doc, request)
+        return routes.make_response(data=data, status_code=status)
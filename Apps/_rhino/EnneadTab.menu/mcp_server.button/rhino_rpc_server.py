@@ -6,6 +6,13 @@ and stop_server() to manage a System.Net.HttpListener on a background thread.
 All Rhino API calls are marshaled to the main thread via
 Rhino.RhinoApp.InvokeOnUiThread().
 
+The listener thread only accepts connections; each request is read, routed
+and written from a thread pool worker, so a slow client or a large response
+does not hold up the next request. Only the routed call itself runs on the
+UI thread, and POST /enneadtab/batch/ runs many calls in that single hop.
+Routing, pagination and JSON encoding live in rpc_routes.py, which has no
+Rhino dependency.
+
 Usage:
     import rhino_rpc_server
     rhino_rpc_server.start_server()   # non-blocking
@@ -15,22 +22,24 @@ Usage:
 
 import System  # pyright: ignore
 from System.Net import HttpListener  # pyright: ignore
-from System.Threading import Thread, ThreadStart  # pyright: ignore
+from System.Threading import Thread, ThreadStart, ThreadPool, WaitCallback  # pyright: ignore
 from System.IO import StreamReader  # pyright: ignore
 import Rhino  # pyright: ignore
 import rhinoscriptsyntax as rs  # pyright: ignore
 import scriptcontext as sc  # pyright: ignore
-import json
 import os
 import sys
 import traceback
 
+import rpc_routes
+
 # ---------------------------------------------------------------------------
 # Module-level state
 # ---------------------------------------------------------------------------
 _listener = None
 _thread = None
 _running = False
+_router = None
 
 PORT = 48885
 
@@ -45,6 +54,7 @@ def start_server():
     if _running:
         return "Server already running on port {}".format(PORT)
 
+    _get_router()
     _listener = HttpListener()
     _listener.Prefixes.Add("http://localhost:{}/".format(PORT))
     _listener.Start()
@@ -76,68 +86,40 @@ def stop_server():
 # ---------------------------------------------------------------------------
 
 def _listen_loop():
-    """Block on GetContext() and dispatch each request."""
+    """Block on GetContext() and hand each request to a pool thread."""
+    callback = WaitCallback(_handle_request_safe)
     while _running:
         try:
             context = _listener.GetContext()
-            _handle_request(context)
+            ThreadPool.QueueUserWorkItem(callback, context)
         except Exception:
             if _running:
                 continue
 
 
+def _handle_request_safe(context):
+    try:
+        _handle_request(context)
+    except Exception:
+        # client went away mid-response, nothing left to answer
+        try:
+            context.Response.Abort()
+        except Exception:
+            pass
+
+
 # ---------------------------------------------------------------------------
-# Request dispatcher
+# Request dispatcher (runs on a pool thread)
 # ---------------------------------------------------------------------------
 
 def _handle_request(context):
-    """Parse the HTTP request, marshal to UI thread, return JSON."""
+    """Parse the HTTP request, marshal the routed call to the UI thread, stream JSON back."""
     request = context.Request
     response = context.Response
 
     path = request.Url.AbsolutePath.rstrip("/")
     method = request.HttpMethod
 
-    # Read body for POST requests
-    body = ""
-    if method == "POST":
-        reader = StreamReader(request.InputStream, request.ContentEncoding)
-        body = reader.ReadToEnd()
-        reader.Close()
-
-    # Parse query string params into a dict
-    query = {}
-    qs = request.Url.Query
-    if qs and qs.startswith("?"):
-        for part in qs[1:].split("&"):
-            if "=" in part:
-                k, v = part.split("=", 1)
-                query[k] = v
-
-    result = {"error": "Internal error"}
-    status = 500
-
-    try:
-        # Use a mutable list to pass results out of the closure
-        result_holder = [None, 200]
-
-        def do_on_ui():
-            try:
-                r, s = _route(path, method, body, query)
-                result_holder[0] = r
-                result_holder[1] = s
-            except Exception:
-                result_holder[0] = {"error": traceback.format_exc()}
-                result_holder[1] = 500
-
-        Rhino.RhinoApp.InvokeOnUiThread(System.Action(do_on_ui))
-
-        result = result_holder[0]
-        status = result_holder[1]
-    except Exception as e:
-        result = {"error": str(e)}
-        status = 500
-
     # Add CORS headers for local dev
     response.AddHeader("Access-Control-Allow-Origin", "*")
     response.AddHeader("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
@@ -149,95 +131,195 @@ def _handle_request(context):
         response.OutputStream.Close()
         return
 
-    # Send JSON response
-    response_body = json.dumps(result, default=str)
-    response_bytes = System.Text.Encoding.UTF8.GetBytes(response_body)
-    response.StatusCode = status
-    response.ContentType = "application/json; charset=utf-8"
-    response.ContentLength64 = response_bytes.Length
-    response.OutputStream.Write(response_bytes, 0, response_bytes.Length)
-    response.OutputStream.Close()
+    # Read body for POST requests
+    body = ""
+    if method == "POST":
+        reader = StreamReader(request.InputStream, request.ContentEncoding)
+        body = reader.ReadToEnd()
+        reader.Close()
 
+    query = rpc_routes.parse_query(request.Url.Query)
+    result, status = _call_on_ui_thread(path, method, body, query)
+    _send_json(response, result, status, request.KeepAlive)
 
-# ---------------------------------------------------------------------------
-# Router — runs on Rhino's main (UI) thread
-# ---------------------------------------------------------------------------
 
-def _route(path, method, body, query):
-    """Route the request to the appropriate handler.
+def _call_on_ui_thread(path, method, body, query):
+    """Route one request on Rhino's main thread. Returns (result, status)."""
+    router = _get_router()
+    # Use a mutable list to pass results out of the closure
+    result_holder = [{"error": "Internal error"}, 500]
 
-    Returns (result_dict, status_code).
-    """
-    data = {}
-    if body:
+    def do_on_ui():
         try:
-            data = json.loads(body)
+            r, s = router.handle(path, method, body, query)
+            result_holder[0] = r
+            result_holder[1] = s
         except Exception:
-            pass
+            result_holder[0] = {"error": traceback.format_exc()}
+            result_holder[1] = 500
 
-    # Merge query params into data (query params are lower priority)
-    merged = dict(query)
-    merged.update(data)
+    try:
+        Rhino.RhinoApp.InvokeOnUiThread(System.Action(do_on_ui))
+    except Exception as e:
+        return {"error": str(e)}, 500
+    return result_holder[0], result_holder[1]
 
-    # Parse path segments: /enneadtab/status -> ["enneadtab", "status"]
-    segments = [s for s in path.split("/") if s]
 
-    if len(segments) < 2 or segments[0] != "enneadtab":
-        return {"error": "Unknown route: {}".format(path)}, 404
+def _send_json(response, result, status, keep_alive=True):
+    """Write the result as JSON.
 
-    route = segments[1]
+    Small results go out with a Content-Length. Anything larger than one
+    chunk is sent with chunked transfer encoding while it is being encoded,
+    so the whole body never sits in memory as one string and byte array.
+    """
+    encoding = System.Text.Encoding.UTF8
+    response.StatusCode = status
+    response.ContentType = "application/json; charset=utf-8"
+    response.KeepAlive = keep_alive
+
+    chunks = rpc_routes.iter_json_chunks(result)
+    first = next(chunks)
+    second = next(chunks, None)
+    if second is None:
+        data = encoding.GetBytes(first)
+        response.ContentLength64 = data.Length
+        response.OutputStream.Write(data, 0, data.Length)
+        response.OutputStream.Close()
+        return
 
-    # ---- Read-only endpoints ----
-    if route == "status":
-        return _handle_status(), 200
+    response.SendChunked = True
+    stream = response.OutputStream
+    for chunk in _chain(first, second, chunks):
+        data = encoding.GetBytes(chunk)
+        stream.Write(data, 0, data.Length)
+    stream.Close()
 
-    if route == "model-info":
-        return _handle_model_info(), 200
 
-    if route == "elements":
-        return _handle_elements(merged), 200
+def _chain(first, second, rest):
+    yield first
+    yield second
+    for chunk in rest:
+        yield chunk
 
-    if route == "element" and len(segments) >= 4:
-        elem_id = segments[2]
-        sub = segments[3]
-        if sub == "parameters" and method == "GET":
-            return _handle_element_params(elem_id), 200
-        if sub == "set-parameter" and method == "POST":
-            return _handle_set_param(elem_id, merged), 200
-        return {"error": "Unknown element sub-route: {}".format(sub)}, 404
 
-    if route == "levels":
-        return {"levels": [], "note": "Levels are not applicable in Rhino."}, 200
+# ---------------------------------------------------------------------------
+# Router — handlers run on Rhino's main (UI) thread
+# ---------------------------------------------------------------------------
 
-    if route == "views":
-        return _handle_views(), 200
+def _get_router():
+    """Build the route table once."""
+    global _router
+    if _router is not None:
+        return _router
 
-    if route == "families":
-        return _handle_block_defs(merged), 200
+    router = rpc_routes.Router()
+    rpc_routes.add_model_routes(router, RhinoDocumentModel())
 
-    if route == "layers":
-        return _handle_layers(), 200
+    # ---- Read-only endpoints ----
+    router.add("status", lambda data, args: _handle_status())
+    router.add("model-info", lambda data, args: _handle_model_info())
+    router.add("element/*/parameters", lambda data, args: _handle_element_params(args[0]), methods=("GET",))
+    router.add("element/*/set-parameter", lambda data, args: _handle_set_param(args[0], data), methods=("POST",))
+    router.add("levels", lambda data, args: {"levels": [], "note": "Levels are not applicable in Rhino."})
+    router.add("views", lambda data, args: _handle_views())
+    router.add("tools", lambda data, args: _handle_list_tools())
+    router.add("view-image", lambda data, args: _handle_view_image(data))
 
     # ---- Write endpoints ----
-    if route == "set-layer-state" and method == "POST":
-        return _handle_set_layer(merged), 200
+    router.add("set-layer-state", lambda data, args: _handle_set_layer(data), methods=("POST",))
+    router.add("execute-code", lambda data, args: _handle_execute_code(data), methods=("POST",))
+    router.add("run-tool", lambda data, args: _handle_run_tool(data), methods=("POST",))
+    router.add("export-geometry", lambda data, args: _handle_export(data), methods=("POST",))
+
+    _router = router
+    return _router
+
+
+# ---------------------------------------------------------------------------
+# Document model used by the list endpoints in rpc_routes
+# ---------------------------------------------------------------------------
 
-    if route == "execute-code" and method == "POST":
-        return _handle_execute_code(merged), 200
+class RhinoDocumentModel(object):
+    """rpc_routes document model backed by rhinoscriptsyntax.
 
-    if route == "tools":
-        return _handle_list_tools(), 200
+    Rows only compute the fields asked for, so fields=id on a large model
+    skips the name, layer and type lookups entirely.
+    """
 
-    if route == "run-tool" and method == "POST":
-        return _handle_run_tool(merged), 200
+    OBJECT_FIELDS = ("id", "name", "layer", "type")
+    LAYER_FIELDS = ("name", "visible", "locked", "color")
+    BLOCK_FIELDS = ("name", "instance_count")
 
-    if route == "view-image":
-        return _handle_view_image(merged), 200
+    # Map category name to rhinoscriptsyntax filter constant
+    FILTER_MAP = {
+        "point": 1,       # rs.filter.point
+        "pointcloud": 2,  # rs.filter.pointcloud
+        "curve": 4,       # rs.filter.curve
+        "surface": 8,     # rs.filter.surface
+        "polysurface": 16,  # rs.filter.polysurface
+        "mesh": 32,       # rs.filter.mesh
+        "light": 256,     # rs.filter.light
+        "annotation": 512,  # rs.filter.annotation
+        "block": 4096,    # rs.filter.instance (block instance)
+    }
 
-    if route == "export-geometry" and method == "POST":
-        return _handle_export(merged), 200
+    def object_categories(self):
+        return list(self.FILTER_MAP.keys())
 
-    return {"error": "Unknown route: {}".format(path)}, 404
+    def object_ids(self, category):
+        if category:
+            filter_val = self.FILTER_MAP.get(category)
+            if filter_val is None:
+                return None
+            ids = rs.ObjectsByType(filter_val, select=False) or []
+        else:
+            # Return all visible objects
+            ids = rs.AllObjects(select=False) or []
+        return [str(obj_id) for obj_id in ids]
+
+    def object_row(self, obj_id, fields):
+        row = {}
+        guid = System.Guid(obj_id)
+        for field in fields:
+            if field == "id":
+                row["id"] = obj_id
+            elif field == "name":
+                row["name"] = rs.ObjectName(guid) or ""
+            elif field == "layer":
+                row["layer"] = rs.ObjectLayer(guid) or ""
+            elif field == "type":
+                row["type"] = rs.ObjectType(guid)
+        return row
+
+    def layer_names(self):
+        return rs.LayerNames() or []
+
+    def layer_row(self, name, fields):
+        row = {}
+        for field in fields:
+            if field == "name":
+                row["name"] = name
+            elif field == "visible":
+                row["visible"] = rs.LayerVisible(name)
+            elif field == "locked":
+                row["locked"] = rs.LayerLocked(name)
+            elif field == "color":
+                color = rs.LayerColor(name)
+                row["color"] = [color.R, color.G, color.B] if color else None
+        return row
+
+    def block_names(self):
+        return rs.BlockNames(sort=True) or []
+
+    def block_row(self, name, fields):
+        row = {}
+        for field in fields:
+            if field == "name":
+                row["name"] = name
+            elif field == "instance_count":
+                count = rs.BlockInstanceCount(name)
+                row["instance_count"] = count if count else 0
+        return row
 
 
 # ---------------------------------------------------------------------------
@@ -271,59 +353,6 @@ def _handle_model_info():
     }
 
 
-def _handle_elements(data):
-    """GET /enneadtab/elements/ — query objects by category type.
-
-    Query param ``category``: Curve, Surface, Brep, Mesh, Point, Block, etc.
-    """
-    category = data.get("category", "").strip()
-
-    # Map category name to rhinoscriptsyntax filter constant
-    filter_map = {
-        "point": 1,       # rs.filter.point
-        "pointcloud": 2,  # rs.filter.pointcloud
-        "curve": 4,       # rs.filter.curve
-        "surface": 8,     # rs.filter.surface
-        "polysurface": 16,  # rs.filter.polysurface
-        "mesh": 32,       # rs.filter.mesh
-        "light": 256,     # rs.filter.light
-        "annotation": 512,  # rs.filter.annotation
-        "block": 4096,    # rs.filter.instance (block instance)
-    }
-
-    if category:
-        filter_val = filter_map.get(category.lower())
-        if filter_val is None:
-            return {
-                "error": "Unknown category: {}. Valid: {}".format(
-                    category, ", ".join(sorted(filter_map.keys()))
-                )
-            }
-        ids = rs.ObjectsByType(filter_val, select=False) or []
-    else:
-        # Return all visible objects
-        ids = rs.AllObjects(select=False) or []
-
-    elements = []
-    for obj_id in ids:
-        obj_id_str = str(obj_id)
-        name = rs.ObjectName(obj_id) or ""
-        layer = rs.ObjectLayer(obj_id) or ""
-        obj_type = rs.ObjectType(obj_id)
-        elements.append({
-            "id": obj_id_str,
-            "name": name,
-            "layer": layer,
-            "type": obj_type,
-        })
-
-    return {
-        "count": len(elements),
-        "category_filter": category or "all",
-        "elements": elements,
-    }
-
-
 def _handle_element_params(elem_id):
     """GET /enneadtab/element/<id>/parameters/ — object attributes."""
     try:
@@ -403,38 +432,6 @@ def _handle_views():
     }
 
 
-def _handle_block_defs(data):
-    """GET /enneadtab/families/ — list block definitions (Rhino equivalent)."""
-    names = rs.BlockNames(sort=True) or []
-    blocks = []
-    for name in names:
-        count = rs.BlockInstanceCount(name)
-        blocks.append({
-            "name": name,
-            "instance_count": count if count else 0,
-        })
-
-    return {
-        "count": len(blocks),
-        "blocks": blocks,
-    }
-
-
-def _handle_layers():
-    """GET /enneadtab/layers/ — list all layers with state."""
-    names = rs.LayerNames() or []
-    layers = []
-    for name in names:
-        color = rs.LayerColor(name)
-        layers.append({
-            "name": name,
-            "visible": rs.LayerVisible(name),
-            "locked": rs.LayerLocked(name),
-            "color": [color.R, color.G, color.B] if color else None,
-        })
-    return {"count": len(layers), "layers": layers}
-
-
 def _handle_set_layer(data):
     """POST /enneadtab/set-layer-state/ — toggle visibility/lock/color."""
     layer_name = data.get("layer")
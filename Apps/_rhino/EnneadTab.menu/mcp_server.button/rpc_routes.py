@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""Host-agnostic routing and serialization for the Rhino RPC server.
+
+rhino_rpc_server.py owns the HttpListener and everything that needs the
+Rhino API. This module only deals with plain dicts and lists, so it runs
+under IronPython inside Rhino and under CPython on any machine, where it
+can be load-tested against a fake document model (see test_rpc_routes.py).
+
+Routes:
+    /enneadtab/<route>/<args...>   handler(data, args) -> result dict
+    /enneadtab/batch/              POST {"requests": [{"method", "path", "params"}]}
+                                   every call runs in the same UI-thread hop
+
+List endpoints (elements, layers, families) accept:
+    limit=<n>          page size, all items when left out
+    cursor=<token>     next_cursor of the previous page
+    fields=id,name     only compute and return these fields
+
+A document model is any object with:
+    object_ids(category)     -> list of id strings, category "" for all
+    object_categories()      -> list of valid category names
+    object_row(id, fields)   -> dict of the requested fields
+    layer_names(), layer_row(name, fields)
+    block_names(), block_row(name, fields)
+    OBJECT_FIELDS, LAYER_FIELDS, BLOCK_FIELDS  (tuples of field names)
+"""
+
+import json
+import traceback
+
+try:
+    from urllib import unquote_plus
+except ImportError:
+    from urllib.parse import unquote_plus
+
+try:
+    _STRING_TYPES = (str, unicode)  # noqa: F821
+except NameError:
+    _STRING_TYPES = (str,)
+
+
+ROUTE_PREFIX = "enneadtab"
+MAX_BATCH_SIZE = 500
+MAX_PAGE_SIZE = 5000
+CHUNK_SIZE = 64 * 1024
+
+
+class RouteError(Exception):
+    """Raised by handlers for a bad request, becomes {"error": message}."""
+
+    def __init__(self, message, status=400):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------------------------
+
+def parse_query(qs):
+    """Parse "?a=1&b=x%2Cy" into {"a": "1", "b": "x,y"}."""
+    query = {}
+    if qs and qs.startswith("?"):
+        qs = qs[1:]
+    if not qs:
+        return query
+    for part in qs.split("&"):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            query[unquote_plus(k)] = unquote_plus(v)
+    return query
+
+
+def merge_request_data(body, query):
+    """Query params overlaid by the JSON body, the body wins."""
+    merged = dict(query or {})
+    if body:
+        try:
+            data = json.loads(body)
+        except Exception:
+            data = None
+        if isinstance(data, dict):
+            merged.update(data)
+    return merged
+
+
+def split_path(path):
+    """/enneadtab/element/<id>/parameters/ -> ["enneadtab", "element", "<id>", "parameters"]"""
+    return [s for s in path.split("/") if s]
+
+
+# ---------------------------------------------------------------------------
+# Pagination and field projection
+# ---------------------------------------------------------------------------
+
+def parse_fields(value, available):
+    """Requested field names, in the order of available.
+
+    Args:
+        value: "id,name", a list of names, or None for every field
+        available (tuple): Fields the endpoint knows
+
+    Raises:
+        RouteError: For an unknown field name
+    """
+    if value is None or value == "" or value == []:
+        return list(available)
+    if isinstance(value, (list, tuple)):
+        requested = [str(x).strip() for x in value]
+    else:
+        requested = [x.strip() for x in str(value).split(",")]
+    requested = set(x for x in requested if x)
+    unknown = sorted(requested.difference(available))
+    if unknown:
+        raise RouteError("Unknown field(s): {}. Valid: {}".format(
+            ", ".join(unknown), ", ".join(available)))
+    return [x for x in available if x in requested]
+
+
+def parse_limit(value):
+    """Page size from the request, None when not paginating."""
+    if value is None or value == "":
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise RouteError("limit must be an integer, got: {}".format(value))
+    if limit < 1:
+        raise RouteError("limit must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def make_cursor(position, key):
+    return "{}:{}".format(position, key)
+
+
+def resolve_cursor(keys, cursor):
+    """Index of the first key after the cursor.
+
+    A cursor is "<position>:<last key>". The position makes the common case
+    O(1); if items were added or removed since, the key is looked up again.
+    """
+    if not cursor:
+        return 0
+    position, _, key = str(cursor).partition(":")
+    try:
+        position = int(position)
+    except ValueError:
+        raise RouteError("Invalid cursor: {}".format(cursor))
+    if 0 < position <= len(keys) and keys[position - 1] == key:
+        return position
+    try:
+        return keys.index(key) + 1
+    except ValueError:
+        raise RouteError("Cursor is no longer valid, the item it points to is gone: {}".format(cursor), 410)
+
+
+def paginate(keys, cursor=None, limit=None):
+    """Slice a key list.
+
+    Returns:
+        tuple: (page keys, next cursor or None on the last page)
+    """
+    start = resolve_cursor(keys, cursor)
+    if limit is None:
+        return keys[start:], None
+    end = start + limit
+    page = keys[start:end]
+    if end >= len(keys) or not page:
+        return page, None
+    return page, make_cursor(end, page[-1])
+
+
+def list_page(keys, data, available_fields, get_row, items_key):
+    """Paged, projected list response shared by every list endpoint.
+
+    Rows are only built for the keys on the page, and get_row(key, fields)
+    only has to compute the requested fields.
+    """
+    fields = parse_fields(data.get("fields"), available_fields)
+    limit = parse_limit(data.get("limit"))
+    page, next_cursor = paginate(keys, data.get("cursor"), limit)
+    rows = [get_row(key, fields) for key in page]
+    return {
+        "count": len(keys),
+        "returned": len(rows),
+        "next_cursor": next_cursor,
+        items_key: rows,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Router
+# ---------------------------------------------------------------------------
+
+class Router(object):
+    """Maps /enneadtab/<route>/ to handler(data, args).
+
+    A route is a name, optionally followed by more segments where "*"
+    matches any one segment: "element/*/parameters". args holds the
+    segments matched by "*" followed by any segments past the pattern.
+
+    A handler returns a result dict, or (result, status). Handlers signal
+    bad input by raising RouteError; any other exception becomes a 500 with
+    the traceback, same as before the split.
+    """
+
+    def __init__(self, prefix=ROUTE_PREFIX):
+        self.prefix = prefix
+        self._routes = {}
+        self.add("batch", self._handle_batch, methods=("POST",))
+
+    def add(self, route, handler, methods=None):
+        """Register a route, methods=None accepts any method."""
+        pattern = split_path(route)
+        entries = self._routes.setdefault(pattern[0], [])
+        entries.append((pattern[1:], handler, tuple(methods) if methods else None))
+        # most specific pattern first
+        entries.sort(key=lambda entry: -len(entry[0]))
+
+    def routes(self):
+        return sorted(self._routes)
+
+    def _match(self, segments, method):
+        for pattern, handler, methods in self._routes.get(segments[1], ()):
+            rest = segments[2:]
+            if len(rest) < len(pattern) or (methods and method not in methods):
+                continue
+            args = []
+            for expected, actual in zip(pattern, rest):
+                if expected == "*":
+                    args.append(actual)
+                elif expected != actual:
+                    break
+            else:
+                return handler, args + rest[len(pattern):]
+        return None, None
+
+    def dispatch(self, path, method, data):
+        """Run one call. Returns (result, status), never raises."""
+        segments = split_path(path)
+        if len(segments) < 2 or segments[0] != self.prefix:
+            return {"error": "Unknown route: {}".format(path)}, 404
+
+        handler, args = self._match(segments, method)
+        if handler is None:
+            return {"error": "Unknown route: {}".format(path)}, 404
+
+        try:
+            result = handler(data, args)
+        except RouteError as e:
+            return {"error": str(e)}, e.status
+        except Exception:
+            return {"error": traceback.format_exc()}, 500
+        if isinstance(result, tuple):
+            return result
+        return result, 200
+
+    def handle(self, path, method, body, query):
+        """Dispatch a raw request: body is the POST text, query the parsed query string."""
+        return self.dispatch(path, method, merge_request_data(body, query))
+
+    def _handle_batch(self, data, args):
+        """POST /enneadtab/batch/ — run several calls in one UI-thread hop.
+
+        Body: {"requests": [{"method": "GET", "path": "/enneadtab/layers/",
+                              "params": {...}}, ...],
+               "stop_on_error": false}
+        """
+        calls = data.get("requests")
+        if not isinstance(calls, list):
+            raise RouteError("requests must be a list of calls")
+        if len(calls) > MAX_BATCH_SIZE:
+            raise RouteError("A batch takes at most {} calls, got {}".format(MAX_BATCH_SIZE, len(calls)))
+        stop_on_error = bool(data.get("stop_on_error", False))
+
+        responses = []
+        for call in calls:
+            if not isinstance(call, dict) or not call.get("path"):
+                result, status = {"error": "Each call needs a path"}, 400
+            else:
+                path = call["path"]
+                method = str(call.get("method", "GET")).upper()
+                params = call.get("params", call.get("body")) or {}
+                if split_path(path)[1:2] == ["batch"]:
+                    result, status = {"error": "Batches cannot be nested"}, 400
+                elif not isinstance(params, dict):
+                    result, status = {"error": "params must be an object"}, 400
+                else:
+                    query = call.get("query")
+                    if isinstance(query, _STRING_TYPES):
+                        query = parse_query(query)
+                    merged = dict(query or {})
+                    merged.update(params)
+                    result, status = self.dispatch(path, method, merged)
+            responses.append({"status": status, "body": result})
+            if stop_on_error and (status >= 400 or (isinstance(result, dict) and "error" in result)):
+                break
+
+        return {"count": len(responses), "responses": responses}
+
+
+# ---------------------------------------------------------------------------
+# Document model routes
+# ---------------------------------------------------------------------------
+
+def add_model_routes(router, model):
+    """Register the list endpoints that only need a document model."""
+
+    def handle_elements(data, args):
+        """GET /enneadtab/elements/ — query objects by category type.
+
+        Query param ``category``: Curve, Surface, Brep, Mesh, Point, Block, etc.
+        """
+        category = (data.get("category") or "").strip()
+        ids = model.object_ids(category.lower())
+        if ids is None:
+            return {
+                "error": "Unknown category: {}. Valid: {}".format(
+                    category, ", ".join(sorted(model.object_categories()))
+                )
+            }
+        result = list_page(ids, data, model.OBJECT_FIELDS, model.object_row, "elements")
+        result["category_filter"] = category or "all"
+        return result
+
+    def handle_layers(data, args):
+        """GET /enneadtab/layers/ — list all layers with state."""
+        return list_page(model.layer_names(), data, model.LAYER_FIELDS, model.layer_row, "layers")
+
+    def handle_blocks(data, args):
+        """GET /enneadtab/families/ — list block definitions (Rhino equivalent)."""
+        return list_page(model.block_names(), data, model.BLOCK_FIELDS, model.block_row, "blocks")
+
+    router.add("elements", handle_elements)
+    router.add("layers", handle_layers)
+    router.add("families", handle_blocks)
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def _dumps(value):
+    return json.dumps(value, default=str)
+
+
+def iter_json_chunks(result, chunk_size=CHUNK_SIZE):
+    """Encode result as JSON text in pieces of roughly chunk_size characters.
+
+    The output is identical to json.dumps(result, default=str) for a
+    top-level dict. Lists directly under it are encoded item by item so
+    a large elements page can start going out before it is fully encoded,
+    and no single string holds the whole response.
+    """
+    if not isinstance(result, dict) or not all(isinstance(k, _STRING_TYPES) for k in result):
+        yield _dumps(result)
+        return
+
+    buffer = []
+    size = [0]
+
+    def push(text):
+        buffer.append(text)
+        size[0] += len(text)
+
+    first = True
+    push("{")
+    for key, value in result.items():
+        if not first:
+            push(", ")
+        first = False
+        push(_dumps(key))
+        push(": ")
+        if isinstance(value, list):
+            push("[")
+            for i, item in enumerate(value):
+                if i:
+                    push(", ")
+                push(_dumps(item))
+                if size[0] >= chunk_size:
+                    yield "".join(buffer)
+                    del buffer[:]
+                    size[0] = 0
+            push("]")
+        else:
+            push(_dumps(value))
+        if size[0] >= chunk_size:
+            yield "".join(buffer)
+            del buffer[:]
+            size[0] = 0
+    push("}")
+    yield "".join(buffer)
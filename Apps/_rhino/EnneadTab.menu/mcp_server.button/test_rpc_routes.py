@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Tests and load test for rpc_routes, run outside Rhino:
+
+    python test_rpc_routes.py
+
+A FakeDocumentModel stands in for the Rhino document, and _FakeUiThread
+for Rhino.RhinoApp.InvokeOnUiThread: one thread that runs posted calls in
+order while the caller waits, the way the listener waits on Rhino.
+
+unit_test() checks routing, batching, pagination, projection and that the
+chunked encoder writes the same bytes as json.dumps. benchmark() times a
+client listing a large model and reading many objects, old style against
+paged/projected and batched.
+"""
+
+import json
+import threading
+import time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+import rpc_routes
+
+
+class FakeDocumentModel(object):
+    """In-memory document with the same fields as RhinoDocumentModel."""
+
+    OBJECT_FIELDS = ("id", "name", "layer", "type")
+    LAYER_FIELDS = ("name", "visible", "locked", "color")
+    BLOCK_FIELDS = ("name", "instance_count")
+    TYPES = {"point": 1, "curve": 4, "surface": 8, "polysurface": 16, "mesh": 32, "block": 4096}
+
+    def __init__(self, object_count=1000, layer_count=50, block_count=20, lookup_cost=0.0):
+        type_codes = sorted(self.TYPES.values())
+        self.layers = ["Layer {:03d}".format(i) for i in range(layer_count)]
+        self.blocks = ["Block {:03d}".format(i) for i in range(block_count)]
+        self.objects = []
+        self.attributes = {}
+        for i in range(object_count):
+            obj_id = "00000000-0000-0000-0000-{:012d}".format(i)
+            self.objects.append(obj_id)
+            self.attributes[obj_id] = {
+                "name": "Object {}".format(i) if i % 3 else "",
+                "layer": self.layers[i % layer_count],
+                "type": type_codes[i % len(type_codes)],
+            }
+        # simulated cost of one rhinoscriptsyntax attribute lookup
+        self.lookup_cost = lookup_cost
+        self.lookups = 0
+
+    def _lookup(self, obj_id, key):
+        self.lookups += 1
+        if self.lookup_cost:
+            deadline = time.time() + self.lookup_cost
+            while time.time() < deadline:
+                pass
+        return self.attributes[obj_id][key]
+
+    def object_categories(self):
+        return list(self.TYPES.keys())
+
+    def object_ids(self, category):
+        if not category:
+            return list(self.objects)
+        code = self.TYPES.get(category)
+        if code is None:
+            return None
+        return [x for x in self.objects if self.attributes[x]["type"] == code]
+
+    def object_row(self, obj_id, fields):
+        row = {}
+        for field in fields:
+            row[field] = obj_id if field == "id" else self._lookup(obj_id, field)
+        return row
+
+    def layer_names(self):
+        return list(self.layers)
+
+    def layer_row(self, name, fields):
+        values = {"name": name, "visible": True, "locked": False, "color": [0, 0, 0]}
+        return dict((field, values[field]) for field in fields)
+
+    def block_names(self):
+        return list(self.blocks)
+
+    def block_row(self, name, fields):
+        values = {"name": name, "instance_count": 3}
+        return dict((field, values[field]) for field in fields)
+
+
+class _FakeUiThread(object):
+    """Runs posted calls on one thread, the caller blocks until its call is done."""
+
+    def __init__(self, hop_cost=0.0):
+        # time Rhino takes to pick a posted call off its message loop
+        self.hop_cost = hop_cost
+        self.hops = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            func, done = self._queue.get()
+            if func is None:
+                return
+            if self.hop_cost:
+                time.sleep(self.hop_cost)
+            func()
+            done.set()
+
+    def invoke(self, func):
+        self.hops += 1
+        done = threading.Event()
+        self._queue.put((func, done))
+        done.wait()
+
+    def stop(self):
+        self._queue.put((None, None))
+
+
+class _Direct(object):
+    """UI thread stand-in that runs the call in place."""
+
+    hops = 0
+
+    def invoke(self, func):
+        self.hops += 1
+        func()
+
+
+def make_router(model):
+    router = rpc_routes.Router()
+    rpc_routes.add_model_routes(router, model)
+    router.add("element/*/parameters",
+               lambda data, args: dict(model.object_row(args[0], model.OBJECT_FIELDS)), methods=("GET",))
+    router.add("echo", lambda data, args: {"data": data, "args": args})
+    return router
+
+
+def serve(router, ui, path, method="GET", body="", qs=""):
+    """One request the way rhino_rpc_server handles it: route on the UI thread, encode after."""
+    holder = [None, None]
+
+    def do_on_ui():
+        holder[0], holder[1] = router.handle(path, method, body, rpc_routes.parse_query(qs))
+    ui.invoke(do_on_ui)
+    return holder[1], "".join(rpc_routes.iter_json_chunks(holder[0]))
+
+
+def _legacy_elements(model, category=""):
+    """Response of the old _handle_elements: every row, every field."""
+    ids = model.object_ids(category.lower())
+    elements = []
+    for obj_id in ids:
+        elements.append(model.object_row(obj_id, model.OBJECT_FIELDS))
+    return {"count": len(elements), "category_filter": category or "all", "elements": elements}
+
+
+def unit_test():
+    model = FakeDocumentModel(object_count=1003)
+    router = make_router(model)
+
+    # query strings are url-decoded, the body wins over the query
+    assert rpc_routes.parse_query("?fields=id%2Cname&a=b+c") == {"fields": "id,name", "a": "b c"}
+    status, text = serve(router, _Direct(), "/enneadtab/echo/x/y", "POST", '{"a": 2}', "?a=1&b=1")
+    assert status == 200 and json.loads(text) == {"data": {"a": 2, "b": "1"}, "args": ["x", "y"]}
+
+    # routing, methods and wildcards
+    assert router.dispatch("/enneadtab/nothing", "GET", {})[1] == 404
+    assert router.dispatch("/other/status", "GET", {})[1] == 404
+    assert router.dispatch("/enneadtab/batch", "GET", {})[1] == 404
+    result, status = router.dispatch("/enneadtab/element/{}/parameters/".format(model.objects[5]), "GET", {})
+    assert status == 200 and result["id"] == model.objects[5]
+    assert router.dispatch("/enneadtab/element/x/parameters", "POST", {})[1] == 404
+
+    # no limit: the old response plus the paging keys
+    result, status = router.dispatch("/enneadtab/elements", "GET", {"category": "Curve"})
+    legacy = _legacy_elements(model, "Curve")
+    assert status == 200 and result["next_cursor"] is None
+    for key in legacy:
+        assert result[key] == legacy[key], key
+    result, status = router.dispatch("/enneadtab/elements", "GET", {"category": "nope"})
+    assert status == 200 and "Unknown category" in result["error"]
+
+    # pages with a projection, walked by cursor
+    model.lookups = 0
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": "100", "fields": "id,name"}
+        if cursor:
+            params["cursor"] = cursor
+        result, status = router.dispatch("/enneadtab/elements", "GET", params)
+        assert status == 200 and result["count"] == 1003
+        assert all(sorted(row) == ["id", "name"] for row in result["elements"])
+        seen.extend(row["id"] for row in result["elements"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == model.objects
+    assert model.lookups == 1003  # only "name" was looked up
+
+    # a cursor survives an object being deleted before it
+    page, cursor = rpc_routes.paginate(model.objects, None, 10)
+    keys = model.objects[1:]
+    assert rpc_routes.paginate(keys, cursor, 10)[0] == model.objects[10:20]
+    assert router.dispatch("/enneadtab/elements", "GET", {"cursor": "3:gone"})[1] == 410
+    assert router.dispatch("/enneadtab/elements", "GET", {"fields": "id,colour"})[1] == 400
+    assert router.dispatch("/enneadtab/elements", "GET", {"limit": "zero"})[1] == 400
+    assert router.dispatch("/enneadtab/layers", "GET", {"fields": ["name"]})[0]["layers"][0] == {"name": "Layer 000"}
+
+    # batch: one hop, one response per call, in order
+    ui = _FakeUiThread()
+    calls = [{"path": "/enneadtab/element/{}/parameters".format(obj_id)} for obj_id in model.objects[:50]]
+    calls.append({"path": "/enneadtab/batch", "method": "POST"})
+    calls.append({"path": "/enneadtab/layers", "query": "?limit=2&fields=name"})
+    calls.append({"path": "/enneadtab/missing"})
+    status, text = serve(ui=ui, router=router, path="/enneadtab/batch", method="POST",
+                         body=json.dumps({"requests": calls}))
+    result = json.loads(text)
+    assert status == 200 and ui.hops == 1 and result["count"] == 53
+    assert [r["body"]["id"] for r in result["responses"][:50]] == model.objects[:50]
+    assert result["responses"][50]["status"] == 400
+    assert result["responses"][51]["body"]["layers"] == [{"name": "Layer 000"}, {"name": "Layer 001"}]
+    assert result["responses"][52]["status"] == 404
+    status, text = serve(ui=ui, router=router, path="/enneadtab/batch", method="POST",
+                         body=json.dumps({"requests": calls[50:], "stop_on_error": True}))
+    assert json.loads(text)["count"] == 1
+    ui.stop()
+
+    # chunked encoding writes exactly what json.dumps writes
+    full = _legacy_elements(model)
+    chunks = list(rpc_routes.iter_json_chunks(full, chunk_size=4096))
+    assert len(chunks) > 1 and "".join(chunks) == json.dumps(full, default=str)
+    for value in ({}, {"a": []}, {"a": [1, {"b": None}], "c": "d"}, [1, 2], {1: "x"}):
+        assert "".join(rpc_routes.iter_json_chunks(value, 1)) == json.dumps(value, default=str)
+    print("rpc routes: OK")
+
+
+def benchmark(object_count=100000, lookups=500, lookup_cost=0.00001, hop_cost=0.002):
+    """Client work against a large fake model, old style versus new.
+
+    lookup_cost and hop_cost stand in for one rhinoscriptsyntax call and one
+    InvokeOnUiThread round trip; both are guesses, the ratios are the point.
+    """
+    model = FakeDocumentModel(object_count, lookup_cost=lookup_cost)
+    router = make_router(model)
+    ui = _FakeUiThread(hop_cost)
+    results = {}
+
+    # 1. list every object id: one full dump versus id-only pages
+    t_start = time.time()
+    text = json.dumps(_legacy_elements(model), default=str)
+    results["list_legacy"] = time.time() - t_start
+    legacy_size = len(text)
+
+    t_start = time.time()
+    ids = []
+    cursor = None
+    page_size = 0
+    while True:
+        qs = "?limit=5000&fields=id" + ("&cursor=" + cursor if cursor else "")
+        status, text = serve(router, ui, "/enneadtab/elements", qs=qs)
+        page = json.loads(text)
+        page_size = max(page_size, len(text))
+        ids.extend(row["id"] for row in page["elements"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    results["list_paged"] = time.time() - t_start
+    assert len(ids) == object_count
+
+    # 2. read attributes of many objects: one request each versus one batch
+    targets = ids[:lookups]
+    hops_before = ui.hops
+    t_start = time.time()
+    for obj_id in targets:
+        serve(router, ui, "/enneadtab/element/{}/parameters".format(obj_id))
+    results["reads_single"] = time.time() - t_start
+    single_hops = ui.hops - hops_before
+
+    hops_before = ui.hops
+    t_start = time.time()
+    body = json.dumps({"requests": [{"path": "/enneadtab/element/{}/parameters".format(x)} for x in targets]})
+    serve(router, ui, "/enneadtab/batch", "POST", body)
+    results["reads_batch"] = time.time() - t_start
+    batch_hops = ui.hops - hops_before
+    ui.stop()
+
+    print("{} objects, {}s per attribute lookup, {}s per UI-thread hop".format(object_count, lookup_cost, hop_cost))
+    print("  list all ids, one dump:      {:.3f}s  {:.1f}MB response".format(results["list_legacy"], legacy_size / 1e6))
+    print("  list all ids, paged fields=id: {:.3f}s  {:.1f}MB largest page".format(results["list_paged"], page_size / 1e6))
+    print("  read {} objects one by one:  {:.3f}s  {} hops".format(lookups, results["reads_single"], single_hops))
+    print("  read {} objects in a batch:  {:.3f}s  {} hop".format(lookups, results["reads_batch"], batch_hops))
+    return results
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
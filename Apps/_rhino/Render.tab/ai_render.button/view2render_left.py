@@ -2031,17 +2031,18 @@ class AiRenderForm(Eto.Forms.Form):
         scroll.Content = grid
         dlg.Content = scroll
 
-        # Background-fill thumbnails from cache (downloads on miss).
+        # Background-fill thumbnails from cache (downloads on miss, a few
+        # at a time on the shared keep-alive client).
         def fill_worker(state):
-            for item, iv in tiles:
-                try:
-                    path = AI_RENDER.get_or_cache_demo_style_image(
-                        item["url"], item["filename"])
-                    bmp = G.bitmap_from_path(path, 160, 100)
-                    if bmp is not None:
-                        self._invoke_ui(lambda im=iv, b=bmp: setattr(im, "Image", b))
-                except Exception:
-                    continue
+            def show(index, path):
+                iv = tiles[index][1]
+                bmp = G.bitmap_from_path(path, 160, 100)
+                if bmp is not None:
+                    self._invoke_ui(lambda im=iv, b=bmp: setattr(im, "Image", b))
+            try:
+                AI_RENDER.cache_demo_style_images([item for item, _iv in tiles], on_cached=show)
+            except Exception as ex:
+                _trace("worker.fill_styles SWALLOWED {}".format(ex))
         System.Threading.ThreadPool.QueueUserWorkItem(
             System.Threading.WaitCallback(fill_worker))
 
@@ -69,6 +69,10 @@ def add_hook():
 
     
     Rhino.RhinoApp.Closing += event_func_update_r8_rui
+
+    # dump folder cleanup and backups run while Rhino is idle
+    from EnneadTab import MAINTENANCE
+    MAINTENANCE.attach_to_rhino()
 ###################################################
 def action_update_timesheet(doc):
     if doc.Path:
@@ -27,6 +27,7 @@ import json
 import os
 import time
 import shutil
+import threading
 import uuid
 
 # Optional .NET imports -- only present in IronPython hosts (Revit/Rhino).
@@ -49,7 +50,7 @@ from EnneadTab import SOUND, FOLDER  # noqa: F401 -- kept for callers
 from EnneadTab.AI._common import (
     RENDER_URL, AIRequestError,
     post_json, get_json, post_multipart, post_multipart_raw,
-    download_url_to_file,
+    download_url_to_file, map_concurrent, PREFETCH_WORKERS,
 )
 
 
@@ -109,10 +110,11 @@ def get_render_presets(token=None):
     """Fetch rendering style presets from /api/create/image (GET).
 
     Returns list of {name, prompt, category, description}. Empty on failure.
+    The last list is cached on disk and revalidated with its ETag.
     """
     url = "{}/api/create/image".format(RENDER_URL)
     try:
-        data = get_json(url, token=token, timeout_ms=10000)
+        data = get_json(url, token=token, timeout_ms=10000, cache=True)
         if data.get("ok") and isinstance(data.get("prompts"), list):
             return data["prompts"]
     except Exception:
@@ -286,7 +288,7 @@ def get_demo_style_images(token, timeout_ms=10000):
     """
     url = "{}/api/demo-images".format(RENDER_URL)
     try:
-        data = get_json(url, token=token, timeout_ms=timeout_ms)
+        data = get_json(url, token=token, timeout_ms=timeout_ms, cache=True)
     except AIRequestError:
         return []
     out = []
@@ -322,25 +324,46 @@ def get_or_cache_demo_style_image(url, filename=None, max_age_days=30):
         raise
 
 
+def cache_demo_style_images(items, on_cached=None, max_workers=PREFETCH_WORKERS):
+    """Cache every style image on a small pool of download threads.
+
+    on_cached(index, path) is called from the pool thread as each image is
+    ready, path None when it failed. Returns the paths in item order.
+    """
+    def fetch(pair):
+        index, item = pair
+        try:
+            path = get_or_cache_demo_style_image(item["url"], item.get("filename"))
+        except Exception:
+            path = None
+        if on_cached:
+            try:
+                on_cached(index, path)
+            except Exception:
+                pass
+        return path
+    return map_concurrent(fetch, list(enumerate(items)), max_workers=max_workers)
+
+
 def prefetch_demo_style_images(token, max_count=None, progress_callback=None):
     """Background-warm the local style cache. Call on dialog open."""
     items = get_demo_style_images(token)
     if max_count:
         items = items[:max_count]
     total = len(items)
-    out = []
-    for i, item in enumerate(items, 1):
-        try:
-            item["cached_path"] = get_or_cache_demo_style_image(item["url"], item.get("filename"))
-        except Exception:
-            item["cached_path"] = None
-        out.append(item)
-        if progress_callback:
-            try:
-                progress_callback(i, total)
-            except Exception:
-                pass
-    return out
+    done = [0]
+    lock = threading.Lock()
+
+    def on_cached(index, path):
+        with lock:
+            done[0] += 1
+            if progress_callback:
+                progress_callback(done[0], total)
+
+    paths = cache_demo_style_images(items, on_cached)
+    for item, path in zip(items, paths):
+        item["cached_path"] = path
+    return items
 
 
 # =====================================================================
@@ -433,7 +456,8 @@ def list_gallery_index_with_token(token, limit=200, offset=0, timeout_ms=15000):
         return []
     url = "{}/api/gallery/index?limit={}&offset={}".format(RENDER_URL, int(limit), int(offset))
     try:
-        data = get_json(url, token=token, timeout_ms=timeout_ms)
+        # revalidated copy: an unchanged page costs a 304, not the thumbnails again
+        data = get_json(url, token=token, timeout_ms=timeout_ms, cache=True)
     except AIRequestError as e:
         _lib_trace("with_token: AIRequestError offset={} {}".format(offset, str(e)[:160]))
         return []
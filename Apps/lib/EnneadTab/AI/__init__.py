@@ -2,7 +2,7 @@
 """EnneadTab AI package.
 
 Submodules (all proxied through enneadtab.com / ennead-ai.com):
-- _common      Shared HTTP transport (.NET WebRequest + urllib fallback), AIRequestError
+- _common      Shared keep-alive HTTP client (.NET WebRequest / http.client), AIRequestError
 - AI_CHAT      Chat completions + prompt improvement + spell check
 - AI_TRANSLATE Text translation
 - AI_RENDER    Image/video render API + cloud Gallery + render-job queue + style-ref library
@@ -54,6 +54,7 @@ from EnneadTab.AI.AI_RENDER import (  # noqa: F401
     # Style-reference library + cache
     get_demo_style_images,
     get_or_cache_demo_style_image,
+    cache_demo_style_images,
     prefetch_demo_style_images,
     # Saved prompts
     list_prompts_with_token,
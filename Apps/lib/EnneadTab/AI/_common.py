@@ -3,7 +3,14 @@
 """Shared HTTP transport for the EnneadTab.AI submodules.
 
 IronPython 2.7 (Revit/Rhino) -- uses .NET HttpWebRequest because urllib2's SSL
-is broken inside the host process. CPython 3.x -- uses urllib.
+is broken inside the host process. CPython 3.x -- uses http.client.
+
+Every call goes through one shared HttpClient (get_client()) that keeps
+connections alive between calls, asks for gzip, resumes interrupted
+downloads with Range requests and, for the GET endpoints that opt in,
+revalidates an on-disk copy of the response with ETag / Last-Modified.
+map_concurrent() runs independent calls (style image prefetch) on a small
+bounded pool instead of one after another.
 
 All AI calls are proxied through enneadtab.com or ennead-ai.com. The desktop
 Bearer token (issued by EnneadTabHome / .desktop_auth_token.sexyDuck) is
@@ -12,9 +19,14 @@ the Vercel side.
 """
 
 import binascii
+import hashlib
+import io
 import json
 import os
 import re
+import threading
+import time
+import zlib
 
 
 # Public service URLs.
@@ -25,19 +37,24 @@ RENDER_URL = "https://ennead-ai.com"       # Image/video render, gallery, prompt
 # --- Runtime detection ---
 _USE_DOTNET = False
 try:
+    import System # pyright: ignore
     from System.Net import WebRequest, WebException, ServicePointManager, SecurityProtocolType # pyright: ignore
-    from System.IO import StreamReader # pyright: ignore
+    from System.Net import DecompressionMethods # pyright: ignore
+    from System.IO import StreamReader, FileStream, FileMode # pyright: ignore
     from System.Text import Encoding # pyright: ignore
     _USE_DOTNET = True
 except ImportError:
     WebException = None  # sentinel for CPython branches
 
 if not _USE_DOTNET:
+    import select
+    import socket
     try:
-        from urllib.request import urlopen, Request
-        from urllib.error import HTTPError
+        import http.client as httplib
+        from urllib.parse import urlsplit, urljoin
     except ImportError:
-        from urllib2 import urlopen, Request, HTTPError
+        import httplib
+        from urlparse import urlsplit, urljoin
 
 
 class AIRequestError(Exception):
@@ -131,106 +148,36 @@ def _status_from_exception(e):
     return None
 
 
-# --- HTTP POST: JSON body ---
-
-def post_json(url, payload_str, token, timeout_ms=120000):
-    if _USE_DOTNET:
-        return _post_json_dotnet(url, payload_str, token, timeout_ms)
-    return _post_json_urllib(url, payload_str, token, timeout_ms)
-
+# --- Shared client: keep-alive connections, gzip, response cache ---
 
-def _post_json_dotnet(url, payload_str, token, timeout_ms):
-    try:
-        ServicePointManager.SecurityProtocol = SecurityProtocolType.Tls12
-        request = WebRequest.Create(url)
-        request.Method = "POST"
-        request.ContentType = "application/json"
-        request.Headers.Add("Authorization", "Bearer {}".format(_safe_token(token)))
-        request.Timeout = timeout_ms
+# Idle connections kept per host. .NET only allows 2 per host by default,
+# which would also cap map_concurrent at 2 downloads in flight.
+MAX_CONNECTIONS_PER_HOST = 6
 
-        body_bytes = Encoding.UTF8.GetBytes(payload_str)
-        request.ContentLength = body_bytes.Length
-        req_stream = request.GetRequestStream()
-        req_stream.Write(body_bytes, 0, body_bytes.Length)
-        req_stream.Close()
-
-        response = request.GetResponse()
-        # StreamReader without an explicit encoding uses Encoding.Default, which
-        # on .NET Framework (IronPython's host) is the Windows ANSI code page --
-        # any non-Latin-1 byte (UTF-8 multibyte sequences for e-acute, c-cedilla, Chinese chars, etc.)
-        # then triggers IronPython's "'unknown' codec can't decode byte 0xNN".
-        # Always pass Encoding.UTF8 explicitly. (2026-04-21 Shorten failure.)
-        reader = StreamReader(response.GetResponseStream(), Encoding.UTF8)
-        result_text = reader.ReadToEnd()
-        reader.Close()
-        response.Close()
-
-        return json.loads(result_text)
-    except Exception as e:
-        raise AIRequestError(str(e), status_code=_status_from_exception(e))
+# Worker threads for map_concurrent (style image prefetch).
+PREFETCH_WORKERS = 4
 
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+_READ_CHUNK = 65536
 
-def _post_json_urllib(url, payload_str, token, timeout_ms):
-    try:
-        req = Request(url)
-        req.add_header("Content-Type", "application/json")
-        req.add_header("Authorization", "Bearer {}".format(_safe_token(token)))
-        response = urlopen(req, payload_str.encode("utf-8"), timeout=timeout_ms // 1000)
-        resp_body = response.read()
-        if isinstance(resp_body, bytes):
-            resp_body = resp_body.decode("utf-8")
-        return json.loads(resp_body)
-    except HTTPError as e:
-        raise AIRequestError(str(e), status_code=e.code)
-    except Exception as e:
-        raise AIRequestError(str(e))
 
+def _replace_file(source, target):
+    """os.replace is not available on IronPython 2.7."""
+    if os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
 
-# --- HTTP GET: JSON body ---
 
-def get_json(url, token=None, timeout_ms=15000):
-    if _USE_DOTNET:
-        try:
-            ServicePointManager.SecurityProtocol = SecurityProtocolType.Tls12
-            request = WebRequest.Create(url)
-            request.Method = "GET"
-            request.Timeout = timeout_ms
-            if token:
-                request.Headers.Add("Authorization", "Bearer {}".format(_safe_token(token)))
-            response = request.GetResponse()
-            reader = StreamReader(response.GetResponseStream(), Encoding.UTF8)
-            try:
-                text = reader.ReadToEnd()
-            finally:
-                reader.Close()
-                response.Close()
-            return json.loads(text)
-        except Exception as e:
-            raise AIRequestError(str(e), status_code=_status_from_exception(e))
-    else:
-        try:
-            req = Request(url)
-            if token:
-                req.add_header("Authorization", "Bearer {}".format(_safe_token(token)))
-            resp = urlopen(req, timeout=timeout_ms // 1000)
-            try:
-                text = resp.read()
-                if isinstance(text, bytes):
-                    text = text.decode("utf-8")
-            finally:
-                resp.close()
-            return json.loads(text)
-        except HTTPError as e:
-            raise AIRequestError(str(e), status_code=e.code)
-        except Exception as e:
-            raise AIRequestError(str(e))
+def _http_cache_dir():
+    appdata = os.environ.get("APPDATA") or os.environ.get("USERPROFILE") or os.path.expanduser("~")
+    return os.path.join(appdata, "EnneadTab", "ai_http_cache")
 
 
-# --- HTTP POST: multipart/form-data, JSON response ---
-
-def post_multipart(url, fields, files, token, timeout_ms=120000):
+def _multipart_body(fields, files):
     """fields: dict of {name: value}.
        files: list of (field_name, filename, file_bytes, content_type).
+    Returns (body bytes, content type header).
     """
     boundary = "----EnneadTabBoundary{}".format(_rand_hex(16))
     body_parts = []
@@ -250,50 +197,599 @@ def post_multipart(url, fields, files, token, timeout_ms=120000):
         body_parts.append(file_bytes)
     body_parts.append("--{}--".format(boundary).encode("utf-8"))
     body_parts.append(b"")
-    body = b"\r\n".join(body_parts)
-    content_type = "multipart/form-data; boundary={}".format(boundary)
+    return b"\r\n".join(body_parts), "multipart/form-data; boundary={}".format(boundary)
 
-    if _USE_DOTNET:
-        return _post_multipart_dotnet(url, body, content_type, token, timeout_ms)
-    return _post_multipart_urllib(url, body, content_type, token, timeout_ms)
 
+class ResponseCache(object):
+    """On-disk copies of GET responses, revalidated with ETag / Last-Modified.
 
-def _post_multipart_dotnet(url, body, content_type, token, timeout_ms):
-    try:
-        import System # pyright: ignore
+    One JSON file per URL and token: {"url", "etag", "last_modified", "text"}.
+    The token only goes into the file name hash, so two accounts on one
+    machine never read each other's gallery and no token is written to disk.
+    Tokens rotate, so entries untouched for max_age_days are pruned once
+    per session.
+    """
+
+    def __init__(self, folder, max_age_days=14):
+        self.folder = folder
+        self.max_age_days = max_age_days
+        self._pruned = False
+
+    def _path(self, url, token):
+        key = u"{}\n{}".format(to_unicode(url), to_unicode(_safe_token(token)))
+        return os.path.join(self.folder, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url, token=None):
+        path = self._path(url, token)
+        if not os.path.exists(path):
+            return None
+        try:
+            with io.open(path, "r", encoding="utf-8") as f:
+                entry = json.loads(f.read())
+        except Exception:
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url, token, etag, last_modified, text):
+        if not os.path.exists(self.folder):
+            try:
+                os.makedirs(self.folder)
+            except OSError:
+                if not os.path.isdir(self.folder):
+                    raise
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+        path = self._path(url, token)
+        temp_path = "{}.{}.tmp".format(path, _rand_hex(4))
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "text": to_unicode(text)}
+        with io.open(temp_path, "w", encoding="utf-8") as f:
+            f.write(to_unicode(json.dumps(entry)))
+        _replace_file(temp_path, path)
+
+    def touch(self, url, token=None):
+        try:
+            os.utime(self._path(url, token), None)
+        except OSError:
+            pass
+
+    def prune(self, max_age_days=None):
+        """Remove entries older than max_age_days, all of them with 0."""
+        if max_age_days is None:
+            max_age_days = self.max_age_days
+        if not os.path.exists(self.folder):
+            return
+        cutoff = time.time() - max_age_days * 86400
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if os.path.getmtime(path) <= cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        self.prune(0)
+
+
+# --- Transport: CPython, pooled http.client connections ---
+
+class _ConnectionPool(object):
+    """Idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self, max_idle):
+        self.max_idle = max_idle
+        self.opened = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, timeout_sec):
+        """Returns (connection, reused)."""
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle and conn is None:
+                conn = idle.pop()
+                if self._is_dropped(conn):
+                    conn.close()
+                    conn = None
+        if conn is not None:
+            conn.timeout = timeout_sec
+            conn.sock.settimeout(timeout_sec)
+            return conn, True
+        scheme, host, port = key
+        connection_class = httplib.HTTPSConnection if scheme == "https" else httplib.HTTPConnection
+        with self._lock:
+            self.opened += 1
+        return connection_class(host, port, timeout=timeout_sec), False
+
+    @staticmethod
+    def _is_dropped(conn):
+        # an idle connection has nothing to read unless the server closed it
+        if conn.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except Exception:
+            return True
+        return bool(readable)
+
+    def put(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle_lists, self._idle = list(self._idle.values()), {}
+        for idle in idle_lists:
+            for conn in idle:
+                conn.close()
+
+
+class _PooledResponse(object):
+    """A response whose connection goes back to the pool once it is read."""
+
+    def __init__(self, pool, key, conn, response):
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = dict((name.lower(), value) for name, value in response.getheaders())
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+
+    def read_text(self):
+        data = self._response.read()
+        if self.headers.get("content-encoding", "").lower() == "gzip":
+            data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+        return data.decode("utf-8")
+
+    def read_to_file(self, path, append=False):
+        """Stream the body to path. Returns the number of bytes written."""
+        written = 0
+        with open(path, "ab" if append else "wb") as f:
+            while True:
+                chunk = self._response.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool.put(self._key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+
+class _PooledTransport(object):
+
+    def __init__(self, max_connections):
+        self.pool = _ConnectionPool(max_connections)
+
+    def open(self, method, url, body, headers, timeout_ms, follow_redirects=True, decompress=True, on_sent=None):
+        headers = dict(headers)
+        if decompress:
+            headers["Accept-Encoding"] = "gzip"
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._send(method, url, body, headers, timeout_ms / 1000.0, on_sent)
+            if not (follow_redirects and method in ("GET", "HEAD") and response.status in _REDIRECT_CODES):
+                return response
+            location = response.headers.get("location")
+            response.read_text()
+            response.close()
+            if not location:
+                return response
+            target = urljoin(url, location)
+            if urlsplit(target).netloc != urlsplit(url).netloc:
+                headers.pop("Authorization", None)
+            url = target
+        raise AIRequestError("Too many redirects: {}".format(url))
+
+    def _send(self, method, url, body, headers, timeout_sec, on_sent):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        for attempt in (0, 1):
+            conn, reused = self.pool.get(key, timeout_sec)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                if on_sent:
+                    on_sent()
+                    on_sent = None
+                response = conn.getresponse()
+            except socket.timeout:
+                conn.close()
+                raise
+            except (httplib.HTTPException, socket.error):
+                conn.close()
+                # The server dropped an idle connection between the check
+                # and the request. Only GETs are sent again, a POST may have
+                # started a render already.
+                if reused and attempt == 0 and method in ("GET", "HEAD"):
+                    continue
+                raise
+            return _PooledResponse(self.pool, key, conn, response)
+
+    def close(self):
+        self.pool.close_all()
+
+
+# --- Transport: IronPython, .NET HttpWebRequest ---
+
+class _DotNetResponse(object):
+
+    def __init__(self, response):
+        self._response = response
+        try:
+            self.status = int(response.StatusCode)
+            self.reason = str(response.StatusDescription)
+        except Exception:
+            self.status = 200
+            self.reason = ""
+        self.headers = {}
+        for name in response.Headers.AllKeys:
+            self.headers[name.lower()] = response.Headers[name]
+
+    def read_text(self):
+        # StreamReader without an explicit encoding uses Encoding.Default, which
+        # on .NET Framework (IronPython's host) is the Windows ANSI code page --
+        # any non-Latin-1 byte (UTF-8 multibyte sequences for e-acute, c-cedilla, Chinese chars, etc.)
+        # then triggers IronPython's "'unknown' codec can't decode byte 0xNN".
+        # Always pass Encoding.UTF8 explicitly. (2026-04-21 Shorten failure.)
+        reader = StreamReader(self._response.GetResponseStream(), Encoding.UTF8)
+        try:
+            return reader.ReadToEnd()
+        finally:
+            reader.Close()
+
+    def read_to_file(self, path, append=False):
+        written = 0
+        stream = self._response.GetResponseStream()
+        fs = FileStream(path, FileMode.Append if append else FileMode.Create)
+        try:
+            buf = System.Array[System.Byte](bytearray(_READ_CHUNK))
+            while True:
+                n = stream.Read(buf, 0, buf.Length)
+                if n <= 0:
+                    break
+                fs.Write(buf, 0, n)
+                written += n
+        finally:
+            fs.Close()
+            stream.Close()
+        return written
+
+    def close(self):
+        # Closing returns the connection to its ServicePoint for reuse.
+        if self._response is not None:
+            self._response.Close()
+            self._response = None
+
+
+class _DotNetTransport(object):
+    """HttpWebRequest pools keep-alive connections per ServicePoint already,
+    the process wide settings only need to allow enough of them."""
+
+    def __init__(self, max_connections):
         ServicePointManager.SecurityProtocol = SecurityProtocolType.Tls12
+        if ServicePointManager.DefaultConnectionLimit < max_connections:
+            ServicePointManager.DefaultConnectionLimit = max_connections
+        # POSTs otherwise wait up to 350 ms for a "100 Continue" first
+        ServicePointManager.Expect100Continue = False
+
+    def open(self, method, url, body, headers, timeout_ms, follow_redirects=True, decompress=True, on_sent=None):
         request = WebRequest.Create(url)
-        request.Method = "POST"
-        request.ContentType = content_type
-        request.Headers.Add("Authorization", "Bearer {}".format(_safe_token(token)))
+        request.Method = method
         request.Timeout = timeout_ms
-        dotnet_bytes = System.Array[System.Byte](bytearray(body))
-        request.ContentLength = dotnet_bytes.Length
-        req_stream = request.GetRequestStream()
-        req_stream.Write(dotnet_bytes, 0, dotnet_bytes.Length)
-        req_stream.Close()
-        response = request.GetResponse()
-        reader = StreamReader(response.GetResponseStream(), Encoding.UTF8)
-        result_text = reader.ReadToEnd()
-        reader.Close()
-        response.Close()
-        return json.loads(result_text)
+        request.ReadWriteTimeout = timeout_ms
+        request.KeepAlive = True
+        request.AllowAutoRedirect = follow_redirects
+        if decompress:
+            request.AutomaticDecompression = DecompressionMethods.GZip | DecompressionMethods.Deflate
+        for name, value in headers.items():
+            lower = name.lower()
+            # restricted headers have their own properties
+            if lower == "content-type":
+                request.ContentType = value
+            elif lower == "range":
+                request.AddRange(System.Int64(int(value.split("=", 1)[1].rstrip("-"))))
+            elif lower == "if-modified-since":
+                request.IfModifiedSince = System.DateTime.Parse(value)
+            else:
+                request.Headers.Add(name, value)
+
+        if body is not None:
+            if not isinstance(body, System.Array[System.Byte]):
+                body = System.Array[System.Byte](bytearray(body))
+            request.ContentLength = body.Length
+            req_stream = request.GetRequestStream()
+            try:
+                req_stream.Write(body, 0, body.Length)
+            finally:
+                req_stream.Close()
+        if on_sent:
+            on_sent()
+
+        try:
+            response = request.GetResponse()
+        except WebException as e:
+            # 304 and error statuses come back as exceptions carrying the response
+            if e.Response is None:
+                raise
+            response = e.Response
+        return _DotNetResponse(response)
+
+    def close(self):
+        pass
+
+
+# --- Client ---
+
+class HttpClient(object):
+    """Keep-alive HTTP client shared by the AI wrappers. Thread safe.
+
+    Args:
+        max_connections (int): Idle connections kept per host.
+        cache_dir (str): Folder of the response cache, see get_json(cache=True).
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS_PER_HOST, cache_dir=None):
+        if _USE_DOTNET:
+            self._transport = _DotNetTransport(max_connections)
+        else:
+            self._transport = _PooledTransport(max_connections)
+        self.cache = ResponseCache(cache_dir or _http_cache_dir())
+        self.stats = {"requests": 0, "not_modified": 0, "resumed": 0}
+        self._stats_lock = threading.Lock()
+        self._download_locks = {}
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def encode_text(self, text):
+        """Request body from text, always UTF-8."""
+        if _USE_DOTNET:
+            return Encoding.UTF8.GetBytes(to_unicode(text))
+        return to_unicode(text).encode("utf-8")
+
+    def open(self, method, url, body=None, headers=None, token=None, timeout_ms=30000,
+             follow_redirects=True, decompress=True, on_sent=None):
+        """Send a request. The caller reads the response and closes it."""
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = "Bearer {}".format(_safe_token(token))
+        self._count("requests")
+        try:
+            return self._transport.open(method, url, body, headers, timeout_ms,
+                                        follow_redirects, decompress, on_sent)
+        except AIRequestError:
+            raise
+        except Exception as e:
+            raise AIRequestError(str(e), status_code=_status_from_exception(e))
+
+    def request_text(self, method, url, body=None, headers=None, token=None, timeout_ms=30000,
+                     follow_redirects=True, on_sent=None):
+        """Send a request and read the body. Returns (response, text).
+
+        Raises AIRequestError for error statuses and redirects that were
+        not followed, 304 is returned to the caller.
+        """
+        response = self.open(method, url, body, headers, token, timeout_ms,
+                             follow_redirects=follow_redirects, on_sent=on_sent)
+        try:
+            text = response.read_text()
+        except Exception as e:
+            raise AIRequestError(str(e), status_code=_status_from_exception(e))
+        finally:
+            response.close()
+        if response.status >= 400 or (response.status in _REDIRECT_CODES):
+            raise AIRequestError("HTTP Error {}: {}".format(response.status, response.reason),
+                                 status_code=response.status)
+        return response, text
+
+    def get_json(self, url, token=None, timeout_ms=15000, cache=False):
+        """GET a JSON endpoint.
+
+        With cache=True the last response is kept on disk and sent back as
+        If-None-Match / If-Modified-Since, so an unchanged list costs a 304.
+        Responses without a validator are not cached.
+        """
+        cached = self.cache.get(url, token) if cache else None
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response, text = self.request_text("GET", url, headers=headers, token=token, timeout_ms=timeout_ms)
+        if response.status == 304 and cached:
+            self._count("not_modified")
+            text = cached["text"]
+            self.cache.touch(url, token)
+        elif cache and response.status == 200:
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if etag or last_modified:
+                try:
+                    self.cache.put(url, token, etag, last_modified, text)
+                except Exception:
+                    pass  # a read-only cache folder must not fail the call
+        try:
+            return json.loads(text)
+        except Exception as e:
+            raise AIRequestError(str(e), status_code=response.status)
+
+    def _download_lock(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        with self._stats_lock:
+            lock = self._download_locks.get(key)
+            if lock is None:
+                lock = self._download_locks[key] = threading.Lock()
+        return lock
+
+    def download(self, url, dest_path, timeout_ms=30000, resume=True):
+        """Download url to dest_path through "<dest_path>.part".
+
+        An interrupted download leaves the .part file behind and the next
+        call asks for the rest with a Range request. If-Range makes the
+        server send the whole file again if it changed in between.
+        """
+        with self._download_lock(dest_path):
+            part_path = dest_path + ".part"
+            validator_path = part_path + ".validator"
+            offset = 0
+            headers = {}
+            if resume and os.path.exists(part_path) and os.path.exists(validator_path):
+                offset = os.path.getsize(part_path)
+                with io.open(validator_path, "r", encoding="utf-8") as f:
+                    validator = f.read().strip()
+                if offset and validator:
+                    headers["Range"] = "bytes={}-".format(offset)
+                    headers["If-Range"] = validator
+                else:
+                    offset = 0
+
+            response = self.open("GET", url, headers=headers, timeout_ms=timeout_ms, decompress=False)
+            try:
+                if response.status == 416 and offset:
+                    # the .part file is not a prefix of what the server has
+                    response.close()
+                    self._remove_partial(part_path)
+                    return self.download(url, dest_path, timeout_ms, resume=False)
+                if response.status >= 400:
+                    raise AIRequestError("HTTP Error {}: {}".format(response.status, response.reason),
+                                         status_code=response.status)
+                append = offset > 0 and response.status == 206
+                if append:
+                    self._count("resumed")
+                else:
+                    validator = response.headers.get("etag") or response.headers.get("last-modified") or ""
+                    with io.open(validator_path, "w", encoding="utf-8") as f:
+                        f.write(to_unicode(validator))
+                try:
+                    written = response.read_to_file(part_path, append)
+                except Exception as e:
+                    raise AIRequestError(str(e), status_code=_status_from_exception(e))
+            finally:
+                response.close()
+
+            expected = response.headers.get("content-length")
+            if expected is not None and int(expected) != written:
+                raise AIRequestError("Incomplete download: {} of {} bytes".format(written, expected))
+            _replace_file(part_path, dest_path)
+            self._remove_partial(part_path)
+            return dest_path
+
+    @staticmethod
+    def _remove_partial(part_path):
+        for name in (part_path, part_path + ".validator"):
+            if os.path.exists(name):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+    def close(self):
+        self._transport.close()
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client():
+    """The process wide HttpClient, created on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient()
+    return _CLIENT
+
+
+def map_concurrent(func, items, max_workers=PREFETCH_WORKERS):
+    """Call func(item) for every item on up to max_workers threads.
+
+    Returns the results in item order. If calls raised, the first failed
+    item's exception is raised after every call has finished.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    errors = []
+    cursor = [0]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                index = cursor[0]
+                cursor[0] += 1
+            if index >= len(items):
+                return
+            try:
+                results[index] = func(items[index])
+            except Exception as e:
+                with lock:
+                    errors.append((index, e))
+
+    threads = []
+    for i in range(min(max_workers, len(items))):
+        thread = threading.Thread(target=worker, name="EnneadTab-ai-http-{}".format(i))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise min(errors, key=lambda x: x[0])[1]
+    return results
+
+
+# --- HTTP POST: JSON body ---
+
+def post_json(url, payload_str, token, timeout_ms=120000):
+    client = get_client()
+    _, text = client.request_text("POST", url, client.encode_text(payload_str),
+                                  {"Content-Type": "application/json"}, token, timeout_ms)
+    try:
+        return json.loads(text)
     except Exception as e:
-        raise AIRequestError(str(e), status_code=_status_from_exception(e))
+        raise AIRequestError(str(e))
+
+
+# --- HTTP GET: JSON body ---
+
+def get_json(url, token=None, timeout_ms=15000, cache=False):
+    """GET a JSON endpoint. cache=True revalidates an on-disk copy, see HttpClient.get_json."""
+    return get_client().get_json(url, token=token, timeout_ms=timeout_ms, cache=cache)
 
 
-def _post_multipart_urllib(url, body, content_type, token, timeout_ms):
+# --- HTTP POST: multipart/form-data, JSON response ---
+
+def post_multipart(url, fields, files, token, timeout_ms=120000):
+    """fields: dict of {name: value}.
+       files: list of (field_name, filename, file_bytes, content_type).
+    """
+    body, content_type = _multipart_body(fields, files)
+    _, text = get_client().request_text("POST", url, body, {"Content-Type": content_type}, token, timeout_ms)
     try:
-        req = Request(url)
-        req.add_header("Content-Type", content_type)
-        req.add_header("Authorization", "Bearer {}".format(_safe_token(token)))
-        response = urlopen(req, body, timeout=timeout_ms // 1000)
-        resp_body = response.read()
-        if isinstance(resp_body, bytes):
-            resp_body = resp_body.decode("utf-8")
-        return json.loads(resp_body)
-    except HTTPError as e:
-        raise AIRequestError(str(e), status_code=e.code)
+        return json.loads(text)
     except Exception as e:
         raise AIRequestError(str(e))
 
@@ -305,94 +801,32 @@ def post_multipart_raw(url, fields, files, token, timeout_ms=180000, progress_ca
     (image render). 3xx redirects are mapped to status_code=401 so the
     caller's auth-recovery path fires.
     """
-    boundary = "----EnneadTabBoundary{}".format(_rand_hex(16))
-    body_parts = []
-    for name, value in fields.items():
-        body_parts.append("--{}".format(boundary).encode("utf-8"))
-        body_parts.append('Content-Disposition: form-data; name="{}"'.format(name).encode("utf-8"))
-        body_parts.append(b"")
-        body_parts.append(str(value).encode("utf-8") if not isinstance(value, bytes) else value)
-    for field_name, filename, file_bytes, ct in files:
-        body_parts.append("--{}".format(boundary).encode("utf-8"))
-        body_parts.append('Content-Disposition: form-data; name="{}"; filename="{}"'.format(field_name, filename).encode("utf-8"))
-        body_parts.append("Content-Type: {}".format(ct).encode("utf-8"))
-        body_parts.append(b"")
-        body_parts.append(file_bytes)
-    body_parts.append("--{}--".format(boundary).encode("utf-8"))
-    body_parts.append(b"")
-    body = b"\r\n".join(body_parts)
-    content_type_header = "multipart/form-data; boundary={}".format(boundary)
+    body, content_type = _multipart_body(fields, files)
 
     if progress_callback:
         progress_callback("Uploading image...")
 
-    if _USE_DOTNET:
-        try:
-            import System # pyright: ignore
-            ServicePointManager.SecurityProtocol = SecurityProtocolType.Tls12
-            request = WebRequest.Create(url)
-            request.Method = "POST"
-            request.ContentType = content_type_header
-            request.Headers.Add("Authorization", "Bearer {}".format(_safe_token(token)))
-            request.Timeout = timeout_ms
-            request.ReadWriteTimeout = timeout_ms
-            request.AllowAutoRedirect = False  # 307 to login page would mask 401
-
-            dotnet_bytes = System.Array[System.Byte](bytearray(body))
-            request.ContentLength = dotnet_bytes.Length
-            req_stream = request.GetRequestStream()
-            req_stream.Write(dotnet_bytes, 0, dotnet_bytes.Length)
-            req_stream.Close()
-
-            if progress_callback:
-                progress_callback("AI is generating your image...")
+    def on_sent():
+        if progress_callback:
+            progress_callback("AI is generating your image...")
 
-            response = request.GetResponse()
-            try:
-                status_code = int(response.StatusCode)
-            except Exception:
-                status_code = 200
-            if 300 <= status_code < 400:
-                try:
-                    response.Close()
-                except Exception:
-                    pass
-                raise AIRequestError(
-                    "Auth redirect ({}) -- token likely expired".format(status_code),
-                    status_code=401)
+    try:
+        # 307 to login page would mask 401
+        _, result_text = get_client().request_text(
+            "POST", url, body, {"Content-Type": content_type}, token, timeout_ms,
+            follow_redirects=False, on_sent=on_sent)
+    except AIRequestError as e:
+        if e.status_code in _REDIRECT_CODES:
+            raise AIRequestError(
+                "Auth redirect ({}) -- token likely expired".format(e.status_code),
+                status_code=401)
+        raise
 
-            reader = StreamReader(response.GetResponseStream(), Encoding.UTF8)
-            try:
-                result_text = reader.ReadToEnd()
-            finally:
-                reader.Close()
-                response.Close()
-
-            if not result_text or len(result_text) < 10:
-                raise AIRequestError(
-                    "Empty response from server (got {} bytes). Check auth token and server logs.".format(
-                        len(result_text or "")))
-            return result_text
-        except AIRequestError:
-            raise
-        except Exception as e:
-            raise AIRequestError(str(e), status_code=_status_from_exception(e))
-    else:
-        try:
-            req = Request(url)
-            req.add_header("Content-Type", content_type_header)
-            req.add_header("Authorization", "Bearer {}".format(_safe_token(token)))
-            if progress_callback:
-                progress_callback("AI is generating your image...")
-            response = urlopen(req, body, timeout=timeout_ms // 1000)
-            resp_body = response.read()
-            if isinstance(resp_body, bytes):
-                resp_body = resp_body.decode("utf-8")
-            return resp_body
-        except HTTPError as e:
-            raise AIRequestError(str(e), status_code=e.code)
-        except Exception as e:
-            raise AIRequestError(str(e))
+    if not result_text or len(result_text) < 10:
+        raise AIRequestError(
+            "Empty response from server (got {} bytes). Check auth token and server logs.".format(
+                len(result_text or "")))
+    return result_text
 
 
 # --- File downloader ---
@@ -400,47 +834,309 @@ def post_multipart_raw(url, fields, files, token, timeout_ms=180000, progress_ca
 def download_url_to_file(url, dest_path, timeout_ms=30000):
     """Download a URL to a local file. No auth header (used for public assets
     like the Ennead style-reference library). Returns dest_path on success.
+    Resumes an interrupted download of the same file.
     """
-    if _USE_DOTNET:
+    return get_client().download(url, dest_path, timeout_ms=timeout_ms)
+
+
+# --- Tests against a local stub server ---
+
+def _start_stub_server(latency=0.0):
+    """Threaded localhost server standing in for the proxy. Returns (server, base_url).
+
+    server.log holds (path, client port, headers) per request, so tests can
+    count connections and check what was sent.
+    """
+    import gzip
+    try:
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+        from socketserver import ThreadingMixIn
+    except ImportError:
+        from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+        from SocketServer import ThreadingMixIn
+
+    class StubServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # headers and body are separate writes, Nagle would hold the body
+        # back for the client's delayed ACK on a kept-alive connection
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+
+        def _json(self, data, etag=None):
+            body = json.dumps(data).encode("utf-8")
+            headers = {"Content-Type": "application/json"}
+            if etag:
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                    return
+                headers["ETag"] = etag
+            if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                buf = io.BytesIO()
+                with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as f:
+                    f.write(body)
+                body = buf.getvalue()
+                headers["Content-Encoding"] = "gzip"
+            self._send(200, body, headers)
+
+        def do_GET(self):
+            server = self.server
+            server.log.append((self.path, self.client_address[1], dict(self.headers.items())))
+            if server.latency:
+                time.sleep(server.latency)
+            path = self.path.split("?")[0]
+            if path == "/gallery":
+                self._json({"ok": True, "items": server.gallery}, etag=server.gallery_etag)
+            elif path == "/plain":
+                self._json({"ok": True, "text": u"café 建筑"})
+            elif path == "/redirect":
+                self._send(302, headers={"Location": "/plain"})
+            elif path == "/denied":
+                self._send(401)
+            elif path.startswith("/files/"):
+                data = server.files.get(path)
+                if data is None:
+                    self._send(404)
+                    return
+                etag = '"{}"'.format(hashlib.sha1(data).hexdigest()[:12])
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header and self.headers.get("If-Range") == etag:
+                    start = int(range_header.split("=")[1].rstrip("-"))
+                if start >= len(data):
+                    self._send(416)
+                    return
+                self.send_response(206 if start else 200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data) - start))
+                self.end_headers()
+                if server.break_next_download:
+                    # drop the connection halfway through the body
+                    server.break_next_download = False
+                    self.wfile.write(data[start:start + (len(data) - start) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(data[start:])
+            else:
+                self._send(404)
+
+        def do_POST(self):
+            server = self.server
+            server.log.append((self.path, self.client_address[1], dict(self.headers.items())))
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path == "/login-redirect":
+                self._send(307, headers={"Location": "/login"})
+                return
+            self._json({"ok": True, "echo": body.decode("utf-8", "replace"),
+                        "content_type": self.headers.get("Content-Type")})
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    server.log = []
+    server.latency = latency
+    server.gallery = [{"id": i, "prompt": "render {}".format(i)} for i in range(50)]
+    server.gallery_etag = '"v1"'
+    server.files = {}
+    server.break_next_download = False
+    server.bytes_sent = 0
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, "http://127.0.0.1:{}".format(server.server_address[1])
+
+
+def unit_test():
+    import shutil
+    import tempfile
+
+    server, base_url = _start_stub_server()
+    folder = tempfile.mkdtemp()
+    client = HttpClient(cache_dir=os.path.join(folder, "cache"))
+    try:
+        # keep-alive: many calls, one connection
+        for _ in range(5):
+            data = client.get_json(base_url + "/plain", token="abc\n")
+            assert data["text"] == u"café 建筑"
+        assert len(set(port for _, port, _ in server.log)) == 1
+        assert server.log[0][2].get("Authorization") == "Bearer abc"
+        assert "gzip" in server.log[0][2].get("Accept-Encoding")
+
+        # redirects are followed for GET, errors carry the status
+        assert client.get_json(base_url + "/redirect")["ok"]
         try:
-            import System # pyright: ignore
-            ServicePointManager.SecurityProtocol = SecurityProtocolType.Tls12
-            request = WebRequest.Create(url)
-            request.Method = "GET"
-            request.Timeout = timeout_ms
-            response = request.GetResponse()
+            client.get_json(base_url + "/denied")
+            raise AssertionError("expected AIRequestError")
+        except AIRequestError as e:
+            assert e.status_code == 401
+
+        # ETag revalidation: the second call is a 304 served from disk
+        url = base_url + "/gallery?limit=200&offset=0"
+        first = client.get_json(url, token="t1", cache=True)
+        second = client.get_json(url, token="t1", cache=True)
+        assert first == second and client.stats["not_modified"] == 1
+        assert server.log[-1][2].get("If-None-Match") == '"v1"'
+        client.get_json(url, token="t2", cache=True)  # another account, its own copy
+        assert "If-None-Match" not in server.log[-1][2]
+        server.gallery = server.gallery[:10]
+        server.gallery_etag = '"v2"'
+        assert len(client.get_json(url, token="t1", cache=True)["items"]) == 10
+        assert len(os.listdir(client.cache.folder)) == 2
+        client.cache.clear()
+        assert not os.listdir(client.cache.folder)
+
+        # POST bodies are UTF-8, multipart goes through the same client
+        echo = client.request_text("POST", base_url + "/echo", client.encode_text(u'{"q": "é"}'),
+                                   {"Content-Type": "application/json"})[1]
+        assert json.loads(json.loads(echo)["echo"]) == {"q": u"é"}
+        body, content_type = _multipart_body({"prompt": "x"}, [("image", "a.png", b"\x89PNG", "image/png")])
+        echo = json.loads(client.request_text("POST", base_url + "/echo", body, {"Content-Type": content_type})[1])
+        assert echo["content_type"] == content_type and 'filename="a.png"' in echo["echo"]
+        try:
+            client.request_text("POST", base_url + "/login-redirect", b"{}", follow_redirects=False)
+            raise AssertionError("expected AIRequestError")
+        except AIRequestError as e:
+            assert e.status_code == 307
+
+        # downloads resume after a dropped connection
+        payload = os.urandom(200000)
+        server.files["/files/style.jpg"] = payload
+        dest = os.path.join(folder, "style.jpg")
+        server.break_next_download = True
+        try:
+            client.download(base_url + "/files/style.jpg", dest)
+            raise AssertionError("expected AIRequestError")
+        except AIRequestError:
+            pass
+        assert not os.path.exists(dest) and os.path.getsize(dest + ".part") == 100000
+        client.download(base_url + "/files/style.jpg", dest)
+        assert server.log[-1][2].get("Range") == "bytes=100000-"
+        with open(dest, "rb") as f:
+            assert f.read() == payload
+        assert client.stats["resumed"] == 1 and not os.path.exists(dest + ".part")
+
+        # a file that changed in between is downloaded whole
+        server.break_next_download = True
+        try:
+            client.download(base_url + "/files/style.jpg", dest)
+        except AIRequestError:
+            pass
+        server.files["/files/style.jpg"] = payload[::-1]
+        client.download(base_url + "/files/style.jpg", dest)
+        with open(dest, "rb") as f:
+            assert f.read() == payload[::-1]
+
+        # bounded pool, results in order, first failure raised
+        assert map_concurrent(lambda x: x * 2, range(20), max_workers=4) == [x * 2 for x in range(20)]
+        try:
+            map_concurrent(lambda x: 1 // (x % 7), range(20), max_workers=4)
+            raise AssertionError("expected ZeroDivisionError")
+        except ZeroDivisionError:
+            pass
+        print("ai http client: OK")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def benchmark(calls=60, images=40, latency=0.02):
+    """Old one-connection-per-call transport against the shared client.
+
+    latency is the stub server's time per request. Localhost has no TLS
+    handshake, so the connection reuse gain here understates the real one.
+    """
+    import shutil
+    import tempfile
+    try:
+        from urllib.request import urlopen
+    except ImportError:
+        from urllib2 import urlopen
+
+    server, base_url = _start_stub_server(latency)
+    folder = tempfile.mkdtemp()
+    client = HttpClient(cache_dir=os.path.join(folder, "cache"))
+    results = {}
+    try:
+        server.gallery = [{"id": i, "prompt": "render {}".format(i), "thumbnailData": "x" * 2000}
+                          for i in range(200)]
+        url = base_url + "/gallery"
+
+        def timed(key, call):
+            server.bytes_sent = 0
+            t_start = time.time()
+            for _ in range(calls):
+                call()
+            results[key] = time.time() - t_start
+            results[key + "_bytes"] = server.bytes_sent
+
+        def legacy_get():
+            resp = urlopen(url, timeout=15)
             try:
-                stream = response.GetResponseStream()
-                fs = System.IO.FileStream(dest_path, System.IO.FileMode.Create)
-                try:
-                    buf = System.Array[System.Byte](bytearray(8192))
-                    while True:
-                        n = stream.Read(buf, 0, buf.Length)
-                        if n <= 0:
-                            break
-                        fs.Write(buf, 0, n)
-                finally:
-                    fs.Close()
-                    stream.Close()
+                json.loads(resp.read().decode("utf-8"))
             finally:
-                response.Close()
-            return dest_path
-        except Exception as e:
-            raise AIRequestError(str(e), status_code=_status_from_exception(e))
-    else:
-        try:
-            resp = urlopen(url, timeout=timeout_ms // 1000)
+                resp.close()
+
+        def keep_alive_get():
+            response = client.open("GET", url, decompress=False)
+            try:
+                json.loads(response.read_text())
+            finally:
+                response.close()
+
+        timed("legacy_get", legacy_get)
+        timed("keep_alive_get", keep_alive_get)
+        timed("client_get", lambda: client.get_json(url))
+        timed("client_get_cached", lambda: client.get_json(url, cache=True))
+
+        for i in range(images):
+            server.files["/files/{}.jpg".format(i)] = os.urandom(50000)
+
+        t_start = time.time()
+        for i in range(images):
+            resp = urlopen(base_url + "/files/{}.jpg".format(i), timeout=30)
             try:
-                with open(dest_path, "wb") as f:
-                    while True:
-                        chunk = resp.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
+                with open(os.path.join(folder, "legacy_{}.jpg".format(i)), "wb") as f:
+                    f.write(resp.read())
             finally:
                 resp.close()
-            return dest_path
-        except HTTPError as e:
-            raise AIRequestError(str(e), status_code=e.code)
-        except Exception as e:
-            raise AIRequestError(str(e))
+        results["legacy_images"] = time.time() - t_start
+
+        t_start = time.time()
+        map_concurrent(lambda i: client.download(base_url + "/files/{}.jpg".format(i),
+                                                 os.path.join(folder, "new_{}.jpg".format(i))),
+                       range(images))
+        results["client_images"] = time.time() - t_start
+
+        print("{} gallery GETs (200 items each), {} style images, {}s server latency".format(calls, images, latency))
+        for key, label in (("legacy_get", "urlopen per call:        "),
+                           ("keep_alive_get", "keep-alive, no gzip:      "),
+                           ("client_get", "keep-alive, gzip:         "),
+                           ("client_get_cached", "keep-alive, ETag 304s:    ")):
+            print("  {} {:.3f}s  {:>9} bytes".format(label, results[key], results[key + "_bytes"]))
+        print("  images, one after another: {:.3f}s".format(results["legacy_images"]))
+        print("  images, {} workers:         {:.3f}s".format(PREFETCH_WORKERS, results["client_images"]))
+        return results
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -76,12 +76,20 @@ __mcp_tools__ = [
     },
     {
         "function": "rgb_to_autocad_color_number",
-        "description": "Convert an RGB color to an AutoCAD color index number (1-255).",
+        "description": "Convert an RGB color to the nearest AutoCAD color index number (1-255).",
         "args": [
             {"name": "rgb_tuple", "type": "list", "description": "RGB color as [r, g, b] with values 0-255"}
         ],
         "returns": "int AutoCAD color number (1-255)"
     },
+    {
+        "function": "autocad_color_number_to_rgb",
+        "description": "Convert an AutoCAD color index number (1-255) to an RGB tuple.",
+        "args": [
+            {"name": "color_number", "type": "int", "description": "AutoCAD color number (1-255)"}
+        ],
+        "returns": "list of 3 ints [r, g, b]"
+    },
 ]
 
 import ENVIRONMENT
@@ -411,11 +419,139 @@ def get_color_template_data(template = None, worksheet = "HEALTHCARE"):
             
         return {"department_color_map": department_data, "program_color_map": program_data}
 
+# AutoCAD Color Index shades, 10-249 go round the hue wheel in 15 degree
+# steps, each hue at five values, solid on even and pastel on odd numbers
+_ACI_SHADE_VALUES = (255, 204, 153, 127, 76)
+_ACI_BASE_COLORS = {1: (255, 0, 0), 2: (255, 255, 0), 3: (0, 255, 0), 4: (0, 255, 255),
+                    5: (0, 0, 255), 6: (255, 0, 255), 7: (255, 255, 255), 8: (128, 128, 128),
+                    9: (192, 192, 192), 250: (51, 51, 51), 251: (80, 80, 80), 252: (105, 105, 105),
+                    253: (130, 130, 130), 254: (190, 190, 190), 255: (255, 255, 255)}
+# lookups remembered before the memo is dropped, the batch exports repeat colors a lot
+ACI_CACHE_LIMIT = 65536
+
+
+def _hue_components(hue):
+    """RGB of a fully saturated hue in degrees, each 0.0-1.0."""
+    sector, remain = divmod(hue / 60.0, 1)
+    rising, falling = remain, 1 - remain
+    return [(1, rising, 0), (falling, 1, 0), (0, 1, rising),
+            (0, falling, 1), (rising, 0, 1), (1, 0, falling)][int(sector) % 6]
+
+
+def _build_aci_palette():
+    palette = [None] * 256
+    for index, rgb in _ACI_BASE_COLORS.items():
+        palette[index] = rgb
+    for index in range(10, 250):
+        components = _hue_components((index // 10 - 1) * 15)
+        value = _ACI_SHADE_VALUES[(index % 10) // 2]
+        if index % 2 == 0:
+            palette[index] = tuple(int(value * c) for c in components)
+        else:
+            palette[index] = tuple(int(value * (0.5 + 0.5 * c)) for c in components)
+    return palette
+
+
+# ACI_PALETTE[n] is the RGB of AutoCAD color n, 0 (ByBlock) has none
+ACI_PALETTE = _build_aci_palette()
+
+_SRGB_TO_LINEAR = [((c / 255.0 + 0.055) / 1.055) ** 2.4 if c > 10 else c / 255.0 / 12.92 for c in range(256)]
+
+
+def _lab_f(t):
+    return t ** (1.0 / 3) if t > 0.008856 else 7.787 * t + 16.0 / 116
+
+
+def rgb_to_lab(rgb_tuple):
+    """Convert an sRGB color to CIELAB (D65).
+
+    Args:
+        rgb_tuple (tuple): RGB color as (r, g, b) tuple with values 0-255
+
+    Returns:
+        tuple: (L, a, b)
+    """
+    r, g, b = [_SRGB_TO_LINEAR[max(0, min(255, int(c)))] for c in rgb_tuple]
+    fx = _lab_f((0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047)
+    fy = _lab_f(0.2126 * r + 0.7152 * g + 0.0722 * b)
+    fz = _lab_f((0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+class AciLookup:
+    """Nearest AutoCAD color lookup, a KD-tree over the palette in CIELAB.
+
+    Equal distances go to the lower color number, so pure red is 1 rather
+    than 10 and white is 7 rather than 255.
+    """
+
+    def __init__(self, palette = None):
+        palette = palette or ACI_PALETTE
+        points = [(rgb_to_lab(palette[index]), index) for index in range(1, 256) if palette[index]]
+        self._root = self._build(points, 0)
+        self._cache = {}
+
+    def _build(self, points, depth):
+        # node: (color number, lab, axis, lower side, upper side)
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key = lambda x: (x[0][axis], x[1]))
+        middle = len(points) // 2
+        lab, index = points[middle]
+        return (index, lab, axis,
+                self._build(points[:middle], depth + 1),
+                self._build(points[middle + 1:], depth + 1))
+
+    def nearest(self, lab):
+        """Color number nearest to a CIELAB color."""
+        best_distance, best_index = float("inf"), 256
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, plane_distance = stack.pop()
+            if node is None or plane_distance > best_distance:
+                continue
+            index, point, axis, lower, upper = node
+            dl, da, db = lab[0] - point[0], lab[1] - point[1], lab[2] - point[2]
+            distance = dl * dl + da * da + db * db
+            if distance < best_distance or (distance == best_distance and index < best_index):
+                best_distance, best_index = distance, index
+            diff = lab[axis] - point[axis]
+            if diff < 0:
+                stack.append((upper, diff * diff))
+                stack.append((lower, 0.0))
+            else:
+                stack.append((lower, diff * diff))
+                stack.append((upper, 0.0))
+        return best_index
+
+    def lookup(self, rgb_tuple):
+        """Color number nearest to an RGB color, remembered per color."""
+        r, g, b = [max(0, min(255, int(c))) for c in rgb_tuple]
+        key = (r << 16) | (g << 8) | b
+        index = self._cache.get(key)
+        if index is None:
+            if len(self._cache) >= ACI_CACHE_LIMIT:
+                self._cache.clear()
+            index = self._cache[key] = self.nearest(rgb_to_lab((r, g, b)))
+        return index
+
+
+_ACI_LOOKUP = []
+
+
+def _get_aci_lookup():
+    # the tree is built on first use, most sessions never export a DWG
+    if not _ACI_LOOKUP:
+        _ACI_LOOKUP.append(AciLookup())
+    return _ACI_LOOKUP[0]
+
+
 def rgb_to_autocad_color_number(rgb_tuple):
     """Convert RGB color to AutoCAD color number.
     
-    AutoCAD uses a specific color index system. This function maps RGB values
-    to the closest AutoCAD color number (1-255).
+    Finds the AutoCAD Color Index (ACI) entry perceptually closest to the
+    color, measured in CIELAB.
     
     Args:
         rgb_tuple (tuple): RGB color as (r, g, b) tuple with values 0-255
@@ -423,20 +559,35 @@ def rgb_to_autocad_color_number(rgb_tuple):
     Returns:
         int: AutoCAD color number (1-255)
     """
-    r, g, b = rgb_tuple
-    
-    # AutoCAD color index mapping for standard colors
-    # This is a simplified mapping - AutoCAD has specific color indices
-    # We'll use a hash-based approach to get consistent colors
-    
-    # Create a hash from RGB values to get a consistent color number
-    color_hash = (r * 299 + g * 587 + b * 114) % 255
-    
-    # Ensure we don't return 0 (which might be problematic)
-    if color_hash == 0:
-        color_hash = 1
-        
-    return color_hash
+    return _get_aci_lookup().lookup(rgb_tuple)
+
+def rgb_list_to_autocad_color_numbers(rgb_tuples):
+    """Convert many RGB colors to AutoCAD color numbers at once.
+
+    For color scheme and layer exports, repeated colors are only looked
+    up once.
+
+    Args:
+        rgb_tuples (list): RGB colors as (r, g, b) tuples with values 0-255
+
+    Returns:
+        list: AutoCAD color numbers (1-255), in the same order
+    """
+    lookup = _get_aci_lookup().lookup
+    return [lookup(rgb_tuple) for rgb_tuple in rgb_tuples]
+
+def autocad_color_number_to_rgb(color_number):
+    """Convert an AutoCAD color number to RGB.
+
+    Args:
+        color_number (int): AutoCAD color number (1-255)
+
+    Returns:
+        tuple: RGB color as (r, g, b) tuple with values 0-255
+    """
+    if not 1 <= color_number <= 255:
+        raise ValueError("AutoCAD color number must be 1-255, got {}".format(color_number))
+    return ACI_PALETTE[color_number]
 
 def get_desaturated_random_index_color_number():
     """Generate a desaturated random color and return as AutoCAD color number.
@@ -446,3 +597,89 @@ def get_desaturated_random_index_color_number():
     """
     desaturated_rgb = get_random_color(return_tuple=True)
     return rgb_to_autocad_color_number(desaturated_rgb)
+
+
+def _nearest_aci_brute_force(rgb_tuple, palette_labs):
+    lab = rgb_to_lab(rgb_tuple)
+    return min(range(1, 256), key = lambda index: (sum((x - y) ** 2 for x, y in zip(lab, palette_labs[index])), index))
+
+
+def _get_palette_labs():
+    return [None] + [rgb_to_lab(ACI_PALETTE[index]) for index in range(1, 256)]
+
+
+def benchmark(count = 1000000):
+    """Time count ACI lookups, a full spread of colors and a 200 color scheme.
+
+    Returns:
+        dict: lookups per second
+    """
+    import time
+    rng = random.Random(25)
+    results = {}
+
+    lookup = AciLookup()
+    spread = [(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)) for _ in range(count)]
+    start = time.time()
+    numbers = [lookup.lookup(x) for x in spread]
+    results["spread"] = count / (time.time() - start)
+
+    scheme = spread[:200]
+    colors = [scheme[rng.randint(0, 199)] for _ in range(count)]
+    start = time.time()
+    rgb_list_to_autocad_color_numbers(colors)
+    results["scheme"] = count / (time.time() - start)
+
+    sample = spread[:20000]
+    palette_labs = _get_palette_labs()
+    start = time.time()
+    assert [_nearest_aci_brute_force(x, palette_labs) for x in sample] == numbers[:20000]
+    results["brute_force"] = len(sample) / (time.time() - start)
+
+    print("{} ACI lookups".format(count))
+    print("  spread of colors     {:>10.0f} per s".format(results["spread"]))
+    print("  200 color scheme     {:>10.0f} per s".format(results["scheme"]))
+    print("  linear scan, no memo {:>10.0f} per s".format(results["brute_force"]))
+    return results
+
+
+def unit_test():
+    assert len(ACI_PALETTE) == 256 and ACI_PALETTE[0] is None
+    # published ACI RGB values
+    known = {10: (255, 0, 0), 11: (255, 127, 127), 12: (204, 0, 0), 15: (153, 76, 76), 21: (255, 159, 127),
+             30: (255, 127, 0), 40: (255, 191, 0), 60: (191, 255, 0), 90: (0, 255, 0), 130: (0, 255, 255),
+             150: (0, 127, 255), 170: (0, 0, 255), 210: (255, 0, 255), 240: (255, 0, 63), 249: (76, 38, 47),
+             250: (51, 51, 51), 254: (190, 190, 190)}
+    for number, rgb in known.items():
+        assert autocad_color_number_to_rgb(number) == rgb, (number, autocad_color_number_to_rgb(number))
+
+    assert rgb_to_autocad_color_number((255, 0, 0)) == 1
+    assert rgb_to_autocad_color_number((255, 255, 255)) == 7
+    assert rgb_to_autocad_color_number((128, 128, 128)) == 8
+    assert rgb_to_autocad_color_number((250, 5, 5)) == 1
+    assert rgb_to_autocad_color_number((0, 0, 0)) == 250
+    assert rgb_to_autocad_color_number((0, 120, 250)) == 150
+    assert rgb_to_autocad_color_number((300, -4, 0.6)) == 1
+
+    # every palette entry finds itself, or the lower number with the same color
+    for number in range(1, 256):
+        found = rgb_to_autocad_color_number(ACI_PALETTE[number])
+        assert found <= number and ACI_PALETTE[found] == ACI_PALETTE[number], (number, found)
+
+    rng = random.Random(7)
+    colors = [(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)) for _ in range(300)]
+    numbers = rgb_list_to_autocad_color_numbers(colors)
+    palette_labs = _get_palette_labs()
+    assert numbers == [_nearest_aci_brute_force(x, palette_labs) for x in colors]
+    assert numbers == [AciLookup().nearest(rgb_to_lab(x)) for x in colors]
+
+    try:
+        autocad_color_number_to_rgb(0)
+        assert False
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
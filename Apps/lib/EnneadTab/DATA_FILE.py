@@ -10,6 +10,7 @@ Key Features:
     - Local and shared dump folder management
     - List-based file operations
     - Sticky data persistence
+    - Opt-in read cache validated by file mtime and size
     - Context manager for safe data updates
     - Cross-platform compatibility (IronPython/CPython)
     - UTF-8 encoding support for international characters
@@ -132,11 +133,66 @@ if FOLDER is None:
 
 
 
+_TEMP_COUNTER = [0]
+
+
+def _get_unique_temp_path(prefix, extension=""):
+    """Get a dump folder temp path no other reader in any process is using.
+
+    Args:
+        prefix (str): Readable part of the temp name
+        extension (str, optional): Extension including the dot. Defaults to
+            the plugin extension.
+
+    Returns:
+        str: Full path in the local dump folder
+    """
+    import threading
+    _TEMP_COUNTER[0] += 1
+    name = "{}_{}_{}_{}{}".format(prefix,
+                                  os.getpid(),
+                                  threading.current_thread().ident,
+                                  _TEMP_COUNTER[0],
+                                  extension)
+    return FOLDER.get_local_dump_folder_file(name)
+
+
+def _read_shared_text(filepath):
+    """Read a whole text file without taking a lock on it.
+
+    The file is opened read-only and allows other processes to keep reading,
+    writing and replacing it while we read, so there is no need to copy it
+    first. Raises IOError/OSError when the file cannot be opened at all.
+
+    Args:
+        filepath (str): Path to the text file
+
+    Returns:
+        str: File content decoded as UTF-8 (BOM tolerated)
+    """
+    if sys.platform == "cli":  # IronPython
+        from System.IO import FileStream, FileMode, FileAccess, FileShare, StreamReader
+        from System.Text import Encoding
+        stream = FileStream(filepath, FileMode.Open, FileAccess.Read,
+                            FileShare.ReadWrite | FileShare.Delete)
+        try:
+            reader = StreamReader(stream, Encoding.UTF8)
+            return reader.ReadToEnd()
+        finally:
+            stream.Close()
+
+    # CPython opens with share-deny-none on Windows, plain buffered read is enough.
+    with io.open(filepath, "r", encoding="utf-8-sig") as f:
+        return f.read()
+
+
 def _read_json_file_safely(filepath, use_encode=True, create_if_not_exist=False):
-    """Safely read a JSON file by creating a temporary copy.
+    """Safely read a JSON file straight from its source location.
     
-    Creates a temporary copy of the JSON file before reading to avoid file locking
-    issues and ensure data integrity.
+    Opens the file read-only with share-friendly flags and parses it in place.
+    Only when the source cannot be opened (locked by another process) a copy
+    is made under a unique temp name, read, and removed again, so concurrent
+    readers never trample each other's temp file.
 
     Args:
         filepath (str): Path to the JSON file
@@ -150,15 +206,30 @@ def _read_json_file_safely(filepath, use_encode=True, create_if_not_exist=False)
     """
     if not os.path.exists(filepath):
         return dict()
-    local_path = FOLDER.get_local_dump_folder_file("temp_data")
     try:
-        COPY.copyfile(filepath, local_path)
-    except IOError:
-        local_path = FOLDER.get_local_dump_folder_file("temp_data_retry")
-        COPY.copyfile(filepath, local_path)
+        content = _read_shared_text(filepath)
+    except (IOError, OSError):
+        return _read_json_file_from_copy(filepath, use_encode, create_if_not_exist)
+
+    try:
+        return json.loads(content)
+    except Exception as e:
+        print("Error reading JSON file {}: {}".format(filepath, str(e)))
+        return None
 
-    content = _read_json_as_dict(local_path, use_encode, create_if_not_exist)
-    return content
+
+def _read_json_file_from_copy(filepath, use_encode=True, create_if_not_exist=False):
+    """Fallback for locked files: read a uniquely named local copy."""
+    local_path = _get_unique_temp_path("temp_data")
+    try:
+        COPY.copyfile(filepath, local_path)
+        return _read_json_as_dict(local_path, use_encode, create_if_not_exist)
+    finally:
+        try:
+            if os.path.exists(local_path):
+                os.remove(local_path)
+        except Exception:
+            pass
 
 
 def _read_json_as_dict(filepath, use_encode=True, create_if_not_exist=False):
@@ -398,7 +469,8 @@ def get_list(filepath):
     """Read file contents as list of strings.
     
     Each line in the file becomes an element in the returned list.
-    Creates a temporary copy to avoid file locking issues.
+    Reads the file in place with share-friendly flags, only a locked file
+    is copied to a unique temp name first.
 
     Args:
         filepath (str): Path to text file
@@ -408,13 +480,22 @@ def get_list(filepath):
     """
     if not os.path.exists(filepath):
         return []
-    extention = FOLDER.get_file_extension_from_path(filepath)
-    local_path = FOLDER.get_local_dump_folder_file("temp{}".format(extention))
-    COPY.copyfile(filepath, local_path)
-
-    with io.open(local_path,  "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    try:
+        content = _read_shared_text(filepath)
+    except (IOError, OSError):
+        extention = FOLDER.get_file_extension_from_path(filepath)
+        local_path = _get_unique_temp_path("temp", extention)
+        COPY.copyfile(filepath, local_path)
+        try:
+            with io.open(local_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        finally:
+            try:
+                os.remove(local_path)
+            except Exception:
+                pass
 
+    lines = content.splitlines(True)
     return map(lambda x: x.replace("\n", ""), lines)
 
 
@@ -441,6 +522,141 @@ def set_list(list, filepath, end_with_new_line=False):
     return True
 
 
+#######################################################################################
+# Opt-in read cache
+#
+# Hot UI paths read the same few dump files many times per command. With the
+# cache enabled, a read of an unchanged file costs one os.stat: the parsed
+# content is kept per path and reused while (mtime, size) still match.
+
+
+class _ReadCache:
+    """LRU cache of parsed JSON files validated by (mtime, size).
+
+    Args:
+        max_entries (int): Most files kept at once.
+        max_bytes (int): Cap on the summed on-disk size of cached files.
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        from collections import OrderedDict
+        import threading
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # path -> (signature, size, data)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bytes_parsed": 0,
+                      "evictions": 0, "invalidations": 0}
+
+    def get(self, filepath, reader):
+        """Return (data, hit), hit is True when the file was not read again."""
+        try:
+            stat = os.stat(filepath)
+        except (IOError, OSError):
+            return reader(filepath), False
+        signature = (stat.st_mtime, stat.st_size)
+
+        with self.lock:
+            entry = self.entries.get(filepath)
+            if entry is not None and entry[0] == signature:
+                self.entries[filepath] = self.entries.pop(filepath)  # mark as most recent
+                self.stats["hits"] += 1
+                return entry[2], True
+
+        data = reader(filepath)
+        with self.lock:
+            self.stats["misses"] += 1
+            self.stats["bytes_parsed"] += stat.st_size
+            self._discard(filepath)
+            if data is not None and stat.st_size <= self.max_bytes:
+                self.entries[filepath] = (signature, stat.st_size, data)
+                self.total_bytes += stat.st_size
+                while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                    oldest = next(iter(self.entries))
+                    self._discard(oldest)
+                    self.stats["evictions"] += 1
+        return data, False
+
+    def _discard(self, filepath):
+        entry = self.entries.pop(filepath, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+        return entry is not None
+
+    def invalidate(self, filepath):
+        with self.lock:
+            if self._discard(filepath):
+                self.stats["invalidations"] += 1
+
+
+_READ_CACHE = [None]
+
+
+def enable_cache(max_entries=64, max_bytes=64 * 1024 * 1024):
+    """Turn on the in-process read cache for get_data and get_sticky.
+
+    Args:
+        max_entries (int, optional): Most files kept at once. Defaults to 64.
+        max_bytes (int, optional): Cap on summed file size. Defaults to 64 MB.
+    """
+    if _READ_CACHE[0] is None:
+        _READ_CACHE[0] = _ReadCache(max_entries, max_bytes)
+    else:
+        _READ_CACHE[0].max_entries = max_entries
+        _READ_CACHE[0].max_bytes = max_bytes
+
+
+def disable_cache():
+    """Turn off the read cache and drop everything it holds."""
+    _READ_CACHE[0] = None
+
+
+def get_cache_stats():
+    """Get read cache counters for profiling.
+
+    Returns:
+        dict: hits, misses, bytes_parsed, evictions, invalidations, entries,
+            cached_bytes. Empty dict when the cache is off.
+    """
+    cache = _READ_CACHE[0]
+    if cache is None:
+        return {}
+    with cache.lock:
+        stats = dict(cache.stats)
+        stats["entries"] = len(cache.entries)
+        stats["cached_bytes"] = cache.total_bytes
+    return stats
+
+
+def _copy_json(obj):
+    # Cheaper than copy.deepcopy for plain JSON trees, no memo bookkeeping.
+    if isinstance(obj, dict):
+        return dict((k, _copy_json(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [_copy_json(x) for x in obj]
+    return obj
+
+
+def _read_through_cache(filepath, reader, copy_result=True):
+    # Returns (data, from_cache) so callers can tell a hit without racing on the shared stats.
+    cache = _READ_CACHE[0]
+    if cache is None:
+        return reader(filepath), False
+    data, hit = cache.get(filepath, reader)
+    # Callers are free to mutate what they get back, never hand out the cached object.
+    return (_copy_json(data) if copy_result else data), hit
+
+
+def _invalidate_cache(file_name_or_full_path):
+    cache = _READ_CACHE[0]
+    if cache is None:
+        return
+    cache.invalidate(file_name_or_full_path)
+    cache.invalidate(FOLDER.get_local_dump_folder_file(file_name_or_full_path))
+    cache.invalidate(FOLDER.get_shared_dump_folder_file(file_name_or_full_path))
+
+
 #######################################################################################
 
 
@@ -461,6 +677,7 @@ def get_data(file_name_or_full_path, is_local=True):
     
     Supports both local and shared storage locations.
     Creates file with empty dictionary if it doesn't exist.
+    When the read cache is enabled, an unchanged file is not parsed again.
 
     Args:
         file_name_or_full_path (str): Filename or full path, extension is optional, if missing, will add plugin extension instead.
@@ -470,17 +687,28 @@ def get_data(file_name_or_full_path, is_local=True):
     Returns:
         dict: File contents as dictionary
     """
+    return _get_data(file_name_or_full_path, is_local)[0]
+
+
+def _get_data(file_name_or_full_path, is_local=True, copy_result=True):
     if os.path.exists(file_name_or_full_path):
-        return _read_json_as_dict(file_name_or_full_path, use_encode=True, create_if_not_exist=False)
+        return _read_through_cache(
+            file_name_or_full_path,
+            lambda x: _read_json_as_dict(x, use_encode=True, create_if_not_exist=False),
+            copy_result)
 
     if is_local:
-        return _read_json_as_dict_in_dump_folder(
-            file_name_or_full_path, use_encode=True, create_if_not_exist=True
-        )
+        filepath = FOLDER.get_local_dump_folder_file(file_name_or_full_path)
+        return _read_through_cache(
+            filepath,
+            lambda x: _read_json_as_dict(x, use_encode=True, create_if_not_exist=True),
+            copy_result)
     else:
-        return _read_json_as_dict_in_shared_dump_folder(
-            file_name_or_full_path, use_encode=True, create_if_not_exist=True
-        )
+        filepath = FOLDER.get_shared_dump_folder_file(file_name_or_full_path)
+        return _read_through_cache(
+            filepath,
+            lambda x: _read_json_file_safely(x, use_encode=True, create_if_not_exist=True),
+            copy_result)
 
 
 def set_data(data_dict, file_name_or_full_path, is_local=True):
@@ -498,6 +726,8 @@ def set_data(data_dict, file_name_or_full_path, is_local=True):
     Returns:
         bool: True if save successful
     """
+    _invalidate_cache(file_name_or_full_path)
+
     # Only use direct path if it's actually a full/absolute path, not just a filename
     is_full_path = os.path.isabs(file_name_or_full_path) or os.path.dirname(file_name_or_full_path)
     
@@ -535,6 +765,8 @@ def update_data(file_name, is_local=True, keep_holder_key=None):
         file_name = os.path.basename(file_name)
 
     try:
+        # Drop any cached copy first, another process may have written since.
+        _invalidate_cache(file_name)
         data = get_data(file_name, is_local) or {}  # Ensure we have a dict
 
 
@@ -547,7 +779,7 @@ def update_data(file_name, is_local=True, keep_holder_key=None):
 
 
         set_data(data, file_name, is_local)
-   
+    
     except Exception as e:
         print("Error in DATA_FILE.py at update_data function:", str(e))
         try:
@@ -602,14 +834,16 @@ def get_sticky(sticky_name, default_value_if_no_sticky=None,
         any: Sticky data value or default
     """
 
-    data = get_data(STICKY_FILE)
+    # Only one value is needed, skip copying the whole sticky file.
+    # A cache hit did not touch the disk, there is no write to wait out.
+    data, from_cache = _get_data(STICKY_FILE, copy_result=False)
     if sticky_name not in data.keys():
         set_sticky(sticky_name, default_value_if_no_sticky, data_type_if_no_sticky)
         if tiny_wait:
             time.sleep(0.05)
         return default_value_if_no_sticky
-    value = data[sticky_name]
-    if tiny_wait:
+    value = _copy_json(data[sticky_name])
+    if tiny_wait and not from_cache:
         time.sleep(0.05)
     if isinstance(value, dict):
         data_type = value.get("type", None)
@@ -665,6 +899,104 @@ def set_sticky(sticky_name, value_to_write,
         time.sleep(0.05)
 
 
+def unit_test():
+    import shutil
+    import tempfile
+    import threading
+
+    work_folder = tempfile.mkdtemp(prefix="data_file_test_")
+    previous_cache = _READ_CACHE[0]
+    _READ_CACHE[0] = _ReadCache(8, 1024 * 1024)
+    try:
+        slow_path = os.path.join(work_folder, "slow.json")
+        fast_path = os.path.join(work_folder, "fast.json")
+        for path in (slow_path, fast_path):
+            with open(path, "wb") as f:
+                f.write(json.dumps({"value": path}).encode("utf-8"))
+
+        assert _get_data(fast_path)[1] is False
+        data, from_cache = _get_data(fast_path)
+        assert from_cache and data == {"value": fast_path}
+
+        # a miss must report a miss even when another thread hits the cache meanwhile
+        reading, release = threading.Event(), threading.Event()
+        result = []
+
+        def slow_reader(path):
+            reading.set()
+            release.wait(5)
+            return _read_json_as_dict(path)
+
+        worker = threading.Thread(
+            target=lambda: result.append(_read_through_cache(slow_path, slow_reader)))
+        worker.start()
+        assert reading.wait(5)
+        assert _get_data(fast_path)[1]
+        release.set()
+        worker.join(5)
+        assert result == [({"value": slow_path}, False)]
+        assert _get_data(slow_path)[1]
+        print("DATA_FILE unit test passed")
+    finally:
+        _READ_CACHE[0] = previous_cache
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+def benchmark_shared_read(sizes_mb=(1, 10, 100), repeat=3):
+    """Compare the legacy copy-then-parse read with the direct shared read.
+
+    Writes synthetic JSON files of roughly the requested sizes to a temp
+    folder and times both read paths on each.
+
+    Args:
+        sizes_mb (tuple, optional): File sizes in MB. Defaults to 1, 10, 100.
+        repeat (int, optional): Reads per path, best time is kept. Defaults to 3.
+
+    Returns:
+        dict: {size_mb: (copy_read_seconds, direct_read_seconds)}
+    """
+    import shutil
+    import tempfile
+
+    def legacy_read(filepath):
+        local_path = os.path.join(work_folder, "temp_data")
+        COPY.copyfile(filepath, local_path)
+        return _read_json_as_dict(local_path)
+
+    results = {}
+    work_folder = tempfile.mkdtemp(prefix="data_file_bench_")
+    try:
+        for size_mb in sizes_mb:
+            filepath = os.path.join(work_folder, "bench_{}mb.json".format(size_mb))
+            record = {"name": "Level 01 - Room", "area": 123.456, "tags": ["a", "b", "c"]}
+            record_size = len(json.dumps(record)) + 12
+            count = int(size_mb * 1024 * 1024 / record_size)
+            with io.open(filepath, "w", encoding="utf-8") as f:
+                f.write(u"{")
+                for i in range(count):
+                    if i:
+                        f.write(u",")
+                    f.write(u'"{}":{}'.format(i, json.dumps(record)))
+                f.write(u"}")
+
+            timings = []
+            for reader in (legacy_read, _read_json_file_safely):
+                best = None
+                for _ in range(repeat):
+                    t_start = time.time()
+                    data = reader(filepath)
+                    duration = time.time() - t_start
+                    assert len(data) == count
+                    best = duration if best is None else min(best, duration)
+                timings.append(best)
+            results[size_mb] = tuple(timings)
+            print("{:>4} MB: copy+parse {:.3f}s, direct parse {:.3f}s".format(size_mb, timings[0], timings[1]))
+            os.remove(filepath)
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+    return results
+
+
 if __name__ == "__main__":
 
 
@@ -331,16 +331,51 @@ depreciated_enneadPLUS_menu = os.path.join(RHINO_FOLDER, "Ennead+.menu")
 
 depreciated_log = os.path.join(os.path.expanduser("~"), "Desktop", "I just blue myself.log")
 
+# (path, (year, month, day)) removed once the date has passed.
+# Nothing is deleted at import, MAINTENANCE runs remove_legacy_paths when the host is idle.
+LEGACY_PATH_REMOVALS = [
+    (depreciated_enneadPLUS_menu, (2025, 4, 1)),
+    (depreciated_dist_lite_folder, (2025, 5, 1)),
+    (depreciated_ECO_SYS_FOLDER_MODERN, (2025, 5, 1)),
+    (depreciated_log, (2025, 5, 1)),
+]
 # Fix: Use compatible approach for both IronPython 2.7 and Python 3
-# _execute_map_compatible(_delete_folder_or_file_after_date, __legacy_one_drive_folders, (2025, 2, 1))
+# LEGACY_PATH_REMOVALS += [(x, (2025, 2, 1)) for x in __legacy_one_drive_folders]
 
-_delete_folder_or_file_after_date(depreciated_enneadPLUS_menu, (2025, 4, 1))
-_delete_folder_or_file_after_date(depreciated_dist_lite_folder, (2025, 5, 1))
-_delete_folder_or_file_after_date(depreciated_ECO_SYS_FOLDER_MODERN, (2025, 5, 1))
 
-_delete_folder_or_file_after_date(depreciated_log, (2025, 5, 1))
+def remove_legacy_paths():
+    """Delete the LEGACY_PATH_REMOVALS entries that are past their date."""
+    for path, date_YYMMDD_tuple in LEGACY_PATH_REMOVALS:
+        _delete_folder_or_file_after_date(path, date_YYMMDD_tuple)
 
 ####################################
+DUMP_FILE_MAX_AGE = 3 * 24 * 60 * 60  # 3 days
+DUMP_PROTECTED_EXTENSIONS = {'.json', PLUGIN_EXTENSION.lower(), ".txt", ".lock", ".ducklock", ".rui"}
+
+
+def is_expired_dump_file(filename, cutoff_time):
+    """Check whether a dump folder entry may be removed by the cleanup.
+
+    The extension is checked before touching the disk, so protected files
+    cost no stat call.
+
+    Args:
+        filename (str): Name of the entry in DUMP_FOLDER
+        cutoff_time (float): Entries modified before this timestamp are expired
+
+    Returns:
+        bool: True for an unprotected file older than cutoff_time
+    """
+    import stat
+    if os.path.splitext(filename)[1].lower() in DUMP_PROTECTED_EXTENSIONS:
+        return False
+    try:
+        info = os.stat(os.path.join(DUMP_FOLDER, filename))
+    except OSError:
+        return False
+    return stat.S_ISREG(info.st_mode) and info.st_mtime < cutoff_time
+
+
 def cleanup_dump_folder():
     """Clean up temporary files from the dump folder.
 
@@ -348,26 +383,17 @@ def cleanup_dump_folder():
     .json, PLUGIN_EXTENSION, .txt, .DuckLock, and .rui files.
     
     This function runs silently and handles file deletion errors gracefully.
+    It goes through the whole folder in one go, the scheduled cleanup in
+    MAINTENANCE does the same work in small time-boxed steps.
     """
-    import os
     import time
 
-    cutoff_time = time.time() - (3 * 24 * 60 * 60)  # 3 days
-    protected_extensions = {'.json', PLUGIN_EXTENSION, ".txt", ".lock", ".DuckLock", ".rui"}
+    cutoff_time = time.time() - DUMP_FILE_MAX_AGE
 
     for filename in os.listdir(DUMP_FOLDER):
-        file_path = os.path.join(DUMP_FOLDER, filename)
-        if not os.path.isfile(file_path):
-            continue
-            
-        file_ext = os.path.splitext(filename)[1].lower()
-
-        if file_ext in protected_extensions:
-            continue
-            
-        if os.path.getmtime(file_path) < cutoff_time:
+        if is_expired_dump_file(filename, cutoff_time):
             try:
-                os.remove(file_path)
+                os.remove(os.path.join(DUMP_FOLDER, filename))
             except:
                 pass
 
@@ -401,35 +427,6 @@ def should_check_l_drive():
         
     return True
 
-def should_cleanup_dump_folder():
-    """Determine if dump folder should be cleaned up based on time elapsed since last cleanup.
-    
-    Ensures cleanup happens at most once per day.
-    
-    Returns:
-        bool: True if a day has passed since last cleanup, False otherwise.
-    """
-    import time
-    import os.path
-    
-    timestamp_file = os.path.join(DUMP_FOLDER, "dump_cleanup.DuckLock")
-    current_time = time.time()
-    cutoff_time = current_time - (24 * 60 * 60)  # 24 hours
-    
-    # If lock file exists and is less than a day old, don't cleanup
-    if os.path.exists(timestamp_file):
-        if os.path.getmtime(timestamp_file) > cutoff_time:
-            return False
-    
-    # Update timestamp by touching the file
-    try:
-        with open(timestamp_file, "w") as f:
-            f.write("")
-    except:
-        pass
-        
-    return True
-
 def is_avd():
     """Detect if running in Azure Virtual Desktop environment.
 
@@ -703,9 +700,8 @@ def alert_l_drive_not_available(play_sound = False):
         
 
 
-# Run maintenance operations
-if should_cleanup_dump_folder():
-    cleanup_dump_folder()
+# Maintenance (dump folder cleanup, legacy path removal) used to run right here
+# on import. It is scheduled by MAINTENANCE now and runs while the host is idle.
 
 # 2026-04-27: removed module-level L-drive availability nag.
 # IS_OFFLINE_MODE (above) handles the missing-share fallback gracefully,
@@ -65,6 +65,12 @@ except Exception as e:
     print("Error importing DATA_CONVERSION in ERROR_HANDLE.py: {}".format(traceback.format_exc()))
     DATA_CONVERSION = None
 
+try:
+    import TRACEBACK_LOG
+except Exception as e:
+    print("Error importing TRACEBACK_LOG in ERROR_HANDLE.py: {}".format(traceback.format_exc()))
+    TRACEBACK_LOG = None
+
 
 # Add recursion depth tracking
 _error_handler_recursion_depth = 0
@@ -207,37 +213,50 @@ def get_alternative_traceback():
     return result
 
 
+def _get_recent_traceback_log_path():
+    """Path of RECENT_TRACEBACK.LOG in the local dump folder."""
+    if FOLDER is not None:
+        return FOLDER.get_local_dump_folder_file("RECENT_TRACEBACK.LOG")
+
+    # Fallback if FOLDER is not available
+    import os
+    user_docs = os.path.expanduser("~/Documents")
+    if not os.path.exists(user_docs):
+        user_docs = os.path.join(os.environ.get("USERPROFILE", ""), "Documents")
+
+    enneadtab_folder = os.path.join(user_docs, "EnneadTab Ecosystem", "Dump")
+    if not os.path.exists(enneadtab_folder):
+        try:
+            os.makedirs(enneadtab_folder)
+        except:
+            pass
+
+    return os.path.join(enneadtab_folder, "RECENT_TRACEBACK.LOG")
+
+
 def save_recent_traceback_to_log(error_info, func_name="unknown", additional_context=""):
     """Save recent traceback information to RECENT_TRACEBACK.LOG file.
     
-    This function creates a persistent log file that can be monitored locally
+    This function keeps a persistent log file that can be monitored locally
     to track errors that occur in Rhino, Revit, or other environments.
+
+    The file is a fixed-size ring (see TRACEBACK_LOG), so an error storm
+    costs the same per error however full the log is. An error already in
+    the log, same function, exception type and frames, only has its
+    counter and last-seen time updated.
     
     Args:
         error_info (str): The error traceback information to log
         func_name (str): Name of the function where the error occurred
         additional_context (str): Any additional context information
+
+    Returns:
+        int: Times this error is now counted in the log, None if not logged
     """
     try:
-        # Get the log file path
-        if FOLDER is not None:
-            log_file_path = FOLDER.get_local_dump_folder_file("RECENT_TRACEBACK.LOG")
-        else:
-            # Fallback if FOLDER is not available
-            import os
-            user_docs = os.path.expanduser("~/Documents")
-            if not os.path.exists(user_docs):
-                user_docs = os.path.join(os.environ.get("USERPROFILE", ""), "Documents")
-            
-            enneadtab_folder = os.path.join(user_docs, "EnneadTab Ecosystem", "Dump")
-            if not os.path.exists(enneadtab_folder):
-                try:
-                    os.makedirs(enneadtab_folder)
-                except:
-                    pass
-            
-            log_file_path = os.path.join(enneadtab_folder, "RECENT_TRACEBACK.LOG")
-        
+        if TRACEBACK_LOG is None:
+            return None
+
         # Get current timestamp
         if TIME is not None:
             timestamp = TIME.get_formatted_current_time()
@@ -255,9 +274,8 @@ def save_recent_traceback_to_log(error_info, func_name="unknown", additional_con
         # Get plugin name
         plugin_name = get_plugin_name()
         
-        # Format the log entry
+        # Format the log entry, the ring slot header frames it
         log_entry = []
-        log_entry.append("=" * 80)
         log_entry.append("TIMESTAMP: {}".format(timestamp))
         log_entry.append("USER: {}".format(user_name))
         log_entry.append("PLUGIN: {}".format(plugin_name))
@@ -266,31 +284,31 @@ def save_recent_traceback_to_log(error_info, func_name="unknown", additional_con
             log_entry.append("CONTEXT: {}".format(additional_context))
         log_entry.append("-" * 80)
         log_entry.append(error_info)
-        log_entry.append("=" * 80)
-        log_entry.append("")  # Empty line for readability
-        
-        # Write to log file (append mode)
-        import io
-        with io.open(log_file_path, "a", encoding="utf-8") as f:
-            f.write("\n".join(log_entry))
-        
-        # Keep log file size manageable (max 1000 lines, ~50KB)
-        try:
-            with io.open(log_file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            
-            if len(lines) > 1000:
-                # Keep only the last 800 lines to prevent file from growing too large
-                with io.open(log_file_path, "w", encoding="utf-8") as f:
-                    f.writelines(lines[-800:])
-        except Exception:
-            # If we can't manage the file size, just continue
-            pass
+
+        ring = TRACEBACK_LOG.get_ring(_get_recent_traceback_log_path())
+        return ring.record(TRACEBACK_LOG.fingerprint_traceback(error_info, func_name),
+                           "\n".join(log_entry))
             
     except Exception as e:
         # Don't let logging errors break the main error handling
         print_note("Failed to save traceback to RECENT_TRACEBACK.LOG: {}".format(str(e)))
 
+
+def read_recent_tracebacks(limit=20):
+    """Get the most recent entries of RECENT_TRACEBACK.LOG, oldest first.
+
+    Args:
+        limit (int, optional): Entries to return. Defaults to 20.
+
+    Returns:
+        list: dicts with seq, count, fingerprint, first, last and text
+    """
+    if TRACEBACK_LOG is None:
+        return []
+    ring = TRACEBACK_LOG.get_ring(_get_recent_traceback_log_path())
+    return list(ring.iter_recent(limit))
+
+
 def try_catch_error(is_silent=False, is_pass = False):
     """Decorator for catching exceptions and sending automated error log emails.
 
@@ -453,6 +471,12 @@ def try_catch_error(is_silent=False, is_pass = False):
 
 _LAST_UPDATE_DUCK_CACHE = [None]
 
+# one ErrorDump report per fingerprint per interval, an error storm
+# must not fire a web request per element
+ERROR_DUMP_MIN_INTERVAL = 600
+_ERROR_DUMP_MAX_TRACKED = 500
+_ERROR_DUMP_HISTORY = {}
+
 def _get_last_update_duck_cached():
     """Timestamp of the newest successful update record (.duck filename).
 
@@ -477,6 +501,29 @@ def _get_last_update_duck_cached():
     return _LAST_UPDATE_DUCK_CACHE[0]
 
 
+def _should_send_error_dump(fingerprint, now=None):
+    """Check the per-fingerprint rate limit of send_error_to_error_dump.
+
+    Args:
+        fingerprint (str): See TRACEBACK_LOG.fingerprint_traceback
+        now (float, optional): Current time, for testing
+
+    Returns:
+        tuple: (True to send, reports suppressed since the last send)
+    """
+    import time
+    now = time.time() if now is None else now
+    record = _ERROR_DUMP_HISTORY.get(fingerprint)
+    if record is not None and now - record[0] < ERROR_DUMP_MIN_INTERVAL:
+        record[1] += 1
+        return False, record[1]
+    if record is None and len(_ERROR_DUMP_HISTORY) >= _ERROR_DUMP_MAX_TRACKED:
+        _ERROR_DUMP_HISTORY.clear()
+    suppressed = record[1] if record is not None else 0
+    _ERROR_DUMP_HISTORY[fingerprint] = [now, 0]
+    return True, suppressed
+
+
 def send_error_to_error_dump(error_message, func_name, user_name, is_silent=False):
     """Send error to the universal ErrorDump service at enneadtab.com.
 
@@ -492,6 +539,10 @@ def send_error_to_error_dump(error_message, func_name, user_name, is_silent=Fals
       3. urllib2 (legacy CPython 2.7)
       4. urllib3 (Revit venv fallback)
 
+    Reports are rate limited per error fingerprint: the same error is sent
+    at most once per ERROR_DUMP_MIN_INTERVAL seconds, and the next report
+    carries ``suppressed_since_last_send`` with the count it stood in for.
+
     When an earlier transport fails, its exception repr is captured and
     attached to the next attempt's context under ``prev_transport_attempts``
     so that the first successful send reveals why prior transports failed.
@@ -505,6 +556,16 @@ def send_error_to_error_dump(error_message, func_name, user_name, is_silent=Fals
     import json
     import os
 
+    fingerprint, suppressed = None, 0
+    try:
+        fingerprint = TRACEBACK_LOG.fingerprint_traceback(error_message, func_name)
+    except Exception:
+        pass
+    if fingerprint:
+        should_send, suppressed = _should_send_error_dump(fingerprint)
+        if not should_send:
+            return
+
     # Detect environment
     env = "terminal"
     try:
@@ -521,6 +582,10 @@ def send_error_to_error_dump(error_message, func_name, user_name, is_silent=Fals
         "is_silent": is_silent,
         "computer_name": os.environ.get("COMPUTERNAME", "unknown"),
     }
+    if fingerprint:
+        base_context["fingerprint"] = fingerprint
+    if suppressed:
+        base_context["suppressed_since_last_send"] = suppressed
     try:
         if ENVIRONMENT is not None:
             if hasattr(ENVIRONMENT, "get_revit_version"):
@@ -728,5 +793,42 @@ def print_note(*args):
             print("- {}: {}".format(type(arg).__name__, arg_str))
 
 
+def unit_test():
+    import os
+    import shutil
+    import tempfile
+
+    # the same failure on another element is one report per interval
+    _ERROR_DUMP_HISTORY.clear()
+    assert _should_send_error_dump("fp", now=1000) == (True, 0)
+    assert _should_send_error_dump("fp", now=1001) == (False, 1)
+    assert _should_send_error_dump("fp", now=1002) == (False, 2)
+    assert _should_send_error_dump("other", now=1002) == (True, 0)
+    assert _should_send_error_dump("fp", now=1000 + ERROR_DUMP_MIN_INTERVAL) == (True, 2)
+    _ERROR_DUMP_HISTORY.clear()
+
+    work_folder = tempfile.mkdtemp(prefix="error_handle_test_")
+    global _get_recent_traceback_log_path
+    original_path_getter = _get_recent_traceback_log_path
+    _get_recent_traceback_log_path = lambda: os.path.join(work_folder, "RECENT_TRACEBACK.LOG")
+    try:
+        def failing_hook(element_id):
+            raise ValueError("bad element {}".format(element_id))
+
+        for element_id in range(3):
+            try:
+                failing_hook(element_id)
+            except ValueError:
+                error = get_alternative_traceback()
+            count = save_recent_traceback_to_log(error, "failing_hook", "Silent: True")
+            assert count == element_id + 1
+        entries = read_recent_tracebacks()
+        assert len(entries) == 1 and entries[0]["count"] == 3
+        assert "bad element 0" in entries[0]["text"]
+    finally:
+        _get_recent_traceback_log_path = original_path_getter
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
 if __name__ == "__main__":
-    pass
+    unit_test()
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Event Log
+
+Append-only event log with rollups kept up to date from it, the storage
+behind TIMESHEET and the TimeSheetMiniApp.
+
+Both used to keep one multi-year dict per user and rewrite it in full for
+every event, a doc opening or a slot typed in the mini app. Here an event
+is one JSON line appended to the log, and the daily and weekly views the
+readers need are folded in by the caller's apply function from where the
+last read stopped. The folded rollups are cached next to the log together
+with the byte offset they cover, so a new session only reads the tail.
+
+Key Features:
+    - One JSON line per event, appended
+    - Incremental rollups through a caller supplied apply_event(rollups, event)
+    - Rollup cache with the log offset it covers, rebuilt when the version changes
+    - One-time import of legacy data as events
+    - Day and week bucket helpers
+
+Layout:
+    <name>.jsonl              -> {"software": "revit", "doc": "...", ...} per line
+    <name>_rollups.json       -> {"version": 1, "offset": 123456, "rollups": {...}}
+    <name>_manifest.json      -> {"legacy_imported": true}
+
+Note:
+    A line torn by a crash is skipped by the reader, the next append starts
+    on a new line after it. A line another process is still writing is left
+    for the next read. The rollups must
+    only depend on the events, as any reader may rebuild them.
+"""
+
+import os
+import io
+import json
+import time
+import shutil
+import datetime
+
+CACHE_SAVE_EVERY = 200
+
+
+def day_of(timestamp=None):
+    """Local date of a unix time as 2024-01-31, today by default."""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def week_of(day):
+    """Monday of the week of a 2024-01-31 date, as the week bucket key."""
+    date = datetime.datetime.strptime(day, "%Y-%m-%d").date()
+    return (date - datetime.timedelta(days=date.weekday())).strftime("%Y-%m-%d")
+
+
+def _dump_line(event):
+    # ascii lines so IronPython and CPython write byte-identical logs
+    return (json.dumps(event, ensure_ascii=True, sort_keys=True) + "\n").encode("ascii")
+
+
+def _replace_file(source, target):
+    # os.replace does not exist in IronPython 2.7
+    if os.path.exists(target):
+        os.remove(target)
+    shutil.move(source, target)
+
+
+def _line_break_needed(path):
+    """True when the file ends in a torn line, an append must start a new line."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except (IOError, OSError):
+        # missing or empty
+        return False
+
+
+def _save_json(data, path):
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "wb") as f:
+        f.write(json.dumps(data, ensure_ascii=True, sort_keys=True).encode("ascii"))
+    _replace_file(temp_path, path)
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with io.open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+class EventLog:
+    """Append-only JSON-lines event log with cached, incremental rollups.
+
+    Args:
+        path (str): The .jsonl log file
+        apply_event (callable): apply_event(rollups, event) folds one event
+            into the rollups dict in place
+        rollup_version (int, optional): Bump when apply_event changes, the
+            cached rollups are then rebuilt from the log
+        save_every (int, optional): Events folded in memory before the
+            cache is saved again
+    """
+
+    def __init__(self, path, apply_event, rollup_version=1, save_every=CACHE_SAVE_EVERY):
+        self.path = path
+        self.apply_event = apply_event
+        self.rollup_version = rollup_version
+        self.save_every = save_every
+        stem = os.path.splitext(path)[0]
+        self.cache_path = stem + "_rollups.json"
+        self.manifest_path = stem + "_manifest.json"
+        self._rollups = None
+        self._offset = 0
+        self._unsaved = 0
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def append(self, event):
+        """Append one event, O(1) whatever the log holds."""
+        self.append_many([event])
+
+    def append_many(self, events):
+        data = b"".join(_dump_line(x) for x in events)
+        if not data:
+            return
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        if _line_break_needed(self.path):
+            # keep the first event off a line torn by a crash
+            data = b"\n" + data
+        size_before = self._size()
+        with open(self.path, "ab") as f:
+            f.write(data)
+        # fold straight into loaded rollups when nobody else wrote in between
+        if self._rollups is not None and self._offset == size_before and self._size() == size_before + len(data):
+            for event in events:
+                self.apply_event(self._rollups, json.loads(json.dumps(event)))
+            self._offset += len(data)
+            self._unsaved += len(events)
+            if self._unsaved >= self.save_every:
+                self.save_rollups()
+
+    def iter_events(self):
+        """Yield every event in the log, skipping torn lines."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    event = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue
+                if isinstance(event, dict):
+                    yield event
+
+    def _load_cache(self):
+        cache = _load_json(self.cache_path)
+        if (isinstance(cache, dict) and cache.get("version") == self.rollup_version
+                and isinstance(cache.get("rollups"), dict) and cache.get("offset", -1) <= self._size()):
+            self._rollups = cache["rollups"]
+            self._offset = cache["offset"]
+        else:
+            self._rollups = {}
+            self._offset = 0
+        self._unsaved = 0
+
+    def get_rollups(self):
+        """Rollups covering every complete line of the log.
+
+        Only the events after the cached offset are read and folded in.
+        The returned dict is live, callers must not change it.
+        """
+        if self._rollups is None or self._offset > self._size():
+            self._load_cache()
+        size = self._size()
+        if size <= self._offset:
+            return self._rollups
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        # a line still being written by another process waits for the next read
+        end = data.rfind(b"\n") + 1
+        folded = 0
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line.decode("utf-8"))
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                self.apply_event(self._rollups, event)
+                folded += 1
+        self._offset += end
+        self._unsaved += folded
+        if folded:
+            self.save_rollups()
+        return self._rollups
+
+    def save_rollups(self):
+        """Save the folded rollups and the offset they cover."""
+        if self._rollups is None:
+            return
+        _save_json({"version": self.rollup_version, "offset": self._offset, "rollups": self._rollups},
+                   self.cache_path)
+        self._unsaved = 0
+
+    def rebuild_rollups(self):
+        """Drop the cache and fold the whole log again."""
+        self._rollups = {}
+        self._offset = 0
+        return self.get_rollups()
+
+    def import_legacy_once(self, make_events):
+        """Append legacy data as events the first time the log is used.
+
+        Args:
+            make_events (callable): make_events() -> iterable of events
+
+        Returns:
+            int: Events imported
+        """
+        manifest = _load_json(self.manifest_path) or {}
+        if manifest.get("legacy_imported"):
+            return 0
+        events = list(make_events() or [])
+        self.append_many(events)
+        manifest["legacy_imported"] = True
+        folder = os.path.dirname(self.manifest_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        _save_json(manifest, self.manifest_path)
+        return len(events)
+
+
+def _count_event(rollups, event):
+    days = rollups.setdefault("days", {})
+    days[event["date"]] = days.get(event["date"], 0) + 1
+    weeks = rollups.setdefault("weeks", {})
+    week = week_of(event["date"])
+    weeks[week] = weeks.get(week, 0) + 1
+
+
+def unit_test():
+    import tempfile
+
+    work_folder = tempfile.mkdtemp(prefix="event_log_test_")
+    try:
+        assert week_of("2024-01-31") == "2024-01-29" and week_of("2024-01-29") == "2024-01-29"
+        assert week_of("2024-02-04") == "2024-01-29"
+
+        path = os.path.join(work_folder, "sub", "events.jsonl")
+        log = EventLog(path, _count_event, save_every=3)
+        assert log.get_rollups() == {}
+        assert log.import_legacy_once(lambda: [{"date": "2024-01-01"}, {"date": "2024-01-02"}]) == 2
+        assert log.import_legacy_once(lambda: [{"date": "2024-01-01"}]) == 0
+        assert log.get_rollups() == {"days": {"2024-01-01": 1, "2024-01-02": 1}, "weeks": {"2024-01-01": 2}}
+
+        # appends fold into loaded rollups without a read, the third one saves the cache
+        assert not os.path.exists(log.cache_path)
+        log.append({"date": "2024-01-08"})
+        assert log.get_rollups()["weeks"] == {"2024-01-01": 2, "2024-01-08": 1}
+        assert _load_json(log.cache_path)["offset"] == os.path.getsize(path)
+
+        # another writer, a torn line and a half written one
+        other = EventLog(path, _count_event)
+        other.append({"date": "2024-01-09"})
+        with open(path, "ab") as f:
+            f.write(b'{"date": \n{"date": "2024-01-1')
+        assert log.get_rollups()["weeks"]["2024-01-08"] == 2
+        with open(path, "ab") as f:
+            f.write(b'0"}\n')
+        assert log.get_rollups()["days"]["2024-01-10"] == 1
+
+        # an append after a torn last line starts on its own line
+        with open(path, "ab") as f:
+            f.write(b'{"date": "2024-0')
+        log.append({"date": "2024-01-11"})
+        assert log.get_rollups()["days"]["2024-01-11"] == 1
+
+        # a new session starts from the cache and reads only the tail
+        assert _load_json(log.cache_path)["offset"] == os.path.getsize(path)
+        seen = []
+        reopened = EventLog(path, lambda rollups, event: seen.append(event) or _count_event(rollups, event))
+        assert reopened.get_rollups()["weeks"] == {"2024-01-01": 2, "2024-01-08": 4}
+        assert seen == []
+        assert len(list(reopened.iter_events())) == 6
+
+        # a new rollup version rebuilds from the log
+        bumped = EventLog(path, _count_event, rollup_version=2)
+        assert bumped.get_rollups()["weeks"] == {"2024-01-01": 2, "2024-01-08": 4}
+        assert _load_json(bumped.cache_path)["version"] == 2
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
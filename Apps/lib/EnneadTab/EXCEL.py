@@ -20,6 +20,8 @@ Key Features:
 - Formula checking and highlighting
 - Hover tooltips for cells with additional information
 - Support for both local and remote Excel files
+- Sparse reads (SparseSheet) that keep the handler's cell dicts as-is and
+  add only a row index; cells are not repacked since callers edit them in place
 """
 
 import os
@@ -38,6 +40,7 @@ import FOLDER
 import UNIT_TEST
 import TEXT
 import DATA_FILE
+import JOB_CHANNEL
 import ERROR_HANDLE
 import COPY
 import USER
@@ -428,6 +431,149 @@ class ExcelDataItem:
         return [ExcelDataItem.from_dict(data) for data in data_dict.values()]
 
 
+class SparseSheet(dict):
+    """Excel cells keyed by (row, column), only non-empty cells are stored.
+
+    Returned by read_data_from_excel(return_dict=True). It is a plain dict for
+    every existing caller, plus a row index that is built once on first use so
+    rows can be streamed in order and a single column can be scanned without
+    touching the rest of the sheet. The index only tracks which cells exist,
+    so editing cell["value"] in place keeps it valid; adding or removing cells
+    rebuilds it on next use.
+
+    Cells are kept as the handler's dicts under (row, column) keys, so the
+    sheet costs the same as the plain dict it replaced. Packing them more
+    tightly is out of scope: callers check isinstance(data, dict) and edit
+    cells in place. The row index (one tuple of columns per row) is the
+    only extra memory, unit_test keeps it under an eighth of the sheet.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._rows = None
+        self._row_order = None
+
+    @classmethod
+    def from_handler_output(cls, raw_data):
+        """Build from ExcelHandler output keyed by "row,col" strings."""
+        sheet = cls()
+        for key, value in raw_data.items():
+            try:
+                row, column = key.split(",")
+                dict.__setitem__(sheet, (int(row), int(column)), value)
+            except Exception:
+                print ("Error converting key: {}".format(key))
+                print (ERROR_HANDLE.get_alternative_traceback())
+        return sheet
+
+    def _invalidate(self):
+        self._rows = None
+        self._row_order = None
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._invalidate()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._invalidate()
+        dict.__delitem__(self, key)
+
+    def pop(self, *args):
+        self._invalidate()
+        return dict.pop(self, *args)
+
+    def clear(self):
+        self._invalidate()
+        dict.clear(self)
+
+    def update(self, *args, **kwargs):
+        self._invalidate()
+        dict.update(self, *args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._invalidate()
+        return dict.setdefault(self, key, default)
+
+    def _build_index(self):
+        if self._rows is not None:
+            return
+        rows = defaultdict(list)
+        for row, column in self.keys():
+            rows[row].append(column)
+        # swap each list for a tuple as we go, tuples do not over-allocate
+        for row in list(rows.keys()):
+            rows[row] = tuple(sorted(rows[row]))
+        self._rows = dict(rows)
+        self._row_order = sorted(self._rows.keys())
+
+    def row_numbers(self):
+        """Get the rows that hold at least one cell, in order."""
+        self._build_index()
+        return list(self._row_order)
+
+    def column_numbers(self):
+        """Get the columns that hold at least one cell, in order."""
+        self._build_index()
+        columns = set()
+        for row_columns in self._rows.values():
+            columns.update(row_columns)
+        return sorted(columns)
+
+    @property
+    def max_row(self):
+        self._build_index()
+        return self._row_order[-1] if self._row_order else 0
+
+    @property
+    def max_column(self):
+        self._build_index()
+        return max(columns[-1] for columns in self._rows.values()) if self._rows else 0
+
+    def get_row(self, row):
+        """Get one row as {column: cell}, empty cells are absent."""
+        self._build_index()
+        return dict((column, self[(row, column)]) for column in self._rows.get(row, []))
+
+    def iter_rows(self, start_row=None):
+        """Lazily yield (row, {column: cell}) in row order, skipping empty rows.
+
+        Args:
+            start_row (int, optional): First row to yield. Defaults to all.
+        """
+        self._build_index()
+        for row in self._row_order:
+            if start_row is not None and row < start_row:
+                continue
+            yield row, self.get_row(row)
+
+    def iter_column(self, column):
+        """Lazily yield (row, cell) for one column in row order."""
+        self._build_index()
+        for row in self._row_order:
+            if (row, column) in self:
+                yield row, self[(row, column)]
+
+    def to_list(self, empty_cell=None):
+        """Dense list of rows, starting at row 1 and column 1.
+
+        Args:
+            empty_cell (any, optional): Filler for missing cells. Defaults to {}.
+        """
+        OUT = []
+        max_column = self.max_column
+        for row in range(1, self.max_row + 1):
+            row_data = []
+            for column in range(1, max_column + 1):
+                cell = self.get((row, column))
+                if cell is None:
+                    cell = {} if empty_cell is None else empty_cell
+                row_data.append(cell)
+            OUT.append(row_data)
+        return OUT
+
+
 def get_all_worksheets(filepath):
     """List all worksheets in an Excel file.
 
@@ -567,36 +713,12 @@ def _read_data_from_excel_locally(filepath, worksheet, return_dict, headless):
             "mode": "read",
             "filepath": filepath,
             "worksheet": worksheet,
-            # explicit pending status so we never accept a leftover "done"
-            # from a previous run as the answer to this job
-            "status": "pending",
         }
-        # Clear stale output up-front to avoid silently inheriting the previous
-        # run's data if ExcelHandler crashes before writing fresh output.
-        DATA_FILE.set_data({}, "excel_handler_output")
-        DATA_FILE.set_data(job_data, "excel_handler_input")
-        EXE.try_open_app("ExcelHandler")
-
-        max_wait = 1000
-        wait = 0
-        finished = False
-        handler_error = None
-        handler_warnings = []
-        last_status = None
-        while wait < max_wait:
-            current = DATA_FILE.get_data("excel_handler_input")
-            last_status = current.get("status")
-            if last_status == "done":
-                finished = True
-                handler_warnings = current.get("warnings", []) or []
-                break
-            if last_status == "error":
-                handler_error = current.get("error", "(no error message provided)")
-                break
-            time.sleep(0.1)
-            wait += 1
-
-        if handler_error is not None:
+        max_wait = 100
+        result = JOB_CHANNEL.EXCEL_HANDLER.run(job_data, timeout=max_wait)
+
+        if result.status == JOB_CHANNEL.STATUS_ERROR:
+            handler_error = result.error
             NOTIFICATION.messenger(
                 "ExcelHandler reported an error while reading\n{}\nsheet '{}':\n{}".format(
                     filepath, worksheet, handler_error
@@ -605,17 +727,20 @@ def _read_data_from_excel_locally(filepath, worksheet, return_dict, headless):
             print("ExcelHandler reported an error: {}".format(handler_error))
             return {} if return_dict else []
 
-        if not finished:
+        if not result.is_done:
+            last_status = result.job_data.get("status")
             NOTIFICATION.messenger(
                 "ExcelHandler did not finish within {:.0f}s for\n{}\nsheet '{}'.\n"
                 "Last status: {}. Likely causes: handler exe crashed, file is "
                 "locked, or worksheet was renamed/removed after picking.".format(
-                    max_wait * 0.1, filepath, worksheet, last_status
+                    max_wait, filepath, worksheet, last_status
                 )
             )
             print("ExcelHandler timed out, last status: {}".format(last_status))
             return {} if return_dict else []
 
+        handler_warnings = result.warnings
+
         # Surface any non-fatal hints the handler attached (e.g. Conditional
         # Formatting present, theme-color resolution failures). The print()
         # always goes to pyRevit output for triage; the toast is gated behind
@@ -628,36 +753,12 @@ def _read_data_from_excel_locally(filepath, worksheet, return_dict, headless):
             if USER.IS_DEVELOPER:
                 NOTIFICATION.messenger("Excel warning: {}".format(warn))
 
-        raw_data = DATA_FILE.get_data("excel_handler_output")
-        # Convert string keys back to tuple keys
-        converted_data = {}
-        for key, value in raw_data.items():
-            try:
-                row, column = map(int, key.split(','))
-                converted_data[(row, column)] = value
-            except:
-                print ("Error converting key: {}".format(key))
-                print (ERROR_HANDLE.get_alternative_traceback())
+        # Convert "row,col" string keys back to tuple keys once, with row/column indexes on demand
+        converted_data = SparseSheet.from_handler_output(result.output or {})
             
         if not return_dict:
-            # convert the converted_data to a list of lists, sorted by row, adding missing rows with empty strings. the coumn count need to match the max column count in the data
-            if not converted_data:
-                # empty sheet (or no convertible keys), max() would raise ValueError
-                return []
-            max_column = max(column for row, column in converted_data.keys())
-            max_row = max(row for row, column in converted_data.keys())
-            OUT = []
-            for row in range(max_row):
-                row += 1 # because the row index is 1-based, so need to shift it
-                row_data = []
-                for column in range( max_column):
-                    column += 1 # because the column index is 1-based, so need to shift it
-                    if (row, column) in converted_data:
-                        row_data.append(converted_data[(row, column)])
-                    else:
-                        row_data.append({})
-                OUT.append(row_data)
-            return OUT
+            # dense list of lists, row and column index are 1-based, missing cells become {}
+            return converted_data.to_list()
 
 
         return converted_data
@@ -745,6 +846,11 @@ def get_column_values(data, column, start_from_zero=False):
     """
     column = get_column_index(column, start_from_zero)
     result = defaultdict(list)
+    if isinstance(data, SparseSheet):
+        # column index, only this column's cells are visited
+        for row, value_dict in data.iter_column(column):
+            result[value_dict["value"]].append(row)
+        return dict(result)
     for key, value_dict in data.items():
         if key[1] == column:
             result[value_dict["value"]].append(key[0])
@@ -772,6 +878,11 @@ def search_row_in_column_by_value(data, column, search_value, is_fuzzy=False, st
         print ("search value changed from [{}] --> [{}]".format(search_value, new_search_value))
         search_value = new_search_value
         
+    if isinstance(data, SparseSheet):
+        for row, value_dict in data.iter_column(column):
+            if value_dict["value"] == search_value:
+                return row
+        return None
 
     for key in data.keys():
         data_row, data_column = key
@@ -873,18 +984,8 @@ def save_data_to_excel(data, filepath, worksheet=ENVIRONMENT.PLUGIN_NAME, open_a
             "data": ExcelDataItem.convert_datas_to_dict(data)
         }
     
-        DATA_FILE.set_data(job_data, "excel_handler_input")
-        DATA_FILE.set_data(job_data, "DEBUGER_excel_handler_input")
-
-        EXE.try_open_app("ExcelHandler")
-        max_wait = 100
-        wait = 0
-        while wait<max_wait:
-            job_data = DATA_FILE.get_data("excel_handler_input")
-            if job_data.get("status") == "done":
-                break
-            time.sleep(0.1)
-            wait += 1
+        JOB_CHANNEL.EXCEL_HANDLER.run(job_data, timeout=10,
+                                  debug_copy_file="DEBUGER_excel_handler_input")
 
         return True
     
@@ -959,6 +1060,14 @@ def get_header_map(data, header_row=1):
     """Get a map of header to column index."""
     header_dict = {}
     
+    if isinstance(data, SparseSheet):
+        for column, value_dict in data.get_row(header_row).items():
+            header = value_dict["value"]
+            if not header or header == "None":
+                continue
+            header_dict[column] = header
+        return header_dict
+
     for key, value_dict in data.items():
         try:
             row, column = key
@@ -1112,7 +1221,11 @@ def parse_excel_data(data, key_name, header_row=1, ignore_keywords=None):
         result_dict[key_value] = RowData(row_data, row_number)
     
     # Sort keys to process row by row
-    sorted_keys = sorted(data.keys())
+    if isinstance(data, SparseSheet):
+        sorted_keys = [(row, column) for row, cells in data.iter_rows(header_row + 1)
+                       for column in sorted(cells.keys())]
+    else:
+        sorted_keys = sorted(data.keys())
     
     for location_key in sorted_keys:
         row, column = location_key
@@ -1243,20 +1356,8 @@ def update_excel_data(existing_excel,
             "data": {"update_data": update_data_dict, "append_data": append_data_dict}
         }
     
-    DATA_FILE.set_data(job_data, "excel_handler_input")
-    DATA_FILE.set_data(job_data, "DEBUGER_excel_handler_input")
-
-    EXE.try_open_app("ExcelHandler")
-    max_wait = 100
-    wait = 0
-    while wait<max_wait:
-        job_data = DATA_FILE.get_data("excel_handler_input")
-        if job_data.get("status") == "done":
-            break
-        time.sleep(0.1)
-        wait += 1
-
-
+    JOB_CHANNEL.EXCEL_HANDLER.run(job_data, timeout=10,
+                                  debug_copy_file="DEBUGER_excel_handler_input")
 
     
     if open_after and os.path.exists(existing_excel):
@@ -1315,6 +1416,53 @@ def sample_excel_writer_by_pointer():
     collection.add(ExcelDataItem("as dedicated item", 10, "B"))
     collection.save("output.xlsx")               
 
+def unit_test():
+    sheet = SparseSheet.from_handler_output({
+        "1,1": {"value": "NAME"}, "1,3": {"value": "AREA"},
+        "2,1": {"value": "Lobby"}, "2,3": {"value": 120},
+        "4,1": {"value": "Office"}, "4,3": {"value": 80},
+    })
+    assert sheet[(2, 3)]["value"] == 120
+    assert [row for row, _ in sheet.iter_rows()] == [1, 2, 4]
+    assert sheet.get_row(3) == {}
+    assert get_header_map(sheet, 1) == {1: "NAME", 3: "AREA"}
+    assert get_column_values(sheet, 1, start_from_zero=True) == {"NAME": [1], "Lobby": [2], "Office": [4]}
+    assert search_row_in_column_by_value(sheet, 1, "Office", start_from_zero=True) == 4
+    dense = sheet.to_list()
+    assert len(dense) == 4 and len(dense[0]) == 3 and dense[2][0] == {}
+
+    sheet[(5, 2)] = {"value": "added"}
+    assert sheet.max_row == 5 and sheet.column_numbers() == [1, 2, 3]
+    parsed = parse_excel_data(sheet, "NAME", header_row=1)
+    assert sorted(parsed.keys()) == ["Lobby", "Office"]
+    sheet[(2, 1)]["value"] = "Atrium"
+    assert list(sheet.iter_column(1))[1] == (2, {"value": "Atrium"})
+
+    try:
+        import tracemalloc
+    except ImportError:
+        return  # IronPython, memory is only measured on CPython
+    raw = dict(("{},{}".format(row, column), {"value": row * column})
+               for row in range(1, 2001) for column in range(1, 21))
+
+    def traced(action):
+        # (bytes still held, peak bytes) allocated while running action
+        tracemalloc.start()
+        try:
+            result = action()
+            held, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, held, peak
+
+    big_sheet, sheet_bytes, _ = traced(lambda: SparseSheet.from_handler_output(raw))
+    _, index_bytes, index_peak = traced(big_sheet.row_numbers)
+    print ("SparseSheet: {} cells take {} KB, row index {} KB (peak {} KB while building)".format(
+        len(big_sheet), sheet_bytes // 1024, index_bytes // 1024, index_peak // 1024))
+    assert index_bytes < sheet_bytes / 8
+    assert index_peak < sheet_bytes / 6
+
+
 #################  MAIN  #################
 
 if __name__ == "__main__":
@@ -369,43 +369,56 @@ def copy_file_to_local_dump_folder(original_path, file_name=None, ignore_warning
     return local_path
 
 
-def backup_data(data_file_name, backup_folder_title, max_time=60 * 60 * 24 * 7):
+def backup_data(data_file_name, backup_folder_title, max_time=60 * 60 * 24 * 7, is_folder=False):
     """Create scheduled backups of data files.
 
     Decorator that creates timestamped backups of data files at specified intervals.
     Backups are stored in a dedicated backup folder within the EA dump folder.
 
+    The backup is a MAINTENANCE task, so a decorated call only checks the
+    persisted "last backup" marker instead of listing the backup folder.
+    A missing source or a failed copy leaves the task due, the next
+    decorated call tries again.
+
     Args:
         data_file_name (str): Name of file to backup
         backup_folder_title (str): Name for backup folder
         max_time (int, optional): Backup interval in seconds.
             Defaults to 7 days (604800 seconds).
+        is_folder (bool, optional): data_file_name is a folder in the EA dump
+            folder, such as a LOG_STORE segment store, copied as a whole.
+            Defaults to False.
 
     Returns:
         function: Decorated function that performs backup
     """
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            out = func(*args, **kwargs)
+    import MAINTENANCE
+    task_name = "backup_" + backup_folder_title
 
-            # Check if source file exists before proceeding
+    def backup(run):
+        # Check if source file exists before proceeding
+        if is_folder:
+            source_file = get_local_dump_folder_folder(data_file_name)
+        else:
             source_file = get_local_dump_folder_file(data_file_name)
-            if not os.path.exists(source_file):
-                return out
-
-            backup_folder = get_local_dump_folder_file("backup_" + backup_folder_title)
-            if not os.path.exists(backup_folder):
-                os.makedirs(backup_folder)
-
-            # Get today's date once
-            today = time.strftime("%Y-%m-%d")
-            
-            # Check if backup exists for today
-            today_backup = os.path.join(backup_folder, "{}_{}".format(today, data_file_name))
-            if os.path.exists(today_backup):
-                return out
-
-            # Find latest backup date
+        if not os.path.exists(source_file):
+            return False
+
+        backup_folder = get_local_dump_folder_file("backup_" + backup_folder_title)
+        if not os.path.exists(backup_folder):
+            os.makedirs(backup_folder)
+
+        # Get today's date once
+        today = time.strftime("%Y-%m-%d")
+
+        # Check if backup exists for today
+        today_backup = os.path.join(backup_folder, "{}_{}".format(today, data_file_name))
+        if os.path.exists(today_backup):
+            return
+
+        if not MAINTENANCE.get_scheduler().get_last_ran(task_name):
+            # No marker yet, look once for the latest backup made before
+            # the scheduler existed.
             latest_backup_date = None
             for filename in os.listdir(backup_folder):
                 if not filename.endswith(PLUGIN_EXTENSION):
@@ -421,14 +434,31 @@ def backup_data(data_file_name, backup_folder_title, max_time=60 * 60 * 24 * 7):
             # Skip if latest backup is within max_time
             if latest_backup_date:
                 if (time.mktime(time.strptime(today, "%Y-%m-%d")) - time.mktime(latest_backup_date)) <= max_time:
-                    return out
+                    run.ran_at = time.mktime(latest_backup_date)
+                    return
 
-            # Create new backup
-            try:
-                COPY.copyfile(source_file, today_backup)
-            except Exception as e:
-                print("Backup failed: %s" % str(e))
+        # Create new backup
+        try:
+            if is_folder:
+                # copied aside first so a failed copy never counts as today's backup
+                temp_backup = today_backup + ".tmp"
+                if os.path.exists(temp_backup):
+                    shutil.rmtree(temp_backup)
+                shutil.copytree(source_file, temp_backup)
+                os.rename(temp_backup, today_backup)
+            elif not COPY.copyfile(source_file, today_backup):
+                ERROR_HANDLE.print_note("Backup of {} failed".format(data_file_name))
+                return False
+        except Exception as e:
+            ERROR_HANDLE.print_note("Backup of {} failed: {}".format(data_file_name, e))
+            return False
 
+    MAINTENANCE.register_task(task_name, backup, interval=max_time)
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            out = func(*args, **kwargs)
+            MAINTENANCE.run_if_due(task_name)
             return out
 
         return wrapper
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Helper Job Channel
+
+Round-trips with external helper executables (ExcelHandler and friends)
+follow one file protocol: write a job dict to "<app>_input" in the dump
+folder, launch the exe, wait until the exe writes status "done" or "error"
+back into that same file, then read the optional "<app>_output" file.
+
+The old loops re-read and re-parsed the input file every 0.1 s, so a job
+always finished on a 100 ms boundary and two jobs started at the same time
+overwrote each other's input. This channel:
+
+    - tags every job with a unique job_id
+    - owns the input/output pair through a cross-process lock file, so a
+      second job waits for the first instead of clobbering it
+    - wakes on file change notification (.NET FileSystemWatcher) and falls
+      back to cheap os.stat polling, the JSON is only parsed when the file
+      actually changed
+
+Example:
+    channel = JobChannel("ExcelHandler", "excel_handler_input", "excel_handler_output")
+    result = channel.run({"mode": "read", "filepath": path, "worksheet": "Sheet1"})
+    if result.is_done:
+        cells = result.output
+
+Note:
+    The helper executables only know the fixed file names, there is no
+    socket or pipe endpoint on their side. The lock keeps each file pair
+    single-owner until that changes.
+"""
+
+import os
+import time
+import uuid
+import threading
+
+import EXE
+import FOLDER
+import DATA_FILE
+import ERROR_HANDLE
+
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+
+
+class JobResult:
+    """Outcome of one helper job.
+
+    Attributes:
+        job_id (str): Id written into the input file
+        status (str): done, error or timeout
+        job_data (dict): Final content of the input file
+        output (dict): Content of the output file, None if not requested
+        duration (float): Seconds from launch to completion
+    """
+
+    def __init__(self, job_id, status, job_data, output, duration):
+        self.job_id = job_id
+        self.status = status
+        self.job_data = job_data or {}
+        self.output = output
+        self.duration = duration
+
+    @property
+    def is_done(self):
+        return self.status == STATUS_DONE
+
+    @property
+    def error(self):
+        return self.job_data.get("error", "(no error message provided)")
+
+    @property
+    def warnings(self):
+        return self.job_data.get("warnings", []) or []
+
+    def __repr__(self):
+        return "JobResult({}, {}, {:.3f}s)".format(self.job_id, self.status, self.duration)
+
+
+def _get_signature(filepath):
+    try:
+        stat = os.stat(filepath)
+        return (stat.st_mtime, stat.st_size)
+    except (IOError, OSError):
+        return None
+
+
+class _FileWatcher:
+    """Wake up as soon as a file changes.
+
+    Uses System.IO.FileSystemWatcher when .NET is available; otherwise,
+    and as a safety net against missed events, compares os.stat signatures
+    every poll_interval seconds.
+    """
+
+    def __init__(self, filepath, poll_interval=0.02):
+        self.filepath = filepath
+        self.poll_interval = poll_interval
+        self.changed = threading.Event()
+        self.signature = _get_signature(filepath)
+        self._watcher = None
+        try:
+            from System.IO import FileSystemWatcher, NotifyFilters  # pyright: ignore
+            watcher = FileSystemWatcher(os.path.dirname(filepath), os.path.basename(filepath))
+            watcher.NotifyFilter = NotifyFilters.LastWrite | NotifyFilters.FileName | NotifyFilters.Size
+            handler = lambda sender, args: self.changed.set()
+            watcher.Changed += handler
+            watcher.Created += handler
+            watcher.Renamed += handler
+            watcher.EnableRaisingEvents = True
+            self._watcher = watcher
+            # with events available the stat check is only a safety net
+            self.poll_interval = 0.25
+        except Exception:
+            self._watcher = None
+
+    def wait(self, timeout):
+        """Block until the file changes or timeout passes.
+
+        Returns:
+            bool: True if the file changed
+        """
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            if self.changed.wait(min(self.poll_interval, remaining)):
+                self.changed.clear()
+            signature = _get_signature(self.filepath)
+            if signature != self.signature:
+                self.signature = signature
+                return True
+
+    def close(self):
+        if self._watcher is not None:
+            try:
+                self._watcher.EnableRaisingEvents = False
+                self._watcher.Dispose()
+            except Exception:
+                pass
+            self._watcher = None
+
+
+class _ChannelLock:
+    """Cross-process lock file in the dump folder.
+
+    The owner writes its pid and the time it will be done by into the lock.
+    Only a lock past that deadline is assumed to belong to a crashed host
+    and taken over, however short the waiting job's own timeout is. A lock
+    without a readable deadline falls back to stale_after seconds of age.
+    """
+
+    def __init__(self, name, stale_after):
+        self.path = FOLDER.get_local_dump_folder_file("{}.lock".format(name))
+        self.stale_after = stale_after
+        self.owned = False
+
+    def _is_stale(self):
+        try:
+            with open(self.path, "rb") as f:
+                content = f.read().decode("utf-8").split()
+            if len(content) >= 2:
+                return time.time() > float(content[1])
+        except (IOError, OSError, ValueError):
+            pass
+        # a lock being written right now or from an older version
+        return time.time() - os.path.getmtime(self.path) > self.stale_after
+
+    def acquire(self, timeout, hold_for):
+        """Take the lock, promising to release it within hold_for seconds."""
+        deadline = time.time() + timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, "{} {}".format(os.getpid(), time.time() + hold_for).encode("utf-8"))
+                os.close(fd)
+                self.owned = True
+                return True
+            except OSError:
+                try:
+                    if self._is_stale():
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+            if time.time() > deadline:
+                return False
+            time.sleep(0.02)
+
+    def release(self):
+        if not self.owned:
+            return
+        self.owned = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class JobChannel:
+    """One helper exe plus the dump folder file pair it reads and writes.
+
+    Args:
+        app_name (str): Exe name passed to EXE.try_open_app
+        input_file (str): Dump folder file the exe reads the job from
+        output_file (str, optional): Dump folder file the exe writes results to
+    """
+
+    def __init__(self, app_name, input_file, output_file=None):
+        self.app_name = app_name
+        self.input_file = input_file
+        self.output_file = output_file
+
+    def run(self, job_data, timeout=100, lock_timeout=None, debug_copy_file=None, launcher=None):
+        """Submit a job, launch the helper and wait for its answer.
+
+        Args:
+            job_data (dict): Job description, job_id and status are added
+            timeout (float, optional): Seconds to wait for the helper. Defaults to 100.
+            lock_timeout (float, optional): Seconds to wait for a job already
+                running on this channel. Defaults to timeout.
+            debug_copy_file (str, optional): Extra dump folder copy of the job for debugging.
+            launcher (callable, optional): Replaces EXE.try_open_app, mostly for testing.
+
+        Returns:
+            JobResult: status is done, error or timeout
+        """
+        if lock_timeout is None:
+            lock_timeout = timeout
+        lock = _ChannelLock(self.input_file, stale_after=max(timeout, lock_timeout) * 2)
+        # twice our own timeout leaves room for writing the job and reading the output
+        if not lock.acquire(lock_timeout, hold_for=timeout * 2):
+            ERROR_HANDLE.print_note("{} is busy with another job, giving up after {}s".format(
+                self.app_name, lock_timeout))
+            return JobResult(None, STATUS_TIMEOUT, {"error": "channel busy"}, None, 0)
+
+        input_path = FOLDER.get_local_dump_folder_file(self.input_file)
+        job_id = uuid.uuid4().hex
+        job_data = dict(job_data)
+        job_data["job_id"] = job_id
+        # explicit pending status so we never accept a leftover "done"
+        # from a previous run as the answer to this job
+        job_data["status"] = STATUS_PENDING
+
+        try:
+            # Clear stale output up-front to avoid silently inheriting the previous
+            # run's data if the helper crashes before writing fresh output.
+            if self.output_file:
+                DATA_FILE.set_data({}, self.output_file)
+            DATA_FILE.set_data(job_data, self.input_file)
+            if debug_copy_file:
+                DATA_FILE.set_data(job_data, debug_copy_file)
+
+            watcher = _FileWatcher(input_path)
+            try:
+                t_start = time.time()
+                (launcher or EXE.try_open_app)(self.app_name)
+                current, status = job_data, STATUS_TIMEOUT
+                while True:
+                    remaining = timeout - (time.time() - t_start)
+                    if remaining <= 0:
+                        break
+                    if not watcher.wait(remaining):
+                        continue
+                    current = DATA_FILE.get_data(input_path) or {}
+                    # a helper that rewrites the file without job_id is still answering us
+                    if current.get("job_id", job_id) != job_id:
+                        continue
+                    if current.get("status") in (STATUS_DONE, STATUS_ERROR):
+                        status = current.get("status")
+                        break
+                duration = time.time() - t_start
+            finally:
+                watcher.close()
+
+            output = None
+            if self.output_file and status == STATUS_DONE:
+                output = DATA_FILE.get_data(self.output_file)
+            return JobResult(job_id, status, current, output, duration)
+        finally:
+            lock.release()
+
+
+EXCEL_HANDLER = JobChannel("ExcelHandler", "excel_handler_input",
+                           output_file="excel_handler_output")
+
+
+def unit_test():
+    """Simulate a helper exe with a thread and check handshake and locking."""
+    channel = JobChannel("FakeHandler", "unit_test_job_channel_input",
+                         output_file="unit_test_job_channel_output")
+
+    def fake_launcher(app_name, delay=0.2):
+        def work():
+            time.sleep(delay)
+            job = DATA_FILE.get_data(channel.input_file)
+            DATA_FILE.set_data({"echo": job["payload"]}, channel.output_file)
+            job["status"] = STATUS_DONE
+            DATA_FILE.set_data(job, channel.input_file)
+        worker = threading.Thread(target=work)
+        worker.daemon = True
+        worker.start()
+
+    result = channel.run({"payload": 1}, timeout=5, launcher=fake_launcher)
+    assert result.is_done, result
+    assert result.output == {"echo": 1}
+    # finished close to the helper's own 0.2s, not on a 0.1s polling grid
+    assert result.duration < 0.5, result.duration
+
+    results = []
+
+    def run_one(payload):
+        results.append(channel.run({"payload": payload}, timeout=5, launcher=fake_launcher))
+
+    threads = [threading.Thread(target=run_one, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(x.output["echo"] for x in results) == [0, 1, 2]
+    assert len(set(x.job_id for x in results)) == 3
+
+    # a short job arriving late in a long job's run waits for it, even
+    # though the lock is older than twice the short job's own timeout
+    long_results = []
+    long_job = threading.Thread(target=lambda: long_results.append(channel.run(
+        {"payload": "long"}, timeout=8, launcher=lambda app_name: fake_launcher(app_name, delay=3.0))))
+    long_job.start()
+    time.sleep(2.5)
+    short_result = channel.run({"payload": "short"}, timeout=0.5, lock_timeout=1.2,
+                               launcher=lambda app_name: fake_launcher(app_name, delay=0.1))
+    long_job.join()
+    assert long_results[0].is_done and long_results[0].output == {"echo": "long"}, long_results
+    assert short_result.is_done and short_result.output == {"echo": "short"}, short_result
+
+
+if __name__ == "__main__":
+    unit_test()
@@ -13,7 +13,7 @@ Key Features:
     - Automatic log file backup
     - User-specific log files
     - Context manager for temporary logging
-    - JSON-based log storage
+    - Append-only JSON-lines log storage (see LOG_STORE)
     - UTF-8 encoding support
 
 Note:
@@ -31,7 +31,8 @@ import traceback
 import USER
 import TIME
 import FOLDER
-import DATA_FILE
+import LOG_STORE
+import TELEMETRY
 import ENVIRONMENT
 import ERROR_HANDLE
 
@@ -125,7 +126,8 @@ def log_usage(func, *args):
 whereas revit need to look at local func run"""
 
 
-@FOLDER.backup_data(LOG_FILE_NAME, "log")
+# backs up the segment store, the legacy .sexyDuck file is no longer written
+@FOLDER.backup_data(LOG_FILE_NAME, "log", is_folder=True)
 def log(script_path, func_name_as_record):
     """Decorator for persistent function usage logging.
     
@@ -154,25 +156,30 @@ def log(script_path, func_name_as_record):
     def decorator(func):
         def wrapper(*args, **kwargs):
             try:
-                # Get environment name before entering the context manager
+                # Get environment name before running the wrapped call
                 app_name = ERROR_HANDLE.get_app_name()
                 
-                with DATA_FILE.update_data(LOG_FILE_NAME) as data:
-                    t_start = time.time()
-                    out = func(*args, **kwargs)
-                    t_end = time.time()
-                    if not data:
-                        data = dict()
-                    data[TIME.get_formatted_current_time()] = {
-                        "application": app_name,
-                        "function_name": func_name_as_record.replace("\n", " "),
-                        "arguments": args,
-                        "result": str(out),
-                        "script_path": script_path,
-                        "duration": TIME.get_readable_time(t_end - t_start),
-                    }
+                t_start = time.time()
+                out = func(*args, **kwargs)
+                t_end = time.time()
 
-                    # print ("data to be place in log is ", data)
+                # One appended line per call, cost does not grow with history.
+                # Must never fall through to the outer except, which would
+                # run the wrapped call a second time.
+                try:
+                    LOG_STORE.get_user_store(LOG_FILE_NAME).append(
+                        TIME.get_formatted_current_time(),
+                        {
+                            "application": app_name,
+                            "function_name": func_name_as_record.replace("\n", " "),
+                            "arguments": args,
+                            "result": str(out),
+                            "script_path": script_path,
+                            "duration": TIME.get_readable_time(t_end - t_start),
+                        },
+                    )
+                except Exception as e:
+                    ERROR_HANDLE.print_note("Failed to append usage log: {}".format(e))
 
                 # Send usage data to Google Form (legacy) and InfraWatch (primary).
                 # Both are best-effort and must never break the wrapped call.
@@ -180,17 +187,9 @@ def log(script_path, func_name_as_record):
                 # 100k-row tab cap on 2026-03-24 and silently dropped writes
                 # for ~6 weeks before being noticed. Once InfraWatch ingestion
                 # has 2 weeks of healthy traffic, the Form path can be removed.
-                try:
-                    environment = app_name
-                    function_name = func_name_as_record.replace("\n", " ")
-                    result = str(out)
-                    send_usage_to_google_form(environment, function_name, result)
-                except Exception:
-                    pass
-                try:
-                    send_usage_to_infrawatch(environment, function_name, result)
-                except Exception:
-                    pass
+                # Delivery happens on the telemetry worker thread, so button
+                # latency never includes a network round-trip.
+                submit_usage(app_name, func_name_as_record.replace("\n", " "), str(out))
 
                 return out
             except:
@@ -205,19 +204,26 @@ def log(script_path, func_name_as_record):
 def read_log(user_name=USER.USER_NAME):
     """Display formatted log entries for a specific user.
     
-    Retrieves and pretty prints the JSON log data for the specified user,
+    Streams the segmented usage log of the specified user oldest first,
     showing all recorded function executions and their details.
 
     Args:
         user_name (str, optional): Username to read logs for.
             Defaults to current user.
 
+    Returns:
+        int: Number of entries printed
+
     Note:
         Output is formatted with proper indentation for readability.
     """
-    data = DATA_FILE.get_data(LOG_FILE_NAME)
+    store = LOG_STORE.get_user_store("log_{}".format(user_name))
     print("Printing user log from <{}>".format(user_name))
-    pprint.pprint(data, indent=4)
+    count = 0
+    for time_key, entry in store.iter_entries():
+        pprint.pprint({time_key: entry}, indent=4)
+        count += 1
+    return count
 
 
 INFRAWATCH_USAGE_URL = "https://enneadtab.com/infra/api/ingest/usage"
@@ -247,6 +253,51 @@ def _build_infrawatch_payload(environment, function_name, result):
     }
 
 
+def _send_usage_batch(events):
+    """Deliver a batch of queued usage events, runs on the telemetry worker.
+
+    The Google Form copy is sent once and never retried, only the InfraWatch
+    POST decides whether an event goes back for retry or to the spool.
+
+    Args:
+        events (list): Events built by submit_usage
+
+    Returns:
+        list: Events whose InfraWatch POST failed
+    """
+    failed = []
+    for event in events:
+        form_args = event.pop("google_form", None)
+        if form_args:
+            try:
+                send_usage_to_google_form(*form_args)
+            except Exception:
+                pass
+        if not TELEMETRY.post_json(INFRAWATCH_USAGE_URL, event["infrawatch"]):
+            failed.append(event)
+    return failed
+
+
+def submit_usage(environment, function_name, result):
+    """Queue a usage event for background delivery to InfraWatch and Google Form.
+
+    Returns immediately, the payload is built here so occurred_at reflects
+    the moment of the call rather than the moment of delivery.
+
+    Args:
+        environment (str): The application environment
+        function_name (str): The name of the function that was executed
+        result (str): The result of the function execution
+    """
+    try:
+        TELEMETRY.get_dispatcher("usage", _send_usage_batch).submit({
+            "infrawatch": _build_infrawatch_payload(environment, function_name, result),
+            "google_form": [environment, function_name, result],
+        })
+    except Exception as e:
+        ERROR_HANDLE.print_note("Failed to queue usage event: {}".format(e))
+
+
 def send_usage_to_infrawatch(environment, function_name, result):
     """Send usage event to InfraWatch Postgres-backed ingestion.
 
@@ -589,8 +640,8 @@ def unit_test():
     # Test 2: Log reading functionality
     print("\n2. Testing log reading...")
     try:
-        log_data = read_log()
-        print("   [PASS] Log reading test passed - Found {} entries".format(len(log_data) if log_data else 0))
+        log_count = read_log()
+        print("   [PASS] Log reading test passed - Found {} entries".format(log_count))
     except Exception as e:
         print("   [FAIL] Log reading test failed: {}".format(e))
     
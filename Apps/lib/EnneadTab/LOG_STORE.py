@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Usage Log Store
+
+Append-only storage backend for the usage log written by LOG.log.
+
+The legacy log was a single JSON dict in the dump folder that was read and
+rewritten in full on every button click, so the cost of logging grew with
+the size of the user's history. This store writes one JSON line per event
+into a monthly segment file instead, so an append costs the same no matter
+how many events came before it.
+
+Key Features:
+    - One JSON line per event, appended to a per-month segment file
+    - Streaming reads over all segments in chronological order
+    - Compaction of closed months (drop torn lines, dedupe, sort)
+    - One-time import of the legacy .sexyDuck log dict
+    - Benchmark comparing append cost against the legacy rewrite
+
+Layout:
+    <dump folder>/log_<user>/
+        2024-01.jsonl
+        2024-02.jsonl
+        manifest.json      -> {"legacy_imported": true, "compacted": ["2024-01"]}
+
+Note:
+    A line that was torn by a crash or by two hosts appending at the same
+    moment is skipped by the reader and dropped at compaction time, it never
+    breaks the rest of the log. The next append starts on a new line after
+    it.
+"""
+
+import os
+import io
+import json
+import time
+import shutil
+
+import FOLDER
+
+SEGMENT_EXTENSION = ".jsonl"
+MANIFEST_FILE = "manifest.json"
+TIME_KEY = "time"
+
+
+def _month_of_key(time_key):
+    """Get the segment name for a formatted time key.
+
+    Args:
+        time_key (str): Time formatted as 2023-05-16_11-33-55
+
+    Returns:
+        str: Month part, e.g. 2023-05
+    """
+    return time_key[:7]
+
+
+def _dump_line(record):
+    # ensure_ascii keeps every line plain ascii so IronPython and CPython
+    # write byte-identical segments; default=str covers Revit objects in args.
+    return json.dumps(record, ensure_ascii=True, sort_keys=True, default=str) + "\n"
+
+
+def _line_break_needed(path):
+    """True when the file ends in a torn line, an append must start a new line."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except (IOError, OSError):
+        # missing or empty
+        return False
+
+
+def _append_lines(segment_path, text):
+    if _line_break_needed(segment_path):
+        # keep the first record off a line torn by a crash
+        text = u"\n" + text
+    with io.open(segment_path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _iter_segment_lines(segment_path):
+    """Yield parsed records from one segment file, skipping torn lines."""
+    with io.open(segment_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+class SegmentLogStore:
+    """Append-only JSON-lines log split into monthly segments.
+
+    Args:
+        folder (str): Folder holding the segment files. Created if missing.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._manifest = None
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    # ------------------------------------------------------------------ manifest
+    def _manifest_path(self):
+        return os.path.join(self.folder, MANIFEST_FILE)
+
+    def get_manifest(self):
+        if self._manifest is None:
+            manifest = {}
+            path = self._manifest_path()
+            if os.path.exists(path):
+                try:
+                    with io.open(path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                except Exception:
+                    manifest = {}
+            manifest.setdefault("legacy_imported", False)
+            manifest.setdefault("compacted", [])
+            self._manifest = manifest
+        return self._manifest
+
+    def _save_manifest(self):
+        path = self._manifest_path()
+        temp_path = path + ".tmp"
+        with io.open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.get_manifest(), ensure_ascii=True, sort_keys=True))
+        _replace_file(temp_path, path)
+
+    # ------------------------------------------------------------------ segments
+    def get_segment_path(self, month):
+        return os.path.join(self.folder, month + SEGMENT_EXTENSION)
+
+    def list_months(self):
+        """Get all months that have a segment, oldest first.
+
+        Returns:
+            list: Month names such as ["2024-01", "2024-02"]
+        """
+        months = []
+        for file_name in os.listdir(self.folder):
+            if file_name.endswith(SEGMENT_EXTENSION):
+                months.append(file_name[:-len(SEGMENT_EXTENSION)])
+        return sorted(months)
+
+    def append(self, time_key, entry):
+        """Append one log event.
+
+        Cost is one open-append-close on the current month's segment,
+        independent of how much history exists.
+
+        Args:
+            time_key (str): Time formatted as 2023-05-16_11-33-55
+            entry (dict): Event details
+        """
+        record = dict(entry)
+        record[TIME_KEY] = time_key
+        _append_lines(self.get_segment_path(_month_of_key(time_key)), _dump_line(record))
+
+    def iter_entries(self, months=None):
+        """Stream every event, oldest segment first.
+
+        Args:
+            months (list, optional): Restrict to these months. Defaults to all.
+
+        Yields:
+            tuple: (time_key, entry dict)
+        """
+        for month in self.list_months():
+            if months is not None and month not in months:
+                continue
+            for record in _iter_segment_lines(self.get_segment_path(month)):
+                time_key = record.pop(TIME_KEY, None)
+                if time_key is None:
+                    continue
+                yield time_key, record
+
+    def count(self):
+        total = 0
+        for _ in self.iter_entries():
+            total += 1
+        return total
+
+    def compact(self, keep_open_month=True):
+        """Rewrite closed monthly segments in clean, sorted form.
+
+        Torn lines are dropped and duplicate time keys are collapsed to the
+        last one written, matching the overwrite behaviour of the legacy dict.
+        The current month stays untouched since it is still being appended to.
+
+        Args:
+            keep_open_month (bool, optional): Skip the current month.
+                Defaults to True.
+
+        Returns:
+            list: Months that were compacted in this run
+        """
+        manifest = self.get_manifest()
+        current_month = time.strftime("%Y-%m")
+        compacted = []
+        for month in self.list_months():
+            if keep_open_month and month >= current_month:
+                continue
+            if month in manifest["compacted"]:
+                continue
+            records = {}
+            for record in _iter_segment_lines(self.get_segment_path(month)):
+                time_key = record.get(TIME_KEY)
+                if time_key is not None:
+                    records[time_key] = record
+            segment_path = self.get_segment_path(month)
+            temp_path = segment_path + ".tmp"
+            with io.open(temp_path, "w", encoding="utf-8") as f:
+                for time_key in sorted(records.keys()):
+                    f.write(_dump_line(records[time_key]))
+            _replace_file(temp_path, segment_path)
+            manifest["compacted"].append(month)
+            compacted.append(month)
+
+        if compacted:
+            self._save_manifest()
+        return compacted
+
+    # ------------------------------------------------------------------ legacy
+    def import_legacy_once(self, legacy_path):
+        """Move the events of a legacy JSON dict log into segments, once.
+
+        The legacy file is left in place so older installs keep working.
+
+        Args:
+            legacy_path (str): Path to the old log_<user>.sexyDuck file
+
+        Returns:
+            int: Number of imported events, 0 if already imported or missing
+        """
+        manifest = self.get_manifest()
+        if manifest["legacy_imported"]:
+            return 0
+
+        imported = 0
+        if os.path.exists(legacy_path):
+            try:
+                with io.open(legacy_path, "r", encoding="utf-8") as f:
+                    legacy_data = json.load(f)
+            except Exception as e:
+                print("Cannot import legacy log {} because {}".format(legacy_path, e))
+                return 0
+
+            by_month = {}
+            for time_key, entry in (legacy_data or {}).items():
+                if not isinstance(entry, dict):
+                    continue
+                record = dict(entry)
+                record[TIME_KEY] = time_key
+                by_month.setdefault(_month_of_key(time_key), []).append(record)
+
+            for month, records in by_month.items():
+                records.sort(key=lambda x: x[TIME_KEY])
+                _append_lines(self.get_segment_path(month), u"".join(_dump_line(record) for record in records))
+                imported += len(records)
+
+        manifest["legacy_imported"] = True
+        self._save_manifest()
+        return imported
+
+
+def _replace_file(source, target):
+    # os.replace does not exist in IronPython 2.7
+    if os.path.exists(target):
+        os.remove(target)
+    shutil.move(source, target)
+
+
+_STORE_CACHE = {}
+
+
+def get_user_store(log_file_name):
+    """Get the segment store for a log file name.
+
+    The first call per session imports the legacy data once and compacts
+    any month that closed since the last run.
+
+    Args:
+        log_file_name (str): Legacy log name such as log_szhang
+
+    Returns:
+        SegmentLogStore: Store living in the local dump folder
+    """
+    store = _STORE_CACHE.get(log_file_name)
+    if store is None:
+        store = SegmentLogStore(FOLDER.get_local_dump_folder_folder(log_file_name))
+        store.import_legacy_once(FOLDER.get_local_dump_folder_file(log_file_name))
+        store.compact()
+        _STORE_CACHE[log_file_name] = store
+    return store
+
+
+def _make_fake_entry(i):
+    return {
+        "application": "revit",
+        "function_name": "fake_function_{}".format(i % 50),
+        "arguments": [],
+        "result": "None",
+        "script_path": "C:\\fake\\script_{}.py".format(i % 50),
+        "duration": "0.1 seconds",
+    }
+
+
+def _make_time_key(i):
+    # Spread fake events across two years so segments rotate.
+    month = 1 + (i // 1000) % 24
+    return "{}-{:02d}-01_00-{:02d}-{:02d}_{}".format(
+        2023 + (month - 1) // 12, (month - 1) % 12 + 1, (i // 60) % 60, i % 60, i)
+
+
+def benchmark(history_sizes=(1000, 10000, 50000), samples=50):
+    """Compare per-event logging cost of the legacy rewrite and the segment store.
+
+    The legacy path is simulated with the same read-whole-dict, add-one-key,
+    rewrite-whole-file cycle that DATA_FILE.update_data performs.
+
+    Args:
+        history_sizes (tuple, optional): Existing event counts to test against.
+        samples (int, optional): Appends timed per history size.
+
+    Returns:
+        dict: {history_size: (legacy_ms_per_event, segment_ms_per_event)}
+    """
+    import tempfile
+
+    results = {}
+    for size in history_sizes:
+        work_folder = tempfile.mkdtemp(prefix="log_store_bench_")
+        try:
+            legacy_path = os.path.join(work_folder, "legacy.sexyDuck")
+            history = dict((_make_time_key(i), _make_fake_entry(i)) for i in range(size))
+            with io.open(legacy_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(history, ensure_ascii=True))
+
+            store = SegmentLogStore(os.path.join(work_folder, "segments"))
+            store.import_legacy_once(legacy_path)
+
+            t_start = time.time()
+            for i in range(size, size + samples):
+                with io.open(legacy_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                data[_make_time_key(i)] = _make_fake_entry(i)
+                with io.open(legacy_path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(data, ensure_ascii=True, indent=4, sort_keys=True))
+            legacy_cost = (time.time() - t_start) * 1000.0 / samples
+
+            t_start = time.time()
+            for i in range(size, size + samples):
+                store.append(_make_time_key(i), _make_fake_entry(i))
+            segment_cost = (time.time() - t_start) * 1000.0 / samples
+
+            results[size] = (legacy_cost, segment_cost)
+            print("history {:>7}: legacy rewrite {:>9.3f} ms/event, segment append {:>7.3f} ms/event".format(
+                size, legacy_cost, segment_cost))
+        finally:
+            shutil.rmtree(work_folder, ignore_errors=True)
+    return results
+
+
+def unit_test():
+    import tempfile
+
+    work_folder = tempfile.mkdtemp(prefix="log_store_test_")
+    try:
+        legacy_path = os.path.join(work_folder, "log_tester.sexyDuck")
+        with io.open(legacy_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "2020-01-05_10-00-00": _make_fake_entry(1),
+                "2020-02-07_10-00-00": _make_fake_entry(2),
+            }))
+
+        store = SegmentLogStore(os.path.join(work_folder, "log_tester"))
+        assert store.import_legacy_once(legacy_path) == 2
+        assert store.import_legacy_once(legacy_path) == 0
+        assert store.list_months() == ["2020-01", "2020-02"]
+
+        store.append("2020-02-08_10-00-00", _make_fake_entry(3))
+        store.append("2020-02-08_10-00-00", _make_fake_entry(4))
+        with io.open(store.get_segment_path("2020-02"), "a", encoding="utf-8") as f:
+            f.write(u'{"torn": ')
+        assert store.count() == 4
+        # the next append starts on its own line instead of joining the torn one
+        store.append("2020-02-09_10-00-00", _make_fake_entry(5))
+        assert store.count() == 5
+
+        assert store.compact() == ["2020-01", "2020-02"]
+        entries = list(store.iter_entries())
+        assert [x[0] for x in entries] == ["2020-01-05_10-00-00",
+                                            "2020-02-07_10-00-00",
+                                            "2020-02-08_10-00-00",
+                                            "2020-02-09_10-00-00"]
+        assert entries[-2][1]["function_name"] == "fake_function_4"
+
+        reopened = SegmentLogStore(store.folder)
+        assert reopened.get_manifest()["legacy_imported"]
+        assert reopened.compact() == []
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Maintenance Scheduler
+
+Housekeeping (dump folder cleanup, legacy folder removal, data backups)
+used to run on the import path or on every decorated call, so a dump
+folder with tens of thousands of temp files slowed down the first button
+click of the day.
+
+Housekeeping is now a list of registered tasks that run while the host
+is idle, each run limited to a small time budget:
+
+    - every task has an interval, the time it last completed is kept in
+      a marker file in the dump folder so a new session does not redo work
+    - a task that runs out of budget keeps a cursor and resumes from it on
+      the next idle tick, see scan_folder for directory walks
+    - registering a task does no disk IO, nothing runs on import
+
+Example:
+    MAINTENANCE.register_task("purge_rfa", purge_func, interval=MAINTENANCE.DAY)
+    MAINTENANCE.attach_to_revit(__revit__)   # or attach_to_rhino()
+
+A task function receives a TaskRun and returns True (or None) when the
+pass is complete, False when it stopped early and wants to resume.
+"""
+
+import os
+import time
+import json
+import bisect
+import threading
+
+import ENVIRONMENT
+
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+STATE_FILE = os.path.join(ENVIRONMENT.DUMP_FOLDER, "maintenance_state.DuckLock")
+DEFAULT_BUDGET = 0.05  # seconds of work per idle tick
+MIN_IDLE_GAP = 2.0  # seconds between two idle ticks doing work
+
+
+class TaskRun:
+    """Time budget and resume cursor handed to a task function.
+
+    Attributes:
+        deadline (float): time.time() after which the task should stop
+        cursor: JSON friendly resume point, persisted between sessions
+        cache (dict): In-memory scratch space kept until the pass completes
+        ran_at (float): Set to backdate the completion marker, e.g. to the
+            time of work found already done. Defaults to now.
+    """
+
+    def __init__(self, deadline, cursor, cache):
+        self.deadline = deadline
+        self.cursor = cursor
+        self.cache = cache
+        self.ran_at = None
+
+    def out_of_time(self):
+        return time.time() >= self.deadline
+
+
+class _Task:
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cache = {}
+
+
+class MaintenanceScheduler:
+    """Registered maintenance tasks plus their persisted markers.
+
+    Args:
+        state_file (str): JSON file keeping last run time and cursor per task
+    """
+
+    def __init__(self, state_file=STATE_FILE):
+        self.state_file = state_file
+        self._tasks = []
+        self._task_by_name = {}
+        self._state = None
+        self._changed = set()
+        self._lock = threading.RLock()
+
+    def register_task(self, name, func, interval=DAY):
+        """Add a task, registering the same name again replaces it.
+
+        Args:
+            name (str): Unique name, used as key in the marker file
+            func (callable): func(run) -> False to resume later, anything else when done
+            interval (float): Seconds between two complete passes
+        """
+        with self._lock:
+            task = _Task(name, func, interval)
+            if name in self._task_by_name:
+                self._tasks = [x for x in self._tasks if x.name != name]
+            self._tasks.append(task)
+            self._task_by_name[name] = task
+
+    def _get_state(self):
+        if self._state is None:
+            self._state = {}
+            try:
+                with open(self.state_file, "r") as f:
+                    self._state = json.load(f)
+            except Exception:
+                pass
+        return self._state
+
+    def _save_state(self):
+        """Write back the entries this session changed.
+
+        Revit and Rhino can run at the same time, so the file is re-read and
+        only our own task entries are replaced.
+        """
+        if not self._changed:
+            return
+        merged = {}
+        try:
+            with open(self.state_file, "r") as f:
+                merged = json.load(f)
+        except Exception:
+            pass
+        for name in self._changed:
+            merged[name] = self._state[name]
+        try:
+            temp_file = self.state_file + ".tmp"
+            with open(temp_file, "w") as f:
+                json.dump(merged, f)
+            if os.path.exists(self.state_file):
+                os.remove(self.state_file)
+            os.rename(temp_file, self.state_file)
+            self._changed.clear()
+        except Exception:
+            pass
+
+    def get_last_ran(self, name):
+        """Time the task last completed a pass, 0 if never."""
+        with self._lock:
+            return self._get_state().get(name, {}).get("last_ran", 0)
+
+    def set_last_ran(self, name, timestamp=None):
+        """Record a completed pass, for work done outside of run_pending."""
+        with self._lock:
+            entry = self._get_state().setdefault(name, {})
+            entry["last_ran"] = time.time() if timestamp is None else timestamp
+            entry.pop("cursor", None)
+            self._changed.add(name)
+            self._save_state()
+
+    def is_due(self, name, now=None):
+        with self._lock:
+            task = self._task_by_name.get(name)
+            if task is None:
+                return False
+            entry = self._get_state().get(name, {})
+            if entry.get("cursor") is not None:
+                return True
+            return (now or time.time()) - entry.get("last_ran", 0) >= task.interval
+
+    def _run_task(self, task, deadline):
+        entry = self._get_state().setdefault(task.name, {})
+        run = TaskRun(deadline, entry.get("cursor"), task.cache)
+        try:
+            finished = task.func(run) is not False
+        except Exception:
+            # a broken task should not retry on every idle tick
+            finished = True
+        if finished:
+            entry["last_ran"] = run.ran_at or time.time()
+            entry.pop("cursor", None)
+            task.cache.clear()
+        else:
+            entry["cursor"] = run.cursor
+        self._changed.add(task.name)
+        return finished
+
+    def run_if_due(self, name, budget=None):
+        """Run one task now if it is due.
+
+        Returns:
+            bool: True if the task ran and completed its pass
+        """
+        with self._lock:
+            if not self.is_due(name):
+                return False
+            deadline = time.time() + (budget if budget is not None else 1e9)
+            finished = self._run_task(self._task_by_name[name], deadline)
+            self._save_state()
+            return finished
+
+    def run_pending(self, budget=DEFAULT_BUDGET):
+        """Run due tasks in registration order until the budget is spent.
+
+        Args:
+            budget (float): Seconds of work allowed for this call
+
+        Returns:
+            list: Names of the tasks that got time in this call
+        """
+        ran = []
+        if not self._lock.acquire(False):
+            return ran  # another idle tick is still busy
+        try:
+            t_start = time.time()
+            deadline = t_start + budget
+            for task in list(self._tasks):
+                if time.time() >= deadline:
+                    break
+                if not self.is_due(task.name, t_start):
+                    continue
+                ran.append(task.name)
+                self._run_task(task, deadline)
+            self._save_state()
+        finally:
+            self._lock.release()
+        return ran
+
+    def has_pending(self):
+        with self._lock:
+            now = time.time()
+            return any(self.is_due(task.name, now) for task in self._tasks)
+
+
+def scan_folder(folder, run, visit):
+    """Walk the entries of a folder in name order, resuming from run.cursor.
+
+    The listing is taken once per pass and kept in run.cache, later ticks
+    only pay for the entries they visit.
+
+    Args:
+        folder (str): Folder to walk
+        run (TaskRun): Current run, its cursor is the last visited name
+        visit (callable): visit(filename) for every entry
+
+    Returns:
+        bool: True when the whole folder has been visited
+    """
+    names = run.cache.get(folder)
+    if names is None:
+        try:
+            names = sorted(os.listdir(folder))
+        except OSError:
+            return True
+        run.cache[folder] = names
+
+    position = bisect.bisect_right(names, run.cursor) if run.cursor else 0
+    while position < len(names):
+        if run.out_of_time():
+            return False
+        visit(names[position])
+        run.cursor = names[position]
+        position += 1
+    return True
+
+
+def make_dump_cleanup_task(folder=None, max_age=None):
+    """Incremental version of ENVIRONMENT.cleanup_dump_folder."""
+    def cleanup(run):
+        target = folder or ENVIRONMENT.DUMP_FOLDER
+        cutoff_time = run.cache.setdefault(
+            "cutoff", time.time() - (max_age or ENVIRONMENT.DUMP_FILE_MAX_AGE))
+
+        def visit(filename):
+            if target == ENVIRONMENT.DUMP_FOLDER:
+                expired = ENVIRONMENT.is_expired_dump_file(filename, cutoff_time)
+            else:
+                path = os.path.join(target, filename)
+                expired = os.path.isfile(path) and os.path.getmtime(path) < cutoff_time
+            if expired:
+                try:
+                    os.remove(os.path.join(target, filename))
+                except OSError:
+                    pass
+        return scan_folder(target, run, visit)
+    return cleanup
+
+
+def _remove_legacy_paths(run):
+    ENVIRONMENT.remove_legacy_paths()
+
+
+_SCHEDULER = MaintenanceScheduler()
+_SCHEDULER.register_task("legacy_paths", _remove_legacy_paths, interval=DAY)
+_SCHEDULER.register_task("dump_folder_cleanup", make_dump_cleanup_task(), interval=DAY)
+
+
+def get_scheduler():
+    return _SCHEDULER
+
+
+def register_task(name, func, interval=DAY):
+    """Register a task on the shared scheduler, see MaintenanceScheduler.register_task."""
+    _SCHEDULER.register_task(name, func, interval)
+
+
+def run_pending(budget=DEFAULT_BUDGET):
+    return _SCHEDULER.run_pending(budget)
+
+
+def run_if_due(name, budget=None):
+    return _SCHEDULER.run_if_due(name, budget)
+
+
+class _IdleTicker:
+    """Throttle for host idle events, which fire many times per second."""
+
+    def __init__(self, budget, min_gap):
+        self.budget = budget
+        self.min_gap = min_gap
+        self.last_tick = 0
+        self.detach = None
+
+    def __call__(self, sender=None, args=None):
+        now = time.time()
+        if now - self.last_tick < self.min_gap:
+            return
+        self.last_tick = now
+        try:
+            _SCHEDULER.run_pending(self.budget)
+            if not _SCHEDULER.has_pending() and self.detach:
+                self.detach()
+                self.detach = None
+        except Exception:
+            pass
+
+
+_ATTACHED = []
+
+
+def attach_to_revit(uiapp, budget=DEFAULT_BUDGET, min_gap=MIN_IDLE_GAP):
+    """Run pending maintenance from the Revit Idling event.
+
+    The handler removes itself once every task is done for the day.
+
+    Args:
+        uiapp: UIApplication, __revit__ in pyRevit startup scripts
+    """
+    if _ATTACHED:
+        return
+    from System import EventHandler  # pyright: ignore
+    from Autodesk.Revit.UI.Events import IdlingEventArgs  # pyright: ignore
+    ticker = _IdleTicker(budget, min_gap)
+    handler = EventHandler[IdlingEventArgs](ticker)
+
+    def detach():
+        uiapp.Idling -= handler
+    uiapp.Idling += handler
+    ticker.detach = detach
+    _ATTACHED.append(ticker)
+
+
+def attach_to_rhino(budget=DEFAULT_BUDGET, min_gap=MIN_IDLE_GAP):
+    """Run pending maintenance from the Rhino Idle event."""
+    if _ATTACHED:
+        return
+    import Rhino  # pyright: ignore
+    ticker = _IdleTicker(budget, min_gap)
+
+    def handler(sender, args):
+        ticker(sender, args)
+
+    def detach():
+        Rhino.RhinoApp.Idle -= handler
+    Rhino.RhinoApp.Idle += handler
+    ticker.detach = detach
+    _ATTACHED.append(ticker)
+
+
+def unit_test():
+    import shutil
+    import tempfile
+
+    folder = tempfile.mkdtemp()
+    try:
+        old_time = time.time() - 10 * DAY
+        for i in range(3000):
+            path = os.path.join(folder, "temp_{:05d}.tmp".format(i))
+            with open(path, "w") as f:
+                f.write("x")
+            if i % 2:
+                os.utime(path, (old_time, old_time))
+        keep = os.path.join(folder, "fresh.tmp")
+        with open(keep, "w") as f:
+            f.write("x")
+
+        scheduler = MaintenanceScheduler(os.path.join(folder, "state.json"))
+        scheduler.register_task("cleanup", make_dump_cleanup_task(folder, max_age=DAY), interval=DAY)
+        assert scheduler.is_due("cleanup")
+
+        ticks = 0
+        while scheduler.has_pending():
+            ticks += 1
+            t_start = time.time()
+            scheduler.run_pending(budget=0.005)
+            # one file may straddle the deadline, but never much more than that
+            assert time.time() - t_start < 0.5
+            assert ticks < 10000
+        left = set(os.listdir(folder))
+        assert len(left) == 1500 + 1 + 1, len(left)
+        assert "fresh.tmp" in left and "temp_00001.tmp" not in left
+
+        # the marker survives a new session, nothing is due until tomorrow
+        scheduler = MaintenanceScheduler(os.path.join(folder, "state.json"))
+        scheduler.register_task("cleanup", make_dump_cleanup_task(folder, max_age=DAY), interval=DAY)
+        assert not scheduler.is_due("cleanup")
+        assert scheduler.run_pending() == []
+        print("cleaned 1500 files in {} idle ticks".format(ticks))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    unit_test()
@@ -0,0 +1,579 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Report Writer
+
+Streaming output for the HTML reports generated by our tools.
+
+Reports used to be assembled as one big string, with the full stylesheet
+and script pasted into every file, and written in a single call at the
+end. Peak memory grew with the size of the project and a large table
+froze the browser while it laid out every row. This module writes the
+document as it is produced instead:
+
+    - ReportWriter streams text chunks to a temp file, moved in place on
+      success together with its data folder, so a failed run never leaves
+      half a report behind
+    - static CSS/JS become asset files named after their content hash,
+      written once per version and linked from every report
+    - PagedRows puts table rows after the first page into inert <template>
+      blocks, the browser only lays out the page on screen
+    - data scripts hold large JSON (geometry, chart data) outside the page,
+      the report loads them when the data is first needed
+
+Example:
+    with REPORT_WRITER.ReportWriter(filepath) as writer:
+        writer.write(u"<html><head>")
+        writer.write(writer.stylesheet_tag("my_report", css))
+        writer.write(writer.pager_tags())
+        writer.write(u"</head><body><table><tbody class=\"report-paged\">")
+        rows = writer.begin_paged_rows()
+        for item in items:
+            rows.add_row(u"<tr><td>{}</td></tr>".format(item))
+        rows.close()
+        writer.write(u"</tbody></table></body></html>")
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import hashlib
+
+
+ASSET_FOLDER = "report_assets"
+DATA_FOLDER_SUFFIX = "_data"
+DEFAULT_PAGE_SIZE = 200
+FLUSH_SIZE = 256 * 1024  # characters kept in memory before a write
+
+try:
+    TEXT_TYPE = unicode  # pyright: ignore
+except NameError:
+    TEXT_TYPE = str
+
+
+PAGER_STYLE = u"""
+.report-pager { display: flex; align-items: center; gap: 8px; margin: 8px 0 16px 0; font-size: 0.85em; color: #9ca3af; }
+.report-pager button { padding: 4px 10px; background: #374151; color: #f3f4f6; border: 1px solid #4b5563; border-radius: 4px; cursor: pointer; }
+.report-pager button:disabled { opacity: 0.4; cursor: default; }
+"""
+
+PAGER_SCRIPT = u"""
+(function () {
+    function rowsOf(body) {
+        var rows = [];
+        for (var i = 0; i < body.children.length; i++) {
+            if (body.children[i].tagName !== 'TEMPLATE') {
+                rows.push(body.children[i]);
+            }
+        }
+        return rows;
+    }
+
+    function setupPager(body) {
+        var templates = body.querySelectorAll(':scope > template');
+        if (!templates.length || body.getAttribute('data-pager-ready')) {
+            return;
+        }
+        body.setAttribute('data-pager-ready', '1');
+        var firstPage = rowsOf(body);
+        var pageCount = templates.length + 1;
+        var total = body.getAttribute('data-row-count') || '';
+        var current = 0;
+
+        var pager = document.createElement('div');
+        pager.className = 'report-pager';
+        var previous = document.createElement('button');
+        previous.textContent = '\\u25C0 Prev';
+        var label = document.createElement('span');
+        var next = document.createElement('button');
+        next.textContent = 'Next \\u25B6';
+        pager.appendChild(previous);
+        pager.appendChild(label);
+        pager.appendChild(next);
+        var table = body.parentNode;
+        table.parentNode.insertBefore(pager, table.nextSibling);
+
+        function show(index) {
+            rowsOf(body).forEach(function (row) { body.removeChild(row); });
+            if (index === 0) {
+                firstPage.forEach(function (row) { body.appendChild(row); });
+            } else {
+                body.appendChild(document.importNode(templates[index - 1].content, true));
+            }
+            current = index;
+            label.textContent = 'Page ' + (index + 1) + ' of ' + pageCount + (total ? ' (' + total + ' rows)' : '');
+            previous.disabled = index === 0;
+            next.disabled = index === pageCount - 1;
+        }
+
+        previous.onclick = function () { if (current > 0) { show(current - 1); } };
+        next.onclick = function () { if (current < pageCount - 1) { show(current + 1); } };
+        show(0);
+    }
+
+    function setupPagers() {
+        var bodies = document.querySelectorAll('tbody.report-paged');
+        for (var i = 0; i < bodies.length; i++) {
+            setupPager(bodies[i]);
+        }
+    }
+
+    window.setupReportPagers = setupPagers;
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', setupPagers);
+    } else {
+        setupPagers();
+    }
+})();
+"""
+
+DATA_LOADER_SCRIPT = u"""
+(function () {
+    var loaded = {};
+    var waiting = {};
+
+    /* Data scripts call this with their payload once they run. */
+    window.registerReportData = function (key, data) {
+        loaded[key] = data;
+        (waiting[key] || []).forEach(function (callback) { callback(data); });
+        delete waiting[key];
+    };
+
+    /* Load the data script at src once, then call callback(data). */
+    window.loadReportData = function (key, src, callback) {
+        if (loaded.hasOwnProperty(key)) {
+            callback(loaded[key]);
+            return;
+        }
+        if (waiting[key]) {
+            waiting[key].push(callback);
+            return;
+        }
+        waiting[key] = [callback];
+        var script = document.createElement('script');
+        script.src = src;
+        script.onerror = function () {
+            console.warn('Could not load report data:', src);
+            var callbacks = waiting[key] || [];
+            delete waiting[key];
+            callbacks.forEach(function (callback) { callback(null); });
+        };
+        document.head.appendChild(script);
+    };
+})();
+"""
+
+
+def _to_text(chunk):
+    if isinstance(chunk, TEXT_TYPE):
+        return chunk
+    if isinstance(chunk, bytes):
+        return chunk.decode("utf-8", "replace")
+    return TEXT_TYPE(chunk)
+
+
+def _replace_file(source, target):
+    """os.replace is not available on IronPython 2.7."""
+    if os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
+
+
+class StreamWriter(object):
+    """Buffered UTF-8 text file written under a temp name.
+
+    The file only appears at filepath when the writer is closed without
+    error, see close and abort.
+
+    Args:
+        filepath (str): Final path of the file
+        flush_size (int): Characters buffered in memory before a write
+    """
+
+    def __init__(self, filepath, flush_size=FLUSH_SIZE):
+        self.filepath = filepath
+        self.flush_size = flush_size
+        self.size = 0
+        self._temp_path = filepath + ".tmp"
+        self._buffer = []
+        self._buffered = 0
+        folder = os.path.dirname(filepath)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._file = io.open(self._temp_path, "w", encoding="utf-8")
+
+    def write(self, *chunks):
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if not isinstance(chunk, TEXT_TYPE):
+                chunk = _to_text(chunk)
+            self._buffer.append(chunk)
+            self._buffered += len(chunk)
+        if self._buffered >= self.flush_size:
+            self.flush()
+
+    def write_lines(self, lines):
+        """Write each line followed by a newline."""
+        for line in lines:
+            self.write(line, u"\n")
+
+    def write_json(self, data, **kwargs):
+        """Write data as JSON.
+
+        The string of data is built in one go, write large collections item
+        by item so memory stays bounded by the largest item.
+        """
+        kwargs.setdefault("ensure_ascii", True)
+        self.write(json.dumps(data, **kwargs))
+
+    def flush(self):
+        if self._buffer:
+            text = u"".join(self._buffer)
+            self._file.write(text)
+            self.size += len(text)
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Finish the file and move it in place."""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        self._move_in_place()
+
+    def _move_in_place(self):
+        _replace_file(self._temp_path, self.filepath)
+
+    def abort(self):
+        """Drop everything written, an existing file at filepath is kept."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._buffer = []
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_asset(folder, name, content, extension):
+    """Write static content once, under a file name carrying its hash.
+
+    A report linking "name.<hash>.css" always gets the content it was
+    generated with, and the file is only written when that version is new.
+
+    Args:
+        folder (str): Asset folder
+        name (str): Base name, e.g. "area_report"
+        content (str): File content
+        extension (str): "css" or "js"
+
+    Returns:
+        str: File name of the asset inside folder
+    """
+    text = _to_text(content)
+    digest = hashlib.md5(text.encode("utf-8")).hexdigest()[:10]
+    filename = "{}.{}.{}".format(name, digest, extension)
+    path = os.path.join(folder, filename)
+    if not os.path.exists(path):
+        with StreamWriter(path) as f:
+            f.write(text)
+    return filename
+
+
+class PagedRows(object):
+    """Table rows written in pages of page_size.
+
+    The first page is written as normal rows, every later page goes into a
+    <template> block in the same tbody. Templates are parsed but never laid
+    out, the pager script (see pager_tags) swaps pages in on demand. The
+    tbody needs the "report-paged" class for the script to find it.
+
+    Args:
+        write (callable): Receives the html chunks, e.g. ReportWriter.write
+            or list.append when building a string
+        page_size (int): Rows per page
+    """
+
+    def __init__(self, write, page_size=DEFAULT_PAGE_SIZE):
+        self._write = write
+        self.page_size = max(1, page_size)
+        self.row_count = 0
+
+    def add_row(self, row_html):
+        if self.row_count and self.row_count % self.page_size == 0:
+            if self.row_count > self.page_size:
+                self._write(u"</template>")
+            self._write(u"<template>")
+        self._write(row_html)
+        self.row_count += 1
+
+    def add_rows(self, rows):
+        for row_html in rows:
+            self.add_row(row_html)
+
+    @property
+    def page_count(self):
+        return max(1, (self.row_count + self.page_size - 1) // self.page_size)
+
+    def close(self):
+        if self.row_count > self.page_size:
+            self._write(u"</template>")
+
+
+def paged_tbody_tag(row_count=None, extra_class=""):
+    """Opening tag of a tbody the pager script will page."""
+    css_class = "report-paged {}".format(extra_class).strip()
+    if row_count is None:
+        return u"<tbody class=\"{}\">".format(css_class)
+    return u"<tbody class=\"{}\" data-row-count=\"{}\">".format(css_class, row_count)
+
+
+class ReportWriter(StreamWriter):
+    """Stream an HTML report with its assets and data scripts.
+
+    Layout next to the report:
+        <report folder>/report_assets/name.<hash>.css|js   shared by all reports
+        <report folder>/<report name>_data/*.js            data of this report only
+
+    Args:
+        filepath (str): Path of the .html file
+        asset_folder (str, optional): Folder for shared assets, defaults to
+            report_assets next to the report
+    """
+
+    def __init__(self, filepath, asset_folder=None, flush_size=FLUSH_SIZE):
+        super(ReportWriter, self).__init__(filepath, flush_size)
+        self.report_folder = os.path.dirname(os.path.abspath(filepath))
+        self.asset_folder = asset_folder or os.path.join(self.report_folder, ASSET_FOLDER)
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        self.data_folder_name = stem + DATA_FOLDER_SUFFIX
+        self.data_folder = os.path.join(self.report_folder, self.data_folder_name)
+        # data scripts are written aside and replace the previous ones on close
+        self._temp_data_folder = self.data_folder + ".tmp"
+        if os.path.isdir(self._temp_data_folder):
+            shutil.rmtree(self._temp_data_folder, ignore_errors=True)
+
+    def _move_in_place(self):
+        # data scripts of a previous run of this report are stale
+        if os.path.isdir(self.data_folder):
+            shutil.rmtree(self.data_folder)
+        if os.path.isdir(self._temp_data_folder):
+            os.rename(self._temp_data_folder, self.data_folder)
+        super(ReportWriter, self)._move_in_place()
+
+    def abort(self):
+        """Drop the report and the data scripts of this run, the previous ones are kept."""
+        super(ReportWriter, self).abort()
+        if os.path.isdir(self._temp_data_folder):
+            shutil.rmtree(self._temp_data_folder, ignore_errors=True)
+
+    def _relative_url(self, path):
+        relative = os.path.relpath(path, self.report_folder)
+        return relative.replace(os.sep, "/")
+
+    def asset_url(self, name, content, extension):
+        filename = write_asset(self.asset_folder, name, content, extension)
+        return self._relative_url(os.path.join(self.asset_folder, filename))
+
+    def stylesheet_tag(self, name, css):
+        return u"<link rel=\"stylesheet\" href=\"{}\">\n".format(self.asset_url(name, css, "css"))
+
+    def script_tag(self, name, javascript):
+        return u"<script src=\"{}\"></script>\n".format(self.asset_url(name, javascript, "js"))
+
+    def pager_tags(self):
+        """Stylesheet and script needed by PagedRows."""
+        return self.stylesheet_tag("report_pager", PAGER_STYLE) + self.script_tag("report_pager", PAGER_SCRIPT)
+
+    def data_loader_tag(self):
+        """Script defining loadReportData(key, src, callback) for data scripts."""
+        return self.script_tag("report_data_loader", DATA_LOADER_SCRIPT)
+
+    def begin_paged_rows(self, page_size=DEFAULT_PAGE_SIZE):
+        return PagedRows(self.write, page_size)
+
+    def open_data_script(self, name, key):
+        """Open a data script that hands its JSON payload to registerReportData.
+
+        Write the payload with write / write_json on the returned writer,
+        the call around it is added here. The page loads it with
+        loadReportData(key, url, callback).
+
+        Args:
+            name (str): File name without extension, unique in this report
+            key (str): Key the payload is registered under
+
+        Returns:
+            tuple: (DataScript writer to use in a with block, url relative to the report)
+        """
+        filename = "{}.js".format(name)
+        url = self._relative_url(os.path.join(self.data_folder, filename))
+        return DataScript(os.path.join(self._temp_data_folder, filename), key), url
+
+
+class DataScript(StreamWriter):
+    """JS file wrapping a JSON payload in registerReportData(key, ...)."""
+
+    def __init__(self, filepath, key):
+        super(DataScript, self).__init__(filepath)
+        self.write(u"registerReportData(")
+        self.write_json(key)
+        self.write(u", ")
+
+    def close(self):
+        if self._file is not None:
+            self.write(u");\n")
+        super(DataScript, self).close()
+
+
+def _make_sample_rows(count):
+    for i in range(count):
+        yield (u"Department {}".format(i % 40), u"Division {}".format(i % 300),
+               u"Room {}".format(i), 100 + (i * 37) % 900)
+
+
+def _legacy_report(path, row_count, css):
+    """The string concatenation the writer replaced, kept for the benchmark."""
+    rows = []
+    for dept, division, room, area in _make_sample_rows(row_count):
+        rows.append(u"<tr><td>{}</td><td>{}</td><td>{}</td><td>{:,} SF</td></tr>".format(dept, division, room, area))
+    html = u"<html><head><style>{}</style></head><body><table><tbody>{}</tbody></table></body></html>".format(
+        css, u"".join(rows))
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def _streamed_report(path, row_count, css):
+    with ReportWriter(path) as writer:
+        writer.write(u"<html><head>", writer.stylesheet_tag("benchmark", css), writer.pager_tags(), u"</head><body><table>")
+        writer.write(paged_tbody_tag(row_count))
+        rows = writer.begin_paged_rows()
+        for dept, division, room, area in _make_sample_rows(row_count):
+            rows.add_row(u"<tr><td>{}</td><td>{}</td><td>{}</td><td>{:,} SF</td></tr>".format(dept, division, room, area))
+        rows.close()
+        writer.write(u"</tbody></table></body></html>")
+
+
+def benchmark(row_count=50000):
+    """Time and peak memory of a report with row_count rows, legacy vs streamed.
+
+    Returns:
+        dict: {"legacy": (seconds, peak bytes), "streamed": (seconds, peak bytes)}
+    """
+    import tempfile
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None  # IronPython, times only
+
+    folder = tempfile.mkdtemp()
+    css = u".row { color: #fff; }\n" * 5000
+    results = {}
+    try:
+        for label, func in (("legacy", _legacy_report), ("streamed", _streamed_report)):
+            path = os.path.join(folder, "{}.html".format(label))
+            t_start = time.time()
+            func(path, row_count, css)
+            duration = time.time() - t_start
+            peak = 0
+            if tracemalloc:
+                # second run for memory, tracing slows down the timed one
+                tracemalloc.start()
+                func(path, row_count, css)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results[label] = (duration, peak)
+            print("  {:<9} {:.3f}s  peak {:.1f} MB  file {:.1f} MB".format(
+                label, duration, peak / 1e6, os.path.getsize(path) / 1e6))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def unit_test():
+    import tempfile
+
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "report.html")
+        with ReportWriter(path, flush_size=100) as writer:
+            css_tag = writer.stylesheet_tag("unit", u"body { color: red; }")
+            writer.write(u"<html><head>", css_tag, writer.pager_tags(), writer.data_loader_tag(), u"</head>")
+            writer.write(u"<body><table>", paged_tbody_tag(5))
+            rows = writer.begin_paged_rows(page_size=2)
+            for i in range(5):
+                rows.add_row(u"<tr><td>{}</td></tr>".format(i))
+            rows.close()
+            writer.write(u"</tbody></table>")
+            data, url = writer.open_data_script("geometry", u"Scheme A")
+            with data:
+                data.write_json({"areas": [1, 2, 3]})
+            writer.write(u"<p>é</p></body></html>")
+            assert not os.path.exists(path)  # nothing visible until closed
+        assert rows.page_count == 3
+
+        with io.open(path, encoding="utf-8") as f:
+            html = f.read()
+        assert html.count(u"<template>") == 2 and html.count(u"</template>") == 2
+        assert html.index(u"<td>1</td>") < html.index(u"<template>")
+        assert u"é" in html
+        assert css_tag.startswith(u"<link rel=\"stylesheet\" href=\"report_assets/unit.")
+        assert url == "report_data/geometry.js"
+        with io.open(os.path.join(folder, "report_data", "geometry.js"), encoding="utf-8") as f:
+            assert f.read() == u"registerReportData(\"Scheme A\", {\"areas\": [1, 2, 3]});\n"
+
+        # assets are written once per content version
+        asset_files = set(os.listdir(os.path.join(folder, ASSET_FOLDER)))
+        assert write_asset(os.path.join(folder, ASSET_FOLDER), "unit", u"body { color: red; }", "css") in asset_files
+        assert write_asset(os.path.join(folder, ASSET_FOLDER), "unit", u"body { color: blue; }", "css") not in asset_files
+
+        # a failing run keeps the previous report and its data
+        try:
+            with ReportWriter(path) as writer:
+                writer.write(u"<html>broken")
+                with writer.open_data_script("geometry", u"Scheme B")[0] as data:
+                    data.write_json({"areas": []})
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        with io.open(path, encoding="utf-8") as f:
+            assert f.read() == html
+        assert not os.path.exists(path + ".tmp")
+        assert not os.path.exists(os.path.join(folder, "report_data.tmp"))
+        with io.open(os.path.join(folder, "report_data", "geometry.js"), encoding="utf-8") as f:
+            assert u"Scheme A" in f.read()
+
+        # a new run without data scripts drops the stale ones
+        with ReportWriter(path) as writer:
+            writer.write(u"<html></html>")
+        assert not os.path.exists(os.path.join(folder, "report_data"))
+
+        parts = []
+        rows = PagedRows(parts.append, page_size=10)
+        rows.add_rows(u"<tr></tr>" for _ in range(10))
+        rows.close()
+        assert u"<template>" not in u"".join(parts)
+        print("report writer: OK")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
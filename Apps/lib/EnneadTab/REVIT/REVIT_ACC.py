@@ -82,11 +82,12 @@ API_CALL_COUNTER = {
 def log_api_call(call_type):
     """Log an API call for cost monitoring."""
     global API_CALL_COUNTER
-    if API_CALL_COUNTER["session_start"] is None:
-        API_CALL_COUNTER["session_start"] = time.time()
-    
-    API_CALL_COUNTER[call_type] += 1
-    API_CALL_COUNTER["total_calls"] += 1
+    with _API_CALL_LOCK:
+        if API_CALL_COUNTER["session_start"] is None:
+            API_CALL_COUNTER["session_start"] = time.time()
+        
+        API_CALL_COUNTER[call_type] += 1
+        API_CALL_COUNTER["total_calls"] += 1
     
     # Log every 10 calls to monitor progress
     if API_CALL_COUNTER["total_calls"] % 10 == 0:
@@ -122,6 +123,9 @@ import sys
 import threading
 import subprocess
 import logging
+from collections import deque
+# log_api_call is hit from the crawler worker threads
+_API_CALL_LOCK = threading.Lock()
 try:
     import base64
 except ImportError as e:
@@ -990,17 +994,383 @@ def get_project_data_by_name(project_name):
                 
     return None
 
-def get_project_revit_files_data(project_id, hub_id, project_name=None, hub_name=None, use_cache=True):
-    """Get Revit files data for a specific project with caching support.
+# ============================================================================
+# CONCURRENT FOLDER CRAWLER
+# ============================================================================
+APS_BASE_URL = "https://developer.api.autodesk.com"
+CRAWLER_MAX_WORKERS = 8           # Requests in flight across all projects
+CRAWLER_PER_PROJECT_LIMIT = 4     # Requests in flight for any single project
+CRAWLER_MAX_PROJECTS = 4          # Projects crawled at the same time by get_ACC_summary_data
+CRAWLER_RATE_PER_SECOND = 10.0    # Sustained APS request rate
+CRAWLER_BURST = 20                # Requests allowed back to back before the rate applies
+CRAWLER_MAX_THROTTLE_RETRIES = 3  # Retries when APS answers 429
+
+
+class _TokenBucket(object):
+    """Thread-safe token bucket, acquire() blocks until a request may go out."""
+
+    def __init__(self, rate_per_second, burst):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _ProjectCrawl(object):
+    """State of one project walk inside AccCrawler."""
+
+    def __init__(self, project_id, hub_id, http_cache):
+        self.project_id = project_id
+        self.hub_id = hub_id
+        self.old_http_cache = http_cache or {}
+        self.http_cache = {}
+        self.lock = threading.Lock()
+        self.running = 0  # jobs handed to the workers, at most CRAWLER_PER_PROJECT_LIMIT
+        self.waiting = deque()  # jobs over the cap, they never hold a worker
+        self.listings = {}  # dfs sort key -> ([(item id, file name)], subfolder count)
+        self.file_keys = []  # dfs sort keys of every .rvt listed so far
+        self.listed = False
+        self.files = []  # (dfs sort key, file data)
+        self.failed = False
+        self.pending = 0
+        self.done = threading.Event()
+
+
+class AccCrawler(object):
+    """Concurrent walker of ACC project folders for Revit files.
+
+    Folder listings and .rvt item details are fetched by a fixed pool of
+    worker threads over one keep-alive requests.Session. Requests are paced
+    by a shared token bucket and each project is capped to a few requests
+    in flight. Jobs over the cap wait in the project's own queue without
+    holding a worker, so one big project cannot starve the others.
+
+    Every GET is conditional when a previous crawl left an ETag or
+    Last-Modified for that URL; a 304 reuses the stored body and costs no
+    download. The validators are kept in the project's shared dump cache
+    under "http_cache".
+
+    The early exit rules of the serial walk still apply: a folder is not
+    opened once more than MAX_REVIT_FILES_SEARCH files are found or below
+    MAX_FOLDER_DEPTH, and only the first MAX_REVIT_FILES_DETAILED files get
+    a detail call. The listings are fetched first, a folder is only skipped
+    early when files before it in depth-first order already pass the
+    limit. The listings are then replayed depth-first to pick exactly the
+    files and detail calls of the serial walk, whatever the timing. Files
+    are returned in that same depth-first order.
+
     Args:
-        project_id (string): The ID of the project to get Revit files for.
-        hub_id (string): The hub ID for the project.
-        project_name (string, optional): The name of the project for readable cache keys.
-        hub_name (string, optional): The name of the hub for readable cache keys.
-        use_cache (bool): Whether to use cached data if available.
-    Returns:
-        list: List containing Revit files data.
+        access_token (str): APS bearer token
+        base_url (str, optional): APS host, a local fake server in tests.
+        max_workers (int, optional): Worker threads.
+        rate_per_second (float, optional): Token bucket refill rate.
+        burst (int, optional): Token bucket size.
+        session (requests.Session, optional): Session to reuse.
     """
+
+    def __init__(self, access_token, base_url=APS_BASE_URL, max_workers=CRAWLER_MAX_WORKERS,
+                 rate_per_second=CRAWLER_RATE_PER_SECOND, burst=CRAWLER_BURST, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": "Bearer {}".format(access_token)}
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.bucket = _TokenBucket(rate_per_second, burst)
+        self.stats = {"requests": 0, "not_modified": 0, "throttled": 0}
+        self._stats_lock = threading.Lock()
+        try:
+            import Queue as queue  # IronPython 2.7
+        except ImportError:
+            import queue
+        self._jobs = queue.Queue()
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._work, name="EnneadTab-acc-crawler-{}".format(i))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    # ------------------------------------------------------------------ workers
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            crawl, func, args = job
+            try:
+                func(crawl, *args)
+            except Exception as e:
+                logging.error("ACC crawler job failed for project {}: {}".format(crawl.project_id, e))
+            finally:
+                self._release_slot(crawl)
+                self._job_finished(crawl)
+
+    def _submit(self, crawl, func, *args):
+        # the project cap is checked before the job takes a worker
+        with crawl.lock:
+            crawl.pending += 1
+            if crawl.running >= CRAWLER_PER_PROJECT_LIMIT:
+                crawl.waiting.append((func, args))
+                return
+            crawl.running += 1
+        self._jobs.put((crawl, func, args))
+
+    def _release_slot(self, crawl):
+        # a finished job hands its slot to the project's next waiting job
+        with crawl.lock:
+            if not crawl.waiting:
+                crawl.running -= 1
+                return
+            func, args = crawl.waiting.popleft()
+        self._jobs.put((crawl, func, args))
+
+    def _job_finished(self, crawl):
+        with crawl.lock:
+            crawl.pending -= 1
+            if crawl.pending:
+                return
+            listing_done = not crawl.listed
+            crawl.listed = True
+        if listing_done:
+            self._start_details(crawl)
+        else:
+            crawl.done.set()
+
+    def _start_details(self, crawl):
+        """Pick the files of the serial walk from the listings, queue their detail calls."""
+        with crawl.lock:
+            # held while queuing so early detail jobs cannot finish the project
+            crawl.pending += 1
+        try:
+            if not crawl.failed:
+                for file_key, item_id, file_name, detailed in self._select_files(crawl):
+                    if detailed:
+                        self._submit(crawl, self._detail_job, item_id, file_name, file_key)
+                    else:
+                        self._add_file(crawl, file_key, {
+                            "basic_info_only": True,
+                            "id": item_id,
+                            "display_name": file_name,
+                            "note": "Detailed info skipped to save API costs"
+                        })
+        except Exception as e:
+            logging.error("ACC crawler could not select files for project {}: {}".format(crawl.project_id, e))
+        finally:
+            self._job_finished(crawl)
+
+    def _select_files(self, crawl):
+        """Replay the serial depth-first walk over the fetched listings.
+
+        Returns:
+            list: (sort key, item id, file name, gets a detail call) per file
+        """
+        selected = []
+        revit_file_count = [0]
+
+        def visit(sort_key, depth):
+            if revit_file_count[0] > MAX_REVIT_FILES_SEARCH or depth > MAX_FOLDER_DEPTH:
+                return
+            listing = crawl.listings.get(sort_key)
+            if listing is None:
+                return
+            revit_items, subfolder_count = listing
+            for index, (item_id, file_name) in enumerate(revit_items):
+                revit_file_count[0] += 1
+                selected.append((sort_key + ((0, index),), item_id, file_name,
+                                 revit_file_count[0] <= MAX_REVIT_FILES_DETAILED))
+            for index in range(subfolder_count):
+                visit(sort_key + ((1, index),), depth + 1)
+
+        visit((), 0)
+        return selected
+
+    def close(self):
+        """Stop the worker threads and release pooled connections."""
+        for _ in self._workers:
+            self._jobs.put(None)
+        self._workers = []
+        self.session.close()
+
+    # ------------------------------------------------------------------ http
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _get_json(self, crawl, path, call_type):
+        """Conditional GET through the rate limiter.
+
+        Returns:
+            tuple: (status_code, parsed body or None, response text)
+        """
+        url = self.base_url + path
+        cached = crawl.old_http_cache.get(path)
+        headers = dict(self.headers)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(CRAWLER_MAX_THROTTLE_RETRIES + 1):
+            self.bucket.acquire()
+            log_api_call(call_type)
+            self._count("requests")
+            response = self.session.get(url, headers=headers, timeout=30)
+            if response.status_code != 429 or attempt == CRAWLER_MAX_THROTTLE_RETRIES:
+                break
+            self._count("throttled")
+            try:
+                delay = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                delay = 1.0
+            time.sleep(min(delay, 30))
+
+        if response.status_code == 304 and cached:
+            self._count("not_modified")
+            with crawl.lock:
+                crawl.http_cache[path] = cached
+            return 200, cached.get("body"), ""
+        if response.status_code != 200:
+            return response.status_code, None, response.text
+        body = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with crawl.lock:
+                crawl.http_cache[path] = {"etag": etag, "last_modified": last_modified, "body": body}
+        return 200, body, ""
+
+    # ------------------------------------------------------------------ jobs
+    def _project_job(self, crawl):
+        try:
+            status, project_data, _ = self._get_json(
+                crawl, "/project/v1/hubs/{}/projects/{}".format(crawl.hub_id, crawl.project_id), "project_calls")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.error("Request error getting project data for project {}: {}".format(crawl.project_id, e))
+            crawl.failed = True
+            return
+        root_folder_id = None
+        if status == 200 and project_data:
+            root_folder_id = project_data.get("data", {}).get("relationships", {}).get("rootFolder", {}).get("data", {}).get("id")
+        if not root_folder_id:
+            crawl.failed = True
+            return
+        self._submit(crawl, self._folder_job, root_folder_id, 0, ())
+
+    def _folder_job(self, crawl, folder_id, depth, sort_key):
+        # Prevent infinite recursion in deep folder structures
+        if depth > MAX_FOLDER_DEPTH:
+            logging.warning("Folder depth limit reached in project {}, stopping search".format(crawl.project_id))
+            return
+        # Early exit if we've found enough files to confirm this is an active project.
+        # Only files before this folder in depth-first order count, the serial
+        # walk had found all of those by the time it got here.
+        with crawl.lock:
+            files_before = sum(1 for key in crawl.file_keys if key < sort_key)
+        if files_before > MAX_REVIT_FILES_SEARCH:
+            logging.info("Found {} Revit files, stopping search to save API calls".format(files_before))
+            return
+
+        try:
+            status, items_data, _ = self._get_json(
+                crawl, "/data/v1/projects/{}/folders/{}/contents".format(crawl.project_id, folder_id), "folder_calls")
+        except requests.exceptions.RequestException as e:
+            logging.error("Request error getting folder contents for folder {} in project {}: {}".format(folder_id, crawl.project_id, e))
+            return
+        except ValueError as e:
+            logging.error("Error parsing folder contents JSON for folder {} in project {}: {}".format(folder_id, crawl.project_id, e))
+            return
+        if status != 200:
+            logging.warning("Failed to get folder contents for folder {} in project {}: {}".format(folder_id, crawl.project_id, status))
+            return
+
+        revit_items = []
+        folder_items = []
+        for item in (items_data or {}).get("data", []):
+            if item.get("type") == "items":
+                file_name = item.get("attributes", {}).get("displayName", "")
+                if file_name.lower().endswith(".rvt"):
+                    revit_items.append((item.get("id"), file_name))
+            elif item.get("type") == "folders":
+                folder_items.append(item)
+
+        # files of a folder come before its subfolders in depth-first order,
+        # _select_files decides which of them the serial walk would keep
+        with crawl.lock:
+            crawl.listings[sort_key] = (revit_items, len(folder_items))
+            crawl.file_keys.extend(sort_key + ((0, index),) for index in range(len(revit_items)))
+
+        for index, item in enumerate(folder_items):
+            self._submit(crawl, self._folder_job, item.get("id"), depth + 1, sort_key + ((1, index),))
+
+    def _detail_job(self, crawl, item_id, file_name, file_key):
+        try:
+            status, detail_data, text = self._get_json(
+                crawl, "/data/v1/projects/{}/items/{}".format(crawl.project_id, item_id), "file_detail_calls")
+        except requests.exceptions.Timeout:
+            logging.error("Timeout getting item details for {} in project {}".format(file_name, crawl.project_id))
+            self._add_file(crawl, file_key, {"id": item_id, "error": "timeout"})
+            return
+        except requests.exceptions.RequestException as e:
+            logging.error("Request error getting item details for {} in project {}: {}".format(file_name, crawl.project_id, e))
+            self._add_file(crawl, file_key, {"id": item_id, "error": str(e)})
+            return
+        except ValueError as e:
+            logging.error("Error parsing item details JSON for {} in project {}: {}".format(file_name, crawl.project_id, e))
+            self._add_file(crawl, file_key, {"id": item_id, "error": str(e)})
+            return
+        if status == 200:
+            self._add_file(crawl, file_key, detail_data)
+        else:
+            logging.warning("Failed to get item details for {} in project {}: {}".format(file_name, crawl.project_id, status))
+            self._add_file(crawl, file_key, {"id": item_id, "error": text})
+
+    def _add_file(self, crawl, file_key, file_data):
+        with crawl.lock:
+            crawl.files.append((file_key, file_data))
+
+    # ------------------------------------------------------------------ public
+    def start_project(self, project_id, hub_id, http_cache=None):
+        """Queue a project walk and return its handle for wait_project."""
+        crawl = _ProjectCrawl(project_id, hub_id, http_cache)
+        self._submit(crawl, self._project_job)
+        return crawl
+
+    def wait_project(self, crawl):
+        """Wait for a project walk.
+
+        Returns:
+            tuple: (list of Revit file data or None if the project failed,
+                http_cache to store for the next conditional crawl)
+        """
+        crawl.done.wait()
+        if crawl.failed:
+            return None, crawl.old_http_cache
+        crawl.files.sort(key=lambda x: x[0])
+        return [file_data for _, file_data in crawl.files], crawl.http_cache
+
+    def crawl_project(self, project_id, hub_id, http_cache=None):
+        """Walk one project and wait for it, see wait_project."""
+        return self.wait_project(self.start_project(project_id, hub_id, http_cache))
+
+
+def _get_revit_files_cache_key(project_id, hub_id, project_name=None, hub_name=None):
     # Create cache key based on project and hub names (fallback to IDs if names not provided)
     if project_name and hub_name:
         # Clean names for use in filenames (remove special characters)
@@ -1017,143 +1387,74 @@ def get_project_revit_files_data(project_id, hub_id, project_name=None, hub_name
             hub_id=hub_id
         )
         logging.info("Using ID-based cache key: {}".format(cache_key))
-    
-    if use_cache:
-        # Check if we have cached data that's less than 2 weeks old
-        cached_data = DATA_FILE.get_data(cache_key, is_local=False)
-        if cached_data and cached_data.get("timestamp"):
-            cache_age_seconds = time.time() - cached_data["timestamp"]
-            cache_age_days = cache_age_seconds / (24 * 60 * 60)
-            if cache_age_days < CACHE_EXPIRY_DAYS:  # Use global constant
-                logging.info("Using cached Revit files data for project {} (cache age: {:.1f} days)".format(project_id, cache_age_days))
-                return cached_data.get("data", [])
-            else:
-                logging.info("Cached Revit files data for project {} is {} days old, refreshing".format(project_id, cache_age_days))
-    
-    # Fetch fresh data from API using reusable token system 
-    access_token = get_reusable_access_token()
-    if not access_token:
-        return None
+    return cache_key
 
-    try:
-        project_url = "https://developer.api.autodesk.com/project/v1/hubs/{}/projects/{}".format(hub_id, project_id)
-        project_headers = {"Authorization": "Bearer {}".format(access_token)}
-        log_api_call("project_calls")
-        project_resp = requests.get(project_url, headers=project_headers, timeout=30)
-    except requests.exceptions.Timeout:
-        logging.error("Timeout getting project data for project {}".format(project_id))
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error("Request error getting project data for project {}: {}".format(project_id, e))
-        return None
-    if project_resp.status_code != 200:
-        return None
-    project_data = project_resp.json()
-    root_folder_id = project_data.get("data", {}).get("relationships", {}).get("rootFolder", {}).get("data", {}).get("id")
-    if not root_folder_id:
-        return None
 
-    revit_files = []
-    # 2026-04-22: was `revit_file_count = 0` + `nonlocal revit_file_count`,
-    # but `nonlocal` is Python 3 only and doesn't exist in IronPython 2.7,
-    # so the function would crash on import inside Revit. Wrap in a 1-element
-    # list so the inner closure can mutate without rebinding (standard IP2.7
-    # workaround). Caught by tools/check_ironpython.py + pyRevit IronPython
-    # compile sweep.
-    revit_file_count = [0]
-
-    def search_folder(folder_id, depth=0):
-        # Early exit if we've found enough files to confirm this is an active project
-        # This saves API calls for large projects
-        if revit_file_count[0] > MAX_REVIT_FILES_SEARCH:  # Use global constant
-            logging.info("Found {} Revit files, stopping search to save API calls".format(revit_file_count[0]))
-            return
-            
-        # Prevent infinite recursion in deep folder structures
-        if depth > MAX_FOLDER_DEPTH:  # Use global constant
-            logging.warning("Folder depth limit reached in project {}, stopping search".format(project_id))
-            return
-            
-        try:
-            items_url = "https://developer.api.autodesk.com/data/v1/projects/{}/folders/{}/contents".format(project_id, folder_id)
-            items_headers = {"Authorization": "Bearer {}".format(access_token)}
-            log_api_call("folder_calls")
-            items_resp = requests.get(items_url, headers=items_headers, timeout=30)
-            if items_resp.status_code != 200:
-                logging.warning("Failed to get folder contents for folder {} in project {}: {}".format(folder_id, project_id, items_resp.status_code))
-                return
-        except requests.exceptions.Timeout:
-            logging.error("Timeout getting folder contents for folder {} in project {}".format(folder_id, project_id))
-            return
-        except requests.exceptions.RequestException as e:
-            logging.error("Request error getting folder contents for folder {} in project {}: {}".format(folder_id, project_id, e))
-            return
-            
-        try:
-            items_data = items_resp.json()
-        except Exception as e:
-            logging.error("Error parsing folder contents JSON for folder {} in project {}: {}".format(folder_id, project_id, e))
-            return
-        
-        # Count items first to determine if we should get detailed info
-        revit_items = []
-        folder_items = []
-        
-        for item in items_data.get("data", []):
-            if item.get("type") == "items":
-                file_name = item.get("attributes", {}).get("displayName", "")
-                if file_name.lower().endswith(".rvt"):
-                    revit_items.append(item)
-            elif item.get("type") == "folders":
-                folder_items.append(item)
-        
-        # Process Revit files - only get detailed info if there aren't too many
-        for item in revit_items:
-            file_name = item.get("attributes", {}).get("displayName", "")
-            item_id = item.get("id")
-            revit_file_count[0] += 1
+def _get_fresh_revit_files_cache(cache_key, project_id):
+    """Get the shared dump cache record and whether it is still fresh.
 
-            # For cost savings, limit detailed file info calls for large projects
-            if revit_file_count[0] <= MAX_REVIT_FILES_DETAILED:  # Use global constant
-                try:
-                    detail_url = "https://developer.api.autodesk.com/data/v1/projects/{}/items/{}".format(project_id, item_id)
-                    detail_headers = {"Authorization": "Bearer {}".format(access_token)}
-                    log_api_call("file_detail_calls")
-                    detail_resp = requests.get(detail_url, headers=detail_headers, timeout=30)
-                    if detail_resp.status_code == 200:
-                        detail_data = detail_resp.json()
-                        revit_files.append(detail_data)
-                    else:
-                        logging.warning("Failed to get item details for {} in project {}: {}".format(file_name, project_id, detail_resp.status_code))
-                        revit_files.append({"id": item_id, "error": detail_resp.text})
-                except requests.exceptions.Timeout:
-                    logging.error("Timeout getting item details for {} in project {}".format(file_name, project_id))
-                    revit_files.append({"id": item_id, "error": "timeout"})
-                except requests.exceptions.RequestException as e:
-                    logging.error("Request error getting item details for {} in project {}: {}".format(file_name, project_id, e))
-                    revit_files.append({"id": item_id, "error": str(e)})
-            else:
-                # For cost savings, just add basic info without detailed API call
-                revit_files.append({
-                    "basic_info_only": True,
-                    "id": item_id,
-                    "display_name": file_name,
-                    "note": "Detailed info skipped to save API costs"
-                })
-        
-        # Process subfolders
-        for item in folder_items:
-            search_folder(item.get("id"), depth + 1)
-    search_folder(root_folder_id)
-    
-    # Cache the results with timestamp
+    Returns:
+        tuple: (cache record dict or None, is_fresh)
+    """
+    # Check if we have cached data that's less than CACHE_EXPIRY_DAYS old
+    cached_data = DATA_FILE.get_data(cache_key, is_local=False)
+    if cached_data and cached_data.get("timestamp"):
+        cache_age_seconds = time.time() - cached_data["timestamp"]
+        cache_age_days = cache_age_seconds / (24 * 60 * 60)
+        if cache_age_days < CACHE_EXPIRY_DAYS:  # Use global constant
+            logging.info("Using cached Revit files data for project {} (cache age: {:.1f} days)".format(project_id, cache_age_days))
+            return cached_data, True
+        logging.info("Cached Revit files data for project {} is {} days old, refreshing".format(project_id, cache_age_days))
+    return cached_data, False
+
+
+def _save_revit_files_cache(cache_key, project_id, revit_files, http_cache):
+    # Cache the results with timestamp, plus validators for conditional requests next time
     cache_data = {
         "timestamp": time.time(),
-        "data": revit_files
+        "data": revit_files,
+        "http_cache": http_cache
     }
     DATA_FILE.set_data(cache_data, cache_key, is_local=False)
     logging.info("Cached Revit files data for project {} in shared dump folder".format(project_id))
+
+
+def get_project_revit_files_data(project_id, hub_id, project_name=None, hub_name=None, use_cache=True, crawler=None):
+    """Get Revit files data for a specific project with caching support.
+    Args:
+        project_id (string): The ID of the project to get Revit files for.
+        hub_id (string): The hub ID for the project.
+        project_name (string, optional): The name of the project for readable cache keys.
+        hub_name (string, optional): The name of the hub for readable cache keys.
+        use_cache (bool): Whether to use cached data if available.
+        crawler (AccCrawler, optional): Shared crawler, a temporary one is used if not given.
+    Returns:
+        list: List containing Revit files data.
+    """
+    cache_key = _get_revit_files_cache_key(project_id, hub_id, project_name, hub_name)
     
+    cached_data = None
+    if use_cache:
+        cached_data, is_fresh = _get_fresh_revit_files_cache(cache_key, project_id)
+        if is_fresh:
+            return cached_data.get("data", [])
+    
+    # Fetch fresh data from API, conditional on the validators of the expired cache
+    own_crawler = crawler is None
+    if own_crawler:
+        access_token = get_reusable_access_token()
+        if not access_token:
+            return None
+        crawler = AccCrawler(access_token)
+    try:
+        revit_files, http_cache = crawler.crawl_project(project_id, hub_id, (cached_data or {}).get("http_cache"))
+    finally:
+        if own_crawler:
+            crawler.close()
+    if revit_files is None:
+        return None
+    
+    _save_revit_files_cache(cache_key, project_id, revit_files, http_cache)
     return revit_files
 
 def get_ACC_summary_data(show_progress = False):
@@ -1274,6 +1575,8 @@ def get_ACC_summary_data(show_progress = False):
     
     logging.info("Starting ACC summary processing for {} hubs".format(len(all_projects_data)))
     
+    # Pass 1: pick the projects to process, answering from the cache where possible
+    jobs = []
     for hub_name, hub_data in all_projects_data.items():
         if not hub_data or "data" not in hub_data:
             logging.warning("Skipping hub {} - no data".format(hub_name))
@@ -1282,7 +1585,6 @@ def get_ACC_summary_data(show_progress = False):
         logging.info("Processing hub {} with {} projects".format(hub_name, len(hub_data["data"])))
         
         for project in hub_data["data"]:
-            project_version_year = set()
             project_name = project["attributes"]["name"]
             if show_progress:
                 print ("{:0{}}/{} {} (Hub: {})".format(count+1, len(str(total)), total, project_name, hub_name))    
@@ -1297,68 +1599,116 @@ def get_ACC_summary_data(show_progress = False):
                     print("  [money] Skipped to save API costs")
                 continue
             
-            # Get Revit files with logging for progress tracking
-            logging.info("Processing project {}/{}: {} (ID: {})".format(count, total, project_name, project_id))
-            start_time = time.time()
-            revit_files = get_project_revit_files_data(project_id, hub_id, project_name=project_name, hub_name=hub_name, use_cache=True)
-            end_time = time.time()
-            elapsed = end_time - start_time
-            
-            if revit_files is None:
-                logging.warning("Failed to get Revit files for project {} after {:.1f}s, skipping".format(project_name, elapsed))
-                if show_progress:
-                    print("  [!]  Failed to get Revit files, skipping")
-                continue
-            else:
-                logging.info("Got {} Revit files for project {} in {:.1f}s".format(len(revit_files) if revit_files else 0, project_name, elapsed))
-                if show_progress and elapsed > 10:
-                    print("  [t]  Took {:.1f}s to process".format(elapsed))
-            
-            processed_files = {}
-            if revit_files:
-                for file_data in revit_files:
-                    if "data" not in file_data:
-                        continue
+            cache_key = _get_revit_files_cache_key(project_id, hub_id, project_name, hub_name)
+            cached_data, is_fresh = _get_fresh_revit_files_cache(cache_key, project_id)
+            jobs.append({
+                "index": count,
+                "project_name": project_name,
+                "project_id": project_id,
+                "hub_id": hub_id,
+                "project_type": project_type,
+                "cache_key": cache_key,
+                "cached_data": cached_data,
+                "revit_files": cached_data.get("data", []) if is_fresh else None,
+                "needs_crawl": not is_fresh,
+                "elapsed": 0.0
+            })
+    
+    # Pass 2: crawl the stale projects, a few at a time on one shared crawler
+    crawl_jobs = [job for job in jobs if job["needs_crawl"]]
+    if crawl_jobs:
+        access_token = get_reusable_access_token()
+        crawler = AccCrawler(access_token) if access_token else None
+        in_flight = []
+        
+        def finish_crawl(job):
+            revit_files, http_cache = crawler.wait_project(job["crawl"])
+            job["elapsed"] = time.time() - job["start_time"]
+            job["revit_files"] = revit_files
+            if revit_files is not None:
+                _save_revit_files_cache(job["cache_key"], job["project_id"], revit_files, http_cache)
+        
+        try:
+            for job in crawl_jobs:
+                if crawler is None:
+                    break
+                logging.info("Processing project {}/{}: {} (ID: {})".format(job["index"], total, job["project_name"], job["project_id"]))
+                job["start_time"] = time.time()
+                job["crawl"] = crawler.start_project(job["project_id"], job["hub_id"],
+                                                     (job["cached_data"] or {}).get("http_cache"))
+                in_flight.append(job)
+                if len(in_flight) >= CRAWLER_MAX_PROJECTS:
+                    finish_crawl(in_flight.pop(0))
+            while in_flight:
+                finish_crawl(in_flight.pop(0))
+        finally:
+            if crawler is not None:
+                crawler.close()
+    
+    # Pass 3: build the summary in the original project order
+    for job in jobs:
+        project_version_year = set()
+        project_name = job["project_name"]
+        project_id = job["project_id"]
+        project_type = job["project_type"]
+        revit_files = job["revit_files"]
+        elapsed = job["elapsed"]
+        
+        if revit_files is None:
+            logging.warning("Failed to get Revit files for project {} after {:.1f}s, skipping".format(project_name, elapsed))
+            if show_progress:
+                print("  [!]  Failed to get Revit files for {}, skipping".format(project_name))
+            continue
+        else:
+            logging.info("Got {} Revit files for project {} in {:.1f}s".format(len(revit_files) if revit_files else 0, project_name, elapsed))
+            if show_progress and elapsed > 10:
+                print("  [t]  Took {:.1f}s to process {}".format(elapsed, project_name))
+        
+        processed_files = {}
+        if revit_files:
+            for file_data in revit_files:
+                if "data" not in file_data:
+                    continue
 
-                        
-                    if not file_data.get("included") or len(file_data["included"]) == 0:
-                        continue
-                    file_attributes = file_data["included"][0].get("attributes", {})
-                    in_depth_attributes = file_attributes.get("extension", {}).get("data", {})
-                    rvt_version = in_depth_attributes.get("revitProjectVersion", "N/A")
-                    model_guid = in_depth_attributes.get("modelGuid", "N/A")
-                    project_guid = in_depth_attributes.get("projectGuid", "N/A")
+                    
+                if not file_data.get("included") or len(file_data["included"]) == 0:
+                    continue
+                file_attributes = file_data["included"][0].get("attributes", {})
+                in_depth_attributes = file_attributes.get("extension", {}).get("data", {})
+                rvt_version = in_depth_attributes.get("revitProjectVersion", "N/A")
+                model_guid = in_depth_attributes.get("modelGuid", "N/A")
+                project_guid = in_depth_attributes.get("projectGuid", "N/A")
 
-                    project_version_year.add(str(rvt_version))
+                project_version_year.add(str(rvt_version))
 
-                        
-                        
-                    doc_name = file_attributes.get("displayName", "")
-                    processed_files[doc_name] = {
-                        "file_name": doc_name,
-                        "file_id": file_data["data"].get("id", ""),
-                        "revit_project_version": rvt_version,
-                        "model_guid": model_guid,
-                        "project_guid": project_guid,
-                        "create_time": file_attributes.get("createTime", ""),
-                        "create_user_name": file_attributes.get("createUserName", ""),
-                        "last_modified_time": file_attributes.get("lastModifiedTime", ""),
-                        "last_modified_user_name": file_attributes.get("lastModifiedUserName", ""),
-                        "storage_size": file_attributes.get("storageSize", -1)
-                    }
+                    
+                    
+                doc_name = file_attributes.get("displayName", "")
+                processed_files[doc_name] = {
+                    "file_name": doc_name,
+                    "file_id": file_data["data"].get("id", ""),
+                    "revit_project_version": rvt_version,
+                    "model_guid": model_guid,
+                    "project_guid": project_guid,
+                    "create_time": file_attributes.get("createTime", ""),
+                    "create_user_name": file_attributes.get("createUserName", ""),
+                    "last_modified_time": file_attributes.get("lastModifiedTime", ""),
+                    "last_modified_user_name": file_attributes.get("lastModifiedUserName", ""),
+                    "storage_size": file_attributes.get("storageSize", -1)
+                }
 
-            summary[project_name] = {
-                "project_name": project_name,
-                "project_id": project_id,
-                "project_type": project_type,
-                "revit_files": processed_files
-            }
-            processed_count += 1
+        summary[project_name] = {
+            "project_name": project_name,
+            "project_id": project_id,
+            "project_type": project_type,
+            "revit_files": processed_files
+        }
+        processed_count += 1
 
-            key_project_version_year = str(sorted(list(project_version_year)))
-            if key_project_version_year not in project_by_year:
-                project_by_year[key_project_version_year] = []
-            project_by_year[key_project_version_year].append(project_name)
+        key_project_version_year = str(sorted(list(project_version_year)))
+        if key_project_version_year not in project_by_year:
+            project_by_year[key_project_version_year] = []
+        project_by_year[key_project_version_year].append(project_name)
 
             
     save_file = ACC_PROJECTS_SUMMARY
@@ -1816,6 +2166,198 @@ def DEMO_data_generation():
     print("   [date] Data cached for {} days".format(CACHE_EXPIRY_DAYS))
     print("   [sync] Will auto-regenerate when cache expires or in debug mode")
 
+def _make_fake_aps_fixtures(project_id="b.fake-project", hub_id="b.fake-hub"):
+    """Recorded-shape APS responses for a small project, keyed by URL path.
+
+    Layout (depth-first): root has 2 .rvt and a .dwg, folder A has 3 .rvt,
+    folder B holds B1 with 1 .rvt, and a chain of MAX_FOLDER_DEPTH + 2
+    nested folders has one .rvt at every level.
+
+    Returns:
+        tuple: (fixtures dict {path: {"etag", "body"}}, expected .rvt names in depth-first order)
+    """
+    fixtures = {}
+    expected = []
+
+    def add(path, body):
+        fixtures[path] = {"etag": '"{}"'.format(abs(hash(path)) % 1000000), "body": body}
+
+    def item(name):
+        item_id = "urn:adsk.wipprod:dm.lineage:{}".format(name.replace(" ", "_"))
+        add("/data/v1/projects/{}/items/{}".format(project_id, item_id), {
+            "data": {"type": "items", "id": item_id},
+            "included": [{"type": "versions", "attributes": {
+                "displayName": name,
+                "createTime": "2024-01-01T10:00:00Z",
+                "createUserName": "user@company.com",
+                "lastModifiedTime": "2024-01-15T14:30:00Z",
+                "lastModifiedUserName": "user2@company.com",
+                "storageSize": 157483520,
+                "extension": {"data": {"revitProjectVersion": 2024,
+                                       "modelGuid": "model-" + name,
+                                       "projectGuid": "project-guid"}}}}]
+        })
+        return {"type": "items", "id": item_id, "attributes": {"displayName": name}}
+
+    def folder(folder_id, contents):
+        add("/data/v1/projects/{}/folders/{}/contents".format(project_id, folder_id), {"data": contents})
+        return {"type": "folders", "id": folder_id}
+
+    add("/project/v1/hubs/{}/projects/{}".format(hub_id, project_id), {"data": {
+        "id": project_id,
+        "relationships": {"rootFolder": {"data": {"type": "folders", "id": "root"}}}}})
+
+    chain = None
+    for level in reversed(range(MAX_FOLDER_DEPTH + 2)):
+        contents = [item("Deep {}.rvt".format(level))]
+        if chain:
+            contents.append(chain)
+        chain = folder("deep-{}".format(level), contents)
+    folder_a = folder("A", [item("A1.rvt"), item("A2.rvt"), item("A3.rvt")])
+    folder_b = folder("B", [folder("B1", [item("B1 Model.rvt")])])
+    folder("root", [item("Root 1.rvt"), {"type": "items", "id": "dwg", "attributes": {"displayName": "Plan.dwg"}},
+                    folder_a, item("Root 2.rvt"), folder_b, chain])
+
+    expected.extend(["Root 1.rvt", "Root 2.rvt", "A1.rvt", "A2.rvt", "A3.rvt", "B1 Model.rvt"])
+    # deep-0 sits at depth 1 below root, anything below MAX_FOLDER_DEPTH is never opened
+    expected.extend(["Deep {}.rvt".format(level) for level in range(MAX_FOLDER_DEPTH)])
+    return fixtures, expected
+
+
+def unit_test():
+    """Crawl a local fake APS server and check order, limits, conditional requests and pacing."""
+    try:
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from socketserver import ThreadingMixIn
+    except ImportError:
+        print("Fake APS server needs CPython 3, skipping REVIT_ACC unit test.")
+        return
+    if not REQUESTS_AVAILABLE:
+        print("requests module not available, skipping REVIT_ACC unit test.")
+        return
+
+    import json
+    global MAX_REVIT_FILES_SEARCH, MAX_REVIT_FILES_DETAILED
+    fixtures, expected = _make_fake_aps_fixtures()
+    # a second project the server answers slowly, for the starvation check
+    slow_fixtures, _ = _make_fake_aps_fixtures("b.slow-project")
+    fixtures.update(slow_fixtures)
+    state = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+    state_lock = threading.Lock()
+
+    class FakeAPSHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with state_lock:
+                state["requests"] += 1
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            try:
+                time.sleep(0.2 if "b.slow-project" in self.path else 0.01)
+                fixture = fixtures.get(self.path)
+                if self.headers.get("Authorization") != "Bearer fake-token":
+                    self._reply(401, b"")
+                elif fixture is None:
+                    self._reply(404, b'{"errors": []}')
+                elif self.headers.get("If-None-Match") == fixture["etag"]:
+                    self._reply(304, b"", fixture["etag"])
+                else:
+                    self._reply(200, json.dumps(fixture["body"]).encode("utf-8"), fixture["etag"])
+            finally:
+                with state_lock:
+                    state["in_flight"] -= 1
+
+        def _reply(self, status, body, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class FakeAPSServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    server = FakeAPSServer(("127.0.0.1", 0), FakeAPSHandler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    base_url = "http://127.0.0.1:{}".format(server.server_address[1])
+    original_search_limit = MAX_REVIT_FILES_SEARCH
+    original_detailed_limit = MAX_REVIT_FILES_DETAILED
+
+    def names(revit_files):
+        return [x["display_name"] if x.get("basic_info_only") else x["included"][0]["attributes"]["displayName"]
+                for x in revit_files]
+
+    try:
+        crawler = AccCrawler("fake-token", base_url=base_url, rate_per_second=1000, burst=1000)
+        try:
+            # 1. same files, same depth-first order, depth limit honoured
+            MAX_REVIT_FILES_SEARCH = 1000
+            revit_files, http_cache = crawler.crawl_project("b.fake-project", "b.fake-hub")
+            assert names(revit_files) == expected, names(revit_files)
+            assert state["max_in_flight"] <= CRAWLER_PER_PROJECT_LIMIT, state
+            first_requests = crawler.stats["requests"]
+
+            # 2. second crawl with the stored validators only gets 304s
+            again, _ = crawler.crawl_project("b.fake-project", "b.fake-hub", http_cache)
+            assert names(again) == expected
+            assert crawler.stats["not_modified"] == first_requests, crawler.stats
+
+            # 3. early exit once enough files are found, exactly where the serial walk stopped
+            MAX_REVIT_FILES_SEARCH = 2
+            before = crawler.stats["requests"]
+            limited, _ = crawler.crawl_project("b.fake-project", "b.fake-hub")
+            assert names(limited) == expected[:5], names(limited)
+            assert crawler.stats["requests"] - before < first_requests
+
+            # only the first files in depth-first order get a detail call
+            MAX_REVIT_FILES_SEARCH = 1000
+            MAX_REVIT_FILES_DETAILED = 3
+            revit_files, _ = crawler.crawl_project("b.fake-project", "b.fake-hub")
+            assert names(revit_files) == expected, names(revit_files)
+            assert [x.get("basic_info_only", False) for x in revit_files] == [False] * 3 + [True] * (len(expected) - 3)
+            MAX_REVIT_FILES_DETAILED = original_detailed_limit
+
+            # 4. unknown project fails like the serial walk did
+            assert crawler.crawl_project("b.missing", "b.fake-hub")[0] is None
+        finally:
+            crawler.close()
+
+        # 5. the token bucket paces requests
+        MAX_REVIT_FILES_SEARCH = 1000
+        paced = AccCrawler("fake-token", base_url=base_url, rate_per_second=100, burst=1)
+        try:
+            t_start = time.time()
+            paced.crawl_project("b.fake-project", "b.fake-hub")
+            assert time.time() - t_start >= (paced.stats["requests"] - 1) / 100.0 * 0.9
+        finally:
+            paced.close()
+
+        # 6. a slow project at its cap leaves a worker free for the others
+        shared = AccCrawler("fake-token", base_url=base_url, max_workers=CRAWLER_PER_PROJECT_LIMIT + 1,
+                            rate_per_second=1000, burst=1000)
+        try:
+            slow = shared.start_project("b.slow-project", "b.fake-hub")
+            time.sleep(0.5)  # the slow project has queued more folders than its cap
+            quick = shared.start_project("b.fake-project", "b.fake-hub")
+            assert names(shared.wait_project(quick)[0]) == expected
+            assert not slow.done.is_set()
+            assert names(shared.wait_project(slow)[0]) == expected
+        finally:
+            shared.close()
+    finally:
+        MAX_REVIT_FILES_SEARCH = original_search_limit
+        MAX_REVIT_FILES_DETAILED = original_detailed_limit
+        server.shutdown()
+    print("REVIT_ACC crawler unit test passed")
+
+
 if __name__ == "__main__":
     # print("Script started from __main__.")
     # logging.info("Script started from __main__.")
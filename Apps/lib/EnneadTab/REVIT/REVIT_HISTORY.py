@@ -1,10 +1,34 @@
 # -*- coding: utf-8 -*-
+"""
+Revit warning history per document.
+
+The legacy history was one nested dict per document, {date: {description:
+{"count", "creators"}}}, rewritten in full on every document open and walked
+day by day again to draw the chart. It now lives in a small store per
+document in the shared dump folder:
+
+    <shared dump folder>/REVIT_WARNING_HISTORY/<doc name>/
+        days.jsonl      -> one line per recorded day, append only
+        matrix.json     -> {"dates": [...], "counts": {description: [count per date]}}
+
+The matrix is the category x date table the chart draws, kept up to date by
+each recording. It remembers how much of days.jsonl it covers, so when
+another machine appended a day in the meantime it is rebuilt from the days
+instead of being trusted.
+
+A document is recorded once per day, on its first open. The store and the
+aggregation have no Revit imports and are covered by unit_test().
+"""
 from datetime import date
+import bisect
+import json
 import pickle
 import os
+import re
 import sys
 import time
 import io
+import shutil
 
 # if hasattr(sys, "setdefaultencoding"):
 #     reload(sys) # pyright: ignore # Required to set default encoding in Python 2
@@ -21,43 +45,97 @@ try:
 except ImportError:
     pass
 
+WARNING_HISTORY_PREFIX = "REVIT_WARNING_HISTORY_"
+STORE_FOLDER_NAME = "REVIT_WARNING_HISTORY"
+DAYS_FILE = "days.jsonl"
+MATRIX_FILE = "matrix.json"
+
+_COUNT_ENTRY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}:\d+$")
+
+
 def name_fix(name):
     new_name = "".join(name)
     if new_name != str(name):
         print("File name renamed!")
     return new_name
 
+
+def _read_count_entries(file):
+    """Read the "date:count" lines of a warning count file.
+
+    The file used to be a pickled list, rewritten in full by every append.
+    A pickled file is converted to lines the first time it is read.
+    """
+    with open(file, "rb") as f:
+        raw = f.read()
+    lines = [x.strip() for x in raw.decode("utf-8", "replace").splitlines() if x.strip()]
+    if all(_COUNT_ENTRY_PATTERN.match(x) for x in lines):
+        return lines
+
+    entries = [str(x) for x in pickle.loads(raw)]
+    with open(file, "wb") as f:
+        f.write("".join(x + "\n" for x in entries).encode("utf-8"))
+    return entries
+
+
+def _read_last_line(file, chunk_size=256):
+    with open(file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - chunk_size))
+        tail = f.read().decode("utf-8", "replace")
+    lines = [x.strip() for x in tail.splitlines() if x.strip()]
+    return lines[-1] if lines else None
+
+
+def _line_break_needed(file):
+    """True when the file ends in a torn line, an append must start a new line."""
+    try:
+        with open(file, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except (IOError, OSError):
+        # missing or empty
+        return False
+
+
 def append_data(file, data_entry):
+    """Append a "date:count" entry, at most one per day.
+
+    Only the last line is read to check the date, the file is never
+    rewritten once it is in the line format.
+    """
     if not os.path.exists(file):
-        with io.open(file, 'wb', encoding="utf-8") as f:
-            pickle.dump([data_entry], f)
+        with open(file, "wb") as f:
+            f.write((data_entry + "\n").encode("utf-8"))
         return
 
-    with io.open(file, 'rb', encoding="utf-8") as f:
-        current_data = pickle.load(f)
+    last_entry = _read_last_line(file)
+    if last_entry is not None and not _COUNT_ENTRY_PATTERN.match(last_entry):
+        # still pickled, convert it first
+        entries = _read_count_entries(file)
+        last_entry = entries[-1] if entries else None
 
-    for item in current_data:
-        if str(date.today()) in item:
-            print("Warning: Data with this date {} already exists".format(date.today()))
-            return
+    if last_entry is not None and last_entry.startswith(str(date.today())):
+        print("Warning: Data with this date {} already exists".format(date.today()))
+        return
 
-    with io.open(file, 'wb', encoding="utf-8") as f:
-        current_data.append(data_entry)
-        pickle.dump(current_data, f)
+    with open(file, "ab") as f:
+        f.write((data_entry + "\n").encode("utf-8"))
 
-def read_data(file, doc):
+
+def read_data(file, doc=None):
     if not os.path.exists(file):
-        print("Data with this file title {} does not exist".format(doc.Title))
+        print("Data with this file title {} does not exist".format(doc.Title if doc else file))
         return None
 
-    with io.open(file, 'rb', encoding="utf-8") as f:
-        current_data = pickle.load(f)
-    return current_data
+    return _read_count_entries(file)
+
 
 def compare_data(previous_data, current_warning_count, doc):
     old_date, old_warnings = previous_data.split(":")
     old_warnings = int(old_warnings)
-    
+
     warning_increase = current_warning_count - old_warnings
     percentage = "{:.1%}".format(abs(float(warning_increase) / old_warnings))
 
@@ -76,13 +154,267 @@ def compare_data(previous_data, current_warning_count, doc):
         return main_text
 
     main_text += "\nSince {}, the warning has {} by {}. A change of {}.".format(old_date, tmp_text, abs(warning_increase), percentage)
-    
+
     if abs(float(warning_increase) / old_warnings) > 0.9:
         return main_text
 
     main_text += "\n{}".format(price_note)
     return main_text
 
+
+def _element_id_key(element_id):
+    # Revit 2024+ uses .Value, older versions .IntegerValue, tests pass ints
+    for attr in ("IntegerValue", "Value"):
+        try:
+            return int(getattr(element_id, attr))
+        except AttributeError:
+            pass
+    return element_id
+
+
+class CreatorLookup:
+    """Creator of an element, looked up once per element id.
+
+    A wall in ten warnings only asks the worksharing tooltip once.
+
+    Args:
+        lookup (callable): lookup(element_id) -> creator name
+    """
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self.calls = 0
+        self._cache = {}
+
+    def get(self, element_id):
+        key = _element_id_key(element_id)
+        creator = self._cache.get(key)
+        if creator is None:
+            self.calls += 1
+            creator = self.lookup(element_id)
+            self._cache[key] = creator
+        return creator
+
+
+def summarize_warnings(warnings, creator_lookup=None):
+    """Count warnings per description and collect who created the elements.
+
+    Args:
+        warnings (iterable): (description, failing element ids) per warning
+        creator_lookup (CreatorLookup, optional): None skips the creators,
+            as for a document that is not workshared
+
+    Returns:
+        dict: {description: {"count": int, "creators": sorted list}}
+    """
+    summary = {}
+    creators = {}
+    for description, element_ids in warnings:
+        data = summary.get(description)
+        if data is None:
+            data = summary[description] = {"count": 0, "creators": []}
+            creators[description] = set()
+        data["count"] += 1
+        if creator_lookup is not None:
+            for element_id in element_ids:
+                creators[description].add(creator_lookup.get(element_id))
+    for description, names in creators.items():
+        summary[description]["creators"] = sorted(names)
+    return summary
+
+
+def _replace_file(source, target):
+    # os.replace does not exist in IronPython 2.7
+    if os.path.exists(target):
+        os.remove(target)
+    shutil.move(source, target)
+
+
+def _empty_matrix():
+    return {"dates": [], "counts": {}, "days_size": 0, "legacy_imported": False}
+
+
+def _apply_day(matrix, day, warnings):
+    """Put one day's counts into the category x date matrix."""
+    dates = matrix["dates"]
+    counts = matrix["counts"]
+    index = bisect.bisect_left(dates, day)
+    if index < len(dates) and dates[index] == day:
+        for series in counts.values():
+            series[index] = 0
+    else:
+        dates.insert(index, day)
+        for series in counts.values():
+            series.insert(index, 0)
+    for description, data in warnings.items():
+        series = counts.get(description)
+        if series is None:
+            series = counts[description] = [0] * len(dates)
+        series[index] = data.get("count", 0)
+
+
+class WarningStore:
+    """Warning history of one document, a day log plus a category x date matrix.
+
+    Args:
+        folder (str): Store folder of the document
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.days_path = os.path.join(folder, DAYS_FILE)
+        self.matrix_path = os.path.join(folder, MATRIX_FILE)
+        self._matrix = None
+
+    def _days_size(self):
+        try:
+            return os.path.getsize(self.days_path)
+        except OSError:
+            return 0
+
+    def iter_days(self):
+        """Yield (date, {description: {"count", "creators"}}) by date.
+
+        A day recorded twice, by two machines at once, keeps its last record.
+        """
+        days = {}
+        if os.path.exists(self.days_path):
+            with io.open(self.days_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        days[record["date"]] = record["warnings"]
+                    except (ValueError, KeyError, TypeError):
+                        # torn line from a crash, skip it
+                        continue
+        for day in sorted(days):
+            yield day, days[day]
+
+    def _load_matrix(self):
+        if not os.path.exists(self.matrix_path):
+            return None
+        try:
+            with io.open(self.matrix_path, "r", encoding="utf-8") as f:
+                matrix = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        return matrix if isinstance(matrix, dict) and "counts" in matrix else None
+
+    def _save_matrix(self, matrix):
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+        # other machines write the same shared folder
+        temp_path = "{}.{}.tmp".format(self.matrix_path, os.getpid())
+        with open(temp_path, "wb") as f:
+            f.write(json.dumps(matrix, ensure_ascii=True, sort_keys=True).encode("utf-8"))
+        _replace_file(temp_path, self.matrix_path)
+        self._matrix = matrix
+
+    def rebuild_matrix(self):
+        """Rebuild the matrix from the day log and save it."""
+        previous = self._matrix or self._load_matrix() or _empty_matrix()
+        matrix = _empty_matrix()
+        matrix["legacy_imported"] = previous.get("legacy_imported", False)
+        matrix["days_size"] = self._days_size()
+        for day, warnings in self.iter_days():
+            _apply_day(matrix, day, warnings)
+        self._save_matrix(matrix)
+        return matrix
+
+    def get_matrix(self):
+        """{"dates": [...], "counts": {description: [count per date]}}, current with the day log."""
+        days_size = self._days_size()
+        matrix = self._matrix
+        if matrix is None or matrix.get("days_size") != days_size:
+            matrix = self._load_matrix()
+        if matrix is None or matrix.get("days_size") != days_size:
+            matrix = self.rebuild_matrix()
+        self._matrix = matrix
+        return matrix
+
+    def has_day(self, day):
+        dates = self.get_matrix()["dates"]
+        index = bisect.bisect_left(dates, day)
+        return index < len(dates) and dates[index] == day
+
+    def record_day(self, day, warnings):
+        """Append one day's warning summary and update the matrix.
+
+        Args:
+            day (str): 2024-01-31
+            warnings (dict): See summarize_warnings
+        """
+        matrix = self.get_matrix()
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+        line = (json.dumps({"date": day, "warnings": warnings}, ensure_ascii=True, sort_keys=True) + "\n").encode("utf-8")
+        if _line_break_needed(self.days_path):
+            # keep the record off a line torn by a crash
+            line = b"\n" + line
+        size_before = matrix["days_size"]
+        with open(self.days_path, "ab") as f:
+            f.write(line)
+        _apply_day(matrix, day, warnings)
+        # another machine appending at the same moment leaves the sizes
+        # apart, the next read then rebuilds from the day log
+        matrix["days_size"] = size_before + len(line) if self._days_size() == size_before + len(line) else -1
+        self._save_matrix(matrix)
+
+    def import_legacy_once(self, legacy_path):
+        """Move the days of the legacy nested dict into the day log, once.
+
+        Returns:
+            int: Days imported
+        """
+        matrix = self.get_matrix()
+        if matrix.get("legacy_imported"):
+            return 0
+        imported = 0
+        if os.path.exists(legacy_path):
+            legacy = DATA_FILE.get_data(legacy_path) or {}
+            known = set(matrix["dates"])
+            lines = []
+            for day in sorted(legacy):
+                if day in known or not isinstance(legacy[day], dict):
+                    continue
+                lines.append(json.dumps({"date": day, "warnings": legacy[day]}, ensure_ascii=True, sort_keys=True) + "\n")
+            if lines:
+                if not os.path.exists(self.folder):
+                    os.makedirs(self.folder)
+                if _line_break_needed(self.days_path):
+                    lines.insert(0, "\n")
+                with open(self.days_path, "ab") as f:
+                    f.write("".join(lines).encode("utf-8"))
+            imported = len(lines)
+        matrix = self.rebuild_matrix()
+        matrix["legacy_imported"] = True
+        self._save_matrix(matrix)
+        return imported
+
+
+def get_store_folder(doc_name):
+    return os.path.join(FOLDER.SHARED_DUMP_FOLDER, STORE_FOLDER_NAME, doc_name)
+
+
+def get_store(doc_name):
+    """Warning store of a document, with its legacy history imported."""
+    store = WarningStore(get_store_folder(doc_name))
+    store.import_legacy_once(FOLDER.get_shared_dump_folder_file(WARNING_HISTORY_PREFIX + doc_name))
+    return store
+
+
+def list_recorded_documents():
+    """Names of the documents with a warning history, in stores or legacy files."""
+    names = set()
+    store_root = os.path.join(FOLDER.SHARED_DUMP_FOLDER, STORE_FOLDER_NAME)
+    if os.path.isdir(store_root):
+        names.update(x for x in os.listdir(store_root) if os.path.isdir(os.path.join(store_root, x)))
+    for file_name in os.listdir(FOLDER.SHARED_DUMP_FOLDER):
+        if file_name.startswith(WARNING_HISTORY_PREFIX) and file_name.endswith(FOLDER.PLUGIN_EXTENSION):
+            names.add(file_name[len(WARNING_HISTORY_PREFIX):-len(FOLDER.PLUGIN_EXTENSION)])
+    return sorted(names)
+
+
 class WarningHistory:
     def __init__(self, doc):
         if isinstance(doc, str):
@@ -91,10 +423,7 @@ class WarningHistory:
         else:
             self.doc = doc
             self.doc_name = doc.Title
-        self.file = "REVIT_WARNING_HISTORY_{}".format(self.doc_name)
-
-        self.data = DATA_FILE.get_data(self.file, is_local=False)
-      
+        self.store = get_store(self.doc_name)
 
     def record_warning(self):
         if not self.doc:
@@ -102,66 +431,58 @@ class WarningHistory:
             return
 
         today = time.strftime("%Y-%m-%d")
-        today_data = self.data.get(today, {})
-
-        for warning in self.doc.GetWarnings():
-            description = warning.GetDescriptionText()
-            
-            if self.doc.IsWorkshared:
-                creators = list(set([DB.WorksharingUtils.GetWorksharingTooltipInfo(self.doc, x).Creator for x in warning.GetFailingElements()]))
-            else:
-                creators = []
+        if self.store.has_day(today):
+            return
 
-            warning_cate_data = today_data.get(description, {})
-            warning_cate_data["count"] = warning_cate_data.get("count", 0) + 1
-            warning_cate_data["creators"] = list(set(warning_cate_data.get("creators", []) + creators))
-            
-            today_data.update({description: warning_cate_data})
+        if self.doc.IsWorkshared:
+            doc = self.doc
+            creator_lookup = CreatorLookup(lambda x: DB.WorksharingUtils.GetWorksharingTooltipInfo(doc, x).Creator)
+        else:
+            creator_lookup = None
 
-        self.data.update({today: today_data})
-        DATA_FILE.set_data(self.data, self.file, is_local=False)
+        warnings = ((x.GetDescriptionText(), x.GetFailingElements()) for x in self.doc.GetWarnings())
+        self.store.record_day(today, summarize_warnings(warnings, creator_lookup))
 
     def display_warning(self, show_detail=True):
-        
-        
+
+
         from pyrevit import script
 
         self.output = script.get_output()
-        all_mentioned_warning_cates = []
-        all_mentioned_users = []
-        
-        if not self.data:
+        matrix = self.store.get_matrix()
+
+        if not matrix["dates"]:
             print("empty data")
             return
 
-        
+
         print ("\n\n\n\n")
         self.output.insert_divider(level='')
         self.output.print_md ("# Document: {}".format(self.doc_name))
-        if len(self.data.keys()) == 1:
+        if len(matrix["dates"]) == 1:
             self.output.print_md ("### This document warning history has only been recorded once.")
-        for date in sorted(self.data.keys()):
-            date_data = self.data[date]
-            
-            self.output.insert_divider(level='') if show_detail else None
-            self.output.print_md ("## Date: {}".format(date)) if show_detail else None
-            all_mentioned_warning_cates += date_data.keys()
-            for i, description  in enumerate( sorted(date_data.keys())):
-                self.output.print_md ("\n\n{}".format(i+1)) if show_detail else None
-                self.output.print_md ("Description: {}".format(description)) if show_detail else None
-                warning_data = date_data[description]
-                self.output.print_md ("Count: **{}**".format(warning_data["count"])) if show_detail else None
-                self.output.print_md ("Creators: **{}**".format(warning_data["creators"])) if show_detail else None
-                all_mentioned_users += warning_data["creators"]
-                
-        all_mentioned_warning_cates = sorted(set(all_mentioned_warning_cates))
-        self.display_overall_status(all_mentioned_warning_cates)
-        
+        if show_detail:
+            for day, date_data in self.store.iter_days():
+                self.output.insert_divider(level='')
+                self.output.print_md ("## Date: {}".format(day))
+                for i, description  in enumerate( sorted(date_data.keys())):
+                    self.output.print_md ("\n\n{}".format(i+1))
+                    self.output.print_md ("Description: {}".format(description))
+                    warning_data = date_data[description]
+                    self.output.print_md ("Count: **{}**".format(warning_data["count"]))
+                    self.output.print_md ("Creators: **{}**".format(warning_data["creators"]))
+
+        self.display_overall_status()
+
         return
 
 
-                
-    def display_overall_status(self, all_mentioned_warning_cates):
+
+    def display_overall_status(self, all_mentioned_warning_cates=None):
+        matrix = self.store.get_matrix()
+        if all_mentioned_warning_cates is None:
+            all_mentioned_warning_cates = sorted(matrix["counts"].keys())
+
         # Line chart
         chart = self.output.make_stacked_chart()
         chart.set_style('height:150px')
@@ -171,7 +492,7 @@ class WarningHistory:
                             'fontSize': 18,
                             'fontColor': '#000',
                             'fontStyle': 'bold'}
-        
+
         # Set the legend configuration
         chart.options.legend = {
             'display': True,
@@ -180,30 +501,22 @@ class WarningHistory:
                 'fontSize': 8,  # Customize the legend label font size
             }
         }
-        
+
         # setting the charts x line data labels
-        chart.data.labels = sorted(self.data.keys())
-        
+        chart.data.labels = list(matrix["dates"])
+
 
         # add data sets:
         for cate in all_mentioned_warning_cates:
             set_local = chart.data.new_dataset(cate)
 
-            set_local.data = []
-
-            # use exact same order as the X asix label
-            for date in chart.data.labels:
-                date_data = self.data[date]
-                
-                if cate in date_data:
-                    set_local.data.append(date_data[cate]["count"])
-                else:
-                    set_local.data.append(0)
+            # the matrix rows are already in the order of the X axis labels
+            set_local.data = list(matrix["counts"].get(cate, [0] * len(matrix["dates"])))
 
             # this make straight line.
             set_local.tension = 0
 
-            
+
 
         chart.randomize_colors()
 
@@ -221,28 +534,30 @@ class WarningHistory:
                             'fontSize': 18,
                             'fontColor': '#000',
                             'fontStyle': 'bold'}
-        
-        
-        
+
+
+        days = list(self.store.iter_days())
+
         # setting the charts x line data labels
-        chart.data.labels = self.data.keys()
-        
+        chart.data.labels = [day for day, _ in days]
+
 
         # add data sets:
         for cate in all_mentioned_warning_cates:
             set_local = chart.data.new_dataset(cate)
 
             set_local.data = []
-            for date_data in self.data.values():
-                if user not in date_data[cate]["creators"]:
+            for _, date_data in days:
+                warning_data = date_data.get(cate)
+                if not warning_data or user not in warning_data["creators"]:
                     set_local.data.append(0)
                 else:
-                    set_local.data.append(date_data[cate]["count"])
-     
-            
+                    set_local.data.append(warning_data["count"])
+
+
             set_local.tension = 0
 
-            
+
 
         chart.randomize_colors()
 
@@ -255,5 +570,173 @@ def record_warning(doc):
 def display_warning(doc_name, show_detail=True):
     WarningHistory(doc_name).display_warning(show_detail)
 
+
+def _make_fake_day(day_index, category_count=60, warnings_per_category=20):
+    """Warnings of one day as (description, element ids) pairs."""
+    warnings = []
+    for category in range(category_count):
+        if (category + day_index) % 7 == 0:
+            continue
+        for k in range(warnings_per_category + day_index % 5):
+            first = 1000 + (category * 37 + k) % 400
+            warnings.append(("Fake warning category {}".format(category), [first, first + 1]))
+    return warnings
+
+
+def _fake_creator(element_id):
+    return "user_{}".format(element_id % 9)
+
+
+def _fake_date(day_index):
+    return time.strftime("%Y-%m-%d", time.gmtime(1577836800 + day_index * 86400))
+
+
+def _legacy_record(legacy_path, day, warnings, lookup):
+    # the record_warning body this store replaced, a lookup per element per
+    # warning and a full rewrite of the nested dict
+    data = DATA_FILE.get_data(legacy_path) if os.path.exists(legacy_path) else {}
+    today_data = data.get(day, {})
+    for description, element_ids in warnings:
+        creators = list(set([lookup(x) for x in element_ids]))
+        warning_cate_data = today_data.get(description, {})
+        warning_cate_data["count"] = warning_cate_data.get("count", 0) + 1
+        warning_cate_data["creators"] = list(set(warning_cate_data.get("creators", []) + creators))
+        today_data.update({description: warning_cate_data})
+    data.update({day: today_data})
+    with open(legacy_path, "wb") as f:
+        f.write(json.dumps(data, ensure_ascii=True, indent=4, sort_keys=True).encode("utf-8"))
+
+
+def _legacy_chart_rows(data):
+    # the old display_overall_status walk over every day's dict
+    cates = sorted(set(cate for date_data in data.values() for cate in date_data))
+    labels = sorted(data.keys())
+    return dict((cate, [data[day][cate]["count"] if cate in data[day] else 0 for day in labels]) for cate in cates)
+
+
+def benchmark(history_days=(30, 365, 1000), samples=5):
+    """Compare one day's recording and the chart data, legacy dict against the store.
+
+    Args:
+        history_days (tuple, optional): Days already recorded
+        samples (int, optional): Recordings timed per history size
+
+    Returns:
+        dict: {days: (legacy_record_ms, store_record_ms, legacy_chart_ms, store_chart_ms)}
+    """
+    import tempfile
+
+    results = {}
+    for size in history_days:
+        work_folder = tempfile.mkdtemp(prefix="revit_history_bench_")
+        try:
+            legacy_path = os.path.join(work_folder, "legacy.sexyDuck")
+            legacy = {}
+            for i in range(size):
+                legacy[_fake_date(i)] = summarize_warnings(_make_fake_day(i), CreatorLookup(_fake_creator))
+            with open(legacy_path, "wb") as f:
+                f.write(json.dumps(legacy, ensure_ascii=True, indent=4, sort_keys=True).encode("utf-8"))
+            store = WarningStore(os.path.join(work_folder, "store"))
+            store.import_legacy_once(legacy_path)
+
+            lookups = [0]
+
+            def counting_creator(element_id):
+                lookups[0] += 1
+                return _fake_creator(element_id)
+
+            t_start = time.time()
+            for i in range(size, size + samples):
+                _legacy_record(legacy_path, _fake_date(i), _make_fake_day(i), counting_creator)
+            legacy_record = (time.time() - t_start) * 1000.0 / samples
+            legacy_lookups = lookups[0] // samples
+
+            lookups[0] = 0
+            t_start = time.time()
+            for i in range(size, size + samples):
+                store.record_day(_fake_date(i), summarize_warnings(_make_fake_day(i), CreatorLookup(counting_creator)))
+            store_record = (time.time() - t_start) * 1000.0 / samples
+            store_lookups = lookups[0] // samples
+
+            t_start = time.time()
+            legacy_rows = _legacy_chart_rows(DATA_FILE.get_data(legacy_path))
+            legacy_chart = (time.time() - t_start) * 1000.0
+            reopened = WarningStore(store.folder)
+            t_start = time.time()
+            store_rows = reopened.get_matrix()["counts"]
+            store_chart = (time.time() - t_start) * 1000.0
+            assert store_rows == legacy_rows
+
+            results[size] = (legacy_record, store_record, legacy_chart, store_chart)
+            print("{:>5} days: record legacy {:>8.1f} ms ({} creator lookups), store {:>6.1f} ms ({} lookups); "
+                  "chart data legacy {:>7.1f} ms, matrix {:>5.1f} ms".format(
+                      size, legacy_record, legacy_lookups, store_record, store_lookups, legacy_chart, store_chart))
+        finally:
+            shutil.rmtree(work_folder, ignore_errors=True)
+    return results
+
+
+def unit_test():
+    import tempfile
+
+    # creators are looked up once per element id
+    lookup = CreatorLookup(_fake_creator)
+    summary = summarize_warnings([("Overlap", [1, 2]), ("Overlap", [2, 10]), ("Duplicate", [1])], lookup)
+    assert summary == {"Overlap": {"count": 2, "creators": ["user_1", "user_2"]},
+                       "Duplicate": {"count": 1, "creators": ["user_1"]}}
+    assert lookup.calls == 3
+    assert summarize_warnings([("Overlap", [1])])["Overlap"] == {"count": 1, "creators": []}
+
+    work_folder = tempfile.mkdtemp(prefix="revit_history_test_")
+    try:
+        legacy_path = os.path.join(work_folder, "REVIT_WARNING_HISTORY_tester.sexyDuck")
+        with open(legacy_path, "wb") as f:
+            f.write(json.dumps({"2024-01-02": {"Overlap": {"count": 4, "creators": ["a"]}},
+                                "2024-01-01": {"Duplicate": {"count": 1, "creators": []}}}).encode("utf-8"))
+        store = WarningStore(os.path.join(work_folder, "store", "tester"))
+        assert store.import_legacy_once(legacy_path) == 2
+        assert store.import_legacy_once(legacy_path) == 0
+        assert store.has_day("2024-01-01") and not store.has_day("2024-01-03")
+
+        store.record_day("2024-01-04", {"Overlap": {"count": 2, "creators": ["b"]}})
+        store.record_day("2024-01-03", {"Room": {"count": 5, "creators": []}})
+        matrix = store.get_matrix()
+        assert matrix["dates"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+        assert matrix["counts"] == {"Duplicate": [1, 0, 0, 0], "Overlap": [0, 4, 0, 2], "Room": [0, 0, 5, 0]}
+
+        # a second record of a day replaces it
+        store.record_day("2024-01-04", {"Room": {"count": 1, "creators": []}})
+        assert store.get_matrix()["counts"]["Overlap"][3] == 0
+        assert dict(store.iter_days())["2024-01-04"] == {"Room": {"count": 1, "creators": []}}
+
+        # another machine appends a day and a torn line, the matrix is rebuilt
+        with open(store.days_path, "ab") as f:
+            f.write(b'{"date": "2024-01-05", "warnings": {"Room": {"count": 3, "creators": []}}}\n{"date": ')
+        reopened = WarningStore(store.folder)
+        assert reopened.get_matrix()["counts"]["Room"] == [0, 0, 5, 1, 3]
+        assert reopened.get_matrix()["legacy_imported"]
+        assert [day for day, _ in reopened.iter_days()][-1] == "2024-01-05"
+
+        # the next record starts on its own line instead of joining the torn one
+        reopened.record_day("2024-01-06", {"Room": {"count": 2, "creators": []}})
+        assert [day for day, _ in reopened.iter_days()][-1] == "2024-01-06"
+        assert WarningStore(store.folder).get_matrix()["counts"]["Room"] == [0, 0, 5, 1, 3, 2]
+        assert reopened.rebuild_matrix()["dates"][-1] == "2024-01-06"
+
+        # the pickled count file turns into lines on first use
+        count_file = os.path.join(work_folder, "counts.txt")
+        with open(count_file, "wb") as f:
+            pickle.dump(["2024-01-01:50", "2024-01-02:60"], f)
+        assert read_data(count_file) == ["2024-01-01:50", "2024-01-02:60"]
+        append_data(count_file, "{}:70".format(date.today()))
+        append_data(count_file, "{}:80".format(date.today()))
+        assert read_data(count_file)[-1] == "{}:70".format(date.today())
+        assert len(read_data(count_file)) == 3
+        assert compare_data("2024-01-01:50", 70, None).startswith("70 warnings found.")
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
 if __name__ == "__main__":
-    record_warning("temp2")
+    unit_test()
+    benchmark()
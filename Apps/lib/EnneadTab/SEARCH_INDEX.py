@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Search Index
+
+Host-free full text index for command palettes and other "type to find"
+lists. It has no Revit, Rhino or .NET dependency, and it is built once and
+saved as JSON, so a palette does not re-read every docstring on open or
+rescan every item on every keystroke.
+
+    - prefix lookup over a sorted vocabulary, the word being typed matches
+      every word it starts
+    - token inverted index with BM25 style ranking over title and body,
+      title hits weigh more
+    - trigram index for typo tolerant matching, candidates are confirmed
+      with levenshtein_distance (shared with TEXT.fuzzy_search)
+    - SearchSession reuses the work of the previous keystroke, only the
+      word being typed is evaluated again
+
+Example:
+    index = SEARCH_INDEX.SearchIndex()
+    index.add("Wall Finder", "Find walls by type...", payload=script_path)
+    index.save(path, signature=version)
+    ...
+    index = SEARCH_INDEX.SearchIndex.load(path, signature=version)
+    session = SEARCH_INDEX.SearchSession(index)
+    session.search("wal fin")  # -> ["Wall Finder", ...]
+"""
+
+import re
+import io
+import json
+import math
+import time
+import bisect
+
+
+INDEX_VERSION = 1
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# BM25 parameters, title and body are separate fields (BM25F)
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+
+# how much a term found by prefix or by typo tolerance counts against an exact hit
+PREFIX_FACTOR = 0.8
+FUZZY_FACTOR = 0.5
+
+
+def tokenize(text):
+    """Lowercase word tokens of text, punctuation and underscores split words."""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def get_trigrams(word):
+    padded = u"  {} ".format(word)
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def levenshtein_distance(s1, s2, max_distance=None):
+    """Edit distance between two strings.
+
+    Args:
+        s1 (str): First string
+        s2 (str): Second string
+        max_distance (int, optional): Stop early once the distance is known
+            to exceed this, max_distance + 1 is returned in that case.
+
+    Returns:
+        int: Number of single character edits
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return max_distance + 1
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        if max_distance is not None and min(current_row) > max_distance:
+            return max_distance + 1
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+class SearchIndex:
+    """Inverted index over (title, body) documents.
+
+    Titles are the keys returned by searches, so they should be unique;
+    adding a title again replaces the earlier document.
+    """
+
+    def __init__(self):
+        self.titles = []
+        self.bodies = []
+        self.payloads = []
+        self._title_position = {}
+        self._built = False
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title, body="", payload=None):
+        """Add a document, the index is rebuilt lazily on the next query."""
+        position = self._title_position.get(title)
+        if position is None:
+            self._title_position[title] = len(self.titles)
+            self.titles.append(title)
+            self.bodies.append(body or "")
+            self.payloads.append(payload)
+        else:
+            self.bodies[position] = body or ""
+            self.payloads[position] = payload
+        self._built = False
+
+    def get_payload(self, title):
+        position = self._title_position.get(title)
+        return None if position is None else self.payloads[position]
+
+    def get_body(self, title):
+        position = self._title_position.get(title)
+        return None if position is None else self.bodies[position]
+
+    def build(self):
+        """Build postings, vocabulary and trigrams from the documents."""
+        # token -> {doc: [title tf, body tf]}
+        postings = {}
+        title_lengths = []
+        body_lengths = []
+        for doc, (title, body) in enumerate(zip(self.titles, self.bodies)):
+            title_tokens = tokenize(title)
+            body_tokens = tokenize(body)
+            title_lengths.append(len(title_tokens))
+            body_lengths.append(len(body_tokens))
+            for field, tokens in ((0, title_tokens), (1, body_tokens)):
+                for token in tokens:
+                    counts = postings.setdefault(token, {}).setdefault(doc, [0, 0])
+                    counts[field] += 1
+
+        self._set_structures(postings, title_lengths, body_lengths)
+        return self
+
+    def _set_structures(self, postings, title_lengths, body_lengths):
+        self.postings = postings
+        self.title_lengths = title_lengths
+        self.body_lengths = body_lengths
+        self.vocabulary = sorted(postings)
+        self.titles_lower = [x.lower() for x in self.titles]
+        count = len(self.titles) or 1
+        self._avg_title = (sum(title_lengths) / float(count)) or 1.0
+        self._avg_body = (sum(body_lengths) / float(count)) or 1.0
+        self.trigrams = {}
+        for token in self.vocabulary:
+            for trigram in get_trigrams(token):
+                self.trigrams.setdefault(trigram, []).append(token)
+        self._term_score_cache = {}
+        self._built = True
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def expand_prefix(self, prefix, candidates=None):
+        """Vocabulary words starting with prefix.
+
+        Args:
+            candidates (list, optional): Sorted words known to contain all
+                matches, e.g. the expansion of a shorter prefix.
+        """
+        self._ensure_built()
+        words = self.vocabulary if candidates is None else candidates
+        start = bisect.bisect_left(words, prefix)
+        end = bisect.bisect_left(words, prefix + u"\uffff")
+        return words[start:end]
+
+    def expand_fuzzy(self, word, max_terms=8):
+        """Vocabulary words within a small edit distance of word.
+
+        Returns:
+            list: (term, distance) pairs, closest first
+        """
+        self._ensure_built()
+        if len(word) < 3:
+            return []
+        word_trigrams = get_trigrams(word)
+        shared = {}
+        for trigram in word_trigrams:
+            for term in self.trigrams.get(trigram, ()):
+                shared[term] = shared.get(term, 0) + 1
+
+        max_distance = 1 if len(word) < 6 else 2
+        matches = []
+        for term, count in shared.items():
+            # Dice coefficient on trigrams filters before the edit distance
+            if 2.0 * count / (len(word_trigrams) + len(term) + 2) < 0.4:
+                continue
+            distance = levenshtein_distance(word, term, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, term))
+        matches.sort()
+        return [(term, distance) for distance, term in matches[:max_terms]]
+
+    def term_scores(self, term):
+        """BM25F score of every document containing term."""
+        scores = self._term_score_cache.get(term)
+        if scores is not None:
+            return scores
+        posting = self.postings.get(term, {})
+        document_count = len(self.titles)
+        idf = math.log(1.0 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+        scores = {}
+        for doc, (title_tf, body_tf) in posting.items():
+            weighted_tf = (TITLE_WEIGHT * title_tf / (1 - B + B * self.title_lengths[doc] / self._avg_title) +
+                           BODY_WEIGHT * body_tf / (1 - B + B * self.body_lengths[doc] / self._avg_body))
+            scores[doc] = idf * weighted_tf / (K1 + weighted_tf)
+        self._term_score_cache[term] = scores
+        return scores
+
+    def score_word(self, word, is_prefix, expansions=None):
+        """Best score per document for one query word.
+
+        Args:
+            word (str): Lowercase query word
+            is_prefix (bool): The word is still being typed, match words it starts
+            expansions (list, optional): Cached prefix expansion to narrow down
+
+        Returns:
+            tuple: ({doc: score}, prefix expansion used or None)
+        """
+        self._ensure_built()
+        terms = [(word, 1.0)] if word in self.postings else []
+        expansion = None
+        if is_prefix:
+            expansion = self.expand_prefix(word, expansions)
+            terms.extend((term, PREFIX_FACTOR) for term in expansion if term != word)
+        if not terms:
+            terms = [(term, FUZZY_FACTOR / (1 + distance)) for term, distance in self.expand_fuzzy(word)]
+
+        doc_scores = {}
+        for term, factor in terms:
+            for doc, score in self.term_scores(term).items():
+                score *= factor
+                if score > doc_scores.get(doc, 0):
+                    doc_scores[doc] = score
+        return doc_scores, expansion
+
+    def search(self, text, limit=None):
+        """Rank titles for a query, see SearchSession for typing as you go."""
+        return SearchSession(self).search(text, limit)
+
+    def to_dict(self, signature=None):
+        self._ensure_built()
+        return {
+            "version": INDEX_VERSION,
+            "signature": signature,
+            "titles": self.titles,
+            "bodies": self.bodies,
+            "payloads": self.payloads,
+            "postings": self.postings,
+            "title_lengths": self.title_lengths,
+            "body_lengths": self.body_lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data, signature=None):
+        """Rebuild an index from to_dict output, None if it is stale.
+
+        Args:
+            signature: Anything JSON friendly, e.g. the distribution version.
+                The stored index is rejected when it was saved with another one.
+        """
+        if not data or data.get("version") != INDEX_VERSION or data.get("signature") != signature:
+            return None
+        index = cls()
+        index.titles = data["titles"]
+        index.bodies = data["bodies"]
+        index.payloads = data["payloads"]
+        index._title_position = dict((title, i) for i, title in enumerate(index.titles))
+        # JSON turned the doc positions into strings
+        postings = dict((token, dict((int(doc), counts) for doc, counts in posting.items()))
+                        for token, posting in data["postings"].items())
+        index._set_structures(postings, data["title_lengths"], data["body_lengths"])
+        return index
+
+    def save(self, filepath, signature=None):
+        with io.open(filepath, "w", encoding="utf-8") as f:
+            f.write(u"{}".format(json.dumps(self.to_dict(signature), ensure_ascii=False)))
+
+    @classmethod
+    def load(cls, filepath, signature=None):
+        """Load a saved index, None if missing, unreadable or stale."""
+        try:
+            with io.open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        return cls.from_dict(data, signature)
+
+
+class SearchSession:
+    """Query state for one search box.
+
+    Typing "wall sec" after "wall se" only evaluates the last word again,
+    and its prefix expansion is narrowed from the one of "se".
+    """
+
+    MAX_CACHE = 200
+
+    def __init__(self, index):
+        self.index = index
+        self._word_cache = {}  # (word, is_prefix) -> doc scores
+        self._expansion_cache = {}  # prefix -> expansion
+
+    def _score_word(self, word, is_prefix):
+        key = (word, is_prefix)
+        cached = self._word_cache.get(key)
+        if cached is not None:
+            return cached
+        if len(self._word_cache) > self.MAX_CACHE:
+            self._word_cache.clear()
+            self._expansion_cache.clear()
+
+        narrower = None
+        if is_prefix:
+            for length in range(len(word) - 1, 0, -1):
+                narrower = self._expansion_cache.get(word[:length])
+                if narrower is not None:
+                    break
+        doc_scores, expansion = self.index.score_word(word, is_prefix, narrower)
+        if expansion is not None:
+            self._expansion_cache[word] = expansion
+        self._word_cache[key] = doc_scores
+        return doc_scores
+
+    def search(self, text, limit=None):
+        """Titles matching text, best first.
+
+        Titles starting with the typed text come first, then documents
+        matching every word, then the rest by score.
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+        query_lower = text.lower().strip()
+        last_is_prefix = not text[-1:].isspace()
+
+        totals = {}
+        hits = {}
+        for i, word in enumerate(words):
+            is_prefix = last_is_prefix and i == len(words) - 1
+            for doc, score in self._score_word(word, is_prefix).items():
+                totals[doc] = totals.get(doc, 0) + score
+                hits[doc] = hits.get(doc, 0) + 1
+
+        titles_lower = self.index.titles_lower
+        ranked = sorted(totals, key=lambda doc: (not titles_lower[doc].startswith(query_lower),
+                                                 -hits[doc], -totals[doc], titles_lower[doc]))
+        if limit:
+            ranked = ranked[:limit]
+        return [self.index.titles[doc] for doc in ranked]
+
+
+def _legacy_search(search_datas, input_text):
+    """The old palette search, kept for the benchmark."""
+    direct = [name for name in search_datas if name.lower().startswith(input_text)]
+    words = input_text.split(' ')
+    word = [name for name in search_datas if all([x in name.lower() for x in words])]
+    in_doc = []
+    for name in search_datas:
+        doc_string = search_datas[name]
+        if doc_string and any(x.lower() in doc_string.lower() for x in words):
+            in_doc.append(name)
+    results = []
+    for resultset in (direct, word, in_doc):
+        for x in sorted(resultset):
+            if x not in results:
+                results.append(x)
+    return results
+
+
+def _make_sample_documents(count):
+    import random
+    random.seed(11)
+    syllables = ["wall", "sheet", "view", "tag", "room", "area", "door", "grid", "level", "family",
+                 "export", "purge", "align", "color", "excel", "print", "model", "link", "sync", "detail"]
+    filler = ["the", "tool", "will", "help", "you", "quickly", "select", "every", "element", "in",
+              "current", "document", "and", "update", "parameter", "value", "from", "template", "file"]
+    documents = []
+    for i in range(count):
+        title = u"{} {} {}".format(random.choice(syllables).capitalize(),
+                                   random.choice(syllables).capitalize(), i)
+        body = u" ".join(random.choice(filler + syllables) for _ in range(60))
+        documents.append((title, body))
+    return documents
+
+
+def benchmark(command_count=3000):
+    """Time index build, save/load and per-keystroke queries against the legacy scan.
+
+    Returns:
+        dict: seconds for build, load, typing with the index and with the legacy scan
+    """
+    import os
+    import tempfile
+
+    documents = _make_sample_documents(command_count)
+    keystrokes = []
+    for query in ("wall tag", "shet export", "purge famil", "room area colr"):
+        keystrokes.extend(query[:i] for i in range(1, len(query) + 1))
+
+    t_start = time.time()
+    index = SearchIndex()
+    for title, body in documents:
+        index.add(title, body)
+    index.build()
+    build_time = time.time() - t_start
+
+    path = os.path.join(tempfile.gettempdir(), "search_index_benchmark.json")
+    index.save(path, signature="benchmark")
+    t_start = time.time()
+    loaded = SearchIndex.load(path, signature="benchmark")
+    load_time = time.time() - t_start
+    os.remove(path)
+
+    session = SearchSession(loaded)
+    t_start = time.time()
+    for text in keystrokes:
+        session.search(text, limit=20)
+    index_time = time.time() - t_start
+
+    search_datas = dict(documents)
+    t_start = time.time()
+    for text in keystrokes:
+        _legacy_search(search_datas, text)
+    legacy_time = time.time() - t_start
+
+    print("{} commands, {} keystrokes".format(command_count, len(keystrokes)))
+    print("  index build:  {:.3f}s".format(build_time))
+    print("  index load:   {:.3f}s".format(load_time))
+    print("  index typing: {:.3f}s ({:.1f} ms per keystroke)".format(index_time, 1000 * index_time / len(keystrokes)))
+    print("  legacy typing: {:.3f}s ({:.1f} ms per keystroke)".format(legacy_time, 1000 * legacy_time / len(keystrokes)))
+    return {"build": build_time, "load": load_time, "index_typing": index_time, "legacy_typing": legacy_time}
+
+
+def unit_test():
+    index = SearchIndex()
+    index.add(u"Wall Finder", u"Find walls by type and select them.", payload="a")
+    index.add(u"Sheet Exporter", u"Export sheets to PDF and DWG.", payload="b")
+    index.add(u"Tag All Walls", u"Place a tag on every wall in the view.", payload="c")
+    index.add(u"Purge Families", u"Remove unused family types.", payload="d")
+
+    assert index.search(u"wal")[0] == u"Wall Finder"  # title prefix first
+    assert set(index.search(u"wall")[:2]) == set([u"Wall Finder", u"Tag All Walls"])
+    assert index.search(u"tag wal")[0] == u"Tag All Walls"
+    assert index.search(u"pdf") == [u"Sheet Exporter"]  # body only
+    assert index.search(u"famly")[0] == u"Purge Families"  # typo
+    assert index.search(u"xyz") == []
+    assert index.get_payload(u"Sheet Exporter") == "b"
+
+    session = SearchSession(index)
+    for text in (u"s", u"sh", u"she", u"shee", u"sheet", u"sheet ", u"sheet e"):
+        assert session.search(text) == index.search(text), text
+
+    restored = SearchIndex.from_dict(json.loads(json.dumps(index.to_dict("v1"))), "v1")
+    assert restored.search(u"tag wal") == index.search(u"tag wal")
+    assert SearchIndex.from_dict(index.to_dict("v1"), "v2") is None
+
+    assert levenshtein_distance("kitten", "sitting") == 3
+    assert levenshtein_distance("kitten", "sitting", max_distance=1) == 2
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -6,6 +6,7 @@ server and client implementations including:
 - Logging setup
 - Authentication
 - Connection tracking
+- Length-prefixed message framing
 """
 
 import os
@@ -17,6 +18,167 @@ import hmac
 import hashlib
 import datetime
 import socket
+import struct
+import threading
+import time
+
+try:
+    ConnectionError = ConnectionError
+except NameError:
+    # IronPython 2.7 has no ConnectionError; a dropped peer is a socket.error there
+    ConnectionError = socket.error
+
+# Every framed message is a 4-byte big-endian length followed by UTF-8 JSON.
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 1024 * 1024
+
+
+class FrameError(Exception):
+    """Raised when a peer sends a frame that cannot be accepted."""
+
+
+def encode_frame(message):
+    """Encode a message dict as one length-prefixed frame.
+    
+    Args:
+        message (dict): JSON serializable message
+        
+    Returns:
+        bytes: Header plus payload
+    """
+    payload = json.dumps(message).encode('utf-8')
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError("Frame of {} bytes exceeds limit of {}".format(len(payload), MAX_FRAME_SIZE))
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class FrameDecoder:
+    """Incremental decoder for a stream of length-prefixed frames.
+    
+    Bytes can arrive in any split; feed() returns every message that is
+    complete so far and keeps the remainder for the next call.
+    """
+    
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+    
+    def feed(self, data):
+        """Add received bytes and return the completed messages.
+        
+        Args:
+            data (bytes): Bytes read from the socket
+            
+        Returns:
+            list: Decoded message dicts, possibly empty
+            
+        Raises:
+            FrameError: If a frame is oversized or not valid JSON
+        """
+        self._buffer.extend(data)
+        messages = []
+        header_size = FRAME_HEADER.size
+        while len(self._buffer) >= header_size:
+            length = FRAME_HEADER.unpack_from(self._buffer, 0)[0]
+            if length > self.max_frame_size:
+                raise FrameError("Frame of {} bytes exceeds limit of {}".format(length, self.max_frame_size))
+            if len(self._buffer) < header_size + length:
+                break
+            payload = bytes(self._buffer[header_size:header_size + length])
+            del self._buffer[:header_size + length]
+            try:
+                messages.append(json.loads(payload.decode('utf-8')))
+            except ValueError as e:
+                raise FrameError("Invalid frame payload: {}".format(e))
+        return messages
+
+
+def send_frame(sock, message):
+    """Send one framed message on a blocking socket."""
+    sock.sendall(encode_frame(message))
+
+
+def recv_frame(sock, max_frame_size=MAX_FRAME_SIZE):
+    """Read exactly one framed message from a blocking socket.
+    
+    Raises:
+        ConnectionError: If the peer closes the connection mid-frame
+        FrameError: If the frame is oversized or not valid JSON
+    """
+    header = _recv_exactly(sock, FRAME_HEADER.size)
+    length = FRAME_HEADER.unpack(header)[0]
+    if length > max_frame_size:
+        raise FrameError("Frame of {} bytes exceeds limit of {}".format(length, max_frame_size))
+    payload = _recv_exactly(sock, length)
+    try:
+        return json.loads(payload.decode('utf-8'))
+    except ValueError as e:
+        raise FrameError("Invalid frame payload: {}".format(e))
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = sock.recv(min(remaining, 65536))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+class ConnectionLog:
+    """Buffered, append-only connection log in JSON-lines format.
+    
+    Records are kept in memory and appended to the file in one write once
+    flush_every records are waiting or flush_interval seconds have passed,
+    so logging a connection never reads or rewrites the existing history.
+    Safe to call from several handler threads.
+    
+    Args:
+        path (str): Log file path
+        flush_every (int): Buffered records that trigger a write
+        flush_interval (float): Max seconds a record waits in the buffer
+    """
+    
+    def __init__(self, path, flush_every=100, flush_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+    
+    def record(self, remote_address, success=True):
+        """Buffer one connection record, writing the buffer when due."""
+        line = json.dumps({
+            'timestamp': datetime.datetime.now().isoformat(),
+            'remote_address': remote_address,
+            'success': success
+        })
+        with self._lock:
+            self._buffer.append(line)
+            due = len(self._buffer) >= self.flush_every
+        if due:
+            self.flush()
+        else:
+            self.flush_if_due()
+    
+    def flush_if_due(self):
+        """Write the buffer if the oldest record waited flush_interval."""
+        if self._buffer and time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        """Append every buffered record to the log file."""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.time()
+            if not lines:
+                return
+            with open(self.path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
 
 class NetworkBase:
     """Base class for network operations.
@@ -73,18 +235,17 @@ class NetworkBase:
             self.logger.addHandler(file_handler)
 
     def _initialize_log(self):
-        """Initialize the connection log file."""
+        """Initialize the append-only connection log.
+        
+        One JSON record per line, so a new connection is appended instead
+        of re-reading and re-writing the whole history.
+        """
         self.connection_log_path = os.path.join(
             os.path.expanduser('~'),
-            '{}_connection_log.json'.format(self.__class__.__name__.lower())
+            '{}_connection_log.jsonl'.format(self.__class__.__name__.lower())
         )
-        
-        if not os.path.exists(self.connection_log_path):
-            self.logger.info("Creating new connection log at: {}".format(self.connection_log_path))
-            with open(self.connection_log_path, 'w') as f:
-                json.dump([], f)
-        else:
-            self.logger.debug("Connection log already exists")
+        self.connection_log = ConnectionLog(self.connection_log_path)
+        self.logger.debug("Connection log at: {}".format(self.connection_log_path))
 
     def _log_initialization(self):
         """Log initialization details."""
@@ -114,23 +275,12 @@ class NetworkBase:
             success (bool): Whether connection was successful
         """
         try:
-            self.logger.info("Connection {}: {}".format(
-                "from" if isinstance(self, SocketServer) else "to",
-                remote_address
+            self.logger.info("Connection {}: {} ({})".format(
+                "from" if hasattr(self, 'handle_client') else "to",
+                remote_address,
+                "SUCCESS" if success else "FAILED"
             ))
-            self.logger.info("Status: {}".format("SUCCESS" if success else "FAILED"))
-            
-            with open(self.connection_log_path, 'r') as f:
-                logs = json.load(f)
-            
-            logs.append({
-                'timestamp': datetime.datetime.now().isoformat(),
-                'remote_address': remote_address,
-                'success': success
-            })
-            
-            with open(self.connection_log_path, 'w') as f:
-                json.dump(logs, f, indent=2)
+            self.connection_log.record(remote_address, success)
             
         except Exception as e:
             self.logger.error("Failed to log connection: {}".format(str(e))) 
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 This module provides client-side networking capabilities including:
 - TCP socket client
+- Pooled persistent connections for framed requests
 - Server discovery
 - Connection logging
 - Authentication
@@ -17,9 +18,10 @@ import hmac
 import hashlib
 import datetime
 import subprocess
+import threading
 import time
 
-from base import NetworkBase
+from base import NetworkBase, ConnectionError, send_frame, recv_frame
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -41,12 +43,69 @@ logger.addHandler(file_handler)
 # Prevent propagation to root logger
 logger.propagate = False
 
+class ConnectionPool:
+    """Keeps idle connections to one server for reuse.
+    
+    acquire() hands out an idle socket or opens a new one; release() puts
+    it back unless the pool already holds max_idle sockets. A socket that
+    hit an error is discarded instead of released.
+    
+    Args:
+        address (tuple): (host, port) of the server
+        max_idle (int): Idle sockets kept open
+        timeout (float): Socket timeout in seconds
+    """
+    
+    def __init__(self, address, max_idle=8, timeout=5):
+        self.address = address
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'reused': 0}
+    
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                self.stats['reused'] += 1
+                return self._idle.pop(), True
+        sock = socket.create_connection(self.address, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stats['opened'] += 1
+        return sock, False
+    
+    def release(self, sock):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(sock)
+                return
+        sock.close()
+    
+    def discard(self, sock):
+        try:
+            sock.close()
+        except Exception:
+            pass
+    
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            self.discard(sock)
+
+
 class SocketClient(NetworkBase):
     """TCP Socket client implementation."""
     
-    def __init__(self, server_ip=None, port=None):
-        """Initialize the client with network configuration."""
-        super().__init__(port=port)
+    def __init__(self, server_ip=None, port=None, max_idle=8):
+        """Initialize the client with network configuration.
+        
+        Args:
+            server_ip (str): Server address, resolved from SZHANG if not given
+            port (int): Server port
+            max_idle (int): Idle connections kept for request()
+        """
+        super(SocketClient, self).__init__(port=port)
         self.computer_name = platform.node().upper()
         
         # Try to get server IP if not provided
@@ -65,6 +124,10 @@ class SocketClient(NetworkBase):
         logger.info("Target Server: {}".format(self.server_ip))
         logger.info("Port: {}".format(self.port))
         logger.info("="*50)
+        
+        self.pool = ConnectionPool((self.server_ip, self.port), max_idle=max_idle)
+        self._request_id = 0
+        self._id_lock = threading.Lock()
 
     def connect(self):
         """Connect to the server and handle the session."""
@@ -97,6 +160,51 @@ class SocketClient(NetworkBase):
             logger.error("Failed to connect to server: {}".format(str(e)))
             return False
 
+    def request(self, action, **fields):
+        """Send one framed request over a pooled connection and wait for the reply.
+        
+        Needs a SelectorSocketServer. An idle pooled connection the server
+        has since closed is detected on use and retried once on a fresh one.
+        
+        Args:
+            action (str): Server handler name, e.g. "connect" or "ping"
+            **fields: Extra request fields
+            
+        Returns:
+            dict: Reply from the server
+        """
+        with self._id_lock:
+            self._request_id += 1
+            request_id = self._request_id
+        message = dict(fields)
+        message['action'] = action
+        message['id'] = request_id
+        message.setdefault('computer_name', self.computer_name)
+        
+        for attempt in range(2):
+            sock, reused = self.pool.acquire()
+            try:
+                send_frame(sock, message)
+                reply = recv_frame(sock)
+            except (ConnectionError, OSError) as e:
+                self.pool.discard(sock)
+                if reused and attempt == 0:
+                    logger.debug("Pooled connection went stale, reconnecting: {}".format(e))
+                    continue
+                raise
+            except Exception:
+                self.pool.discard(sock)
+                raise
+            if reply.get('id') != request_id:
+                self.pool.discard(sock)
+                raise ValueError("Reply id {} does not match request {}".format(reply.get('id'), request_id))
+            self.pool.release(sock)
+            return reply
+    
+    def close(self):
+        """Close every pooled connection."""
+        self.pool.close()
+
 def connect_to_server(server_ip=None, port=None):
     """Convenience function to connect to server."""
     client = SocketClient(server_ip, port)
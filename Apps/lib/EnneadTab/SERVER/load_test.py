@@ -0,0 +1,162 @@
+"""Local load test for the socket servers.
+
+Starts servers on loopback inside this process and measures:
+- connections/sec for the one-shot handshake (new TCP connection per request)
+  against the threaded SocketServer and the SelectorSocketServer
+- requests/sec and latency percentiles for pooled, persistent sessions
+  against the SelectorSocketServer
+
+Usage:
+    python load_test.py [--clients 16] [--requests 500] [--handshakes 500]
+"""
+
+import argparse
+import logging
+import socket
+import threading
+import time
+
+from server import SocketServer, SelectorSocketServer
+from client import SocketClient
+
+
+def _free_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _quiet_logging():
+    for name in ('server', 'client', 'SocketServer', 'SelectorSocketServer', 'SocketClient'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def _run_clients(client_count, work):
+    """Run work(client_index) in client_count threads, return elapsed seconds."""
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(client_count)]
+    t_start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.time() - t_start
+
+
+def measure_handshakes(host, port, client_count, handshakes):
+    """One-shot handshake, each on its own TCP connection.
+
+    Returns:
+        dict: connections_per_sec, p50_ms, p99_ms, failures
+    """
+    client = SocketClient(host, port)
+    per_client = max(1, handshakes // client_count)
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+
+    def work(index):
+        local = []
+        for _ in range(per_client):
+            t_start = time.time()
+            ok = client.connect()
+            local.append(time.time() - t_start)
+            if not ok:
+                with lock:
+                    failures[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    elapsed = _run_clients(client_count, work)
+    latencies.sort()
+    return {
+        'connections_per_sec': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'failures': failures[0],
+    }
+
+
+def measure_pooled_requests(host, port, client_count, requests):
+    """Framed ping requests over pooled persistent connections.
+
+    Returns:
+        dict: requests_per_sec, p50_ms, p99_ms, connections_opened
+    """
+    client = SocketClient(host, port, max_idle=client_count)
+    latencies = []
+    lock = threading.Lock()
+
+    def work(index):
+        local = []
+        for _ in range(requests):
+            t_start = time.time()
+            reply = client.request('ping')
+            local.append(time.time() - t_start)
+            assert reply.get('action') == 'pong', reply
+        with lock:
+            latencies.extend(local)
+
+    elapsed = _run_clients(client_count, work)
+    client.close()
+    latencies.sort()
+    return {
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'connections_opened': client.pool.stats['opened'],
+    }
+
+
+def _print_result(title, result):
+    print(title)
+    for key in sorted(result):
+        value = result[key]
+        print("    {:<22} {}".format(key, "{:.2f}".format(value) if isinstance(value, float) else value))
+
+
+def main(client_count=16, requests=500, handshakes=500):
+    _quiet_logging()
+
+    selector_server = SelectorSocketServer('127.0.0.1', _free_port())
+    _quiet_logging()
+    threading.Thread(target=selector_server.start, daemon=True).start()
+    selector_server.wait_until_ready()
+    host, port = selector_server.bound_address
+
+    threaded_server = SocketServer(port=_free_port())
+    _quiet_logging()
+    threading.Thread(target=threaded_server.start, daemon=True).start()
+    time.sleep(0.5)
+
+    results = {}
+    try:
+        results['threaded_handshake'] = measure_handshakes(threaded_server.host, threaded_server.port, client_count, handshakes)
+        results['selector_handshake'] = measure_handshakes(host, port, client_count, handshakes)
+        results['selector_pooled'] = measure_pooled_requests(host, port, client_count, requests)
+    finally:
+        selector_server.stop()
+
+    print("{} concurrent clients on loopback".format(client_count))
+    _print_result("  threaded server, new connection per handshake:", results['threaded_handshake'])
+    _print_result("  selector server, new connection per handshake:", results['selector_handshake'])
+    _print_result("  selector server, pooled persistent sessions:", results['selector_pooled'])
+    print("  selector server stats: {}".format(selector_server.stats))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500, help="pooled requests per client")
+    parser.add_argument('--handshakes', type=int, default=500, help="total one-shot handshakes")
+    args = parser.parse_args()
+    main(args.clients, args.requests, args.handshakes)
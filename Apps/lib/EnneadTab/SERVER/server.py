@@ -3,11 +3,13 @@
 This module provides server-side networking capabilities including:
 - TCP socket server
 - Multi-threaded client handling
+- Selector-based server with persistent framed sessions
 - Connection logging
 - Authentication
 """
 
 import os
+import errno
 import socket
 import threading
 import json
@@ -19,7 +21,13 @@ import hmac
 import hashlib
 import datetime
 
-from base import NetworkBase
+try:
+    import selectors
+except ImportError:
+    # IronPython 2.7 has no selectors module; only the threaded SocketServer is available there
+    selectors = None
+
+from base import NetworkBase, FrameDecoder, FrameError, ConnectionError, encode_frame
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -41,6 +49,16 @@ logger.addHandler(file_handler)
 # Prevent propagation to root logger
 logger.propagate = False
 
+# Non-blocking socket calls that should simply be retried on the next select
+_RETRY_ERRNOS = tuple(code for code in (
+    errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR, getattr(errno, 'WSAEWOULDBLOCK', None)
+) if code is not None)
+
+
+def _would_block(error):
+    """Whether a socket error only means the call should be retried later."""
+    return getattr(error, 'errno', None) in _RETRY_ERRNOS
+
 class SocketServer(NetworkBase):
     """TCP Socket server implementation.
     
@@ -61,7 +79,7 @@ class SocketServer(NetworkBase):
         Raises:
             RuntimeError: If attempting to run server on a computer other than SZHANG
         """
-        super().__init__(port=port)
+        super(SocketServer, self).__init__(port=port)
         
         # Get server's actual IP address
         self.computer_name = platform.node().upper()
@@ -112,17 +130,7 @@ class SocketServer(NetworkBase):
                 "SUCCESS" if success else "FAILED"
             ))
             
-            with open(self.connection_log_path, 'r') as f:
-                logs = json.load(f)
-            
-            logs.append({
-                'timestamp': datetime.datetime.now().isoformat(),
-                'remote_host': remote_host,
-                'success': success
-            })
-            
-            with open(self.connection_log_path, 'w') as f:
-                json.dump(logs, f, indent=2)
+            self.connection_log.record(remote_host, success)
             
         except Exception as e:
             logger.error("Failed to log connection: {}".format(str(e)))
@@ -233,14 +241,285 @@ class SocketServer(NetworkBase):
                 else:
                     raise
 
-def start_server(host=None, port=None):
+class _Session(object):
+    """State of one client connection in the selector server."""
+    
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.decoder = FrameDecoder()
+        self.outgoing = bytearray()
+        self.legacy = None  # decided by the first byte the client sends
+        self.legacy_buffer = bytearray()
+        self.close_after_send = False
+        self.reading = True
+
+
+class SelectorSocketServer(SocketServer):
+    """Single-threaded TCP server built on the selectors module.
+    
+    Unlike SocketServer, which starts a thread and closes the socket after
+    one 1024-byte recv, each client keeps a persistent session and may send
+    any number of length-prefixed JSON requests (see base.encode_frame).
+    
+    - At most max_connections sessions are open; beyond that the listener
+      stops accepting and new clients wait in the kernel backlog
+    - A client whose unsent replies exceed write_high_water stops being
+      read until its buffer drains below write_low_water
+    - Connections are logged through the buffered connection log
+    - A client that opens with a bare JSON object is served the legacy
+      one-shot handshake, so SocketClient.connect keeps working
+    
+    Handlers are looked up by the request's "action" and return the reply
+    dict; the request "id" is echoed back so pooled clients can pair them.
+    """
+    
+    def __init__(self, host=None, port=None, max_connections=256,
+                 write_high_water=256 * 1024, write_low_water=64 * 1024, backlog=128):
+        """Initialize the server.
+        
+        Args:
+            host (str): Host address to bind to, resolved from the computer name if not given
+            port (int): Port number to listen on
+            max_connections (int): Open sessions before accepting pauses
+            write_high_water (int): Unsent bytes at which a session stops being read
+            write_low_water (int): Unsent bytes at which reading resumes
+            backlog (int): Listen backlog holding clients while accepting is paused
+            
+        Raises:
+            RuntimeError: If the selectors module is not available (IronPython 2.7)
+        """
+        if selectors is None:
+            raise RuntimeError("SelectorSocketServer needs the selectors module; use SocketServer instead")
+        super(SelectorSocketServer, self).__init__(host=host, port=port)
+        if host:
+            self.host = host
+        self.max_connections = max_connections
+        self.write_high_water = write_high_water
+        self.write_low_water = write_low_water
+        self.backlog = backlog
+        self.handlers = {
+            'connect': self._handle_connect,
+            'ping': self._handle_ping,
+        }
+        self.stats = {'accepted': 0, 'requests': 0, 'paused_accepts': 0, 'paused_reads': 0}
+        self.bound_address = None
+        self._selector = None
+        self._listener = None
+        self._sessions = {}
+        self._accepting = False
+        self._running = threading.Event()
+        self._ready = threading.Event()
+    
+    # ------------------------------------------------------------------ handlers
+    def _handle_connect(self, request):
+        return {'status': 'connected', 'token': self.generate_token()}
+    
+    def _handle_ping(self, request):
+        return {'status': 'ok', 'action': 'pong'}
+    
+    def dispatch(self, request):
+        """Build the reply for one request dict."""
+        handler = self.handlers.get(request.get('action', 'connect'))
+        if handler is None:
+            reply = {'status': 'error', 'error': 'unknown action: {}'.format(request.get('action'))}
+        else:
+            try:
+                reply = handler(request)
+            except Exception as e:
+                self.logger.error("Handler for {} failed: {}".format(request.get('action'), e))
+                reply = {'status': 'error', 'error': str(e)}
+        if 'id' in request:
+            reply['id'] = request['id']
+        return reply
+    
+    # ------------------------------------------------------------------ loop
+    def start(self):
+        """Start the server and serve sessions until stop() is called."""
+        self._selector = selectors.DefaultSelector()
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self._listener.bind((self.host, self.port))
+        except OSError as e:
+            logger.warning("Failed to bind to {}: {}".format(self.host, str(e)))
+            self._listener.bind(('0.0.0.0', self.port))
+        self._listener.listen(self.backlog)
+        self._listener.setblocking(False)
+        self.bound_address = self._listener.getsockname()
+        self._resume_accepting()
+        
+        logger.info("SERVER STATUS: ONLINE (selector mode)")
+        logger.info("Listening on {}:{}".format(*self.bound_address))
+        self._running.set()
+        self._ready.set()
+        try:
+            while self._running.is_set():
+                for key, mask in self._selector.select(timeout=0.5):
+                    if key.data is None:
+                        self._accept()
+                    else:
+                        self._service(key.data, mask)
+                self.connection_log.flush_if_due()
+        finally:
+            for session in list(self._sessions.values()):
+                self._close(session)
+            self._selector.close()
+            self._listener.close()
+            self.connection_log.flush()
+            self._ready.clear()
+    
+    def wait_until_ready(self, timeout=5.0):
+        """Block until start() is listening, for servers started in a thread."""
+        return self._ready.wait(timeout)
+    
+    def stop(self):
+        """Ask the serving loop to close every session and return."""
+        self._running.clear()
+    
+    def _resume_accepting(self):
+        if not self._accepting:
+            self._selector.register(self._listener, selectors.EVENT_READ, data=None)
+            self._accepting = True
+    
+    def _pause_accepting(self):
+        if self._accepting:
+            self._selector.unregister(self._listener)
+            self._accepting = False
+            self.stats['paused_accepts'] += 1
+    
+    def _accept(self):
+        while len(self._sessions) < self.max_connections:
+            try:
+                sock, addr = self._listener.accept()
+            except socket.error as e:
+                if _would_block(e):
+                    return
+                raise
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            session = _Session(sock, "{}:{}".format(addr[0], addr[1]))
+            self._sessions[sock.fileno()] = session
+            self._selector.register(sock, selectors.EVENT_READ, data=session)
+            self.stats['accepted'] += 1
+            self.log_connection(session.address, success=True)
+        # backpressure: leave further clients queued in the listen backlog
+        self._pause_accepting()
+    
+    def log_connection(self, remote_host, success=True):
+        """Buffer a connection record without a console line per client."""
+        logger.debug("Connection from {}: {}".format(remote_host, "SUCCESS" if success else "FAILED"))
+        self.connection_log.record(remote_host, success)
+    
+    def _service(self, session, mask):
+        try:
+            if mask & selectors.EVENT_READ:
+                self._read(session)
+            if session.sock.fileno() != -1 and mask & selectors.EVENT_WRITE:
+                self._write(session)
+        except (ConnectionError, socket.error, OSError, FrameError) as e:
+            logger.debug("Closing session {}: {}".format(session.address, e))
+            if isinstance(e, FrameError):
+                self.log_connection(session.address, success=False)
+            self._close(session)
+    
+    def _read(self, session):
+        try:
+            data = session.sock.recv(65536)
+        except socket.error as e:
+            if _would_block(e):
+                return
+            raise
+        if not data:
+            self._close(session)
+            return
+        
+        if session.legacy is None:
+            session.legacy = data[:1] == b'{'
+        if session.legacy:
+            self._read_legacy(session, data)
+            return
+        
+        for request in session.decoder.feed(data):
+            self.stats['requests'] += 1
+            session.outgoing.extend(encode_frame(self.dispatch(request)))
+        self._update_interest(session)
+    
+    def _read_legacy(self, session, data):
+        """Answer the one-shot handshake sent by SocketClient.connect."""
+        session.legacy_buffer.extend(data)
+        try:
+            request = json.loads(session.legacy_buffer.decode('ascii'))
+        except ValueError:
+            if len(session.legacy_buffer) > 1024:
+                raise FrameError("Legacy request too long")
+            return
+        self.stats['requests'] += 1
+        reply = self.dispatch(request)
+        session.outgoing.extend(json.dumps(reply).encode('ascii'))
+        session.close_after_send = True
+        self._update_interest(session)
+    
+    def _write(self, session):
+        if session.outgoing:
+            try:
+                sent = session.sock.send(session.outgoing)
+            except socket.error as e:
+                if _would_block(e):
+                    return
+                raise
+            del session.outgoing[:sent]
+        if not session.outgoing and session.close_after_send:
+            self._close(session)
+            return
+        self._update_interest(session)
+    
+    def _update_interest(self, session):
+        pending = len(session.outgoing)
+        if session.reading and pending >= self.write_high_water:
+            session.reading = False
+            self.stats['paused_reads'] += 1
+        elif not session.reading and pending <= self.write_low_water:
+            session.reading = True
+        if session.close_after_send:
+            session.reading = False
+        
+        events = selectors.EVENT_WRITE if pending else 0
+        if session.reading:
+            events |= selectors.EVENT_READ
+        if not events:
+            events = selectors.EVENT_READ
+        self._selector.modify(session.sock, events, data=session)
+    
+    def _close(self, session):
+        fileno = session.sock.fileno()
+        if fileno == -1:
+            return
+        self._sessions.pop(fileno, None)
+        try:
+            self._selector.unregister(session.sock)
+        except (KeyError, ValueError):
+            pass
+        session.sock.close()
+        if self._running.is_set() and len(self._sessions) < self.max_connections:
+            self._resume_accepting()
+
+
+def start_server(host=None, port=None, mode="threaded"):
     """Convenience function to start the server.
     
     Args:
         host (str): Host address to bind to
         port (int): Port number to listen on
+        mode (str): "threaded" for SocketServer, "selector" for SelectorSocketServer
     """
-    server = SocketServer(host, port)
+    if mode == "selector" and selectors is None:
+        logger.warning("selectors module not available, falling back to the threaded server")
+        mode = "threaded"
+    if mode == "selector":
+        server = SelectorSocketServer(host, port)
+    else:
+        server = SocketServer(host, port)
     server.start()
 
 if __name__ == '__main__':
@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Telemetry Dispatcher
+
+Moves best-effort usage reporting off the user-visible path. Callers drop an
+event into a bounded in-memory queue and return immediately; a single daemon
+worker drains the queue in batches, posts them over a reused connection,
+retries with exponential backoff and spools anything it could not deliver
+to a file in a dump subfolder so it can be replayed on the next session.
+The dump folder cleanup only removes old files of the dump folder root, so
+a spool outlives an outage of any length.
+
+Key Features:
+    - Non-blocking submit, the wrapped button never waits for the network
+    - Bounded queue, overflow goes straight to the spool file
+    - One lazily started daemon worker per dispatcher
+    - Batched delivery with exponential backoff between attempts
+    - JSON-lines spool file, replayed when the worker starts
+    - Pooled urllib3 connection when available, urllib2/urllib.request otherwise
+
+Example:
+    dispatcher = Dispatcher("usage", send_batch=my_sender)
+    dispatcher.submit({"function_name": "Pick Room"})
+
+Note:
+    send_batch(events) receives a list of events and returns the list of
+    events that failed and should be retried. It must not raise, but the
+    worker treats an exception as "every event failed".
+"""
+
+import os
+import io
+import json
+import time
+import atexit
+import threading
+
+try:
+    import Queue as queue  # IronPython 2.7
+except ImportError:
+    import queue
+
+import FOLDER
+
+SPOOL_FOLDER = "telemetry_spool"
+
+_HTTP_POOL = [None]
+
+
+def get_spool_path(name, dump_folder=None):
+    """Spool file of a dispatcher, inside the telemetry_spool dump subfolder."""
+    folder = os.path.join(dump_folder, SPOOL_FOLDER) if dump_folder else \
+        FOLDER.get_local_dump_folder_folder(SPOOL_FOLDER)
+    return os.path.join(folder, "{}.jsonl".format(name))
+
+
+def _get_urllib3_pool():
+    if _HTTP_POOL[0] is None:
+        import urllib3
+        _HTTP_POOL[0] = urllib3.PoolManager(maxsize=2)
+    return _HTTP_POOL[0]
+
+
+def post_json(url, payload, timeout=10.0):
+    """POST one JSON payload, reusing a pooled keep-alive connection when possible.
+
+    Tries urllib3 (Revit), then urllib2 (Rhino IronPython), then
+    urllib.request (terminal), same order as the rest of EnneadTab.
+
+    Args:
+        url (str): Target URL
+        payload (dict): JSON serializable body
+        timeout (float, optional): Seconds before giving up. Defaults to 10.
+
+    Returns:
+        bool: True if the server answered 200
+    """
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+
+    try:
+        http = _get_urllib3_pool()
+    except ImportError:
+        http = None
+    if http is not None:
+        try:
+            response = http.request("POST", url, body=body, headers=headers, timeout=timeout, retries=False)
+            return response.status == 200
+        except Exception:
+            return False
+
+    try:
+        import urllib2
+        try:
+            response = urllib2.urlopen(urllib2.Request(url, data=body, headers=headers), timeout=timeout)
+            return response.getcode() == 200
+        except Exception:
+            return False
+    except ImportError:
+        pass
+
+    try:
+        import urllib.request
+        request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        response = urllib.request.urlopen(request, timeout=timeout)
+        return response.getcode() == 200
+    except Exception:
+        return False
+
+
+class Dispatcher:
+    """Queue plus single background worker delivering events in batches.
+
+    Args:
+        name (str): Used for the spool file name and the worker thread name.
+        send_batch (callable): send_batch(events) -> list of failed events.
+        max_queue (int, optional): Events held in memory before spooling.
+        batch_size (int, optional): Max events handed to one send_batch call.
+        linger (float, optional): Seconds the worker waits to fill a batch.
+        max_retries (int, optional): Attempts before a batch is spooled.
+        base_backoff (float, optional): First retry delay in seconds, doubled
+            every attempt and capped at max_backoff.
+        max_backoff (float, optional): Longest retry delay in seconds.
+        spool_path (str, optional): Spool file. Defaults to get_spool_path(name).
+    """
+
+    def __init__(self, name, send_batch, max_queue=1000, batch_size=25,
+                 linger=0.5, max_retries=4, base_backoff=1.0, max_backoff=60.0,
+                 spool_path=None):
+        self.name = name
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.spool_path = spool_path or get_spool_path(name)
+        # where the first version spooled, still replayed once
+        self._root_spool_path = None if spool_path else FOLDER.get_local_dump_folder_file(
+            "telemetry_spool_{}.jsonl".format(name))
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._worker = None
+        self._stopping = threading.Event()
+        self._pending = 0
+        self.stats = {"submitted": 0, "sent": 0, "retried": 0, "spooled": 0, "replayed": 0}
+
+    # ------------------------------------------------------------------ public
+    def submit(self, event):
+        """Hand an event to the worker. Never blocks and never raises.
+
+        Args:
+            event (dict): JSON serializable event
+        """
+        try:
+            self._ensure_worker()
+            self.stats["submitted"] += 1
+            try:
+                with self._lock:
+                    self._queue.put_nowait(event)
+                    self._pending += 1
+            except queue.Full:
+                self._spool([event])
+        except Exception:
+            pass
+
+    def flush(self, timeout=10.0):
+        """Wait until the queue is drained and nothing is in flight.
+
+        Args:
+            timeout (float, optional): Max seconds to wait. Defaults to 10.
+
+        Returns:
+            bool: True if everything was handled within the timeout
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self._pending == 0:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def stop(self, spool_pending=True):
+        """Stop the worker and spool whatever is still queued."""
+        self._stopping.set()
+        if spool_pending:
+            pending = self._drain_nowait(self._queue.qsize())
+            if pending:
+                self._spool(pending)
+                with self._lock:
+                    self._pending -= len(pending)
+
+    # ------------------------------------------------------------------ worker
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopping.clear()
+            worker = threading.Thread(target=self._run, name="EnneadTab-telemetry-{}".format(self.name))
+            worker.daemon = True
+            worker.start()
+            self._worker = worker
+
+    def _drain_nowait(self, limit):
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self):
+        self._replay_spool()
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=self.linger)
+            except queue.Empty:
+                continue
+            batch = [first]
+            try:
+                deadline = time.time() + self.linger
+                while len(batch) < self.batch_size and time.time() < deadline:
+                    batch.extend(self._drain_nowait(self.batch_size - len(batch)))
+                    if len(batch) < self.batch_size:
+                        time.sleep(0.01)
+                if self._deliver(batch):
+                    self._replay_spool()
+            finally:
+                with self._lock:
+                    self._pending -= len(batch)
+
+    def _deliver(self, batch):
+        """Send a batch with backoff. Returns True if everything went through."""
+        pending = batch
+        for attempt in range(self.max_retries):
+            try:
+                failed = self.send_batch(pending) or []
+            except Exception:
+                failed = pending
+            self.stats["sent"] += len(pending) - len(failed)
+            if not failed:
+                return True
+            pending = failed
+            if attempt < self.max_retries - 1:
+                self.stats["retried"] += len(pending)
+                delay = min(self.base_backoff * (2 ** attempt), self.max_backoff)
+                if self._stopping.wait(delay):
+                    break
+        self._spool(pending)
+        return False
+
+    # ------------------------------------------------------------------ spool
+    def _spool(self, events):
+        with self._spool_lock:
+            try:
+                folder = os.path.dirname(self.spool_path)
+                if folder and not os.path.exists(folder):
+                    os.makedirs(folder)
+                with io.open(self.spool_path, "a", encoding="utf-8") as f:
+                    for event in events:
+                        f.write(json.dumps(event, ensure_ascii=True, default=str) + "\n")
+                self.stats["spooled"] += len(events)
+            except Exception:
+                pass
+
+    def _take_spool(self):
+        with self._spool_lock:
+            events = []
+            for path in (self._root_spool_path, self.spool_path):
+                if not path or not os.path.exists(path):
+                    continue
+                try:
+                    taken = []
+                    with io.open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                taken.append(json.loads(line))
+                            except ValueError:
+                                continue
+                    os.remove(path)
+                except Exception:
+                    continue
+                events.extend(taken)
+            return events
+
+    def _replay_spool(self):
+        events = self._take_spool()
+        if not events:
+            return
+        self.stats["replayed"] += len(events)
+        for i in range(0, len(events), self.batch_size):
+            if not self._deliver(events[i:i + self.batch_size]):
+                # still offline, put the rest back and try again next session
+                self._spool(events[i + self.batch_size:])
+                return
+
+
+_DISPATCHERS = []
+
+
+def get_dispatcher(name, send_batch, **kwargs):
+    """Get or create the process-wide dispatcher for a name.
+
+    Args:
+        name (str): Dispatcher name
+        send_batch (callable): Used only when the dispatcher is created
+        **kwargs: Passed to Dispatcher on creation
+
+    Returns:
+        Dispatcher: Shared dispatcher
+    """
+    for dispatcher in _DISPATCHERS:
+        if dispatcher.name == name:
+            return dispatcher
+    dispatcher = Dispatcher(name, send_batch, **kwargs)
+    _DISPATCHERS.append(dispatcher)
+    return dispatcher
+
+
+@atexit.register
+def _spool_all_pending():
+    for dispatcher in _DISPATCHERS:
+        try:
+            dispatcher.stop(spool_pending=True)
+        except Exception:
+            pass
+
+
+def unit_test():
+    """Check that submit returns before any network I/O and that offline
+    events are spooled and replayed, using a local stub HTTP server."""
+    import shutil
+    import tempfile
+    try:
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+    except ImportError:
+        print("Stub HTTP server needs CPython 3, skipping TELEMETRY unit test.")
+        return
+
+    received = []
+    release = threading.Event()
+    first_request_seen = threading.Event()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            first_request_seen.set()
+            release.wait(5)
+            length = int(self.headers.get("Content-Length", 0))
+            received.append(json.loads(self.rfile.read(length).decode("utf-8")))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), StubHandler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    url = "http://127.0.0.1:{}/api/ingest/usage".format(server.server_address[1])
+
+    work_folder = tempfile.mkdtemp(prefix="telemetry_test_")
+    dispatcher = None
+    try:
+        def sender(events):
+            return [x for x in events if not post_json(url, x["infrawatch"], timeout=5)]
+
+        # Stand in for the "usage" dispatcher LOG.log submits to.
+        dispatcher = Dispatcher("usage", sender, linger=0.05,
+                                spool_path=get_spool_path("usage", work_folder))
+        _DISPATCHERS.insert(0, dispatcher)
+
+        import LOG
+
+        @LOG.log("telemetry_unit_test.py", "telemetry_unit_test")
+        def decorated_call():
+            return "done"
+
+        # 1. the decorated call returns while the server is still holding the request
+        t_start = time.time()
+        assert decorated_call() == "done"
+        assert time.time() - t_start < 1
+        assert not received, "network I/O happened before the call returned"
+        assert first_request_seen.wait(5)
+        release.set()
+        assert dispatcher.flush(5)
+        assert [x["function_name"] for x in received] == ["telemetry_unit_test"]
+
+        # 2. offline events are spooled after retries and replayed later
+        dead_url = "http://127.0.0.1:1/api/ingest/usage"
+        offline = Dispatcher("offline", lambda events: [x for x in events if not post_json(dead_url, x["infrawatch"], timeout=1)],
+                             linger=0.05, max_retries=2, base_backoff=0.01,
+                             spool_path=dispatcher.spool_path)
+        offline.submit({"infrawatch": {"function_name": "offline_call"}})
+        assert offline.flush(10)
+        offline.stop()
+        assert offline.stats["spooled"] == 1
+
+        # 3. the dump folder cleanup keeps the spool of an outage longer than its max age
+        import ENVIRONMENT
+        import MAINTENANCE
+        stray = os.path.join(work_folder, "stray.jsonl")
+        with open(stray, "w") as f:
+            f.write("{}\n")
+        old_time = time.time() - 10 * 24 * 60 * 60
+        for path in (stray, dispatcher.spool_path):
+            os.utime(path, (old_time, old_time))
+        original_dump_folder = ENVIRONMENT.DUMP_FOLDER
+        ENVIRONMENT.DUMP_FOLDER = work_folder
+        try:
+            cleanup = MAINTENANCE.make_dump_cleanup_task()
+            assert cleanup(MAINTENANCE.TaskRun(time.time() + 60, None, {}))
+        finally:
+            ENVIRONMENT.DUMP_FOLDER = original_dump_folder
+        assert not os.path.exists(stray) and os.path.exists(dispatcher.spool_path)
+
+        dispatcher._replay_spool()
+        assert {"function_name": "offline_call"} in received
+        assert not os.path.exists(dispatcher.spool_path)
+        dispatcher.stop()
+    finally:
+        if dispatcher in _DISPATCHERS:
+            _DISPATCHERS.remove(dispatcher)
+        release.set()
+        server.shutdown()
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
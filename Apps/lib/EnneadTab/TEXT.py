@@ -8,6 +8,7 @@ try:
 except:
     pass
 from COLOR import TextColorEnum
+import SEARCH_INDEX
 
 
 
@@ -32,26 +33,6 @@ def strip_chinese(text):
 def fuzzy_search(keyword, words):
     """Search from a list of words, return the best likely match, there could be case insensitive, and wrong spelling"""
     
-    def levenshtein_distance(s1, s2):
-        """Calculate the Levenshtein distance between two strings."""
-        if len(s1) < len(s2):
-            return levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
-
     # Error handling
     if not isinstance(keyword, str):
         raise ValueError("Keyword must be a string.")
@@ -73,7 +54,9 @@ def fuzzy_search(keyword, words):
             if word == keyword:
                 return word  # Early exit for perfect match
 
-            distance = levenshtein_distance(keyword, word)
+            # stop computing a distance once it cannot beat the best so far
+            distance = SEARCH_INDEX.levenshtein_distance(
+                keyword, word, None if best_match is None else lowest_distance)
             if distance < lowest_distance:
                 lowest_distance = distance
                 best_match = word
@@ -1,42 +1,127 @@
-
+import os
 import time
+import shutil
 
 
 import DATA_FILE
 import ENVIRONMENT
+import EVENT_LOG
 import TIME
 import OUTPUT
 import FOLDER
 import USER
 
+# the legacy {software: {date: {doc: {starting_time, end_time}}}} dict,
+# only read once to import it into the event log
 TIMESHEET_DATA_FILE = "timesheet_{}".format(USER.USER_NAME)
+# the event log, its rollups and manifest live in their own dump subfolder,
+# the dump folder cleanup only removes old files from the dump folder root
+TIMESHEET_LOG_FOLDER = "timesheet_{}_events".format(USER.USER_NAME)
+TIMESHEET_LOG_FILE = "events.jsonl"
+# where the first version of the event log sat, moved into the subfolder once
+_ROOT_LOG_FILE = "timesheet_{}_events.jsonl".format(USER.USER_NAME)
+SOFTWARES = ["revit", "rhino", "terminal"]
+
+# bump when apply_timesheet_event changes, the cached rollups are rebuilt
+ROLLUP_VERSION = 1
+
+
+def apply_timesheet_event(rollups, event):
+    """Fold one doc event into the timesheet rollups.
+
+    Rollups:
+        days:  {software: {date: {doc: {"starting_time", "end_time"}}}}
+        weeks: {software: {monday: {doc: seconds}}}
+
+    A day keeps the first start and the last end seen for a doc, the same
+    span the legacy dict kept, and the week adds up the day spans.
+    """
+    software, doc_name, day = event["software"], event["doc"], event["date"]
+    day_data = rollups.setdefault("days", {}).setdefault(software, {}).setdefault(day, {})
+    span = day_data.get(doc_name)
+    if span is None:
+        old_duration = 0
+        span = day_data[doc_name] = {"starting_time": event["start"], "end_time": event["end"]}
+    else:
+        old_duration = span["end_time"] - span["starting_time"]
+        span["starting_time"] = min(span["starting_time"], event["start"])
+        span["end_time"] = max(span["end_time"], event["end"])
+
+    week_data = rollups.setdefault("weeks", {}).setdefault(software, {}).setdefault(EVENT_LOG.week_of(day), {})
+    week_data[doc_name] = week_data.get(doc_name, 0) + span["end_time"] - span["starting_time"] - old_duration
+
+
+def _legacy_events():
+    """Events rebuilding the legacy timesheet dicts, local and shared copy."""
+    events = []
+    paths = [FOLDER.get_local_dump_folder_file(TIMESHEET_DATA_FILE),
+             FOLDER.get_shared_dump_folder_file(TIMESHEET_DATA_FILE)]
+    for path in paths:
+        # get_data creates a missing file, only read what is there
+        if not os.path.exists(path):
+            continue
+        data = DATA_FILE.get_data(path) or {}
+        for software, software_data in data.items():
+            if not isinstance(software_data, dict):
+                continue
+            for day, doc_data in sorted(software_data.items()):
+                for doc_name, doc_info in doc_data.items():
+                    starting_time = doc_info.get("starting_time")
+                    end_time = doc_info.get("end_time", starting_time)
+                    if starting_time is None:
+                        continue
+                    events.append({"software": software, "doc": doc_name, "date": day,
+                                   "start": starting_time, "end": end_time})
+    return events
+
+
+_LOG_CACHE = []
 
 
-@FOLDER.backup_data(TIMESHEET_DATA_FILE , "timesheet")
+def get_timesheet_log_path(dump_folder=None):
+    """Path of the event log inside its dump subfolder."""
+    folder = os.path.join(dump_folder, TIMESHEET_LOG_FOLDER) if dump_folder else \
+        FOLDER.get_local_dump_folder_folder(TIMESHEET_LOG_FOLDER)
+    return os.path.join(folder, TIMESHEET_LOG_FILE)
+
+
+def _move_root_log(path):
+    root_log = FOLDER.get_local_dump_folder_file(_ROOT_LOG_FILE)
+    if not os.path.exists(root_log) or os.path.exists(path):
+        return
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    root_stem, stem = os.path.splitext(root_log)[0], os.path.splitext(path)[0]
+    for suffix in ("_rollups.json", "_manifest.json"):
+        if os.path.exists(root_stem + suffix):
+            shutil.move(root_stem + suffix, stem + suffix)
+    shutil.move(root_log, path)
+
+
+def get_timesheet_log():
+    """The user's timesheet event log, with the legacy dict imported once."""
+    if not _LOG_CACHE:
+        path = get_timesheet_log_path()
+        _move_root_log(path)
+        log = EVENT_LOG.EventLog(path, apply_timesheet_event, rollup_version=ROLLUP_VERSION)
+        log.import_legacy_once(_legacy_events)
+        _LOG_CACHE.append(log)
+    return _LOG_CACHE[0]
+
+
+@FOLDER.backup_data(TIMESHEET_LOG_FOLDER, "timesheet", is_folder=True)
 def update_timesheet(doc_name):
     app_name = ENVIRONMENT.get_app_name()
     _update_time_sheet_by_software(doc_name, app_name)
 
-def print_timesheet_detail():
-    def print_in_style(text):
-        if ENVIRONMENT.IS_REVIT_ENVIRONMENT:
-            from pyrevit import script
-            output = script.get_output()
-            lines = text.split("\n")
-            for line in lines:
-                output.print_md(line)
-            return
-        print(text)
 
+def format_timesheet_detail(days):
+    """Markdown text of every day and doc in the days rollup."""
     output = ""
-    data = DATA_FILE.get_data(TIMESHEET_DATA_FILE, is_local=False)
-    if not data:
-        data = DATA_FILE.get_data(TIMESHEET_DATA_FILE, is_local=True)
-
-    for software in ["revit", "rhino", "terminal"]:
+    for software in SOFTWARES:
         output += "\n\n"
         output += "\n# Printing timesheet for {}".format(software.capitalize())
-        log_data = data.get(software, {})
+        log_data = days.get(software, {})
         for date, doc_data in sorted(log_data.items()):
             output += "\n## Date: {}".format(date)
             for doc_name, doc_info in doc_data.items():
@@ -54,6 +139,21 @@ def print_timesheet_detail():
             output += "\n"
 
     output += "\n\n\nOutput finish!"
+    return output
+
+
+def print_timesheet_detail():
+    def print_in_style(text):
+        if ENVIRONMENT.IS_REVIT_ENVIRONMENT:
+            from pyrevit import script
+            output = script.get_output()
+            lines = text.split("\n")
+            for line in lines:
+                output.print_md(line)
+            return
+        print(text)
+
+    output = format_timesheet_detail(get_timesheet_log().get_rollups().get("days", {}))
 
     if ENVIRONMENT.IS_REVIT_ENVIRONMENT:
         print_revit_log_as_table()
@@ -65,74 +165,238 @@ def print_timesheet_detail():
         import rhinoscriptsyntax as rs
         rs.TextOut(output, "All your busy work recently.")
 
-def print_revit_log_as_table():
-    data = DATA_FILE.get_data(TIMESHEET_DATA_FILE)
-    log_data = data.get("revit", {})
-    from pyrevit import script
-    output = script.get_output()
-    output.insert_divider()
-    output.print_md("# This is an alternative display of the Revit Timesheet")
 
-    def print_table(dates):
-        table_data = []
-        valid_dates = set()
+def _duration_table(columns_by_doc, columns):
+    table_data = []
+    for proj_name, proj_info in sorted(columns_by_doc.items()):
+        total_duration = sum(proj_info.values())
+        table_data.append([proj_name] + [TIME.get_readable_time(proj_info.get(column, 0)) if proj_info.get(column, 0) != 0 else "N/A" for column in columns] + [TIME.get_readable_time(total_duration)])
+    return table_data
+
+
+def build_daily_tables(log_data, seg_max=10):
+    """Doc x date duration tables, seg_max dates per table.
+
+    Args:
+        log_data (dict): {date: {doc: {"starting_time", "end_time"}}} of one software
+
+    Returns:
+        list: (dates, table rows) per table
+    """
+    tables = []
+    all_dates = sorted(log_data.keys())
+    for i in range(0, len(all_dates), seg_max):
+        dates = all_dates[i:i + seg_max]
         proj_dict = dict()
         for date in dates:
-            doc_data = log_data.get(date, {})
-            valid_dates.add(date)
-            for doc_name, doc_info in doc_data.items():
-                temp = proj_dict.get(doc_name, {})
+            for doc_name, doc_info in log_data[date].items():
                 starting_time = doc_info.get("starting_time", None)
                 end_time = doc_info.get("end_time", None)
                 if starting_time and end_time:
-                    duration = end_time - starting_time
-                    temp[date] = duration
-                    proj_dict[doc_name] = temp
+                    proj_dict.setdefault(doc_name, {})[date] = end_time - starting_time
+        tables.append((dates, _duration_table(proj_dict, dates)))
+    return tables
+
+
+def build_weekly_table(week_data, max_weeks=10):
+    """Doc x week duration table of the latest weeks.
 
-        for proj_name, proj_info in sorted(proj_dict.items()):
-            total_duration = sum(proj_info.values())
-            table_data.append([proj_name] + [TIME.get_readable_time(proj_info.get(date, 0)) if proj_info.get(date, 0) != 0 else "N/A" for date in sorted(valid_dates)] + [TIME.get_readable_time(total_duration)])
+    Args:
+        week_data (dict): {monday: {doc: seconds}} of one software
 
+    Returns:
+        tuple: (weeks, table rows)
+    """
+    weeks = sorted(week_data.keys())[-max_weeks:]
+    proj_dict = dict()
+    for week in weeks:
+        for doc_name, duration in week_data[week].items():
+            if duration:
+                proj_dict.setdefault(doc_name, {})[week] = duration
+    return weeks, _duration_table(proj_dict, weeks)
+
+
+def print_revit_log_as_table():
+    rollups = get_timesheet_log().get_rollups()
+    from pyrevit import script
+    output = script.get_output()
+    output.insert_divider()
+    output.print_md("# This is an alternative display of the Revit Timesheet")
+
+    for dates, table_data in build_daily_tables(rollups.get("days", {}).get("revit", {})):
         output.print_table(table_data=table_data,
                            title="Revit Timesheet",
-                           columns=["Proj. Name"] + sorted(valid_dates) + ["Total Hour"])
+                           columns=["Proj. Name"] + dates + ["Total Hour"])
 
-    all_dates = sorted(log_data.keys())
-    seg_max = 10
-    for i in range(0, len(all_dates), seg_max):
-        if i + seg_max < len(all_dates):
-            dates = all_dates[i:i + seg_max]
-        else:
-            dates = all_dates[i:]
-        print_table(dates)
+    weeks, table_data = build_weekly_table(rollups.get("weeks", {}).get("revit", {}))
+    if table_data:
+        output.print_table(table_data=table_data,
+                           title="Revit Timesheet by Week",
+                           columns=["Proj. Name"] + ["Week of {}".format(x) for x in weeks] + ["Total Hour"])
 
 
+def _update_time_sheet_by_software(doc_name, software):
+    now = time.time()
+    get_timesheet_log().append({"software": software, "doc": doc_name,
+                                "date": EVENT_LOG.day_of(now), "start": now, "end": now})
 
 
-def _update_time_sheet_by_software(doc_name, software):
-    with DATA_FILE.update_data(TIMESHEET_DATA_FILE) as data:
-        software_data = data.get(software, {})
-        today = time.strftime("%Y-%m-%d")
-        
-        today_data = software_data.get(today, {})
-        current_doc_data = today_data.get(doc_name, {})
-        if "starting_time" not in current_doc_data:
-            current_doc_data["starting_time"] = time.time()
-        current_doc_data.update({"end_time": time.time()})
-        today_data[doc_name] = current_doc_data
-        
-        software_data[today] = today_data
-        data[software] = software_data
+def _make_fake_events(days=730, docs_per_day=4, events_per_doc=6):
+    """Two years of doc events, opens and syncs through each working day."""
+    events = []
+    start = 1577872800  # 2020-01-01 10:00 UTC
+    for day_index in range(days):
+        day_start = start + day_index * 86400
+        day = EVENT_LOG.day_of(day_start)
+        for k in range(docs_per_day):
+            software = SOFTWARES[k % 2]
+            doc_name = "Project {}".format((day_index // 30 + k) % 12)
+            for n in range(events_per_doc):
+                stamp = float(day_start + k * 600 + n * 1800)
+                events.append({"software": software, "doc": doc_name, "date": day, "start": stamp, "end": stamp})
+    return events
+
+
+def _legacy_update(legacy_path, event):
+    # the _update_time_sheet_by_software body this log replaced: read the
+    # whole dict, touch one doc, write the whole dict back
+    data = DATA_FILE.get_data(legacy_path) or {}
+    software_data = data.get(event["software"], {})
+    today_data = software_data.get(event["date"], {})
+    current_doc_data = today_data.get(event["doc"], {})
+    if "starting_time" not in current_doc_data:
+        current_doc_data["starting_time"] = event["start"]
+    current_doc_data.update({"end_time": event["end"]})
+    today_data[event["doc"]] = current_doc_data
+    software_data[event["date"]] = today_data
+    data[event["software"]] = software_data
+    DATA_FILE.set_data(data, legacy_path)
+
+
+def benchmark(days=730, samples=50):
+    """Two years of synthetic doc events, legacy dict rewrite against the event log.
+
+    Times one more event on top of the history, and the data read behind
+    print_timesheet_detail / print_revit_log_as_table in a new session.
+
+    Returns:
+        dict: timings in ms
+    """
+    import json
+    import tempfile
+
+    work_folder = tempfile.mkdtemp(prefix="timesheet_bench_")
+    try:
+        events = _make_fake_events(days)
+        history, extra = events[:-samples], events[-samples:]
+
+        legacy = {}
+        for event in history:
+            span = legacy.setdefault(event["software"], {}).setdefault(event["date"], {}).setdefault(event["doc"], {})
+            span.setdefault("starting_time", event["start"])
+            span["end_time"] = event["end"]
+        legacy_path = os.path.join(work_folder, "timesheet_bench.sexyDuck")
+        with open(legacy_path, "wb") as f:
+            f.write(json.dumps(legacy).encode("utf-8"))
+
+        log = EVENT_LOG.EventLog(os.path.join(work_folder, "timesheet_bench_events.jsonl"), apply_timesheet_event)
+        log.append_many(history)
+        t_start = time.time()
+        log.get_rollups()
+        cold_build = (time.time() - t_start) * 1000.0
+
+        results = {}
+        t_start = time.time()
+        for event in extra:
+            _legacy_update(legacy_path, event)
+        results["legacy_event"] = (time.time() - t_start) * 1000.0 / samples
+
+        writer = EVENT_LOG.EventLog(log.path, apply_timesheet_event)
+        t_start = time.time()
+        for event in extra:
+            writer.append(event)
+        results["log_event"] = (time.time() - t_start) * 1000.0 / samples
+
+        t_start = time.time()
+        data = DATA_FILE.get_data(legacy_path)
+        legacy_tables = build_daily_tables(data["revit"])
+        results["legacy_read"] = (time.time() - t_start) * 1000.0
+
+        t_start = time.time()
+        rollups = EVENT_LOG.EventLog(log.path, apply_timesheet_event).get_rollups()
+        log_tables = build_daily_tables(rollups["days"]["revit"])
+        build_weekly_table(rollups["weeks"]["revit"])
+        results["log_read"] = (time.time() - t_start) * 1000.0
+        assert log_tables == legacy_tables
+
+        print("{} events over {} days, legacy file {} KB, event log {} KB".format(
+            len(events), days, os.path.getsize(legacy_path) // 1024, os.path.getsize(log.path) // 1024))
+        print("  one doc event:  legacy rewrite {:>8.2f} ms, log append {:>6.3f} ms".format(
+            results["legacy_event"], results["log_event"]))
+        print("  timesheet read: legacy dict    {:>8.2f} ms, rollups    {:>6.2f} ms (cold build {:.0f} ms)".format(
+            results["legacy_read"], results["log_read"], cold_build))
+        return results
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
 
 
 def unit_test():
-    update_timesheet("test_project_revit_1")
-    update_timesheet("test_project_revit_2")
-    update_timesheet("test_project_rhino_1")
+    import tempfile
+    import MAINTENANCE
 
-    print_timesheet_detail()
+    work_folder = tempfile.mkdtemp(prefix="timesheet_test_")
+    try:
+        log = EVENT_LOG.EventLog(os.path.join(work_folder, "timesheet_test_events.jsonl"), apply_timesheet_event)
+        # Monday 2024-01-29 and Tuesday
+        log.append({"software": "revit", "doc": "A", "date": "2024-01-29", "start": 1000.0, "end": 1000.0})
+        log.append({"software": "revit", "doc": "A", "date": "2024-01-29", "start": 4600.0, "end": 4600.0})
+        log.append({"software": "revit", "doc": "B", "date": "2024-01-30", "start": 9000.0, "end": 9000.0})
+        log.append({"software": "revit", "doc": "B", "date": "2024-01-30", "start": 9600.0, "end": 9600.0})
+        log.append({"software": "rhino", "doc": "C", "date": "2024-01-30", "start": 500.0, "end": 500.0})
+        # an import of an older span after the fact
+        log.append({"software": "revit", "doc": "A", "date": "2024-01-29", "start": 400.0, "end": 2000.0})
+
+        rollups = EVENT_LOG.EventLog(log.path, apply_timesheet_event).get_rollups()
+        assert rollups["days"]["revit"]["2024-01-29"]["A"] == {"starting_time": 400.0, "end_time": 4600.0}
+        assert rollups["weeks"]["revit"] == {"2024-01-29": {"A": 4200, "B": 600}}
+        assert rollups["weeks"]["rhino"] == {"2024-01-29": {"C": 0}}
+
+        tables = build_daily_tables(rollups["days"]["revit"], seg_max=1)
+        assert [dates for dates, _ in tables] == [["2024-01-29"], ["2024-01-30"]]
+        assert tables[0][1] == [["A", "1h 10m 0s", "1h 10m 0s"]]
+        weeks, table = build_weekly_table(rollups["weeks"]["revit"])
+        assert weeks == ["2024-01-29"] and table[1] == ["B", "10m 0s", "10m 0s"]
+
+        text = format_timesheet_detail(rollups["days"])
+        assert "### Doc Name: C" in text and "Open Time" in text and "Duration: 1h 10m 0s" in text
+
+        # the dump folder cleanup leaves the log of an idle long weekend alone
+        dump_folder = os.path.join(work_folder, "dump")
+        path = get_timesheet_log_path(dump_folder)
+        log = EVENT_LOG.EventLog(path, apply_timesheet_event)
+        log.import_legacy_once(lambda: _make_fake_events(days=3))
+        week_totals = log.get_rollups()["weeks"]
+        stray = os.path.join(dump_folder, "stray.jsonl")
+        with open(stray, "w") as f:
+            f.write("{}\n")
+        old_time = time.time() - 10 * 24 * 60 * 60
+        for folder, _, file_names in os.walk(dump_folder):
+            for file_name in file_names:
+                os.utime(os.path.join(folder, file_name), (old_time, old_time))
+        original_dump_folder = ENVIRONMENT.DUMP_FOLDER
+        ENVIRONMENT.DUMP_FOLDER = dump_folder
+        try:
+            cleanup = MAINTENANCE.make_dump_cleanup_task()
+            assert cleanup(MAINTENANCE.TaskRun(time.time() + 60, None, {}))
+        finally:
+            ENVIRONMENT.DUMP_FOLDER = original_dump_folder
+        assert not os.path.exists(stray)
+        assert EVENT_LOG.EventLog(path, apply_timesheet_event).get_rollups()["weeks"] == week_totals
+        assert sorted(os.listdir(os.path.dirname(path))) == ["events.jsonl", "events_manifest.json", "events_rollups.json"]
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
 
 
 if __name__  == "__main__":
     unit_test()
-
+    benchmark()
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+"""
+EnneadTab Traceback Ring Log
+
+Fixed-size storage for RECENT_TRACEBACK.LOG written by
+ERROR_HANDLE.save_recent_traceback_to_log.
+
+The legacy log was appended to and then read back in full with readlines()
+so it could be cut to its last 800 lines, which made every caught error an
+O(n) read-modify-write on the UI thread. This ring preallocates a fixed
+number of fixed-size slots and overwrites the oldest one, so logging an
+error costs the same whatever the log holds. An error whose fingerprint is
+already in the ring only bumps the counter on that slot's header line.
+
+Key Features:
+    - O(1) append into a preallocated ring of slots
+    - Deduplication by traceback fingerprint with occurrence counters
+    - Reader yielding the most recent N entries in order
+    - One-time move of a legacy text log out of the way
+    - Benchmark comparing an error storm against the legacy rewrite
+
+Layout:
+    RECENT_TRACEBACK.LOG
+        header line (128 bytes)  -> magic, slot_size, slots, next slot, last seq
+        slot 0 (slot_size bytes) -> "#ENTRY seq=.. count=.. fp=.. first=.. last=.."
+                                    followed by the entry text, space padded
+        slot 1 ...
+
+Note:
+    The file stays plain text so it can still be opened in a text editor,
+    but slots are in ring order, not time order. Use iter_recent() to read
+    entries by time. Two hosts writing the same file at the same moment can
+    at worst lose one entry, the ring itself never breaks.
+"""
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import threading
+
+MAGIC = "EnneadTab traceback ring v1"
+HEADER_SIZE = 128
+SLOT_SIZE = 4096
+SLOT_COUNT = 64
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+_HEADER_PATTERN = re.compile(
+    r"^EnneadTab traceback ring v1 slot_size=(\d+) slots=(\d+) next=(\d+) seq=(\d+)")
+_SLOT_PATTERN = re.compile(
+    r"^#ENTRY seq=(\d+) count=(\d+) fp=(\w+) +first=(.{19}) last=(.{19})")
+_FINGERPRINT_LENGTH = 16
+_MAX_COUNT = 99999999
+
+
+def _format_header(slot_size, slot_count, next_slot, seq):
+    line = "{} slot_size={:06d} slots={:04d} next={:04d} seq={:010d}".format(
+        MAGIC, slot_size, slot_count, next_slot, seq)
+    return (line.ljust(HEADER_SIZE - 1) + "\n").encode("ascii")
+
+
+def _format_slot_header(seq, count, fingerprint, first, last):
+    # fixed width, so a repeat can rewrite this line in place
+    return "#ENTRY seq={:010d} count={:08d} fp={} first={} last={}\n".format(
+        seq, min(count, _MAX_COUNT), fingerprint[:_FINGERPRINT_LENGTH].ljust(_FINGERPRINT_LENGTH),
+        first, last).encode("ascii")
+
+
+SLOT_HEADER_SIZE = len(_format_slot_header(0, 0, "", "0" * 19, "0" * 19))
+
+
+def _to_bytes(text):
+    try:
+        return text.encode("utf-8")
+    except UnicodeDecodeError:
+        # CPython 2.7 str that is already encoded
+        return text
+    except AttributeError:
+        return str(text).encode("utf-8")
+
+
+def _fit_text(text, room):
+    """Encode text into at most room bytes, cutting the middle when too long.
+
+    The head keeps the exception type and message, the tail keeps the
+    innermost frames, which is where the error happened.
+    """
+    data = _to_bytes(text)
+    if len(data) <= room:
+        return data
+    marker = TRUNCATION_MARKER.encode("ascii")
+    head = (room - len(marker)) * 2 // 5
+    tail = room - len(marker) - head
+    data = data[:head] + marker + data[len(data) - tail:]
+    # a cut can split a multi-byte character, drop the broken pieces
+    return data.decode("utf-8", "ignore").encode("utf-8")
+
+
+def fingerprint_traceback(error_info, func_name=""):
+    """Identify an error by where it happened, not by when or with what values.
+
+    Uses the function name, the exception type and the file/line frames, as
+    written by ERROR_HANDLE.get_alternative_traceback or traceback.format_exc.
+    Messages and timestamps are left out, so the same failure on another
+    element gets the same fingerprint.
+
+    Args:
+        error_info (str): Traceback text
+        func_name (str, optional): Function the error was caught in
+
+    Returns:
+        str: 16 hex characters
+    """
+    try:
+        error_info = error_info.decode("utf-8", "replace")
+    except (AttributeError, UnicodeEncodeError):
+        pass
+    lines = [x.strip() for x in error_info.splitlines() if x.strip()]
+    keys = []
+    for line in lines:
+        if line.startswith("Exception Type:") or line.startswith("File:") or line.startswith('File "'):
+            keys.append(line)
+    if keys and not any(x.startswith("Exception Type:") for x in keys):
+        # traceback.format_exc ends with "ValueError: message"
+        keys.append(lines[-1].split(":")[0])
+    if not keys:
+        # free text, numbers are usually ids, counts and times
+        keys = [re.sub(r"\d+", "#", " ".join(lines))]
+    key = u"{}\n{}".format(func_name, u"\n".join(keys))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:_FINGERPRINT_LENGTH]
+
+
+def _replace_file(source, target):
+    # os.replace does not exist in IronPython 2.7
+    if os.path.exists(target):
+        os.remove(target)
+    shutil.move(source, target)
+
+
+class TracebackRing:
+    """Fixed-size ring of traceback entries in one text file.
+
+    Args:
+        path (str): Log file, created and preallocated on first write
+        slot_size (int, optional): Bytes per entry, longer text is cut in the middle
+        slot_count (int, optional): Entries kept before the oldest is overwritten
+
+    An existing ring keeps the geometry written in its header.
+    """
+
+    def __init__(self, path, slot_size=SLOT_SIZE, slot_count=SLOT_COUNT):
+        self.path = path
+        self.slot_size = slot_size
+        self.slot_count = slot_count
+        self._lock = threading.Lock()
+        # fingerprint -> slot, built from the slot headers on first use
+        self._index = None
+
+    def get_legacy_path(self):
+        stem, ext = os.path.splitext(self.path)
+        return "{}_legacy{}".format(stem, ext)
+
+    def _slot_offset(self, slot):
+        return HEADER_SIZE + slot * self.slot_size
+
+    def _create(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        empty_slot = b"#EMPTY".ljust(self.slot_size - 1) + b"\n"
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_format_header(self.slot_size, self.slot_count, 0, 0))
+            for _ in range(self.slot_count):
+                f.write(empty_slot)
+        _replace_file(temp_path, self.path)
+        self._index = {}
+
+    def _read_header(self, f):
+        f.seek(0)
+        match = _HEADER_PATTERN.match(f.read(HEADER_SIZE).decode("ascii", "replace"))
+        if not match:
+            return None
+        slot_size, slot_count, next_slot, seq = [int(x) for x in match.groups()]
+        if slot_size <= SLOT_HEADER_SIZE or slot_count < 1:
+            return None
+        return slot_size, slot_count, next_slot % slot_count, seq
+
+    def _open(self):
+        """Open the ring for update, creating it or moving a legacy log aside."""
+        if os.path.exists(self.path):
+            f = open(self.path, "r+b")
+            header = self._read_header(f)
+            if header is not None:
+                self.slot_size, self.slot_count = header[0], header[1]
+                return f, header[2], header[3]
+            f.close()
+            _replace_file(self.path, self.get_legacy_path())
+            self._index = None
+        self._create()
+        return open(self.path, "r+b"), 0, 0
+
+    def _read_slot_header(self, f, slot):
+        f.seek(self._slot_offset(slot))
+        match = _SLOT_PATTERN.match(f.read(SLOT_HEADER_SIZE).decode("ascii", "replace"))
+        if not match:
+            return None
+        seq, count, fingerprint, first, last = match.groups()
+        return {"seq": int(seq), "count": int(count), "fingerprint": fingerprint,
+                "first": first, "last": last, "slot": slot}
+
+    def _build_index(self, f):
+        newest = {}
+        for slot in range(self.slot_count):
+            entry = self._read_slot_header(f, slot)
+            if entry is None:
+                continue
+            known = newest.get(entry["fingerprint"])
+            if known is None or known[1] < entry["seq"]:
+                newest[entry["fingerprint"]] = (slot, entry["seq"])
+        self._index = dict((key, value[0]) for key, value in newest.items())
+
+    def record(self, fingerprint, text, timestamp=None):
+        """Store one error, or count it again when its fingerprint is in the ring.
+
+        Args:
+            fingerprint (str): See fingerprint_traceback
+            text (str): Entry text, shown under the slot header
+            timestamp (str, optional): Defaults to now
+
+        Returns:
+            int: Occurrences of this fingerprint in its slot, 1 for a new entry
+        """
+        fingerprint = fingerprint[:_FINGERPRINT_LENGTH]
+        timestamp = (timestamp or time.strftime(TIME_FORMAT))[:19].ljust(19)
+        with self._lock:
+            f, next_slot, seq = self._open()
+            try:
+                if self._index is None:
+                    self._build_index(f)
+                seq += 1
+
+                slot = self._index.get(fingerprint)
+                if slot is not None:
+                    entry = self._read_slot_header(f, slot)
+                    # another host may have reused the slot since the index was built
+                    if entry is not None and entry["fingerprint"] == fingerprint:
+                        count = entry["count"] + 1
+                        f.seek(self._slot_offset(slot))
+                        f.write(_format_slot_header(seq, count, fingerprint, entry["first"], timestamp))
+                        f.seek(0)
+                        f.write(_format_header(self.slot_size, self.slot_count, next_slot, seq))
+                        return count
+
+                slot = next_slot
+                overwritten = self._read_slot_header(f, slot)
+                if overwritten is not None and self._index.get(overwritten["fingerprint"]) == slot:
+                    del self._index[overwritten["fingerprint"]]
+
+                body = _fit_text(text, self.slot_size - SLOT_HEADER_SIZE - 1)
+                f.seek(self._slot_offset(slot))
+                f.write(_format_slot_header(seq, 1, fingerprint, timestamp, timestamp)
+                        + body.ljust(self.slot_size - SLOT_HEADER_SIZE - 1) + b"\n")
+                f.seek(0)
+                f.write(_format_header(self.slot_size, self.slot_count, (slot + 1) % self.slot_count, seq))
+                self._index[fingerprint] = slot
+                return 1
+            finally:
+                f.close()
+
+    def iter_recent(self, limit=None):
+        """Yield stored entries oldest first, only the newest limit of them.
+
+        Entries are dicts with seq, count, fingerprint, first, last and text.
+        An entry counted again moves up, as its seq is that of the last repeat.
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._lock:
+            with open(self.path, "rb") as f:
+                header = self._read_header(f)
+                if header is None:
+                    return
+                self.slot_size, self.slot_count = header[0], header[1]
+                entries = []
+                for slot in range(self.slot_count):
+                    entry = self._read_slot_header(f, slot)
+                    if entry is None:
+                        continue
+                    f.seek(self._slot_offset(slot) + SLOT_HEADER_SIZE)
+                    entry["text"] = f.read(self.slot_size - SLOT_HEADER_SIZE).rstrip(b" \n").decode("utf-8", "replace")
+                    entries.append(entry)
+        entries.sort(key=lambda x: x["seq"])
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        for entry in entries:
+            yield entry
+
+
+_RING_CACHE = {}
+
+
+def get_ring(path):
+    """Get the ring for a log file, one instance per path per session."""
+    ring = _RING_CACHE.get(path)
+    if ring is None:
+        ring = TracebackRing(path)
+        _RING_CACHE[path] = ring
+    return ring
+
+
+def _make_fake_traceback(i, distinct):
+    return "Oops at 2024-01-01 00:00:{:02d}\n\nException Type: ValueError\n" \
+           "Exception Message: bad element {}\n" \
+           "File: C:\\EnneadTab\\fake_hook.py, Line: {}\n" \
+           "File: C:\\EnneadTab\\fake_script.py, Line: 12".format(i % 60, i, 100 + i % distinct)
+
+
+def _legacy_append(log_path, entry):
+    # the save_recent_traceback_to_log body this module replaced
+    import io
+    with io.open(log_path, "a", encoding="utf-8") as f:
+        f.write(entry)
+    with io.open(log_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    if len(lines) > 1000:
+        with io.open(log_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[-800:])
+
+
+def benchmark(storm_size=2000, distinct_errors=(1, 40)):
+    """Time an error storm, legacy append plus readlines trim against the ring.
+
+    Args:
+        storm_size (int, optional): Errors logged per run
+        distinct_errors (tuple, optional): Different tracebacks in the storm,
+            1 is a failing hook on every element, 40 mixes in new entries
+
+    Returns:
+        dict: {distinct: (legacy_ms_per_error, ring_ms_per_error)}
+    """
+    import tempfile
+
+    results = {}
+    for distinct in distinct_errors:
+        work_folder = tempfile.mkdtemp(prefix="traceback_log_bench_")
+        try:
+            legacy_path = os.path.join(work_folder, "legacy.LOG")
+            t_start = time.time()
+            for i in range(storm_size):
+                text = _make_fake_traceback(i, distinct)
+                _legacy_append(legacy_path, "=" * 80 + "\nFUNCTION: fake\n" + "-" * 80 + "\n" + text + "\n" + "=" * 80 + "\n")
+            legacy_cost = (time.time() - t_start) * 1000.0 / storm_size
+
+            ring = TracebackRing(os.path.join(work_folder, "ring.LOG"))
+            t_start = time.time()
+            for i in range(storm_size):
+                text = _make_fake_traceback(i, distinct)
+                ring.record(fingerprint_traceback(text, "fake"), "FUNCTION: fake\n" + text)
+            ring_cost = (time.time() - t_start) * 1000.0 / storm_size
+
+            results[distinct] = (legacy_cost, ring_cost)
+            print("{} errors, {:>2} distinct: legacy rewrite {:>7.3f} ms/error, ring {:>7.3f} ms/error, "
+                  "file {} KB".format(storm_size, distinct, legacy_cost, ring_cost,
+                                       os.path.getsize(ring.path) // 1024))
+        finally:
+            shutil.rmtree(work_folder, ignore_errors=True)
+    return results
+
+
+def unit_test():
+    import io
+    import tempfile
+
+    work_folder = tempfile.mkdtemp(prefix="traceback_log_test_")
+    try:
+        # the same failure with another message and time shares a fingerprint
+        first = _make_fake_traceback(1, 1)
+        assert fingerprint_traceback(first, "f") == fingerprint_traceback(_make_fake_traceback(7, 1), "f")
+        assert fingerprint_traceback(first, "f") != fingerprint_traceback(first, "g")
+        assert fingerprint_traceback(first, "f") != fingerprint_traceback(_make_fake_traceback(2, 5), "f")
+        assert fingerprint_traceback("update stale (3 days)") == fingerprint_traceback("update stale (9 days)")
+        formatted = 'Traceback (most recent call last):\n  File "a.py", line 3, in f\nKeyError: 1'
+        assert fingerprint_traceback(formatted) != fingerprint_traceback(formatted.replace("KeyError", "TypeError"))
+
+        # a legacy text log is moved aside
+        path = os.path.join(work_folder, "RECENT_TRACEBACK.LOG")
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(u"=" * 80 + u"\nold entry\n")
+        ring = TracebackRing(path, slot_size=512, slot_count=4)
+        assert ring.record("a", u"error a", "2024-01-01 00:00:00") == 1
+        assert os.path.exists(ring.get_legacy_path())
+        assert os.path.getsize(path) == HEADER_SIZE + 4 * 512
+
+        # repeats only bump the counter
+        assert ring.record("a", u"error a again", "2024-01-01 00:00:05") == 2
+        ring.record("b", u"error b \u00e9", "2024-01-01 00:00:06")
+        entries = list(ring.iter_recent())
+        assert [x["fingerprint"] for x in entries] == ["a", "b"]
+        assert entries[0]["count"] == 2 and entries[0]["text"] == u"error a"
+        assert entries[0]["first"] == "2024-01-01 00:00:00" and entries[0]["last"] == "2024-01-01 00:00:05"
+        assert entries[1]["text"] == u"error b \u00e9"
+
+        # the oldest slot is overwritten, a repeat after that is a new entry
+        for name in "cde":
+            ring.record(name, u"error " + name)
+        assert [x["fingerprint"] for x in ring.iter_recent()] == ["b", "c", "d", "e"]
+        assert ring.record("a", u"error a") == 1
+        assert [x["fingerprint"] for x in ring.iter_recent(limit=2)] == ["e", "a"]
+        assert list(ring.iter_recent(limit=0)) == []
+        assert os.path.getsize(path) == HEADER_SIZE + 4 * 512
+
+        # long text keeps both ends
+        ring.record("long", u"HEAD" + u"x" * 5000 + u"TAIL")
+        text = list(ring.iter_recent(limit=1))[0]["text"]
+        assert text.startswith(u"HEAD") and text.endswith(u"TAIL") and "[truncated]" in text
+
+        # a new session reads the geometry and counters from the file
+        reopened = TracebackRing(path)
+        assert reopened.record("long", u"again") == 2
+        assert reopened.slot_size == 512 and reopened.slot_count == 4
+        assert len(list(reopened.iter_recent())) == 4
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
@@ -19,7 +19,7 @@ Have a nice day, my friend, good and kind.
 Sen.Z
 
 
-
+
 '''
 
 
@@ -37,11 +37,26 @@ encoding failures in IronPython environments.
 """
 import os
 import sys
+import time
+import json
 import traceback
 import io
+import types
 
 __py3_marker__ = "#!python3"
 
+# Set ENNEADTAB_EAGER_IMPORT=1 to import every module up front like before.
+EAGER_IMPORT_ENV = "ENNEADTAB_EAGER_IMPORT"
+MANIFEST_VERSION = 1
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules import each other by bare name ("import FOLDER"), so the package
+# folder has to be on sys.path before the first module loads.
+if _PACKAGE_DIR not in sys.path:
+    sys.path.append(_PACKAGE_DIR)
+
+_IMPORT_PROFILE = []
+_MANIFEST = {}
 
 
 def get_module_files():
@@ -59,10 +74,72 @@ def get_module_files():
         {'REVIT.py', 'PDF.py', 'RHINO.py'}
     """
     return {
-        module for module in os.listdir(os.path.dirname(__file__))
+        module for module in os.listdir(_PACKAGE_DIR)
         if module.endswith('.py') and module != '__init__.py'
     }
 
+
+def _get_manifest_path():
+    """Manifest lives in the temp folder, keyed by package location, so a
+    read-only install or several installs side by side never collide."""
+    import tempfile
+    tag = "".join(c if c.isalnum() else "_" for c in _PACKAGE_DIR)[-80:]
+    return os.path.join(tempfile.gettempdir(), "EnneadTab_module_manifest_{}.json".format(tag))
+
+
+def _has_py3_marker(module_path):
+    try:
+        with io.open(module_path, 'r', encoding='utf-8') as f:
+            return f.readline().strip() == __py3_marker__
+    except Exception:
+        return False
+
+
+def get_module_manifest(refresh=False):
+    """Get the cached list of package modules and their #!python3 markers.
+    
+    The manifest is rebuilt only when the package folder changed (its mtime
+    moves whenever a module is added, removed or replaced), so a normal
+    import neither lists the folder contents nor opens any module file.
+    
+    Args:
+        refresh (bool): Rebuild even if the cached manifest looks current.
+    
+    Returns:
+        dict: {module_name: {"py3": bool}}
+    """
+    if _MANIFEST and not refresh:
+        return _MANIFEST
+    
+    signature = [MANIFEST_VERSION, os.path.getmtime(_PACKAGE_DIR)]
+    manifest_path = _get_manifest_path()
+    modules = None
+    if not refresh:
+        try:
+            with io.open(manifest_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                modules = cached["modules"]
+        except Exception:
+            modules = None
+    
+    if modules is None:
+        modules = {}
+        for module_file in get_module_files():
+            modules[module_file[:-3]] = {
+                "py3": _has_py3_marker(os.path.join(_PACKAGE_DIR, module_file))
+            }
+        try:
+            with io.open(manifest_path, 'w', encoding='utf-8') as f:
+                f.write(u"{}".format(json.dumps({"signature": signature, "modules": modules})))
+        except Exception:
+            pass  # a read-only temp folder only costs the rescan next time
+    
+    _MANIFEST.clear()
+    _MANIFEST.update(modules)
+    return _MANIFEST
+
+
 def import_special_modules(module_name):
     """Handle special module imports (RHINO, REVIT).
     
@@ -91,42 +168,36 @@ def import_special_modules(module_name):
         pass  # Silently skip if special module import fails
     return True
 
+
 def import_module(module_name):
-    """Import a single module with error handling.
-    
-    Attempts to import a module while handling potential import errors and
-    ensuring the module directory is in the Python path.
+    """Import a single module with error handling and timing.
     
     Args:
         module_name (str): The name of the module to import. Can include the .py
             extension, which will be stripped before import.
     
+    Returns:
+        module: The imported module, None if the import failed.
+    
     Note:
-        If an import fails, the error will be printed to stdout only if #!python3 is not present in the script.
-        Two attempts are made to format the error message:
-        1. Using the full traceback
-        2. Using just the exception string if traceback formatting fails
+        If an import fails, the error will be printed to stdout only if #!python3
+        is not present in the script. Every attempt is recorded for
+        get_import_profile, the time includes modules pulled in along the way.
     """
+    base_name = module_name[:-3] if module_name.endswith('.py') else module_name
+    full_name = "{}.{}".format(__package_name__, base_name)
+    if full_name in sys.modules:
+        return sys.modules[full_name]
+    
+    t_start = time.time()
     try:
-        # Ensure module directory is in path for relative imports
-        module_dir = os.path.dirname(__file__)
-        if module_dir not in sys.path:
-            sys.path.append(module_dir)
-            
-        # Import the module (strip .py extension if present)
-        base_name = module_name[:-3] if module_name.endswith('.py') else module_name
-        module_path = os.path.join(module_dir, module_name)
-        
-        # Check if script has python3 marker
-        should_silent = False
-        if os.path.exists(module_path):
-            with io.open(module_path, 'r', encoding='utf-8') as f:
-                first_line = f.readline().strip()
-                if first_line == __py3_marker__:
-                    should_silent = True
-                    
-        __import__("{}.{}".format(__package_name__, base_name), fromlist=['*'])
+        __import__(full_name, fromlist=['*'])
+        module = sys.modules[full_name]
+        _IMPORT_PROFILE.append((base_name, time.time() - t_start, True))
+        return module
     except Exception as e:
+        _IMPORT_PROFILE.append((base_name, time.time() - t_start, False))
+        should_silent = get_module_manifest().get(base_name, {}).get("py3", False)
         if not should_silent:
             try:
                 print("Cannot import {} because\n\n{}".format(
@@ -134,41 +205,128 @@ def import_module(module_name):
             except:
                 print("Cannot import {} because\n\n{}".format(
                     module_name, str(e)))
+        return None
 
-def initialize_package():
-    """Initialize the package by importing all modules.
+
+def _load_module_attribute(name):
+    """Import a package module on first attribute access."""
+    if name.startswith("__") or name not in get_module_manifest():
+        raise AttributeError("module '{}' has no attribute '{}'".format(__package_name__, name))
+    module = import_module(name)
+    if module is None:
+        raise AttributeError("module '{}' failed to import '{}'".format(__package_name__, name))
+    globals()[name] = module
+    package = sys.modules.get(__package_name__)
+    if package is not None and getattr(package, "__dict__", None) is not globals():
+        setattr(package, name, module)
+    return module
+
+
+def __getattr__(name):
+    """PEP 562 hook, EnneadTab.EXCEL imports EXCEL the first time it is used."""
+    return _load_module_attribute(name)
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(get_module_manifest().keys()))
+
+
+class _LazyPackage(types.ModuleType):
+    """Stand-in package module for interpreters without module __getattr__
+    (IronPython 2.7, CPython before 3.7)."""
     
-    This function orchestrates the package initialization process by:
-    1. Getting a list of all Python modules in the package
-    2. Attempting to import special modules first
-    3. Importing remaining modules
+    def __getattr__(self, name):
+        return _load_module_attribute(name)
     
-    The function handles both regular and special module imports, ensuring that
-    all package components are properly initialized.
+    def __dir__(self):
+        return __dir__()
+
+
+def _install_lazy_proxy():
+    if sys.version_info[:2] >= (3, 7):
+        return True  # module level __getattr__ above is enough
+    try:
+        proxy = _LazyPackage(__package_name__)
+        proxy.__dict__.update(globals())
+        sys.modules[__package_name__] = proxy
+        return True
+    except Exception:
+        return False
+
+
+def initialize_package():
+    """Import every module in the package right away.
     
-    Note:
-        This function is automatically called when the package is imported.
-        Special modules (RHINO, REVIT) are handled separately from regular modules
-        due to their specific initialization requirements.
+    This was the default behaviour of importing EnneadTab. Modules are now
+    imported on first use instead, this stays available for tools that
+    need everything loaded (and for the startup benchmark).
     """
     imported_modules = {}
-    for module in get_module_files():
-        if not import_special_modules(module):
-            import_module(module)
-            # Store the module reference for namespace exposure
-            base_name = module[:-3] if module.endswith('.py') else module
-            try:
-                mod = sys.modules.get("{}.{}".format(__package_name__, base_name))
-                if mod is not None:
-                    imported_modules[base_name] = mod
-            except:
-                pass
+    for module_name in get_module_manifest():
+        if import_special_modules(module_name):
+            continue
+        module = import_module(module_name)
+        if module is not None:
+            imported_modules[module_name] = module
     
     # Expose all imported modules in the package namespace
     globals().update(imported_modules)
+    package = sys.modules.get(__package_name__)
+    if package is not None and getattr(package, "__dict__", None) is not globals():
+        package.__dict__.update(imported_modules)
+
+
+def get_import_profile():
+    """Get the cost of every module imported through the package so far.
+    
+    Returns:
+        list: (module_name, seconds, succeeded) tuples, slowest first.
+            Seconds are inclusive of modules imported along the way.
+    """
+    return sorted(_IMPORT_PROFILE, key=lambda x: x[1], reverse=True)
+
+
+def print_import_profile(limit=20):
+    """Print the slowest package module imports of this session."""
+    profile = get_import_profile()
+    total = sum(x[1] for x in profile)
+    print("EnneadTab imported {} modules in {:.3f}s (inclusive times)".format(len(profile), total))
+    for module_name, seconds, succeeded in profile[:limit]:
+        print("  {:<24} {:>8.1f} ms{}".format(module_name, seconds * 1000, "" if succeeded else "  FAILED"))
+
+
+def benchmark_startup(repeat=5, python=None):
+    """Measure a cold "import EnneadTab" in fresh interpreters, eager vs lazy.
+    
+    Args:
+        repeat (int): Interpreter launches per mode.
+        python (str): Interpreter to launch, defaults to the current one.
+    
+    Returns:
+        dict: {"eager": best seconds, "lazy": best seconds}
+    """
+    import subprocess
+    lib_dir = os.path.dirname(_PACKAGE_DIR)
+    code = ("import sys, time; sys.path.insert(0, {!r}); t = time.time(); "
+            "import EnneadTab; sys.stdout.write(repr(time.time() - t))").format(lib_dir)
+    results = {}
+    for mode in ("eager", "lazy"):
+        env = dict(os.environ)
+        env.pop(EAGER_IMPORT_ENV, None)
+        if mode == "eager":
+            env[EAGER_IMPORT_ENV] = "1"
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.check_output([python or sys.executable, "-c", code], env=env)
+            timings.append(float(output.decode("utf-8").strip().splitlines()[-1]))
+        results[mode] = min(timings)
+    print("cold import EnneadTab, best of {}: eager {:.3f}s, lazy {:.3f}s".format(
+        repeat, results["eager"], results["lazy"]))
+    return results
+
 
-# Execute package initialization
-initialize_package()
+if os.environ.get(EAGER_IMPORT_ENV) == "1" or not _install_lazy_proxy():
+    initialize_package()
 
 
 
@@ -50,8 +50,11 @@ import openpyxl
 import datetime
 import textwrap
 import time
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
+from concurrent.futures import ThreadPoolExecutor
+from name_matcher import NameMatcher
+
+# Parallel reads of the APPVERSIONLOOKUP files on the share
+READ_WORKERS = 16
 
 # Priority application patterns that should appear first
 PRIORITY_PATTERNS = [
@@ -113,18 +116,18 @@ def read_application_json_files():
     # for file in json_files:
     #     print(f"- {os.path.basename(file)}")
     
-    # Read and parse all JSON files
-    all_data = []
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8-sig') as f:  # Using utf-8-sig to handle BOM
-                data = json.load(f)
-                all_data.append(data)
-                # print(f"\nSuccessfully read {os.path.basename(json_file)}:")
-        except Exception as e:
-            print(f"Error reading {json_file}: {str(e)}")
-    
-    return all_data
+    # Read and parse all JSON files, the share latency dominates so read them side by side
+    with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(json_files))) as executor:
+        results = list(executor.map(_read_application_json_file, json_files))
+    return [data for data in results if data is not None]
+
+def _read_application_json_file(json_file):
+    try:
+        with open(json_file, 'r', encoding='utf-8-sig') as f:  # Using utf-8-sig to handle BOM
+            return json.load(f)
+    except Exception as e:
+        print(f"Error reading {json_file}: {str(e)}")
+        return None
 
 def create_visualization(data, output_path):
     num_pcs = len(set(record['PC'] for record in data))
@@ -545,26 +548,10 @@ def read_employee_names():
         print(f"Error reading employee file: {e}")
         return []
 
-def normalize_name(name):
-    """Normalize a name for better matching."""
-    if not name:
-        return ""
-    # Convert to lowercase and remove extra spaces
-    normalized = str(name).lower().strip()
-    # Remove common prefixes/suffixes that might appear in usernames
-    normalized = re.sub(r'^[a-z]\.', '', normalized)  # Remove single letter prefix like "j."
-    normalized = re.sub(r'[^\w\s]', '', normalized)   # Remove special characters except spaces
-    return normalized
+def compare_names_with_usernames(employee_records, pc_usernames, threshold=90, workers=None):
+    """Compare employee email usernames and names with PC usernames using exact and fuzzy matching. Only matches with confidence >= 90 are considered valid.
 
-def extract_last_name(full_name):
-    """Extract last name from full name."""
-    if not full_name:
-        return ""
-    parts = str(full_name).strip().split()
-    return parts[-1].lower() if parts else ""
-
-def compare_names_with_usernames(employee_records, pc_usernames, threshold=90):
-    """Compare employee email usernames and names with PC usernames using exact and fuzzy matching. Only matches with confidence >= 90 are considered valid."""
+    The usernames are indexed once by name_matcher.NameMatcher, see there for the blocking and the process pool."""
     matches = []
     unmatched_employees = []
     unmatched_usernames = list(pc_usernames)
@@ -572,37 +559,11 @@ def compare_names_with_usernames(employee_records, pc_usernames, threshold=90):
     print(f"\nComparing {len(employee_records)} employee records with {len(pc_usernames)} PC usernames...")
     print(f"Using threshold: {threshold}%")
     
-    for emp in employee_records:
+    matcher = NameMatcher(pc_usernames, threshold=threshold)
+    results = matcher.match_all(employee_records, workers=workers)
+    for emp, (best_match, best_score) in zip(employee_records, results):
         employee_name = emp['full_name']
         email_username = emp['email_username']
-        best_match = None
-        best_score = 0
-        # 1. Try exact match with email username
-        for username in pc_usernames:
-            if username.lower() == email_username.lower():
-                best_match = username
-                best_score = 100
-                break
-        # 2. If no exact match, use fuzzy matching on full name
-        if best_score < 100:
-            norm_employee = normalize_name(employee_name)
-            employee_last_name = extract_last_name(employee_name)
-            for username in pc_usernames:
-                norm_username = normalize_name(username)
-                scores = []
-                scores.append(fuzz.ratio(norm_employee, norm_username))
-                scores.append(fuzz.partial_ratio(norm_employee, norm_username))
-                scores.append(fuzz.token_sort_ratio(norm_employee, norm_username))
-                if employee_last_name and employee_last_name in norm_username:
-                    scores.append(85)
-                if len(employee_name.split()) >= 2:
-                    first_initial = employee_name.split()[0][0].lower()
-                    if norm_username.startswith(first_initial) and employee_last_name in norm_username:
-                        scores.append(90)
-                max_score = max(scores)
-                if max_score > best_score:
-                    best_score = max_score
-                    best_match = username
         if best_score >= threshold:
             matches.append({
                 'employee_name': employee_name,
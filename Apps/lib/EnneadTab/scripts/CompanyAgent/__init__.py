@@ -54,11 +54,17 @@ Key Features:
 __version__ = "0.1.0"
 __author__ = "Ennead Architects"
 
-# Import main classes for easy access
-from .__main__ import EnneadTabAgent, main
+# Main classes are imported on first use, so crawler, knowledge_store and
+# vector_store can be used without the UI and OpenAI client stack
+def __getattr__(name):
+    if name in ("EnneadTabAgent", "main"):
+        from . import __main__ as app
+        return getattr(app, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run():
     """Convenience function to run the application."""
+    from .__main__ import main
     main()
 
 # Allow direct execution of the module
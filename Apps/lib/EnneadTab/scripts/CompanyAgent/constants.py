@@ -11,11 +11,16 @@ from pathlib import Path
 VECTOR_STORE_MAX_AGE_DAYS = 7
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 100
+KNOWLEDGE_STORE_FILE = "ennead_knowledge.sqlite"  # chunks and cached embeddings
+CRAWL_MANIFEST_FILE = "ennead_crawl_manifest.json"  # content hash per crawled page
 
 # Web scraping settings
 BASE_URL = "https://ennead.com"
 MAX_PAGES = 500
 MAX_DEPTH = 3
+CRAWL_MAX_WORKERS = 4  # pages fetched at the same time
+CRAWL_DELAY = 0.05  # minimum seconds between two requests to the site
+REQUEST_TIMEOUT = 10
 URLS_TO_VISIT = [
     BASE_URL,
     BASE_URL + "/work",
@@ -11,9 +11,6 @@ import os
 import sys
 import json
 import logging
-import requests
-import re
-from bs4 import BeautifulSoup
 from datetime import datetime
 from pathlib import Path
 import threading
@@ -22,6 +19,7 @@ import time
 from . import constants
 from . import utils
 from . import vector_store
+from . import crawler
 
 # Setup logger
 logger = logging.getLogger("EnneadTabAgent.content_manager")
@@ -33,6 +31,8 @@ class ContentManager:
         self.base_url = constants.BASE_URL
         self.max_pages = constants.MAX_PAGES
         self.max_depth = constants.MAX_DEPTH
+        self.crawl_workers = constants.CRAWL_MAX_WORKERS
+        self.crawl_delay = constants.CRAWL_DELAY
         self.urls_to_visit = constants.URLS_TO_VISIT.copy()
         self.visited_urls = set()
         self.skipped_urls = set()
@@ -45,6 +45,8 @@ class ContentManager:
             "total_content_chunks": 0
         }
         self.content_cache_path = utils.get_storage_path("ennead_content.json")
+        self.manifest_path = utils.get_storage_path(constants.CRAWL_MANIFEST_FILE)
+        self.last_crawl = None
         
     def initialize(self, force_update=False):
         """Initialize content by loading from cache or fetching new content."""
@@ -117,143 +119,41 @@ class ContentManager:
             return False
             
     def parse_website(self, focus_query=None):
-        """Parse the Ennead website and extract content."""
+        """Crawl the Ennead website and extract content.
+
+        Pages unchanged since the last crawl come from the crawl manifest
+        without being parsed again, see crawler.WebsiteCrawler.
+        """
         try:
-            # Reset data
-            self.visited_urls = set()
-            self.skipped_urls = set()
-            self.content = []
-            
             # Record start time
             self.crawl_details["start_time"] = datetime.now().isoformat()
-            
-            def normalize_url(url, base):
-                """Normalize URL to absolute form."""
-                if url.startswith('/'):
-                    return base.rstrip('/') + url
-                elif url.startswith('http'):
-                    return url
-                else:
-                    return base.rstrip('/') + '/' + url
-                    
-            def should_follow_link(url):
-                """Determine if a link should be followed."""
-                # Don't follow external links
-                if not url.startswith(self.base_url):
-                    return False
-                    
-                # Skip file downloads
-                if any(url.endswith(ext) for ext in ['.pdf', '.doc', '.docx', '.jpg', '.png', '.zip']):
-                    return False
-                    
-                # Skip certain paths
-                skip_patterns = ['/search', '/login', '/admin', '/wp-admin', '/logout']
-                if any(pattern in url for pattern in skip_patterns):
-                    return False
-                    
-                return True
-                
-            def extract_content(soup, page_url):
-                """Extract content from a BeautifulSoup parsed page."""
-                page_content = []
-                
-                # Extract title
-                title = soup.find('title')
-                title_text = title.get_text().strip() if title else "Untitled Page"
-                
-                # Extract main content based on common content containers
-                content_containers = soup.select('main, article, .content, #content, .main-content, .page-content')
-                
-                # If no specific content containers found, use body
-                if not content_containers:
-                    content_containers = [soup.find('body')]
-                    
-                for container in content_containers:
-                    if not container:
-                        continue
-                        
-                    # Skip navigation, footer, sidebars, etc.
-                    for element in container.select('nav, footer, header, .sidebar, .navigation, .menu, .comments, script, style'):
-                        if element:
-                            element.decompose()
-                            
-                    # Extract text
-                    text = container.get_text(separator=' ', strip=True)
-                    text = re.sub(r'\s+', ' ', text).strip()
-                    
-                    if text:
-                        item = {
-                            "url": page_url,
-                            "title": title_text,
-                            "text": text,
-                            "source": "Ennead Website",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        page_content.append(item)
-                
-                return page_content
-                
-            # Recursive function to parse pages
-            def parse_page(url, depth=0):
-                if url in self.visited_urls or url in self.skipped_urls:
-                    return
-                    
-                if len(self.visited_urls) >= self.max_pages:
-                    self.skipped_urls.add(url)
-                    return
-                    
-                if depth > self.max_depth:
-                    self.skipped_urls.add(url)
-                    return
-                    
-                # Add to visited set
-                self.visited_urls.add(url)
-                logger.info(f"Parsing page {len(self.visited_urls)}: {url}")
-                
-                try:
-                    # Request page with reasonable timeout
-                    response = requests.get(url, timeout=10)
-                    
-                    if response.status_code != 200:
-                        logger.warning(f"Error status {response.status_code} for {url}")
-                        return
-                        
-                    # Parse HTML
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Extract content
-                    page_content = extract_content(soup, url)
-                    self.content.extend(page_content)
-                    
-                    # Extract links for further crawling
-                    links = soup.find_all('a', href=True)
-                    new_urls = []
-                    
-                    for link in links:
-                        href = link['href']
-                        abs_url = normalize_url(href, self.base_url)
-                        
-                        if should_follow_link(abs_url):
-                            new_urls.append(abs_url)
-                            
-                    # Continue crawling
-                    for new_url in new_urls:
-                        parse_page(new_url, depth + 1)
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing {url}: {e}")
-                    
-            # Start parsing from the initial URLs
-            for start_url in self.urls_to_visit:
-                parse_page(start_url)
+
+            site_crawler = crawler.WebsiteCrawler(
+                base_url=self.base_url,
+                start_urls=self.urls_to_visit,
+                max_pages=self.max_pages,
+                max_depth=self.max_depth,
+                max_workers=self.crawl_workers,
+                delay=self.crawl_delay,
+                manifest_path=self.manifest_path,
+            )
+            result = site_crawler.crawl()
+            self.last_crawl = result
+            self.visited_urls = set(result.changed_urls) | set(result.unchanged_urls) | set(result.failed_urls)
+            self.skipped_urls = set(result.skipped_urls)
+            self.content = result.content
                 
             # Record crawl details
             self.crawl_details["end_time"] = datetime.now().isoformat()
             self.crawl_details["pages_visited"] = len(self.visited_urls)
             self.crawl_details["pages_skipped"] = len(self.skipped_urls)
+            self.crawl_details["pages_changed"] = len(result.changed_urls)
+            self.crawl_details["pages_unchanged"] = len(result.unchanged_urls)
+            self.crawl_details["pages_removed"] = len(result.removed_urls)
             self.crawl_details["total_content_chunks"] = len(self.content)
             
-            logger.info(f"Website parsing complete. Visited {len(self.visited_urls)} pages, extracted {len(self.content)} content chunks.")
+            logger.info(f"Website parsing complete. Visited {len(self.visited_urls)} pages "
+                        f"({len(result.changed_urls)} changed), extracted {len(self.content)} content chunks.")
             
             return len(self.content) > 0
             
@@ -292,7 +192,9 @@ class ContentManager:
                 logger.warning("No documents created during processing")
                 return False
                 
-            success = self.vector_store.update_vector_store(documents)
+            # pages the last crawl found gone take their chunks with them
+            removed_urls = self.last_crawl.removed_urls if self.last_crawl else None
+            success = self.vector_store.update_vector_store(documents, removed_urls)
             
             if success:
                 logger.info(f"Successfully added {len(documents)} documents to vector store")
@@ -0,0 +1,317 @@
+"""
+Website crawler for EnneadTabAgent
+
+This module handles:
+- Concurrent crawling with a bounded worker pool
+- A politeness delay between requests to the site
+- A manifest of content hashes so unchanged pages are not parsed again
+
+The crawl goes breadth first, one depth level at a time, so a page is
+always reached at its shallowest depth. Each page's ETag, Last-Modified,
+content hash, extracted items and links are kept in the manifest. On the
+next crawl the page is requested conditionally, and a 304 or an identical
+hash reuses the stored items and links without parsing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from . import constants
+
+# Setup logger
+logger = logging.getLogger("EnneadTabAgent.crawler")
+
+SKIP_EXTENSIONS = ['.pdf', '.doc', '.docx', '.jpg', '.png', '.zip']
+SKIP_PATTERNS = ['/search', '/login', '/admin', '/wp-admin', '/logout']
+
+
+def normalize_url(url, base):
+    """Normalize URL to absolute form."""
+    if url.startswith('/'):
+        return base.rstrip('/') + url
+    elif url.startswith('http'):
+        return url
+    else:
+        return base.rstrip('/') + '/' + url
+
+
+def should_follow_link(url, base_url):
+    """Determine if a link should be followed."""
+    # Don't follow external links
+    if not url.startswith(base_url):
+        return False
+
+    # Skip file downloads
+    if any(url.endswith(ext) for ext in SKIP_EXTENSIONS):
+        return False
+
+    # Skip certain paths
+    if any(pattern in url for pattern in SKIP_PATTERNS):
+        return False
+
+    return True
+
+
+def extract_content(soup, page_url):
+    """Extract content from a BeautifulSoup parsed page."""
+    page_content = []
+
+    # Extract title
+    title = soup.find('title')
+    title_text = title.get_text().strip() if title else "Untitled Page"
+
+    # Extract main content based on common content containers
+    content_containers = soup.select('main, article, .content, #content, .main-content, .page-content')
+
+    # If no specific content containers found, use body
+    if not content_containers:
+        content_containers = [soup.find('body')]
+
+    for container in content_containers:
+        if not container:
+            continue
+
+        # Skip navigation, footer, sidebars, etc.
+        for element in container.select('nav, footer, header, .sidebar, .navigation, .menu, .comments, script, style'):
+            if element:
+                element.decompose()
+
+        # Extract text
+        text = container.get_text(separator=' ', strip=True)
+        text = re.sub(r'\s+', ' ', text).strip()
+
+        if text:
+            item = {
+                "url": page_url,
+                "title": title_text,
+                "text": text,
+                "source": "Ennead Website",
+                "timestamp": datetime.now().isoformat()
+            }
+            page_content.append(item)
+
+    return page_content
+
+
+def content_hash(text: str) -> str:
+    """Hash of a page body, used to tell whether the page changed."""
+    return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class PolitenessGate:
+    """Spaces request starts at least `delay` seconds apart across all workers."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.delay <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CrawlManifest:
+    """What the last crawl saw per URL, stored as one JSON file.
+
+    Entry: {"hash", "etag", "last_modified", "items", "links", "fetched_at"}
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.pages: Dict[str, Dict] = {}
+
+    def load(self) -> "CrawlManifest":
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.pages = json.load(f).get("pages", {})
+            except Exception as e:
+                logger.error(f"Error loading crawl manifest: {e}")
+                self.pages = {}
+        return self
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        temp_path = str(self.path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"pages": self.pages, "last_updated": datetime.now().isoformat()}, f)
+        os.replace(temp_path, self.path)
+
+
+@dataclass
+class CrawlResult:
+    """Pages of one crawl, split by what happened to them since the last one."""
+
+    content: List[Dict] = field(default_factory=list)
+    changed_urls: List[str] = field(default_factory=list)
+    unchanged_urls: List[str] = field(default_factory=list)
+    failed_urls: List[str] = field(default_factory=list)
+    removed_urls: List[str] = field(default_factory=list)
+    skipped_urls: List[str] = field(default_factory=list)
+    requests_made: int = 0
+
+    @property
+    def pages_visited(self) -> int:
+        return len(self.changed_urls) + len(self.unchanged_urls) + len(self.failed_urls)
+
+
+class WebsiteCrawler:
+    """Crawls a site with a bounded pool, reusing the manifest for unchanged pages.
+
+    Args:
+        base_url (str): Only links under this URL are followed.
+        start_urls (list): Depth 0 pages.
+        max_workers (int): Pages fetched at the same time.
+        delay (float): Minimum seconds between two request starts.
+        manifest_path (str): JSON manifest file, None to keep it in memory only.
+        session (requests.Session): Shared HTTP session, one is created if None.
+    """
+
+    def __init__(self, base_url=constants.BASE_URL, start_urls=None,
+                 max_pages=constants.MAX_PAGES, max_depth=constants.MAX_DEPTH,
+                 max_workers=constants.CRAWL_MAX_WORKERS, delay=constants.CRAWL_DELAY,
+                 manifest_path=None, session=None, timeout=constants.REQUEST_TIMEOUT):
+        self.base_url = base_url
+        self.start_urls = list(start_urls) if start_urls else [base_url]
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.gate = PolitenessGate(delay)
+        self.manifest = CrawlManifest(manifest_path).load()
+        self.session = session or requests.Session()
+
+    def _fetch(self, url: str, previous: Optional[Dict]):
+        """Conditional GET. Returns (status, text, etag, last_modified)."""
+        headers = {}
+        if previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        self.gate.wait()
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        return (response.status_code, response.text if response.status_code == 200 else "",
+                response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def _visit(self, url: str):
+        """Fetch one page. Returns (state, entry) with state changed/unchanged/failed/removed."""
+        previous = self.manifest.pages.get(url)
+        try:
+            status, text, etag, last_modified = self._fetch(url, previous)
+        except Exception as e:
+            logger.error(f"Error parsing {url}: {e}")
+            # keep what we had, a network hiccup is not a removed page
+            return ("failed", previous)
+
+        if status == 304 and previous:
+            return ("unchanged", previous)
+        if status in (404, 410):
+            logger.warning(f"Page gone ({status}): {url}")
+            return ("removed", None)
+        if status != 200:
+            logger.warning(f"Error status {status} for {url}")
+            # a 503 or 429 is not a removed page, keep its content and links
+            return ("failed", previous)
+
+        page_hash = content_hash(text)
+        if previous and previous.get("hash") == page_hash:
+            entry = dict(previous, etag=etag, last_modified=last_modified)
+            return ("unchanged", entry)
+
+        # Parse HTML
+        soup = BeautifulSoup(text, 'html.parser')
+        items = extract_content(soup, url)
+
+        # Extract links for further crawling
+        links = []
+        for link in soup.find_all('a', href=True):
+            abs_url = normalize_url(link['href'], self.base_url)
+            if should_follow_link(abs_url, self.base_url) and abs_url not in links:
+                links.append(abs_url)
+        entry = {
+            "hash": page_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": items,
+            "links": links,
+            "fetched_at": datetime.now().isoformat(),
+        }
+        return ("changed", entry)
+
+    def crawl(self) -> CrawlResult:
+        """Crawl from the start URLs and update the manifest."""
+        result = CrawlResult()
+        seen = set()
+        frontier = []
+        for url in self.start_urls:
+            if url not in seen:
+                seen.add(url)
+                frontier.append(url)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            depth = 0
+            while frontier:
+                room = self.max_pages - result.pages_visited
+                batch, overflow = frontier[:max(room, 0)], frontier[max(room, 0):]
+                result.skipped_urls.extend(overflow)
+                for url in batch:
+                    logger.info(f"Parsing page {len(seen)}: {url} (depth {depth})")
+                pages = list(executor.map(self._visit, batch))
+                result.requests_made += len(batch)
+
+                next_frontier = []
+                for url, (state, entry) in zip(batch, pages):
+                    getattr(result, f"{state}_urls").append(url)
+                    if entry is None:
+                        self.manifest.pages.pop(url, None)
+                        continue
+                    self.manifest.pages[url] = entry
+                    result.content.extend(entry.get("items", []))
+                    for link in entry.get("links", []):
+                        if link in seen:
+                            continue
+                        seen.add(link)
+                        if depth + 1 > self.max_depth:
+                            result.skipped_urls.append(link)
+                        else:
+                            next_frontier.append(link)
+                frontier = next_frontier
+                depth += 1
+
+        # pages we knew that no crawled page links to anymore
+        reached = set(result.changed_urls) | set(result.unchanged_urls) | set(result.failed_urls)
+        reached.update(result.skipped_urls)
+        for url in list(self.manifest.pages):
+            if url not in reached:
+                result.removed_urls.append(url)
+                del self.manifest.pages[url]
+
+        try:
+            self.manifest.save()
+        except Exception as e:
+            logger.error(f"Error saving crawl manifest: {e}")
+
+        logger.info(f"Crawl complete: {len(result.changed_urls)} changed, {len(result.unchanged_urls)} unchanged, "
+                    f"{len(result.failed_urls)} failed, {len(result.removed_urls)} removed")
+        return result
@@ -0,0 +1,181 @@
+"""
+Knowledge store for EnneadTabAgent
+
+This module handles:
+- Persisting document chunks and their embeddings in one SQLite file
+- Caching embeddings by chunk hash so unchanged text is never re-embedded
+
+The FAISS index is rebuilt in memory from the stored vectors on load,
+which needs no embedding calls. A knowledge base update only writes the
+chunks that were added or removed, instead of pickling the whole index.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    try:
+        from langchain.embeddings.base import Embeddings
+    except ImportError:
+        Embeddings = object
+
+logger = logging.getLogger("EnneadTabAgent.knowledge_store")
+
+
+def chunk_hash(text: str) -> str:
+    """Embedding cache key, the same text embeds the same wherever it appears."""
+    return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+def chunk_id(text: str, metadata: Optional[Dict] = None) -> str:
+    """Stable id of a chunk in the index, text plus the page it came from."""
+    metadata = metadata or {}
+    key = "\0".join((metadata.get("url", ""), metadata.get("title", ""), text))
+    return hashlib.sha1(key.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    # FAISS works in float32, storing more precision buys nothing
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class KnowledgeStore:
+    """Chunks and cached embeddings in a SQLite file.
+
+    Tables:
+        embeddings(hash, vector)                  vector per chunk text
+        chunks(id, hash, url, text, metadata)     what is in the index
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, vector BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY, hash TEXT NOT NULL, url TEXT NOT NULL,
+                text TEXT NOT NULL, metadata TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS chunks_url ON chunks (url);
+        """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- embedding cache ----
+
+    def get_vectors(self, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        hashes = list(set(hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                part = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embeddings WHERE hash IN ({})".format(",".join("?" * len(part))), part)
+                for key, blob in rows:
+                    found[key] = _unpack(blob)
+        return found
+
+    def put_vectors(self, vectors: Dict[str, List[float]]) -> None:
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (hash, vector) VALUES (?, ?)",
+                                   [(key, _pack(vector)) for key, vector in vectors.items()])
+            self._conn.commit()
+
+    def embedding_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def prune_embeddings(self) -> int:
+        """Drop cached vectors no chunk uses anymore. Returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM embeddings WHERE hash NOT IN (SELECT hash FROM chunks)")
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ---- chunks ----
+
+    def chunk_ids_for_urls(self, urls: Iterable[str]) -> Dict[str, str]:
+        """{chunk id: url} of every stored chunk from these pages."""
+        urls = list(set(urls))
+        found = {}
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                part = urls[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT id, url FROM chunks WHERE url IN ({})".format(",".join("?" * len(part))), part)
+                found.update(rows)
+        return found
+
+    def chunk_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def apply_changes(self, added: List[Tuple[str, str, str, Dict]], removed_ids: Iterable[str]) -> None:
+        """Add (id, text, url, metadata) chunks and remove ids in one transaction."""
+        removed_ids = list(removed_ids)
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(x,) for x in removed_ids])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO chunks (id, hash, url, text, metadata) VALUES (?, ?, ?, ?, ?)",
+                    [(cid, chunk_hash(text), url, text, json.dumps(metadata)) for cid, text, url, metadata in added])
+
+    def load_chunks(self) -> List[Tuple[str, str, Dict, List[float]]]:
+        """Every chunk with its vector, as (id, text, metadata, vector)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunks.id, chunks.text, chunks.metadata, embeddings.vector "
+                "FROM chunks JOIN embeddings ON chunks.hash = embeddings.hash ORDER BY chunks.rowid").fetchall()
+        return [(cid, text, json.loads(metadata), _unpack(blob)) for cid, text, metadata, blob in rows]
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends texts it has not seen before.
+
+    Args:
+        embeddings: Any object with embed_documents and embed_query.
+        store (KnowledgeStore): Where the vectors are cached.
+    """
+
+    def __init__(self, embeddings, store: KnowledgeStore):
+        self.embeddings = embeddings
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [chunk_hash(text) for text in texts]
+        vectors = self.store.get_vectors(hashes)
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), new_vectors))
+            self.store.put_vectors(computed)
+            vectors.update(computed)
+        return [vectors[key] for key in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # queries are one-off, caching them would only grow the file
+        return self.embeddings.embed_query(text)
+
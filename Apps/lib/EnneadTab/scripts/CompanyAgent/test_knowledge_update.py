@@ -0,0 +1,321 @@
+"""
+Tests and timing harness for the incremental knowledge base update.
+
+Serves a generated static site from a temp folder on localhost and uses a
+deterministic fake embedding function, so nothing leaves the machine:
+
+    cd Apps/lib/EnneadTab/scripts
+    python -m CompanyAgent.test_knowledge_update
+
+unit_test() checks that a second crawl skips unchanged pages, that edits
+and removed pages are picked up, and that only new chunks get embedded.
+benchmark() times the old sequential crawl with a full re-embed against
+the concurrent crawler with the embedding cache.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from bs4 import BeautifulSoup
+
+from . import constants, crawler
+from .content_manager import ContentManager
+from .vector_store import VectorStore
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings from a hash of the text, with an optional cost per text."""
+
+    def __init__(self, dimensions=16, cost_per_text=0.0):
+        self.dimensions = dimensions
+        self.cost_per_text = cost_per_text
+        self.embedded = 0
+
+    def _vector(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [(digest[i % len(digest)] - 128) / 128.0 for i in range(self.dimensions)]
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        if self.cost_per_text:
+            time.sleep(self.cost_per_text * len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def _page_text(index, revision=0):
+    sentences = ["Project {} revision {} paragraph {} describes a building, its site and its program.".format(
+        index, revision, k) for k in range(40)]
+    return " ".join(sentences)
+
+
+def write_site(folder, page_count, links_per_page=3, revisions=None, removed=()):
+    """Static site: index.html links to page_0..page_(n-1), pages link onward."""
+    revisions = revisions or {}
+    pages = [i for i in range(page_count) if i not in removed]
+    links = "".join('<a href="/page_{0}.html">Page {0}</a>'.format(i) for i in pages[:links_per_page])
+    with open(os.path.join(folder, "index.html"), "w") as f:
+        f.write("<html><head><title>Home</title></head><body><nav>{}</nav>"
+                "<main><p>Welcome to the studio.</p>{}</main></body></html>".format(links, links))
+    for position, i in enumerate(pages):
+        onward = pages[position + 1:position + 1 + links_per_page]
+        page_links = "".join('<a href="/page_{0}.html">Next {0}</a>'.format(k) for k in onward)
+        with open(os.path.join(folder, "page_{}.html".format(i)), "w") as f:
+            f.write("<html><head><title>Page {}</title></head><body><main><p>{}</p></main>"
+                    "<div>{}</div></body></html>".format(i, _page_text(i, revisions.get(i, 0)), page_links))
+    for i in removed:
+        path = os.path.join(folder, "page_{}.html".format(i))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def touch_later(folder, seconds):
+    """Move every file's mtime forward, Last-Modified has one second resolution."""
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        stamp = os.path.getmtime(path) + seconds
+        os.utime(path, (stamp, stamp))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+    # {path: status} answered instead of the file
+    failing = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.path in self.failing:
+            self.send_error(self.failing[self.path])
+            return
+        super().do_GET()
+
+
+def serve_folder(folder, latency=0.0):
+    """Serve a folder on a free localhost port. Returns (server, base_url)."""
+    handler = type("Handler", (_QuietHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=folder))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, "http://127.0.0.1:{}".format(server.server_address[1])
+
+
+def make_content_manager(base_url, data_folder, embeddings):
+    store = VectorStore(embeddings=embeddings, store_path=os.path.join(data_folder, "knowledge.sqlite"))
+    manager = ContentManager(store)
+    manager.base_url = base_url
+    manager.urls_to_visit = [base_url + "/index.html"]
+    manager.max_depth = 50
+    manager.content_cache_path = os.path.join(data_folder, "content.json")
+    manager.manifest_path = os.path.join(data_folder, "manifest.json")
+    return manager
+
+
+def unit_test():
+    site = tempfile.mkdtemp()
+    data = tempfile.mkdtemp()
+    server = None
+    try:
+        write_site(site, 8)
+        server, base_url = serve_folder(site)
+        manifest = os.path.join(data, "crawl_manifest.json")
+
+        def crawl():
+            return crawler.WebsiteCrawler(base_url, [base_url + "/index.html"], max_depth=50,
+                                          max_workers=3, delay=0.0, manifest_path=manifest).crawl()
+
+        first = crawl()
+        assert len(first.changed_urls) == 9 and not first.unchanged_urls and not first.failed_urls
+        assert len(first.content) == 9
+
+        # conditional GET answers 304 for every page
+        second = crawl()
+        assert not second.changed_urls and len(second.unchanged_urls) == 9
+        assert [x["text"] for x in second.content] == [x["text"] for x in first.content]
+
+        # a newer mtime but the same bytes: 200, recognised by its hash
+        touch_later(site, 5)
+        third = crawl()
+        assert not third.changed_urls and len(third.unchanged_urls) == 9
+
+        # an edit and a removed page
+        write_site(site, 8, revisions={2: 1}, removed=(5,))
+        touch_later(site, 10)
+        fourth = crawl()
+        assert base_url + "/page_2.html" in fourth.changed_urls
+        assert fourth.removed_urls == [base_url + "/page_5.html"]
+        assert len(fourth.content) == 8
+
+        # a server error on the home page keeps it and everything behind it
+        _QuietHandler.failing = {"/index.html": 503}
+        fifth = crawl()
+        assert fifth.failed_urls == [base_url + "/index.html"] and not fifth.removed_urls
+        assert len(fifth.unchanged_urls) == 7 and len(fifth.content) == 8
+        # only a page that is gone is removed
+        _QuietHandler.failing = {"/page_3.html": 410}
+        sixth = crawl()
+        assert sixth.removed_urls == [base_url + "/page_3.html"] and not sixth.failed_urls
+        _QuietHandler.failing = {}
+
+        # knowledge base: only new chunks are embedded, removed pages drop out
+        shutil.rmtree(site)
+        os.mkdir(site)
+        write_site(site, 8)
+        touch_later(site, 20)
+        embeddings = FakeEmbeddings()
+        manager = make_content_manager(base_url, data, embeddings)
+        assert manager.update_knowledge_base(force_update=True)
+        store = manager.vector_store.store
+        chunk_count = store.chunk_count()
+        assert embeddings.embedded == chunk_count > 9
+
+        embeddings.embedded = 0
+        assert manager.update_knowledge_base(force_update=True)
+        assert embeddings.embedded == 0 and store.chunk_count() == chunk_count
+
+        write_site(site, 8, revisions={2: 1}, removed=(5,))
+        touch_later(site, 30)
+        assert manager.update_knowledge_base(force_update=True)
+        assert manager.crawl_details["pages_changed"] == 3  # index, page_2 and page_4 whose links changed
+        page_2 = [x for x in manager.content if x["url"].endswith("/page_2.html")][0]
+        chunks_page_2 = manager.vector_store.process_text([page_2["text"]])
+        assert embeddings.embedded == len(chunks_page_2)
+        urls = set(doc.metadata["url"] for doc in manager.vector_store.vector_store.docstore._dict.values())
+        assert base_url + "/page_5.html" not in urls
+        assert len(manager.vector_store.vector_store.index_to_docstore_id) == store.chunk_count()
+
+        # a new session rebuilds the index from the store without embedding
+        embeddings.embedded = 0
+        reloaded = VectorStore(embeddings=embeddings, store_path=manager.vector_store.store_path)
+        assert reloaded.load_vector_store() and embeddings.embedded == 0
+        # fake vectors are hashes, only the exact chunk text finds itself
+        hits = reloaded.search(chunks_page_2[-1].page_content, k=1)
+        assert hits and hits[0].metadata["url"] == page_2["url"]
+        reloaded.store.close()
+
+        # an update that changes nothing keeps the store fresh, though the file is old
+        ten_days_ago = time.time() - 10 * 86400
+        os.utime(store.path, (ten_days_ago, ten_days_ago))
+        assert manager.update_knowledge_base(force_update=True)
+        assert os.path.getmtime(store.path) < time.time() - 9 * 86400
+        fresh = VectorStore(embeddings=embeddings, store_path=manager.vector_store.store_path)
+        assert fresh.load_vector_store()
+        fresh.store.close()
+        store.close()
+        print("knowledge update: OK")
+    finally:
+        _QuietHandler.failing = {}
+        if server:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(site, ignore_errors=True)
+        shutil.rmtree(data, ignore_errors=True)
+
+
+def _legacy_crawl(base_url, start_urls, max_pages=500, max_depth=50):
+    """The old ContentManager.parse_website: recursive, one blocking GET at a time."""
+    visited, skipped, content = set(), set(), []
+
+    def parse_page(url, depth=0):
+        if url in visited or url in skipped:
+            return
+        if len(visited) >= max_pages or depth > max_depth:
+            skipped.add(url)
+            return
+        visited.add(url)
+        response = requests.get(url, timeout=10)
+        if response.status_code != 200:
+            return
+        soup = BeautifulSoup(response.text, 'html.parser')
+        content.extend(crawler.extract_content(soup, url))
+        for link in soup.find_all('a', href=True):
+            abs_url = crawler.normalize_url(link['href'], base_url)
+            if crawler.should_follow_link(abs_url, base_url):
+                parse_page(abs_url, depth + 1)
+
+    for start_url in start_urls:
+        parse_page(start_url)
+    return content
+
+
+def benchmark(page_count=120, links_per_page=12, latency=0.15, cost_per_text=0.002):
+    """Two knowledge base updates of an unchanged site, old path against new.
+
+    latency is the server time per page and cost_per_text the embedding API
+    time per chunk, both stand-ins for the real site and OpenAI.
+    """
+    site = tempfile.mkdtemp()
+    data = tempfile.mkdtemp()
+    server = None
+    results = {}
+    try:
+        write_site(site, page_count, links_per_page)
+        server, base_url = serve_folder(site, latency)
+        start_urls = [base_url + "/index.html"]
+
+        embeddings = FakeEmbeddings(cost_per_text=cost_per_text)
+        splitter = VectorStore(embeddings=embeddings, store_path=os.path.join(data, "unused.sqlite"))
+        t_start = time.time()
+        # depth first, the old crawl skips pages it first meets too deep,
+        # lift the depth limit so both crawls read every page
+        content = _legacy_crawl(base_url, start_urls, max_depth=page_count + 1)
+        results["legacy_crawl"] = time.time() - t_start
+        documents = splitter.process_text([x["text"] for x in content])
+        t_start = time.time()
+        embeddings.embed_documents([doc.page_content for doc in documents])
+        results["legacy_embed"] = time.time() - t_start
+
+        embeddings = FakeEmbeddings(cost_per_text=cost_per_text)
+        manager = make_content_manager(base_url, data, embeddings)
+        for run in ("first", "second"):
+            t_start = time.time()
+            manager.parse_website()
+            results[run + "_crawl"] = time.time() - t_start
+            t_start = time.time()
+            manager.process_to_vector_store()
+            results[run + "_embed"] = time.time() - t_start
+        manager.vector_store.store.close()
+        assert len(manager.content) == len(content)
+
+        # the politeness delay caps the request rate whatever the pool size
+        os.remove(manager.manifest_path)
+        manager.crawl_delay = 0.0
+        t_start = time.time()
+        manager.parse_website()
+        results["no_delay_crawl"] = time.time() - t_start
+
+        print("{} pages, {}s per page, {}s per embedded chunk, {} chunks".format(
+            page_count + 1, latency, cost_per_text, len(documents)))
+        print("  old crawl (sequential):           {:.2f}s".format(results["legacy_crawl"]))
+        print("  old embed (every chunk):          {:.2f}s".format(results["legacy_embed"]))
+        print("  new crawl, first run:             {:.2f}s ({} workers, {}s delay)".format(
+            results["first_crawl"], constants.CRAWL_MAX_WORKERS, constants.CRAWL_DELAY))
+        print("  new crawl, first run, no delay:   {:.2f}s".format(results["no_delay_crawl"]))
+        print("  new embed + store, first run:     {:.2f}s".format(results["first_embed"]))
+        print("  new crawl, nothing changed:       {:.2f}s".format(results["second_crawl"]))
+        print("  new embed + store, unchanged:     {:.2f}s".format(results["second_embed"]))
+        return results
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(site, ignore_errors=True)
+        shutil.rmtree(data, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()
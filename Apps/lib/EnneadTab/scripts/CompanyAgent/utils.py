@@ -189,12 +189,38 @@ def open_url(url):
     import webbrowser
     webbrowser.open(url)
     
+def get_vector_store_stats_path(store_path=None):
+    """Stats file written next to the knowledge store on every update."""
+    store_path = store_path or get_storage_path(constants.KNOWLEDGE_STORE_FILE)
+    return os.path.splitext(str(store_path))[0] + "_stats.json"
+
+def get_vector_store_updated_time(store_path=None):
+    """When the knowledge base was last brought up to date, None if it does not exist.
+
+    An update that finds nothing new never writes to the store file, so
+    its mtime says nothing, the stats file has the time of the last update.
+    """
+    store_path = store_path or get_storage_path(constants.KNOWLEDGE_STORE_FILE)
+    if not os.path.exists(store_path):
+        return None
+    try:
+        with open(get_vector_store_stats_path(store_path), "r") as f:
+            return datetime.fromisoformat(json.load(f)["last_updated"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # no stats yet, the store file is the best we have
+        return datetime.fromtimestamp(os.path.getmtime(store_path))
+
 def get_vector_store_age():
     """Get age of vector store in days."""
     try:
-        vector_store_path = get_storage_path("ennead_knowledge.pkl")
-        if not os.path.exists(vector_store_path):
+        updated = get_vector_store_updated_time()
+        if updated is None:
             return None
+        days = (datetime.now() - updated).days
+        return days
+    except Exception as e:
+        logger.error(f"Error getting vector store age: {e}")
+        return None
             
         mtime = datetime.fromtimestamp(os.path.getmtime(vector_store_path))
         days = (datetime.now() - mtime).days
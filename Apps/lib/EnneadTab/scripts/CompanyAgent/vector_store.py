@@ -5,32 +5,46 @@ This module handles:
 - Creating and updating the FAISS vector store
 - Text chunking and embedding
 - Vector search functionality
+
+Chunks and their embeddings are kept in a KnowledgeStore (SQLite). The
+FAISS index is rebuilt from it on load without calling the embedding API,
+and updates only embed and write the chunks that changed.
 """
 
 import os
 import sys
 import json
 import logging
-import pickle
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # For vector database
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+try:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+except ImportError:  # newer langchain moved the splitters to their own package
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 
 # Import local modules
 from . import utils
 from . import constants
+from .knowledge_store import KnowledgeStore, CachedEmbeddings, chunk_id
 
 class VectorStore:
-    def __init__(self):
-        """Initialize the vector store component."""
+    def __init__(self, embeddings=None, store_path=None):
+        """Initialize the vector store component.
+
+        Args:
+            embeddings: Embedding function to use instead of OpenAIEmbeddings.
+            store_path: KnowledgeStore file, defaults to the app data folder.
+        """
         self.logger = logging.getLogger("EnneadTabAgent.vector_store")
         self.vector_store = None
-        self.vector_store_path = utils.get_storage_path("ennead_knowledge.pkl")
-        self.metadata_path = utils.get_storage_path("ennead_knowledge_stats.json")
+        self.store_path = store_path or utils.get_storage_path(constants.KNOWLEDGE_STORE_FILE)
+        self.metadata_path = utils.get_vector_store_stats_path(self.store_path)
+        self.store = None
+        self.base_embeddings = embeddings
         self.embeddings = None
         self.last_updated = None
         
@@ -49,18 +63,23 @@ class VectorStore:
             self.logger.error(f"Error initializing vector store: {e}")
             return False
 
+    def _get_store(self):
+        if self.store is None:
+            self.store = KnowledgeStore(self.store_path)
+        return self.store
+
     def load_vector_store(self):
-        """Load the vector store from disk if it exists and is not too old."""
+        """Rebuild the index from the knowledge store if it exists and is not too old."""
         try:
-            if not os.path.exists(self.vector_store_path):
-                self.logger.info(f"Vector store file not found at {self.vector_store_path}")
+            if not os.path.exists(self.store_path):
+                self.logger.info(f"Knowledge store not found at {self.store_path}")
                 return False
                 
-            # Check age of vector store
-            file_time = datetime.fromtimestamp(os.path.getmtime(self.vector_store_path))
+            # Check age of vector store, by its last update rather than the file
+            updated = utils.get_vector_store_updated_time(self.store_path)
             max_age = constants.VECTOR_STORE_MAX_AGE_DAYS
             
-            if datetime.now() - file_time > timedelta(days=max_age):
+            if datetime.now() - updated > timedelta(days=max_age):
                 self.logger.info(f"Vector store is older than {max_age} days, will create a new one")
                 return False
                 
@@ -68,8 +87,11 @@ class VectorStore:
             if not self.initialize_embeddings():
                 return False
                 
-            with open(self.vector_store_path, "rb") as f:
-                self.vector_store = pickle.load(f)
+            chunks = self._get_store().load_chunks()
+            if not chunks:
+                self.logger.info("Knowledge store is empty")
+                return False
+            self.vector_store = self._build_index(chunks)
                 
             # Load metadata
             if os.path.exists(self.metadata_path):
@@ -78,7 +100,7 @@ class VectorStore:
                     if "last_updated" in metadata:
                         self.last_updated = datetime.fromisoformat(metadata["last_updated"])
                         
-            self.logger.info(f"Successfully loaded vector store from {self.vector_store_path}")
+            self.logger.info(f"Loaded {len(chunks)} chunks from {self.store_path}")
             return True
             
         except Exception as e:
@@ -86,44 +108,84 @@ class VectorStore:
             return False
             
     def initialize_embeddings(self):
-        """Initialize the OpenAI embeddings with API key."""
+        """Initialize the embeddings, OpenAI with API key unless one was given, behind the cache."""
         try:
-            api_key = utils.get_openai_api_key()
-            if not api_key:
-                self.logger.error("Failed to get API key for embeddings")
-                return False
+            if self.embeddings is not None:
+                return True
+            base = self.base_embeddings
+            if base is None:
+                api_key = utils.get_openai_api_key()
+                if not api_key:
+                    self.logger.error("Failed to get API key for embeddings")
+                    return False
+                base = OpenAIEmbeddings(openai_api_key=api_key)
                 
-            self.embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+            self.embeddings = CachedEmbeddings(base, self._get_store())
             return True
         except Exception as e:
             self.logger.error(f"Error initializing embeddings: {e}")
             return False
+
+    def _build_index(self, chunks):
+        """FAISS index from stored (id, text, metadata, vector) rows."""
+        return FAISS.from_embeddings(
+            [(text, vector) for _, text, _, vector in chunks],
+            self.embeddings,
+            metadatas=[metadata for _, _, metadata, _ in chunks],
+            ids=[cid for cid, _, _, _ in chunks],
+        )
             
     def create_vector_store(self, documents):
         """Create a new vector store from documents."""
+        return self.update_vector_store(documents)
+            
+    def update_vector_store(self, new_documents, removed_urls=None):
+        """Bring the store up to date with new documents.
+
+        Documents are compared by chunk id. For every page (metadata url)
+        in new_documents, chunks of that page that are no longer present
+        are removed. Chunks already stored are left alone and only new text
+        is sent for embedding.
+
+        Args:
+            new_documents (list): langchain Documents
+            removed_urls (list): Pages whose chunks should all be removed
+        """
         try:
             if not self.initialize_embeddings():
                 return False
-                
-            # Create new vector store
-            self.vector_store = FAISS.from_documents(documents, self.embeddings)
-            
-            # Save to disk
-            self.save_vector_store()
-            return True
-        except Exception as e:
-            self.logger.error(f"Error creating vector store: {e}")
-            return False
-            
-    def update_vector_store(self, new_documents):
-        """Update existing vector store with new documents."""
-        try:
-            if not self.vector_store:
-                return self.create_vector_store(new_documents)
-                
-            # Add new documents to existing vector store
-            if new_documents:
-                self.vector_store.add_documents(new_documents)
+            store = self._get_store()
+
+            incoming = {}
+            for doc in new_documents or []:
+                incoming.setdefault(chunk_id(doc.page_content, doc.metadata), doc)
+            page_urls = set(doc.metadata.get("url", "") for doc in incoming.values())
+            removed_urls = set(removed_urls or [])
+            existing = store.chunk_ids_for_urls(page_urls | removed_urls)
+
+            stale = [cid for cid, url in existing.items() if url in removed_urls or cid not in incoming]
+            added = [cid for cid in incoming if cid not in existing]
+            texts = [incoming[cid].page_content for cid in added]
+            vectors = self.embeddings.embed_documents(texts) if texts else []
+            store.apply_changes(
+                [(cid, incoming[cid].page_content, incoming[cid].metadata.get("url", ""), incoming[cid].metadata)
+                 for cid in added],
+                stale)
+
+            if self.vector_store is None:
+                chunks = store.load_chunks()
+                self.vector_store = self._build_index(chunks) if chunks else None
+            else:
+                if stale:
+                    self.vector_store.delete(stale)
+                if added:
+                    self.vector_store.add_embeddings(
+                        list(zip(texts, vectors)),
+                        metadatas=[incoming[cid].metadata for cid in added],
+                        ids=added,
+                    )
+            self.logger.info(f"Vector store update: {len(added)} chunks added, {len(stale)} removed, "
+                             f"{self.embeddings.misses} embedded, {self.embeddings.hits} from cache")
                 
             # Save to disk
             self.save_vector_store()
@@ -133,23 +195,19 @@ class VectorStore:
             return False
             
     def save_vector_store(self):
-        """Save vector store to disk with metadata."""
+        """Save metadata, the chunks are written to the knowledge store as they change."""
         try:
-            # Save vector store
-            with open(self.vector_store_path, "wb") as f:
-                pickle.dump(self.vector_store, f)
-                
             # Update and save metadata
             self.last_updated = datetime.now()
             metadata = {
                 "last_updated": self.last_updated.isoformat(),
-                "document_count": len(self.vector_store.index_to_docstore_id) if self.vector_store else 0
+                "document_count": self._get_store().chunk_count()
             }
             
             with open(self.metadata_path, "w") as f:
                 json.dump(metadata, f, indent=2)
                 
-            self.logger.info(f"Successfully saved vector store to {self.vector_store_path}")
+            self.logger.info(f"Successfully saved vector store to {self.store_path}")
             return True
         except Exception as e:
             self.logger.error(f"Error saving vector store: {e}")
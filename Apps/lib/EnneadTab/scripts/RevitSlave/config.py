@@ -18,6 +18,9 @@ class Config:
     max_workers: int = 4
     log_level: str = "INFO"
     task_interval: int = 3600  # seconds
+    execution_mode: str = "thread"  # "thread" or "process"
+    task_timeout: Optional[float] = None  # seconds per attempt
+    task_retries: int = 0
     
     @classmethod
     def from_file(cls, config_path: Path) -> 'Config':
@@ -32,7 +35,10 @@ class Config:
             data_file=Path(data.get('data_file', "DOC_OPENER_DATA.sexyDuck")),
             max_workers=data.get('max_workers', 4),
             log_level=data.get('log_level', "INFO"),
-            task_interval=data.get('task_interval', 3600)
+            task_interval=data.get('task_interval', 3600),
+            execution_mode=data.get('execution_mode', "thread"),
+            task_timeout=data.get('task_timeout'),
+            task_retries=data.get('task_retries', 0)
         )
     
     def save(self, config_path: Path) -> None:
@@ -49,12 +49,15 @@ def main():
 
     # Set up version control and task manager
     version_control = VersionControl(data_file)
-    task_manager = TaskManager(version_control, max_workers=config.max_workers)
+    task_manager = TaskManager(version_control, max_workers=config.max_workers,
+                               mode=config.execution_mode, task_timeout=config.task_timeout,
+                               retries=config.task_retries)
 
     # Register and run the sample print_title task
     task_manager.register_task("print_title", print_title_task)
     results = task_manager.execute_tasks_batch("print_title", models)
     logger.info(f"Task results: {results}")
+    task_manager.shutdown()
 
     # Schedule weekly rerun
     schedule_weekly_run(Path(__file__).absolute())
@@ -2,6 +2,15 @@
 Task manager module for RevitSlave.
 
 This module handles the execution and scheduling of Revit automation tasks.
+
+Batches run either on a thread pool (default) or on a process pool, where
+each task runs in its own interpreter so a crashing or hanging model cannot
+take the manager down with it. Every task gets a timeout and a number of
+retries. A thread cannot be stopped, so in thread mode a timed out task is
+not retried: the retry would open the same model while the first attempt
+still runs. In process mode a timed out task is retried once its stuck
+worker has been terminated. Version control updates are applied by the
+manager as results come in and written out once at the end of the batch.
 """
 
 from typing import Dict, List, Optional, Callable
@@ -9,61 +18,252 @@ from pathlib import Path
 import json
 from datetime import datetime
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import os
+import signal
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor, wait, FIRST_COMPLETED
+import multiprocessing
 
 from .models import RevitModel, RevitProject
 from .version_control import VersionControl
 
 
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+
+
+@dataclass
+class TaskResult:
+    """Outcome and metrics of one task on one model."""
+
+    model_guid: str
+    success: bool = False
+    attempts: int = 0
+    duration: float = 0.0
+    error: str = ""
+    timed_out: bool = False
+
+
+def _run_task(task_func: Callable, model: RevitModel, kwargs: Dict):
+    """
+    Run one task attempt. Module level so a process pool can pickle it.
+
+    Returns:
+        tuple: (success, duration in seconds, error message)
+    """
+    start = time.time()
+    try:
+        return bool(task_func(model, **kwargs)), time.time() - start, ""
+    except Exception as e:
+        return False, time.time() - start, str(e)
+
+
+def _register_worker(worker_pids) -> None:
+    """Process pool initializer, reports the worker so a stuck pool can be torn down."""
+    worker_pids.put(os.getpid())
+
+
 class TaskManager:
     """Manages and executes Revit automation tasks."""
-    
-    def __init__(self, version_control: VersionControl, max_workers: int = 4):
-        """Initialize task manager with version control and worker count."""
+
+    def __init__(self, version_control: VersionControl, max_workers: int = 4,
+                 mode: str = MODE_THREAD, task_timeout: Optional[float] = None, retries: int = 0):
+        """
+        Initialize task manager with version control and worker count.
+
+        Args:
+            version_control (VersionControl): Store updated after each successful task.
+            max_workers (int): Tasks running at the same time.
+            mode (str): "thread" or "process". Process mode needs task functions
+                defined at module level so they can be pickled.
+            task_timeout (float, optional): Seconds one attempt may run.
+            retries (int): Extra attempts after a failure or error, and after a
+                timeout in process mode.
+        """
         self.version_control = version_control
         self.max_workers = max_workers
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.mode = mode
+        self.task_timeout = task_timeout
+        self.retries = retries
+        self._executor = None
+        self._worker_pids = {}  # process pool -> queue of its worker pids
         self._tasks: Dict[str, Callable] = {}
         self._logger = logging.getLogger(__name__)
-    
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == MODE_PROCESS:
+                worker_pids = multiprocessing.SimpleQueue()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_register_worker,
+                                                     initargs=(worker_pids,))
+                self._worker_pids[self._executor] = worker_pids
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _retire_executor(self):
+        """Stop submitting to the current pool, a worker of it is stuck on a timed out task."""
+        executor, self._executor = self._executor, None
+        return executor
+
+    def _discard_executor(self, executor) -> None:
+        """Shut down a retired pool without waiting for its stuck workers."""
+        worker_pids = self._worker_pids.pop(executor, None)
+        if worker_pids is not None:
+            # no public API stops a busy worker, end the processes the pool reported
+            while not worker_pids.empty():
+                try:
+                    os.kill(worker_pids.get(), signal.SIGTERM)
+                except OSError:
+                    pass  # already gone
+        executor.shutdown(wait=False)
+
     def register_task(self, task_id: str, task_func: Callable) -> None:
         """Register a new task function."""
         self._tasks[task_id] = task_func
-    
+
     def execute_task(self, task_id: str, model: RevitModel, **kwargs) -> bool:
         """Execute a task on a specific model."""
         task_func = self._tasks.get(task_id)
         if not task_func:
             self._logger.error(f"Task {task_id} not found")
             return False
-            
-        try:
-            result = task_func(model, **kwargs)
-            if result:
+
+        success, duration, error = _run_task(task_func, model, kwargs)
+        if error:
+            self._logger.error(f"Error executing task {task_id}: {error}")
+        if success:
+            self.version_control.update_model(model)
+        return success
+
+    def run_batch(self, task_id: str, models: List[RevitModel],
+                  progress: Optional[Callable[[TaskResult, int, int], None]] = None,
+                  **kwargs) -> Dict[str, TaskResult]:
+        """
+        Execute a task on multiple models in parallel with timeouts and retries.
+
+        At most max_workers tasks are in flight, so a task's timeout starts
+        when it is handed to a worker and not while it waits in a queue.
+
+        Args:
+            task_id (str): Registered task.
+            models (list): Models to run the task on.
+            progress (callable, optional): Called as progress(result, done, total)
+                each time a model finishes, after its last attempt.
+            **kwargs: Passed to the task function.
+
+        Returns:
+            dict: Model GUID to TaskResult.
+        """
+        task_func = self._tasks.get(task_id)
+        results = {model.model_guid: TaskResult(model.model_guid) for model in models}
+        if not task_func:
+            self._logger.error(f"Task {task_id} not found")
+            for result in results.values():
+                result.error = "task not registered"
+            return results
+
+        pending = list(models)
+        in_flight = {}
+        done_count = 0
+        total = len(models)
+        batch_start = time.time()
+        retired = []
+        stuck = {}  # retired process pool -> models whose timed out attempt still runs on it
+
+        def finish(model: RevitModel, result: TaskResult) -> None:
+            nonlocal done_count
+            done_count += 1
+            if result.success:
                 self.version_control.update_model(model)
-            return bool(result)
-        except Exception as e:
-            self._logger.error(f"Error executing task {task_id}: {str(e)}")
-            return False
-    
-    def execute_tasks_batch(self, task_id: str, models: List[RevitModel], **kwargs) -> Dict[str, bool]:
-        """Execute a task on multiple models in parallel. Logs errors and waits for all threads to finish."""
-        results = {}
-        futures = {
-            model.model_guid: self._executor.submit(self.execute_task, task_id, model, **kwargs)
-            for model in models
-        }
-        for guid, future in futures.items():
-            try:
-                result = future.result()
-                results[guid] = result
-                if not result:
-                    logging.error(f"Task '{task_id}' failed for model GUID: {guid}")
-            except Exception as e:
-                results[guid] = False
-                logging.error(f"Exception in task '{task_id}' for model GUID: {guid}: {e}")
+            else:
+                self._logger.error(f"Task '{task_id}' failed for model GUID: {model.model_guid} "
+                                   f"after {result.attempts} attempt(s): {result.error}")
+            self._logger.info(f"[{done_count}/{total}] {task_id} {model.model_guid} "
+                              f"{'OK' if result.success else 'FAILED'} in {result.duration:.2f}s")
+            if progress:
+                progress(result, done_count, total)
+
+        def retry_or_finish(model: RevitModel, result: TaskResult) -> None:
+            if not result.success and result.attempts <= self.retries:
+                pending.append(model)
+            else:
+                finish(model, result)
+
+        with self.version_control.batch():
+            while pending or in_flight:
+                while pending and len(in_flight) < self.max_workers:
+                    model = pending.pop(0)
+                    results[model.model_guid].attempts += 1
+                    executor = self._get_executor()
+                    future = executor.submit(_run_task, task_func, model, kwargs)
+                    in_flight[future] = (model, time.time(), executor)
+
+                wait_timeout = None
+                if self.task_timeout is not None:
+                    oldest = min(started for _, started, _ in in_flight.values())
+                    wait_timeout = max(0.0, oldest + self.task_timeout - time.time())
+                completed, _ = wait(list(in_flight), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+                for future in completed:
+                    model, started, executor = in_flight.pop(future)
+                    result = results[model.model_guid]
+                    try:
+                        success, duration, error = future.result()
+                    except BrokenExecutor as e:
+                        # a worker process died, the pool refuses new work
+                        if executor is self._executor:
+                            retired.append(self._retire_executor())
+                        success, duration, error = False, time.time() - started, f"worker crashed: {e}"
+                    except Exception as e:
+                        success, duration, error = False, time.time() - started, str(e)
+                    result.success, result.error, result.timed_out = success, error, False
+                    result.duration += duration
+                    retry_or_finish(model, result)
+
+                if self.task_timeout is not None:
+                    now = time.time()
+                    for future, (model, started, executor) in list(in_flight.items()):
+                        if now - started < self.task_timeout:
+                            continue
+                        future.cancel()
+                        del in_flight[future]
+                        if executor is self._executor:
+                            retired.append(self._retire_executor())
+                        result = results[model.model_guid]
+                        result.success, result.timed_out = False, True
+                        result.error = f"timed out after {self.task_timeout}s"
+                        result.duration += now - started
+                        if self.mode == MODE_PROCESS:
+                            # retried once the pool and its stuck worker are gone
+                            stuck.setdefault(executor, []).append(model)
+                        else:
+                            # the attempt keeps running in its thread, a retry
+                            # would be a second writer on the same model
+                            finish(model, result)
+
+                # a retired pool is torn down once none of our tasks still run on it
+                busy = set(executor for _, _, executor in in_flight.values())
+                for executor in [x for x in retired if x not in busy]:
+                    retired.remove(executor)
+                    self._discard_executor(executor)
+                    for model in stuck.pop(executor, []):
+                        retry_or_finish(model, results[model.model_guid])
+
+        succeeded = sum(1 for result in results.values() if result.success)
+        self._logger.info(f"Batch '{task_id}': {succeeded}/{total} succeeded in {time.time() - batch_start:.2f}s")
         return results
-    
+
+    def execute_tasks_batch(self, task_id: str, models: List[RevitModel], **kwargs) -> Dict[str, bool]:
+        """Execute a task on multiple models in parallel. Logs errors and waits for all workers to finish."""
+        results = self.run_batch(task_id, models, **kwargs)
+        return {guid: result.success for guid, result in results.items()}
+
     def shutdown(self) -> None:
-        """Shutdown the task manager and its thread pool."""
-        self._executor.shutdown(wait=True) 
\ No newline at end of file
+        """Shutdown the task manager and its worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._worker_pids.pop(self._executor, None)
+            self._executor = None
+        self.version_control.flush()
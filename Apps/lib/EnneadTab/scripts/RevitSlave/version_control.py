@@ -2,11 +2,20 @@
 Version control module for RevitSlave.
 
 This module handles version tracking and management for Revit models.
+
+Models are indexed by GUID so an update is a dict lookup instead of a
+scan of the project's model list. Changes are appended to a journal file
+next to the data file and the full snapshot is only rewritten on flush(),
+at the end of a batch() or once flush_interval seconds have passed. A
+journal left behind by a crash is replayed on the next load.
 """
 
 from typing import Dict, List, Optional
 from pathlib import Path
+from contextlib import contextmanager
 import json
+import os
+import time
 from datetime import datetime
 
 from .models import RevitModel, RevitProject
@@ -14,55 +23,138 @@ from .models import RevitModel, RevitProject
 
 class VersionControl:
     """Manages version control for Revit models."""
-    
-    def __init__(self, data_file: Path):
-        """Initialize version control with data file path."""
-        self.data_file = data_file
+
+    def __init__(self, data_file: Path, flush_interval: Optional[float] = 30.0):
+        """
+        Initialize version control with data file path.
+
+        Args:
+            data_file (Path): JSON snapshot of all projects.
+            flush_interval (float, optional): Seconds between snapshot rewrites
+                outside of a batch. 0 rewrites on every change, None only on
+                an explicit flush().
+        """
+        self.data_file = Path(data_file)
+        self.journal_file = self.data_file.with_name(self.data_file.name + ".journal")
+        self.flush_interval = flush_interval
         self._projects: Dict[str, RevitProject] = {}
+        # project guid -> model guid -> position in project.models
+        self._model_index: Dict[str, Dict[str, int]] = {}
+        self._dirty = False
+        self._batch_depth = 0
+        self._last_flush = time.time()
         self._load_data()
-    
+
     def _load_data(self) -> None:
-        """Load version data from file."""
-        if not self.data_file.exists():
-            return
-            
-        with open(self.data_file, 'r') as f:
-            data = json.load(f)
-            
-        if isinstance(data, dict):
-            for project_data in data.values():
-                project = RevitProject.from_dict(project_data)
-                self._projects[project.guid] = project
-    
+        """Load version data from file, then replay any unflushed journal."""
+        if self.data_file.exists():
+            with open(self.data_file, 'r') as f:
+                data = json.load(f)
+
+            if isinstance(data, dict):
+                for project_data in data.values():
+                    project = RevitProject.from_dict(project_data)
+                    self._set_project(project)
+
+        if self.journal_file.exists():
+            replayed = 0
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # torn last line from a crash mid-write
+                        continue
+                    if entry.get('type') == 'project':
+                        self._set_project(RevitProject.from_dict(entry['data']))
+                    elif entry.get('type') == 'model':
+                        self._apply_model(RevitModel.from_dict(entry['data']),
+                                          datetime.fromisoformat(entry['time']))
+                    replayed += 1
+            if replayed:
+                self._dirty = True
+                self.flush()
+
     def _save_data(self) -> None:
         """Save version data to file."""
         data = {project.guid: project.to_dict() for project in self._projects.values()}
-        with open(self.data_file, 'w') as f:
+        temp_file = self.data_file.with_name(self.data_file.name + ".tmp")
+        with open(temp_file, 'w') as f:
             json.dump(data, f, indent=2)
-    
+        os.replace(str(temp_file), str(self.data_file))
+
+    def _append_journal(self, entry: Dict) -> None:
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _set_project(self, project: RevitProject) -> None:
+        self._projects[project.guid] = project
+        self._model_index[project.guid] = {model.model_guid: i for i, model in enumerate(project.models)}
+
+    def _apply_model(self, model: RevitModel, updated: datetime) -> bool:
+        project = self._projects.get(model.project_guid)
+        if not project:
+            return False
+        index = self._model_index[project.guid]
+        position = index.get(model.model_guid)
+        if position is None:
+            index[model.model_guid] = len(project.models)
+            project.models.append(model)
+        else:
+            project.models[position] = model
+        project.last_updated = updated
+        return True
+
+    def _changed(self) -> None:
+        self._dirty = True
+        if self._batch_depth:
+            return
+        if self.flush_interval is not None and time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Rewrite the snapshot if anything changed and clear the journal."""
+        self._last_flush = time.time()
+        if not self._dirty:
+            return
+        self._save_data()
+        self._dirty = False
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+
+    @contextmanager
+    def batch(self):
+        """Defer snapshot rewrites until the outermost batch exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
     def get_project(self, guid: str) -> Optional[RevitProject]:
         """Get a project by its GUID."""
         return self._projects.get(guid)
-    
+
     def get_model(self, project_guid: str, model_guid: str) -> Optional[RevitModel]:
         """Get a model by project and model GUIDs."""
         project = self.get_project(project_guid)
-        return project.get_model_by_guid(model_guid) if project else None
-    
+        if not project:
+            return None
+        position = self._model_index[project_guid].get(model_guid)
+        return project.models[position] if position is not None else None
+
     def update_model(self, model: RevitModel) -> None:
         """Update model information."""
-        project = self._projects.get(model.project_guid)
-        if not project:
+        updated = datetime.now()
+        if not self._apply_model(model, updated):
             return
-            
-        existing_model = project.get_model_by_guid(model.guid)
-        if existing_model:
-            project.models.remove(existing_model)
-        project.models.append(model)
-        project.last_updated = datetime.now()
-        self._save_data()
-    
+        self._append_journal({'type': 'model', 'time': updated.isoformat(), 'data': model.to_dict()})
+        self._changed()
+
     def add_project(self, project: RevitProject) -> None:
         """Add a new project."""
-        self._projects[project.guid] = project
-        self._save_data() 
\ No newline at end of file
+        self._set_project(project)
+        self._append_journal({'type': 'project', 'data': project.to_dict()})
+        self._changed()
@@ -1,42 +1,81 @@
 import os
+import sys
 import json
+import time
 import datetime
-from contextlib import contextmanager
+
+# EVENT_LOG lives in the EnneadTab lib, two levels up
+enneadtab_lib_path = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if enneadtab_lib_path not in sys.path:
+    sys.path.append(enneadtab_lib_path)
+import EVENT_LOG
+
+DEFAULT_SETTINGS = {"auto_show": True}
+RECENT_LIMIT = 20
+# bump when apply_miniapp_event changes, the cached rollups are rebuilt
+ROLLUP_VERSION = 1
+
+
+def apply_miniapp_event(rollups, event):
+    """Fold one mini app event into the rollups.
+
+    Rollups:
+        weeks:    {monday: {date: {slot: content}}}
+        recents:  most recent contents first
+        settings: {key: value}
+    """
+    kind = event.get("kind")
+    if kind == "entry":
+        date_str, time_str, content = event["date"], event["slot"], event["content"]
+        day_entries = rollups.setdefault("weeks", {}).setdefault(EVENT_LOG.week_of(date_str), {}).setdefault(date_str, {})
+        if content and content.strip():
+            day_entries[time_str] = content.strip()
+
+            # Update recent entries
+            recents = rollups.setdefault("recents", [])
+            if content in recents:
+                recents.remove(content)
+            recents.insert(0, content)
+            del recents[RECENT_LIMIT:]
+        else:
+            # If content is empty, remove the entry
+            day_entries.pop(time_str, None)
+    elif kind == "setting":
+        rollups.setdefault("settings", {})[event["key"]] = event["value"]
+    elif kind == "recents":
+        rollups["recents"] = list(event["values"])[:RECENT_LIMIT]
+
 
 class DataManager:
+    # the legacy single JSON file, imported into the event log once
     DATA_FILE_NAME = "timesheet_miniapp_data.json"
+    EVENTS_FILE_NAME = "timesheet_miniapp_events.jsonl"
 
-    def __init__(self):
+    def __init__(self, app_dir=None):
         # Determine user documents path
         try:
-            # Try standard Documents location
-            docs_dir = os.path.join(os.path.expanduser("~"), "Documents")
-            if not os.path.exists(docs_dir):
-                # Fallback to home directory if Documents doesn't exist
-                docs_dir = os.path.expanduser("~")
-            
-            # Create a dedicated subfolder
-            self.app_dir = os.path.join(docs_dir, "EnneadTab_TimeSheet")
-            if not os.path.exists(self.app_dir):
-                os.makedirs(self.app_dir)
-                
-            self.data_path = os.path.join(self.app_dir, self.DATA_FILE_NAME)
-            
+            if app_dir is None:
+                # Try standard Documents location
+                docs_dir = os.path.join(os.path.expanduser("~"), "Documents")
+                if not os.path.exists(docs_dir):
+                    # Fallback to home directory if Documents doesn't exist
+                    docs_dir = os.path.expanduser("~")
+
+                # Create a dedicated subfolder
+                app_dir = os.path.join(docs_dir, "EnneadTab_TimeSheet")
+            if not os.path.exists(app_dir):
+                os.makedirs(app_dir)
+            self.app_dir = app_dir
+
         except Exception as e:
             # Fallback to local script folder if permission denied or other error
             print(f"Warning: Could not use Documents folder ({e}). Using application folder instead.")
-            self.data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.DATA_FILE_NAME)
-
-        self.ensure_data_file()
+            self.app_dir = os.path.dirname(os.path.abspath(__file__))
 
-    def ensure_data_file(self):
-        if not os.path.exists(self.data_path):
-            initial_data = {
-                "settings": {"auto_show": True},
-                "entries": {},
-                "recent_entries": []
-            }
-            self._save_json(initial_data)
+        self.data_path = os.path.join(self.app_dir, self.DATA_FILE_NAME)
+        self.log = EVENT_LOG.EventLog(os.path.join(self.app_dir, self.EVENTS_FILE_NAME),
+                                      apply_miniapp_event, rollup_version=ROLLUP_VERSION)
+        self.log.import_legacy_once(self._legacy_events)
 
     def _read_json(self):
         if not os.path.exists(self.data_path):
@@ -48,70 +87,61 @@ class DataManager:
             # print(f"Error reading data: {e}")
             return {}
 
-    def _save_json(self, data):
+    def _legacy_events(self):
+        data = self._read_json()
+        events = []
+        for date_str, day_entries in sorted(data.get("entries", {}).items()):
+            for time_str, content in sorted(day_entries.items()):
+                events.append({"kind": "entry", "date": date_str, "slot": time_str, "content": content})
+        for key, value in data.get("settings", {}).items():
+            events.append({"kind": "setting", "key": key, "value": value})
+        # after the entries, which reorder the recents as they replay
+        if "recent_entries" in data:
+            events.append({"kind": "recents", "values": data["recent_entries"]})
+        return events
+
+    def _append(self, event):
+        event["time"] = time.time()
         try:
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            self.log.append(event)
         except Exception as e:
             # print(f"Error saving data: {e}")
             pass
 
-    @contextmanager
-    def update_data_context(self):
-        data = self._read_json()
-        try:
-            yield data
-        finally:
-            self._save_json(data)
-
     def get_data(self):
-        return self._read_json()
+        """Everything as the legacy {"settings", "entries", "recent_entries"} dict."""
+        rollups = self.log.get_rollups()
+        entries = {}
+        for week_data in rollups.get("weeks", {}).values():
+            entries.update(week_data)
+        return {"settings": self.get_settings(),
+                "entries": entries,
+                "recent_entries": list(rollups.get("recents", []))}
 
     def save_entry(self, date_str, time_str, content):
-        with self.update_data_context() as data:
-            if "entries" not in data:
-                data["entries"] = {}
-            if date_str not in data["entries"]:
-                data["entries"][date_str] = {}
-            
-            if content and content.strip():
-                data["entries"][date_str][time_str] = content.strip()
-                
-                # Update recent entries
-                recents = data.get("recent_entries", [])
-                if content in recents:
-                    recents.remove(content)
-                recents.insert(0, content)
-                data["recent_entries"] = recents[:20] # Keep top 20
-            else:
-                # If content is empty, remove the entry
-                if time_str in data["entries"][date_str]:
-                    del data["entries"][date_str][time_str]
+        self._append({"kind": "entry", "date": date_str, "slot": time_str, "content": content})
 
     def get_entries_for_week(self, start_date):
         # start_date is Monday of the week (datetime.date)
-        data = self.get_data()
-        entries = data.get("entries", {})
+        week_str = start_date.strftime("%Y-%m-%d")
+        entries = self.log.get_rollups().get("weeks", {}).get(week_str, {})
         week_data = {}
         for i in range(5): # Mon-Fri
             current_date = start_date + datetime.timedelta(days=i)
             date_str = current_date.strftime("%Y-%m-%d")
-            week_data[date_str] = entries.get(date_str, {})
+            week_data[date_str] = dict(entries.get(date_str, {}))
         return week_data
 
     def get_recent_entries(self):
-        data = self.get_data()
-        return data.get("recent_entries", [])
+        return list(self.log.get_rollups().get("recents", []))
 
     def get_settings(self):
-        data = self.get_data()
-        return data.get("settings", {"auto_show": True})
+        settings = dict(DEFAULT_SETTINGS)
+        settings.update(self.log.get_rollups().get("settings", {}))
+        return settings
 
     def update_setting(self, key, value):
-        with self.update_data_context() as data:
-            if "settings" not in data:
-                data["settings"] = {}
-            data["settings"][key] = value
+        self._append({"kind": "setting", "key": key, "value": value})
 
     def check_missing_slots(self):
         # Check slots up to current time for the current week
@@ -123,8 +153,7 @@ class DataManager:
         
         missing_count = 0
         
-        data = self.get_data()
-        entries = data.get("entries", {})
+        entries = self.get_entries_for_week(start_of_week)
 
         # Iterate days from Monday to Today (inclusive)
         for i in range(5): # Mon-Fri
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Name matcher for ApplicationListToExcel
+
+Matches employee records (full name + email username) against the PC
+usernames found in the APPVERSIONLOOKUP files.
+
+This module handles:
+- Normalizing every name and username once instead of once per pair
+- Exact email-username matching through a hash map
+- Narrowing the fuzzy candidates through a gram index before scoring
+- Scoring the remaining employees across a process pool for large rosters
+
+The scores are the ones compare_names_with_usernames always used, the max
+of ratio, partial_ratio and token_sort_ratio plus the last name bonuses.
+At a threshold of 90 or more a username scoring at the threshold always
+shares a trigram with the employee name (two strings with no common
+trigram cannot reach a ratio of 0.895), so the blocking never drops a
+match. Lower thresholds score every username.
+"""
+
+import os
+import re
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fuzzywuzzy import fuzz
+from fuzzywuzzy import utils as fuzz_utils
+
+BLOCKING_MIN_THRESHOLD = 90
+PARALLEL_MIN_EMPLOYEES = 500
+CHUNK_SIZE = 50
+
+
+def normalize_name(name):
+    """Normalize a name for better matching."""
+    if not name:
+        return ""
+    # Convert to lowercase and remove extra spaces
+    normalized = str(name).lower().strip()
+    # Remove common prefixes/suffixes that might appear in usernames
+    normalized = re.sub(r'^[a-z]\.', '', normalized)  # Remove single letter prefix like "j."
+    normalized = re.sub(r'[^\w\s]', '', normalized)   # Remove special characters except spaces
+    return normalized
+
+
+def extract_last_name(full_name):
+    """Extract last name from full name."""
+    if not full_name:
+        return ""
+    parts = str(full_name).strip().split()
+    return parts[-1].lower() if parts else ""
+
+
+def token_sort_key(text):
+    """The sorted-token string fuzz.token_sort_ratio compares."""
+    return " ".join(sorted(fuzz_utils.full_process(text, force_ascii=True).split()))
+
+
+def _grams(text, size):
+    return set(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+class _Name(object):
+    """A name or username with everything the scoring needs computed once."""
+
+    __slots__ = ("text", "norm", "sort_key", "last_name", "first_initial")
+
+    def __init__(self, text):
+        self.text = text
+        self.norm = normalize_name(text)
+        self.sort_key = token_sort_key(self.norm)
+        self.last_name = extract_last_name(text)
+        parts = text.split() if text else []
+        self.first_initial = parts[0][0].lower() if len(parts) >= 2 else None
+
+    def trigrams(self):
+        return _grams(self.norm, 3) | _grams(self.sort_key, 3)
+
+    def is_short(self):
+        # too short to be found through a trigram
+        return len(self.norm) < 3 or len(self.sort_key) < 3
+
+
+def score_pair(employee, username):
+    """The compare_names_with_usernames score of one employee/username pair."""
+    scores = [fuzz.ratio(employee.norm, username.norm),
+              fuzz.partial_ratio(employee.norm, username.norm),
+              # token_sort_ratio is ratio over the sorted-token strings
+              fuzz.ratio(employee.sort_key, username.sort_key)]
+    if employee.last_name and employee.last_name in username.norm:
+        scores.append(85)
+    if employee.first_initial is not None:
+        if username.norm.startswith(employee.first_initial) and employee.last_name in username.norm:
+            scores.append(90)
+    return max(scores)
+
+
+class NameMatcher(object):
+    """Index over the PC usernames, built once per comparison.
+
+    Args:
+        pc_usernames (iterable): The usernames, ties go to the first in this order
+        threshold (int): Minimum confidence of a match
+    """
+
+    def __init__(self, pc_usernames, threshold=90):
+        self.threshold = threshold
+        self.usernames = [_Name(x) for x in pc_usernames]
+        self.blocking = threshold >= BLOCKING_MIN_THRESHOLD
+
+        self._exact = {}
+        self._grams = {}
+        self._short = []
+        for index, username in enumerate(self.usernames):
+            self._exact.setdefault(username.text.lower(), index)
+            if username.is_short():
+                self._short.append(index)
+            # 1 and 2-grams find the short last names of the 90 bonus
+            grams = username.trigrams() | _grams(username.norm, 1) | _grams(username.norm, 2)
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(index)
+
+    def exact_match(self, email_username):
+        """Username equal to the email username ignoring case, or None."""
+        index = self._exact.get(email_username.lower())
+        return None if index is None else self.usernames[index].text
+
+    def candidates(self, employee):
+        """Indexes of every username that can reach the threshold, in order."""
+        if not self.blocking or employee.is_short():
+            return range(len(self.usernames))
+        found = set(self._short)
+        for gram in employee.trigrams():
+            found.update(self._grams.get(gram, ()))
+        last_name = employee.last_name
+        if employee.first_initial is not None and last_name:
+            # the bonus only needs the last name somewhere in the username
+            found.update(i for i in self._grams.get(last_name[:3], ()) if last_name in self.usernames[i].norm)
+        return sorted(found)
+
+    def best_fuzzy(self, employee_name):
+        """(username, score) of the best fuzzy candidate, (None, 0) if none."""
+        employee = _Name(employee_name)
+        best_match, best_score = None, 0
+        for index in self.candidates(employee):
+            username = self.usernames[index]
+            score = score_pair(employee, username)
+            if score > best_score:
+                best_score = score
+                best_match = username.text
+        return best_match, best_score
+
+    def match_all(self, employee_records, workers=None):
+        """(username, score) per employee record, in the same order.
+
+        An exact email-username match scores 100, the others take the best
+        fuzzy candidate. With workers above 1, or None for every CPU, large
+        rosters are scored in a process pool.
+        """
+        results = [None] * len(employee_records)
+        pending = []
+        for i, emp in enumerate(employee_records):
+            username = self.exact_match(emp['email_username'])
+            if username is not None:
+                results[i] = (username, 100)
+            else:
+                pending.append(i)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        names = [employee_records[i]['full_name'] for i in pending]
+        if workers > 1 and len(names) >= PARALLEL_MIN_EMPLOYEES:
+            chunks = [names[i:i + CHUNK_SIZE] for i in range(0, len(names), CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+                scored = [x for chunk in executor.map(_match_chunk, chunks) for x in chunk]
+        else:
+            scored = [self.best_fuzzy(name) for name in names]
+        for i, result in zip(pending, scored):
+            results[i] = result
+        return results
+
+
+_WORKER_MATCHER = []
+
+
+def _init_worker(matcher):
+    _WORKER_MATCHER.append(matcher)
+
+
+def _match_chunk(names):
+    matcher = _WORKER_MATCHER[0]
+    return [matcher.best_fuzzy(name) for name in names]
+
+
+def _reference_match(employee_records, pc_usernames):
+    # the all-pairs loop the matcher replaced, for the test and benchmark
+    results = []
+    for emp in employee_records:
+        employee_name = emp['full_name']
+        best_match, best_score = None, 0
+        for username in pc_usernames:
+            if username.lower() == emp['email_username'].lower():
+                best_match, best_score = username, 100
+                break
+        if best_score < 100:
+            norm_employee = normalize_name(employee_name)
+            employee_last_name = extract_last_name(employee_name)
+            for username in pc_usernames:
+                norm_username = normalize_name(username)
+                scores = [fuzz.ratio(norm_employee, norm_username),
+                          fuzz.partial_ratio(norm_employee, norm_username),
+                          fuzz.token_sort_ratio(norm_employee, norm_username)]
+                if employee_last_name and employee_last_name in norm_username:
+                    scores.append(85)
+                if len(employee_name.split()) >= 2:
+                    first_initial = employee_name.split()[0][0].lower()
+                    if norm_username.startswith(first_initial) and employee_last_name in norm_username:
+                        scores.append(90)
+                if max(scores) > best_score:
+                    best_score, best_match = max(scores), username
+        results.append((best_match, best_score))
+    return results
+
+
+FIRST_NAMES = ["John", "Mary", "Wei", "Ana", "Olu", "Jean-Luc", "Priya", "Tom", "Li", "Sofia",
+               "Ahmed", "Kim", "Lucas", "Emma", "Yuki", "Omar", "Grace", "Ivan", "Nora", "Raj"]
+LAST_NAMES = ["Smith", "Chen", "Li", "O'Neil", "Garcia", "Ng", "Nakamura", "Okafor", "Rossi", "Wu",
+              "Johnson", "Patel", "Kowalski", "Lee", "Brown", "Martinez", "Kim", "Singh", "Dubois", "Ho"]
+
+
+def make_fake_roster(employee_count, username_count, seed=7):
+    """Employee records and PC usernames that look like the real lists."""
+    rng = random.Random(seed)
+    employees = []
+    for i in range(employee_count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if rng.random() < 0.1:
+            first = "{} {}.".format(first, rng.choice("ABCDEFG"))
+        full_name = "{} {}".format(first, last) if rng.random() > 0.02 else last
+        email = "{}{}{}".format(first[0], re.sub(r"\W", "", last), i).lower()
+        employees.append({'full_name': full_name, 'email_username': email})
+
+    usernames = []
+    for i in range(username_count):
+        emp = employees[rng.randrange(len(employees))]
+        parts = emp['full_name'].split()
+        style = rng.random()
+        if style < 0.3:
+            name = emp['email_username'].upper() if rng.random() < 0.5 else emp['email_username']
+        elif style < 0.5:
+            name = ".".join(parts).lower()
+        elif style < 0.65:
+            name = re.sub(r"\W", "", parts[-1]).lower() + parts[0][0].lower()
+        elif style < 0.8:
+            name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(rng.randint(2, 10)))
+        else:
+            name = "{}-{}".format(emp['email_username'][:-1], rng.choice(["PC", "WS", "admin", "2"]))
+        usernames.append(name)
+    # same order as the set main() builds
+    return employees, list(set(usernames))
+
+
+def benchmark(employee_count=1000, username_count=1500):
+    """All-pairs loop against the indexed matcher on a synthetic roster.
+
+    Returns:
+        dict: timings in seconds
+    """
+    employees, usernames = make_fake_roster(employee_count, username_count)
+    results = {}
+    start = time.time()
+    expected = _reference_match(employees, usernames)
+    results["all_pairs"] = time.time() - start
+
+    start = time.time()
+    matcher = NameMatcher(usernames, threshold=90)
+    found = matcher.match_all(employees, workers=1)
+    results["indexed"] = time.time() - start
+
+    start = time.time()
+    pooled = NameMatcher(usernames, threshold=90).match_all(employees, workers=4)
+    results["indexed_pool_4"] = time.time() - start
+
+    for result, reference in zip(found, expected):
+        if reference[1] >= 90:
+            assert result == reference, (result, reference)
+    assert pooled == found
+
+    print("{} employees x {} usernames".format(employee_count, len(usernames)))
+    print("  all pairs      {:>7.2f} s".format(results["all_pairs"]))
+    print("  indexed        {:>7.2f} s".format(results["indexed"]))
+    print("  indexed, pool  {:>7.2f} s".format(results["indexed_pool_4"]))
+    return results
+
+
+def unit_test():
+    assert normalize_name("J. Smith-Jones") == " smithjones"
+    assert token_sort_key(" smith  john") == "john smith"
+    assert fuzz.token_sort_ratio("ab  cd", "cd ab") == fuzz.ratio(token_sort_key("ab  cd"), token_sort_key("cd ab"))
+
+    matcher = NameMatcher(["JSMITH", "jsmith", "wli", "mchen-PC"], threshold=90)
+    assert matcher.exact_match("jSmith") == "JSMITH"
+    assert matcher.exact_match("nobody") is None
+    # a two letter last name is still found for the 90 bonus
+    assert matcher.best_fuzzy("Wei Li") == ("wli", 90)
+
+    for threshold in (90, 95, 80):
+        employees, usernames = make_fake_roster(60, 200, seed=threshold)
+        expected = _reference_match(employees, usernames)
+        found = NameMatcher(usernames, threshold=threshold).match_all(employees, workers=1)
+        for result, reference in zip(found, expected):
+            if reference[1] >= threshold:
+                assert result == reference, (threshold, result, reference)
+            else:
+                assert result[1] < threshold
+        if threshold < BLOCKING_MIN_THRESHOLD:
+            # no blocking, the best candidate below the threshold is the same too
+            assert found == expected
+
+
+if __name__ == "__main__":
+    unit_test()
+    benchmark()